@@ -0,0 +1,51 @@
+"""
+YahooFinanceCrawler 성능 측정 스크립트
+합성 / 샘플 페이지로 기능별 처리 속도를 비교합니다. 측정 코드는 benchmarks 패키지에 기능별로 있습니다.
+
+사용법: python benchmark.py [행 수]
+        python benchmark.py startup   (시작 시간 회귀 검사만)
+        python benchmark.py suite [--sizes 10,1000,100000] [--save-baseline]
+                                      (합성 페이지로 단계별 처리량 / 메모리를 재고 기준값과 비교)
+"""
+import sys
+
+from benchmarks.data import bench_diff, bench_memory, bench_normalize, bench_query, bench_snapshots
+from benchmarks.network import bench_batch, bench_cache, bench_daemon, bench_json, bench_paginate, bench_rate_limit
+from benchmarks.output import bench_export, bench_sinks
+from benchmarks.parsing import bench_browser, bench_parse, bench_parse_cache
+from benchmarks.services import bench_bulk, bench_service
+from benchmarks.startup import bench_startup
+from benchmarks.suite import run_suite
+
+
+def main():
+    # python benchmark.py startup : 시작 시간만 측정하고 회귀가 있으면 종료 코드 1
+    if len(sys.argv) > 1 and sys.argv[1] == 'startup':
+        sys.exit(0 if bench_startup() else 1)
+    # python benchmark.py suite ... : 합성 페이지 벤치마크 모음, 기준값 대비 회귀가 있으면 종료 코드 1
+    if len(sys.argv) > 1 and sys.argv[1] == 'suite':
+        sys.exit(run_suite(sys.argv[2:]))
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    bench_parse(n_rows)
+    bench_batch()
+    bench_paginate()
+    bench_json()
+    bench_cache()
+    bench_parse_cache()
+    bench_memory()
+    bench_normalize()
+    bench_export()
+    bench_sinks()
+    bench_diff()
+    bench_query()
+    bench_snapshots()
+    bench_daemon()
+    bench_rate_limit()
+    bench_service()
+    bench_browser()
+    bench_bulk()
+    bench_startup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""
+기능별 성능 측정 모음 (실행: python benchmark.py)
+
+    common     측정 함수와 html_sample을 복제한 입력 데이터
+    parsing    파서 / 추출기, 파싱 캐시, 브라우저 경로
+    network    동시 크롤링, 페이지 나누기, JSON 경로, 응답 캐시, 데몬, 속도 제한
+    data       행 표현의 메모리, 숫자 변환, 변경분, 질의 엔진, 스냅샷 저장소
+    output     엑셀 내보내기, 출력 형식별 쓰기
+    services   파싱 서비스, 스냅샷 일괄 파싱
+    startup    진입 스크립트의 import 시간
+    suite      기준값과 비교하는 재현 가능한 벤치마크 모음
+"""
@@ -0,0 +1,96 @@
+"""
+벤치마크 공통 도구: 측정 함수(처리량, 메모리, 최고 기록)와 html_sample을 복제한 입력 데이터
+"""
+import os
+import time
+import tracemalloc
+
+from crawler import YahooFinanceCrawler
+from fixtures import html_sample
+
+# 저장소 최상위 디렉터리 (스크립트를 새 프로세스로 실행할 때 씁니다)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_sample_page(n_rows: int) -> str:
+    """html_sample의 데이터 행을 n_rows개로 복제한 HTML을 만듭니다."""
+    row_start = html_sample.index('<tr class="row')
+    row_end = html_sample.index('</tr>', row_start) + len('</tr>')
+    head, row, tail = html_sample[:row_start], html_sample[row_start:row_end], html_sample[row_end:]
+
+    rows = []
+    for i in range(n_rows):
+        symbol = f"S{i:05d}"
+        rows.append(row.replace('ELPC', symbol).replace('data-testid-row="0"', f'data-testid-row="{i}"'))
+    return head + ''.join(rows) + tail
+
+
+def measure(label: str, func, n_rows: int):
+    """func를 실행하고 초당 처리 행 수를 출력합니다."""
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.3f}s  {n_rows / elapsed:10,.0f} rows/s  ({len(result)}행)")
+    return result
+
+
+def sample_dicts(n_rows: int):
+    """html_sample 행을 파싱한 딕셔너리를 n_rows개 만듭니다 (값은 행마다 별도의 문자열 객체)."""
+    template = YahooFinanceCrawler().parse_html_table(html_sample)[0]
+    return [{key: (None if value is None else (value + ' ')[:-1]) for key, value in template.items()}
+            | {'Symbol': f"S{i:06d}"} for i in range(n_rows)]
+
+
+def measure_memory(label: str, build):
+    """build()가 만든 객체가 차지하는 메모리를 출력합니다."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<32} {current / 1e6:8.1f}MB")
+    return result
+
+
+def varied_dicts(n_rows: int):
+    """sample_dicts와 같지만 숫자 값이 행마다 달라 파일 크기 비교가 현실적입니다."""
+    stocks = sample_dicts(n_rows)
+    for i, stock in enumerate(stocks):
+        stock['Price'] = f"{1 + (i * 7919) % 100000 / 100:.2f}"
+        stock['Change %'] = f"{((i * 104729) % 4000 - 2000) / 100:.4f}"
+        stock['Volume'] = str((i * 15485863) % 90000000 + 1000)
+        stock['Market Cap'] = f"{(i * 32452843) % 10 ** 12 + 10 ** 6:.2f}"
+    return stocks
+
+
+def best_time(func, min_time: float = 1.0, min_repeat: int = 3, max_time: float = 10.0, max_repeat: int = 50):
+    """
+    func를 여러 번 실행해 가장 빠른 시간을 반환합니다.
+    min_repeat번 이상, 합계 min_time초 이상 실행하되 합계가 max_time초를 넘거나 max_repeat번을 채우면 멈춥니다.
+    (한 번에 max_time초 넘게 걸리는 큰 입력은 한 번만 실행됩니다)
+
+    Returns:
+        (func() 반환값 목록, 가장 빠른 시간(초))
+    """
+    best = None
+    results = []
+    total = 0.0
+    for count in range(1, max_repeat + 1):
+        start = time.perf_counter()
+        results.append(func())
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        best = elapsed if best is None else min(best, elapsed)
+        if total >= max_time or (total >= min_time and count >= min_repeat):
+            break
+    return results, best
+
+
+def peak_memory(func) -> int:
+    """func 실행 중 tracemalloc으로 잰 최대 메모리(바이트). 입력으로 이미 만들어 둔 객체는 포함하지 않습니다."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
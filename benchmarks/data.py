@@ -0,0 +1,242 @@
+"""
+데이터 처리 벤치마크: 행 표현의 메모리, 숫자 변환, 변경분 비교, 질의 엔진, 스냅샷 저장소
+"""
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.common import measure, measure_memory, sample_dicts, varied_dicts
+from crawler import YahooFinanceCrawler
+from fixtures import html_sample
+from stock_row import StockRow, StockTable
+
+
+def bench_memory(n_rows: int = 100000):
+    """딕셔너리 / StockRow / StockTable 형식의 메모리 사용량을 비교합니다."""
+    print(f"\n[memory] {n_rows:,}행")
+    dicts = measure_memory("list[dict[str, str]]", lambda: sample_dicts(n_rows))
+    measure_memory("list[StockRow]", lambda: [StockRow.from_dict(stock) for stock in dicts])
+    measure_memory("StockTable", lambda: StockTable.from_rows(dicts))
+
+
+def bench_diff(sizes=(50, 10000, 100000), changed: float = 0.01):
+    """직전 결과와 비교해 바뀐 행만 내보낼 때의 비교 시간과 출력 크기를 전체를 다시 쓸 때와 비교합니다."""
+    import io
+    import json
+    import random
+    from row_diff import RowDiffer, apply_events, write_jsonl
+
+    rng = random.Random(3)
+    for n_rows in sizes:
+        before = varied_dicts(n_rows)
+        after = [dict(stock) for stock in before]
+        for stock in rng.sample(after, max(1, int(n_rows * changed))):
+            stock['Price'] = f"{float(stock['Price']) * 1.01:.2f}"
+            stock['Volume'] = str(int(stock['Volume']) + 100)
+        after = after[3:] + [dict(before[0], Symbol=f"N{i}") for i in range(3)]  # 3개 삭제, 3개 추가
+
+        print(f"\n[diff] {n_rows:,}행, {changed:.0%} 변경 + 3개 추가 / 3개 삭제")
+        differ = RowDiffer(before)
+        events = measure("RowDiffer.diff", lambda: list(differ.diff(after)), n_rows)
+        assert apply_events(before, events) == after or n_rows < 3
+        full = io.StringIO()
+        for stock in after:
+            full.write(json.dumps(stock, ensure_ascii=False) + '\n')
+        delta = io.StringIO()
+        write_jsonl(events, delta)
+        print(f"{'JSONL: full result':<32} {len(full.getvalue()) / 1e3:10,.1f}KB")
+        print(f"{'JSONL: diff events':<32} {len(delta.getvalue()) / 1e3:10,.1f}KB  ({len(events):,}건)")
+
+
+def bench_query(n_rows: int = 1000000, repeat: int = 20):
+    """질의 엔진(정렬 색인 + 배열 연산)과 같은 질의를 pandas로 할 때를 비교합니다."""
+    import numpy as np
+    from query import QueryEngine
+
+    rng = np.random.default_rng(5)
+    columns = {
+        'symbol': np.array([f"S{i:07d}" for i in range(n_rows)], dtype=object),
+        'price': rng.lognormal(3, 1, n_rows).round(2),
+        'change_percent': rng.normal(0, 3, n_rows).round(4),
+        'volume': rng.integers(1000, 50000000, n_rows).astype(np.float64),
+        'avg_volume': rng.integers(1000, 20000000, n_rows).astype(np.float64),
+        'market_cap': rng.lognormal(21, 2, n_rows),
+    }
+    print(f"\n[query] {n_rows:,}행, 질의마다 {repeat}회 평균")
+
+    def timed(label, func):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = func()
+        elapsed = (time.perf_counter() - start) / repeat
+        print(f"{label:<40} {elapsed * 1e3:9.2f}ms  ({len(result):,}행)")
+        return result
+
+    start = time.perf_counter()
+    engine = QueryEngine()
+    engine.add_columns(columns)
+    loaded = time.perf_counter() - start
+    start = time.perf_counter()
+    engine.build_indexes()
+    print(f"{'load (add_columns)':<40} {loaded * 1e3:9.2f}ms")
+    print(f"{'build sorted indexes (4 columns)':<40} {(time.perf_counter() - start) * 1e3:9.2f}ms")
+
+    df = pd.DataFrame({name: values for name, values in columns.items()})
+    cases = (
+        ("market_cap > 1B, top 20 change_percent",
+         lambda: engine.query().where('market_cap', '>', 1e9).top(20, 'change_percent').positions(),
+         lambda: df[df.market_cap > 1e9].nlargest(20, 'change_percent')),
+        ("volume > 5 * avg_volume",
+         lambda: engine.query().where('volume', '>', 'avg_volume', scale=5).positions(),
+         lambda: df[df.volume > 5 * df.avg_volume]),
+        ("10 <= price < 11, sort by volume",
+         lambda: engine.query().where('price', '>=', 10).where('price', '<', 11).sort('volume').positions(),
+         lambda: df[(df.price >= 10) & (df.price < 11)].sort_values('volume', ascending=False)),
+        ("top 20 market_cap",
+         lambda: engine.query().top(20, 'market_cap').positions(),
+         lambda: df.nlargest(20, 'market_cap')),
+    )
+    for label, query, reference in cases:
+        positions = timed(f"engine: {label}", query)
+        expected = timed(f"pandas: {label}", reference)
+        assert sorted(positions.tolist()) == sorted(expected.index.tolist())
+
+    symbols = [f"S{i:07d}" for i in rng.integers(0, n_rows, 1000)]
+    timed("engine: 1,000 symbol lookups", lambda: engine.query().symbols(symbols).positions())
+    indexed = df.set_index('symbol')
+    timed("pandas: 1,000 symbol lookups (.loc)", lambda: indexed.loc[symbols])
+
+
+def legacy_parse_number(value):
+    """기존 stock_row.parse_number: 쉼표와 끝의 %만 지우고 K/M/B/T를 처리합니다. ('$', '−'는 변환하지 못함)"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return None if isinstance(value, float) and value != value else float(value)
+    text = str(value).strip().replace(',', '').rstrip('%')
+    if not text:
+        return None
+    multiplier = {'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12}.get(text[-1].upper())
+    if multiplier is not None:
+        text = text[:-1]
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    return number * multiplier if multiplier is not None else number
+
+
+def mixed_number_strings(n_values: int, seed: int = 1):
+    """화면 / data-value 표기가 섞인 숫자 문자열 (일반 숫자, 쉼표, 약어, 퍼센트, 통화, 빈 값)"""
+    import random
+
+    rng = random.Random(seed)
+    values = []
+    for _ in range(n_values):
+        kind = rng.random()
+        if kind < 0.4:
+            values.append(f"{rng.uniform(-50, 500):.2f}")
+        elif kind < 0.55:
+            values.append(f"{rng.randint(0, 9999999):,}")
+        elif kind < 0.7:
+            values.append(f"{rng.uniform(1, 999):.3f}{rng.choice('KMBT')}")
+        elif kind < 0.85:
+            values.append(f"{rng.uniform(-20, 20):+.2f}%")
+        elif kind < 0.9:
+            values.append(f"${rng.uniform(1, 999):.3f}B")
+        else:
+            values.append(rng.choice(['--', 'N/A', '']))
+    return values
+
+
+def bench_normalize(n_values: int = 1000000):
+    """숫자 표기 변환: 값마다 변환하는 경로와 열 단위 변환(normalize_column)을 비교합니다."""
+    import numpy as np
+    from normalize import normalize_column, to_number
+
+    values = mixed_number_strings(n_values)
+    print(f"\n[normalize] 표기가 섞인 문자열 {n_values:,}개")
+
+    def column(parse):
+        return np.array([np.nan if number is None else number for number in map(parse, values)])
+
+    legacy = measure("legacy parse_number (per value)", lambda: column(legacy_parse_number), n_values)
+    scalar = measure("to_number (per value)", lambda: column(to_number), n_values)
+    vector = measure("normalize_column", lambda: normalize_column(values), n_values)
+    measure("pd.to_numeric (no suffixes)", lambda: pd.to_numeric(pd.Series(values), errors='coerce'), n_values)
+    assert np.array_equal(scalar, vector, equal_nan=True)
+    print(f"{'converted: legacy / normalize':<32} {np.count_nonzero(~np.isnan(legacy)):,} / "
+          f"{np.count_nonzero(~np.isnan(vector)):,}")
+
+    dicts = varied_dicts(100000)
+    measure("StockTable: append per row", lambda: StockTable.from_rows(iter(dicts)), len(dicts))
+    measure("StockTable.from_dicts (columns)", lambda: StockTable.from_dicts(dicts), len(dicts))
+
+
+def trading_day(n_symbols: int = 250, minutes: int = 390, seed: int = 7):
+    """1분 간격 스냅샷 minutes개를 만듭니다. 매분 일부 종목의 가격과 거래량만 바뀝니다."""
+    import random
+
+    rng = random.Random(seed)
+    template = YahooFinanceCrawler().parse_html_table(html_sample)[0]
+    state = [dict(template, Symbol=f"S{i:04d}", Price=f"{rng.uniform(1, 500):.2f}",
+                  Volume=str(rng.randint(1000, 10 ** 6)))
+             for i in range(n_symbols)]
+    snapshots = []
+    for minute in range(minutes):
+        for stock in state:
+            if rng.random() < 0.6:
+                stock['Volume'] = str(int(stock['Volume']) + rng.randint(100, 50000))
+            if rng.random() < 0.3:
+                price = float(stock['Price']) * (1 + rng.gauss(0, 0.002))
+                stock['Price'] = f"{price:.2f}"
+                stock['Change'] = f"{price * 0.01:.2f}"
+                stock['Change %'] = f"{rng.uniform(-5, 5):.4f}"
+        snapshots.append((34200.0 + minute * 60, [dict(stock) for stock in state]))
+    return snapshots
+
+
+def bench_snapshots(n_symbols: int = 250, minutes: int = 390):
+    """하루치 1분 스냅샷의 저장 속도와 파일 크기, 복원 / 종목 조회 속도를 비교합니다."""
+    import json
+    from snapshot_store import SnapshotStore
+
+    snapshots = trading_day(n_symbols, minutes)
+    n_rows = n_symbols * minutes
+    print(f"\n[snapshots] {n_symbols}종목 x {minutes}분")
+    with tempfile.TemporaryDirectory() as directory:
+        full_path = f"{directory}/full.jsonl"
+
+        def write_full():
+            with open(full_path, 'w', encoding='utf-8') as f:
+                for timestamp, stocks in snapshots:
+                    f.write(json.dumps({'timestamp': timestamp, 'stocks': stocks}) + '\n')
+            return range(n_rows)
+
+        def ingest():
+            with SnapshotStore(f"{directory}/day.snap") as store:
+                for timestamp, stocks in snapshots:
+                    store.append(stocks, timestamp)
+            return range(n_rows)
+
+        measure("full snapshots (jsonl)", write_full, n_rows)
+        measure("delta store ingest", ingest, n_rows)
+        print(f"{'size: full snapshots':<32} {os.path.getsize(full_path) / 1e6:8.2f}MB")
+        print(f"{'size: delta store':<32} {os.path.getsize(f'{directory}/day.snap') / 1e6:8.2f}MB")
+
+        store = SnapshotStore(f"{directory}/day.snap")
+        times = [timestamp for timestamp, _ in snapshots]
+        start = time.perf_counter()
+        for timestamp in times[::-7]:
+            assert len(store.snapshot_at(timestamp + 30)) == n_symbols
+        print(f"{'snapshot_at (random order)':<32} {(time.perf_counter() - start) / len(times[::-7]) * 1000:8.2f}ms")
+        start = time.perf_counter()
+        for timestamp in times:
+            store.snapshot_at(timestamp)
+        print(f"{'snapshot_at (sequential)':<32} {(time.perf_counter() - start) / len(times) * 1000:8.2f}ms")
+        start = time.perf_counter()
+        history = store.history('S0042', times[60], times[180])
+        print(f"{'history (2 hours, 1 symbol)':<32} {(time.perf_counter() - start) * 1000:8.2f}ms  ({len(history)}개 변화)")
+        store.close()
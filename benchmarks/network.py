@@ -0,0 +1,169 @@
+"""
+네트워크 벤치마크: 로컬 서버(fixtures.FixtureServer)로 동시 크롤링, 페이지 나누기, JSON 경로,
+응답 캐시, 데몬 폴링, 속도 제한을 측정합니다.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.common import ROOT, build_sample_page, measure
+from crawler import YahooFinanceCrawler
+from fixtures import FixtureServer, paged_screener, screener_api
+from http_cache import ResponseCache
+
+
+def bench_batch(n_urls: int = 24, n_rows: int = 50, latency: float = 0.1):
+    """URL을 하나씩 크롤링할 때와 crawl_many로 동시에 크롤링할 때를 비교합니다."""
+    page = build_sample_page(n_rows)
+    pages = {f"/screener/predefined/s{i}": page for i in range(n_urls)}
+    print(f"\n[batch] URL {n_urls}개 x {n_rows}행, 응답 지연 {latency * 1000:.0f}ms")
+
+    with FixtureServer(pages, latency) as server:
+        urls = [server.url(path) for path in pages]
+        crawler = YahooFinanceCrawler(use_api=False)
+        measure("sequential crawl_from_url", lambda: [row for url in urls for row in crawler.crawl_from_url(url)],
+                n_urls * n_rows)
+        rows = measure("crawl_many (8 workers)",
+                       lambda: [row for rows in crawler.crawl_many(urls, max_workers=8).values() for row in rows],
+                       n_urls * n_rows)
+        assert len(rows) == n_urls * n_rows
+
+
+def bench_paginate(total_rows: int = 5000, page_size: int = 100, latency: float = 0.05):
+    """페이지를 하나씩 가져올 때와 병렬로 가져올 때의 처리량을 비교합니다."""
+    print(f"\n[paginate] {total_rows:,}행, 페이지당 {page_size}행, 응답 지연 {latency * 1000:.0f}ms")
+    with FixtureServer(paged_screener(total_rows), latency) as server:
+        url = server.url('/screener/predefined/day_gainers')
+        crawler = YahooFinanceCrawler(use_api=False)
+        for workers in (1, 4, 8):
+            rows = measure(f"paginate ({workers} workers)",
+                           lambda: crawler.crawl_from_url(url, None, paginate=True, page_size=page_size,
+                                                          max_workers=workers),
+                           total_rows)
+            assert len(rows) == total_rows and len({row['Symbol'] for row in rows}) == total_rows
+
+
+def bench_json(n_rows: int = 1000, latency: float = 0.05):
+    """같은 스크리너를 HTML 표 / 페이지에 포함된 JSON / 스크리너 API로 가져올 때를 비교합니다."""
+    from fixtures import expected_stocks, synthetic_embedded_page, synthetic_page, synthetic_quotes
+    from json_source import API_URL
+
+    expected = expected_stocks(n_rows)
+    api = screener_api(synthetic_quotes(n_rows))
+    pages = {'/screener/predefined/day_gainers': synthetic_page(n_rows),
+             '/markets/stocks/gainers/': synthetic_embedded_page(n_rows)}
+    print(f"\n[json] {n_rows:,}행, 응답 지연 {latency * 1000:.0f}ms")
+    with FixtureServer(lambda path: pages.get(path) or api(path), latency) as server:
+        api_url = server.url(urlsplit(API_URL).path)
+        html_crawler = YahooFinanceCrawler(use_api=False)
+        api_crawler = YahooFinanceCrawler(api_url=api_url)
+        cases = [
+            ("HTML table (streaming)", html_crawler, '/screener/predefined/day_gainers'),
+            ("embedded <script> JSON", html_crawler, '/markets/stocks/gainers/'),
+            ("screener API JSON", api_crawler, '/screener/predefined/day_gainers'),
+        ]
+        for label, crawler, path in cases:
+            rows = measure(label, lambda: crawler.fetch(server.url(path), None), n_rows)
+            assert rows == expected, label
+
+
+def bench_cache(n_polls: int = 50, n_rows: int = 200):
+    """같은 URL을 반복해서 가져올 때 캐시 유무(TTL 적중 / 304 재검증)를 비교합니다."""
+    page = build_sample_page(n_rows)
+    print(f"\n[cache] 같은 URL {n_polls}회 요청, {n_rows}행")
+    with FixtureServer({'/screener/predefined/day_gainers': page}) as server:
+        url = server.url('/screener/predefined/day_gainers')
+
+        crawler = YahooFinanceCrawler(use_api=False)
+        measure("no cache", lambda: [row for _ in range(n_polls) for row in crawler.crawl_from_url(url, None)],
+                n_polls * n_rows)
+
+        for label, ttl in (("cache, ttl=0 (304 revalidate)", 0), ("cache, ttl=60 (fresh hit)", 60)):
+            cache = ResponseCache(ttl=ttl)
+            crawler = YahooFinanceCrawler(cache=cache, use_api=False)
+            measure(label, lambda: [row for _ in range(n_polls) for row in crawler.crawl_from_url(url, None)],
+                    n_polls * n_rows)
+            print(f"{'':<32} {cache.stats()}")
+
+
+def bench_daemon(n_rows: int = 50, seconds: float = 3.0, slow_latency: float = 1.0):
+    """
+    cron처럼 매번 스크립트를 새로 실행할 때와 데몬이 크롤러를 재사용할 때의 폴링 비용,
+    느린 스크리너가 있어도 빠른 스크리너의 간격이 지켜지는지를 확인합니다.
+    """
+    import subprocess
+    from poller import Poller
+
+    page = build_sample_page(n_rows)
+    print(f"\n[daemon] {n_rows}행 페이지, 느린 스크리너 응답 지연 {slow_latency * 1000:.0f}ms")
+    latency = lambda path: slow_latency if path.startswith('/slow') else 0.0  # noqa: E731
+    with FixtureServer(lambda path: page, latency) as server, tempfile.TemporaryDirectory() as directory:
+        fast_url, slow_url = server.url('/fast'), server.url('/slow')
+        script = os.path.join(ROOT, 'stock_crawler.py')
+        runs = 3
+        start = time.perf_counter()
+        for _ in range(runs):
+            subprocess.run([sys.executable, script, fast_url, '--format', 'csv'], cwd=directory,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        print(f"{'one-shot script (per poll)':<32} {(time.perf_counter() - start) / runs * 1000:8.1f}ms")
+
+        poller = Poller(interval=0.2, min_interval=0.2, max_interval=0.2)
+        poller.add(fast_url)
+        start = time.perf_counter()
+        for _ in range(runs * 10):
+            poller.crawler.fetch(fast_url)
+        print(f"{'daemon (per poll, warm + 304)':<32} {(time.perf_counter() - start) / (runs * 10) * 1000:8.1f}ms")
+
+        poller.add(slow_url)
+        poller.run(duration=seconds)
+        stats = poller.stats()
+        print(f"{'0.2s interval for ' + str(seconds) + 's':<32} 빠른 URL {stats[fast_url]['polls']}회, "
+              f"느린 URL {stats[slow_url]['polls']}회 (빠른 URL 기대값 {int(seconds / 0.2)}회)")
+
+
+def bench_rate_limit(n_urls: int = 24, n_rows: int = 50, server_rate: int = 10):
+    """
+    초당 server_rate개를 넘는 요청에 429(Retry-After: 1)로 답하는 서버에서
+    속도 제한 없이 동시에 요청할 때와 RateLimiter로 맞춰 요청할 때의 성공 수와 시간을 비교합니다.
+    """
+    import contextlib
+    import io
+    from metrics import METRICS
+    from rate_limit import RateLimiter
+
+    page = build_sample_page(n_rows)
+    window = []
+    rejected = []
+    lock = threading.Lock()
+
+    def limited(path):
+        now = time.monotonic()
+        with lock:
+            while window and window[0] <= now - 1.0:
+                window.pop(0)
+            if len(window) >= server_rate:
+                rejected.append(path)
+                return 429, {'Retry-After': '1'}
+            window.append(now)
+        return page
+
+    print(f"\n[rate limit] {n_urls}개 URL, 서버 허용량 초당 {server_rate}개 (넘으면 429)")
+    for label, limiter in (('no limiter', None), ('RateLimiter', RateLimiter(rate=server_rate * 0.8, burst=2))):
+        with FixtureServer(limited) as server:
+            time.sleep(1.0)
+            window.clear()
+            rejected.clear()
+            METRICS.reset()
+            crawler = YahooFinanceCrawler(rate_limiter=limiter)
+            urls = [server.url(f'/screener/{i}') for i in range(n_urls)]
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = crawler.crawl_many(urls, n_rows, max_workers=8)
+            elapsed = time.perf_counter() - start
+            ok = sum(1 for stocks in results.values() if stocks)
+            waited = METRICS.to_dict()['spans'].get('rate_limit_wait', {}).get('total', 0.0)
+            print(f"{label:<32} {elapsed:6.2f}s  성공 {ok}/{n_urls}, 요청 {server.requests}회, "
+                  f"429 {len(rejected)}회, 대기 합계 {waited:.2f}s")
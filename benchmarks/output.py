@@ -0,0 +1,92 @@
+"""
+출력 벤치마크: 기존 save_to_excel과 내보내기 엔진, 출력 형식(싱크)별 쓰기 / 다시 읽기
+"""
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.common import measure, sample_dicts, varied_dicts
+from crawler import YahooFinanceCrawler
+
+
+def legacy_save_to_excel(crawler: YahooFinanceCrawler, stocks, filename):
+    """기존 save_to_excel: 행마다 딕셔너리를 만들고 셀마다 포맷 함수를 호출합니다 (filename이 None이면 쓰지 않음)."""
+    df_data = []
+    for stock in stocks:
+        row = {}
+        row['Symbol'] = stock.get('Symbol', '')
+        row['Name'] = stock.get('Name', '')
+        row['Price'] = crawler._format_number(stock.get('Price', ''))
+        row['Change'] = crawler._format_number(stock.get('Change', ''))
+        row['Change %'] = crawler._format_percent(stock.get('Change %', ''))
+        row['Volume'] = crawler._format_number(stock.get('Volume', ''))
+        row['Avg Vol (3M)'] = stock.get('Avg Vol (3M)', '')
+        row['Market Cap'] = crawler._format_market_cap(stock.get('Market Cap', ''))
+        row['P/E Ratio (TTM)'] = stock.get('P/E Ratio (TTM)', '')
+        row['52 Wk Change %'] = crawler._format_percent(stock.get('52 Wk Change %', ''))
+        row['52 Wk Range'] = stock.get('52 Wk Range', '')
+        df_data.append(row)
+
+    df = pd.DataFrame(df_data)
+    if filename:
+        df.to_excel(filename, index=False, engine='openpyxl')
+    return df_data
+
+
+def bench_export(sizes=(10000, 100000)):
+    """기존 save_to_excel과 내보내기 엔진의 각 모드를 비교합니다 (포맷만 / 파일 쓰기 포함)."""
+    from export import build_export_frame, default_engine, write_excel
+
+    crawler = YahooFinanceCrawler()
+    engines = ['openpyxl'] + (['xlsxwriter'] if default_engine() == 'xlsxwriter' else [])
+    with tempfile.TemporaryDirectory() as directory:
+        path = f"{directory}/out.xlsx"
+        for n_rows in sizes:
+            stocks = sample_dicts(n_rows)
+            print(f"\n[export] {n_rows:,}행")
+            measure("format only: legacy", lambda: legacy_save_to_excel(crawler, stocks, None), n_rows)
+            measure("format only: vectorized", lambda: build_export_frame(stocks, crawler=crawler), n_rows)
+            measure("format only: numeric", lambda: build_export_frame(stocks, numeric=True), n_rows)
+            measure("xlsx: legacy save_to_excel", lambda: legacy_save_to_excel(crawler, stocks, path), n_rows)
+            for engine in engines:
+                measure(f"xlsx: text ({engine})", lambda: stocks[:write_excel(stocks, path, crawler=crawler,
+                                                                             engine=engine)], n_rows)
+                measure(f"xlsx: numeric ({engine})", lambda: stocks[:write_excel(stocks, path, numeric=True,
+                                                                                engine=engine)], n_rows)
+                measure(f"xlsx: write_only ({engine})", lambda: stocks[:write_excel(
+                    stocks, path, numeric=True, write_only=True, engine=engine)], n_rows)
+            tracemalloc.start()
+            write_excel(iter(stocks), path, write_only=True, crawler=crawler)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{'xlsx: write_only peak memory':<32} {peak / 1e6:8.1f}MB")
+
+
+def bench_sinks(n_rows: int = 50000):
+    """출력 형식별 쓰기 속도, 파일 크기, pandas로 다시 읽는 시간을 비교합니다."""
+    from sinks import SINKS, get_sink
+
+    crawler = YahooFinanceCrawler()
+    stocks = varied_dicts(n_rows)
+    readers = {'xlsx': pd.read_excel, 'csv': pd.read_csv, 'jsonl': lambda path: pd.read_json(path, lines=True),
+               'parquet': pd.read_parquet,
+               'sqlite': lambda path: pd.read_sql('SELECT * FROM stocks', sqlite3.connect(path))}
+    print(f"\n[sinks] {n_rows:,}행")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, sink_class in SINKS.items():
+            path = f"{directory}/out{sink_class.extension}"
+            options = {'write_only': True} if name == 'xlsx' else {}
+            try:
+                measure(f"write: {name}", lambda: stocks[:get_sink(name, **options).write(stocks, path, crawler)],
+                        n_rows)
+            except ImportError as e:
+                print(f"write: {name:<25} 건너뜀 ({e})")
+                continue
+            size = os.path.getsize(path)
+            start = time.perf_counter()
+            readers[name](path)
+            print(f"{'':<7}{'':<25} {size / 1e6:8.2f}MB   read {time.perf_counter() - start:.3f}s")
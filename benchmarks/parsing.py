@@ -0,0 +1,170 @@
+"""
+파싱 벤치마크: 기존 필드별 row.find 추출기와 단일 순회 / 스트리밍 파서, 파싱 캐시, 브라우저 경로
+"""
+import tempfile
+
+from bs4 import BeautifulSoup
+
+from benchmarks.common import best_time, build_sample_page, measure
+from crawler import YahooFinanceCrawler
+from parse_cache import ParseCache
+from stream_parser import iter_rows
+
+
+def legacy_parse(html_content: str):
+    """기존 방식: html.parser로 전체 트리를 만든 뒤 행마다 legacy_extract_row_data를 호출합니다."""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    stocks = []
+    for row in soup.find_all('tr', {'data-testid': 'data-table-v2-row'}):
+        stock = legacy_extract_row_data(row)
+        if stock:
+            stocks.append(stock)
+    return stocks
+
+
+def legacy_extract_row_data(row):
+    """기존 _extract_row_data: 필드마다 row.find로 행 전체를 다시 탐색합니다."""
+    stock = {}
+    
+    # Symbol (티커)
+    ticker_cell = row.find('td', {'data-testid-cell': 'ticker'})
+    if ticker_cell:
+        symbol_link = ticker_cell.find('a', {'data-testid': 'table-cell-ticker'})
+        if symbol_link:
+            symbol_span = symbol_link.find('span', class_='symbol')
+            if symbol_span:
+                stock['Symbol'] = symbol_span.get_text(strip=True)
+    
+    # Name (회사명)
+    name_cell = row.find('td', {'data-testid-cell': 'companyshortname.raw'})
+    if name_cell:
+        name_div = name_cell.find('div', class_='companyName')
+        if name_div:
+            stock['Name'] = name_div.get_text(strip=True)
+    
+    # Price (가격)
+    price_cell = row.find('td', {'data-testid-cell': 'intradayprice'})
+    if price_cell:
+        price_streamer = price_cell.find('fin-streamer', {'data-field': 'regularMarketPrice'})
+        if price_streamer:
+            stock['Price'] = price_streamer.get('data-value', price_streamer.get_text(strip=True))
+    
+    # Change (변동액)
+    change_cell = row.find('td', {'data-testid-cell': 'intradaypricechange'})
+    if change_cell:
+        change_streamer = change_cell.find('fin-streamer', {'data-field': 'regularMarketChange'})
+        if change_streamer:
+            stock['Change'] = change_streamer.get('data-value', change_streamer.get_text(strip=True))
+    
+    # Change % (변동률)
+    percent_cell = row.find('td', {'data-testid-cell': 'percentchange'})
+    if percent_cell:
+        percent_streamer = percent_cell.find('fin-streamer', {'data-field': 'regularMarketChangePercent'})
+        if percent_streamer:
+            stock['Change %'] = percent_streamer.get('data-value', percent_streamer.get_text(strip=True))
+    
+    # Volume (거래량)
+    volume_cell = row.find('td', {'data-testid-cell': 'dayvolume'})
+    if volume_cell:
+        volume_streamer = volume_cell.find('fin-streamer', {'data-field': 'regularMarketVolume'})
+        if volume_streamer:
+            stock['Volume'] = volume_streamer.get('data-value', volume_streamer.get_text(strip=True))
+    
+    # Avg Vol (3M) (3개월 평균 거래량)
+    avgvol_cell = row.find('td', {'data-testid-cell': 'avgdailyvol3m'})
+    if avgvol_cell:
+        stock['Avg Vol (3M)'] = avgvol_cell.get_text(strip=True)
+    
+    # Market Cap (시가총액)
+    marketcap_cell = row.find('td', {'data-testid-cell': 'intradaymarketcap'})
+    if marketcap_cell:
+        marketcap_streamer = marketcap_cell.find('fin-streamer', {'data-field': 'marketCap'})
+        if marketcap_streamer:
+            stock['Market Cap'] = marketcap_streamer.get('data-value', marketcap_streamer.get_text(strip=True))
+    
+    # P/E Ratio (TTM)
+    pe_cell = row.find('td', {'data-testid-cell': 'peratio.lasttwelvemonths'})
+    if pe_cell:
+        pe_text = pe_cell.get_text(strip=True)
+        stock['P/E Ratio (TTM)'] = pe_text if pe_text != '--' else None
+    
+    # 52 Wk Change %
+    wk52_change_cell = row.find('td', {'data-testid-cell': 'fiftytwowkpercentchange'})
+    if wk52_change_cell:
+        wk52_streamer = wk52_change_cell.find('fin-streamer', {'data-field': 'fiftyTwoWeekChangePercent'})
+        if wk52_streamer:
+            stock['52 Wk Change %'] = wk52_streamer.get('data-value', wk52_streamer.get_text(strip=True))
+    
+    # 52 Wk Range
+    wk52_range_cell = row.find('td', {'data-testid-cell': 'fiftyTwoWeekRange'})
+    if wk52_range_cell:
+        labels = wk52_range_cell.find('div', class_='labels')
+        if labels:
+            spans = labels.find_all('span')
+            if len(spans) >= 2:
+                stock['52 Wk Range'] = f"{spans[0].get_text(strip=True)} - {spans[1].get_text(strip=True)}"
+    
+    return stock if stock else None
+
+
+def bench_parse(n_rows: int):
+    """기존 경로와 단일 순회 추출기(파서별)를 비교합니다."""
+    html_content = build_sample_page(n_rows)
+    print(f"\n[parse] {n_rows:,}행, HTML {len(html_content) / 1e6:.1f}MB")
+
+    measure("legacy (html.parser, find x20)", lambda: legacy_parse(html_content), n_rows)
+    for parser in ('html.parser', 'lxml'):
+        crawler = YahooFinanceCrawler(parser=parser)
+        measure(f"single-pass ({parser})", lambda: crawler.parse_html_table(html_content), n_rows)
+
+    chunks = [html_content[i:i + 16384] for i in range(0, len(html_content), 16384)]
+    measure("streaming (16KB chunks)", lambda: list(iter_rows(chunks)), n_rows)
+
+
+def bench_parse_cache(n_rows: int = 2000, n_changed: int = 10):
+    """같은 스냅샷 / 몇 행만 바뀐 스냅샷을 다시 파싱할 때 ParseCache의 효과를 측정합니다."""
+    html_content = build_sample_page(n_rows)
+    changed = html_content
+    for i in range(n_changed):
+        changed = changed.replace(f"S{i * 7:05d}", f"X{i * 7:05d}")
+    print(f"\n[parse cache] {n_rows:,}행 스냅샷, 변경된 행 {n_changed}개")
+
+    with tempfile.TemporaryDirectory() as directory:
+        original_path = f"{directory}/original.html"
+        changed_path = f"{directory}/changed.html"
+        with open(original_path, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        with open(changed_path, 'w', encoding='utf-8') as f:
+            f.write(changed)
+
+        crawler = YahooFinanceCrawler()
+        cache = ParseCache(f"{directory}/cache")
+        measure("cold (parse every row)", lambda: cache.parse_file(original_path, crawler), n_rows)
+        measure("warm (document hit)", lambda: ParseCache(f"{directory}/cache").parse_file(original_path, crawler),
+                n_rows)
+        changed_cache = ParseCache(f"{directory}/cache")
+        measure(f"{n_changed} rows changed", lambda: changed_cache.parse_file(changed_path, crawler), n_rows)
+        print(f"{'':<32} {changed_cache.stats()}")
+
+
+def bench_browser(n_rows: int = 100):
+    """
+    브라우저 경로에서 page_source 전체를 받아 파싱할 때와 페이지 안 스크립트(TABLE_SCRIPT)의 JSON을 받을 때,
+    WebDriver로 넘어오는 크기와 파이썬 쪽 처리 시간을 비교합니다 (스크립트 실행은 fixtures.FakeDriver가 대신합니다).
+    """
+    import json
+    from browser_pool import ROW_TESTID, TABLE_SCRIPT, script_spec, stocks_from_script
+    from fixtures import FakeDriver, synthetic_page
+
+    crawler = YahooFinanceCrawler()
+    page = synthetic_page(n_rows)
+    driver = FakeDriver({'page': page})
+    driver.get('page')
+    payload = driver.execute_script(TABLE_SCRIPT, ROW_TESTID, script_spec(crawler.schema), 0)
+    assert stocks_from_script(json.loads(payload), crawler.schema) == crawler.parse_html_table(page)
+
+    print(f"\n[browser] {n_rows}행 페이지")
+    _, source_time = best_time(lambda: crawler.parse_html_table(driver.page_source))
+    _, script_time = best_time(lambda: stocks_from_script(json.loads(payload), crawler.schema))
+    print(f"{'page_source + parse_html_table':<32} {source_time * 1000:8.2f}ms  {len(page):>10,}B")
+    print(f"{'in-page script JSON':<32} {script_time * 1000:8.2f}ms  {len(payload):>10,}B")
@@ -0,0 +1,76 @@
+"""
+대량 처리 벤치마크: 파싱 서비스(parse_service)와 스냅샷 일괄 파싱(bulk_parse)
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.common import ROOT
+
+
+def bench_service(n_docs: int = 64, n_rows: int = 100, workers: int = None):
+    """
+    스크립트마다 crawler.py를 불러와 파싱할 때와 parse_service에 요청할 때의 비용,
+    문서를 요청 하나로 묶어 작업 프로세스에 나눌 때의 처리량, 열 단위 인코딩의 크기를 비교합니다.
+    """
+    import marshal
+    import pickle
+    import subprocess
+    from fixtures import synthetic_page
+    from parse_service import ParseClient, ParseService, encode_rows
+    from schema import DEFAULT_SCHEMA
+
+    workers = workers or os.cpu_count() or 1
+    pages = [synthetic_page(n_rows, seed) for seed in range(n_docs)]
+    print(f"\n[service] {n_rows}행 문서 {n_docs}개, 작업 프로세스 {workers}개")
+    with tempfile.TemporaryDirectory() as directory:
+        page_path = os.path.join(directory, 'page.html')
+        with open(page_path, 'w', encoding='utf-8') as f:
+            f.write(pages[0])
+        code = ("import sys; from crawler import YahooFinanceCrawler; import export; "
+                "YahooFinanceCrawler().parse_html_table(open(sys.argv[1], encoding='utf-8').read())")
+        runs = 3
+        start = time.perf_counter()
+        for _ in range(runs):
+            subprocess.run([sys.executable, '-c', code, page_path], cwd=ROOT, check=True)
+        print(f"{'new process (import + parse)':<32} {(time.perf_counter() - start) / runs * 1000:8.1f}ms")
+
+        address = os.path.join(directory, 'service.sock')
+        with ParseService(address, workers=workers).start(), ParseClient(address) as client:
+            client.parse(pages[0])
+            start = time.perf_counter()
+            for page in pages[:16]:
+                client.parse(page)
+            print(f"{'service, one request per doc':<32} {(time.perf_counter() - start) / 16 * 1000:8.1f}ms")
+            start = time.perf_counter()
+            results = client.parse_many(pages)
+            elapsed = time.perf_counter() - start
+            print(f"{'service, batched':<32} {elapsed / n_docs * 1000:8.1f}ms  ({n_docs / elapsed:.0f} docs/s)")
+
+        stocks = results[0][0]
+        columnar = len(marshal.dumps(encode_rows(stocks, DEFAULT_SCHEMA.columns)))
+        print(f"{'payload per doc':<32} 열 단위 {columnar:,}B, 행 딕셔너리 marshal {len(marshal.dumps(stocks)):,}B, "
+              f"pickle {len(pickle.dumps(stocks)):,}B")
+
+
+def bench_bulk(n_files: int = 64, n_rows: int = 100, max_workers: int = None):
+    """bulk_parse로 스냅샷 파일을 파싱할 때 작업 프로세스 수(1 ~ CPU 수)에 따른 files/s를 비교합니다."""
+    from bulk_parse import BulkParser, find_html_files
+    from fixtures import synthetic_page
+
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = sorted({1, *(2 ** i for i in range(1, max_workers.bit_length())), max_workers})
+    print(f"\n[bulk] 파일 {n_files}개 x {n_rows}행, CPU {os.cpu_count()}개")
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(n_files):
+            with open(f"{directory}/snapshot-{i:04d}.html", 'w', encoding='utf-8') as f:
+                f.write(synthetic_page(n_rows, seed=i))
+        paths = find_html_files([directory])
+        base = None
+        for workers in counts:
+            stats = BulkParser(f"{directory}/out-{workers}", 'csv', workers=workers, quiet=True).run(paths)
+            rate = stats['files'] / stats['seconds']
+            base = base or rate
+            print(f"{'workers=' + str(workers):<32} {stats['seconds']:8.3f}s  {rate:8.1f} files/s  "
+                  f"x{rate / base:.2f}  ({stats['rows']:,}행)")
@@ -0,0 +1,59 @@
+"""
+시작 시간 벤치마크: 진입 스크립트의 import 시간과 무거운 모듈을 불러오는지 확인합니다.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import ROOT
+
+
+# 시작 시간 측정 대상: (스크립트, 인자) - 모두 무거운 작업 없이 바로 끝나는 경로입니다
+STARTUP_SCRIPTS = [
+    ('stock_crawler.py', ['--help']),
+    ('run_crawler.py', []),          # input.html이 없으면 안내만 출력
+    ('parse_html.py', []),           # 인자가 없으면 사용법만 출력
+]
+
+# 이 경로들에서 불러오면 안 되는 무거운 모듈
+HEAVY_MODULES = ('pandas', 'numpy', 'bs4', 'lxml', 'requests', 'selenium', 'openpyxl')
+
+
+def import_times(script: str, args, cwd: str):
+    """
+    python -X importtime으로 스크립트를 실행해 (모듈 이름 -> 누적 import 시간(초), 최상위 합계)를 반환합니다.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', script, *args], cwd=cwd,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    modules = {}
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        seconds = int(cumulative) / 1e6
+        modules[name.strip()] = seconds
+        if not name.startswith('  '):  # 들여쓰기가 없는 줄이 최상위 import
+            total += seconds
+    return modules, total
+
+
+def bench_startup(threshold_ms: float = 150.0) -> bool:
+    """
+    진입 스크립트의 import 시간을 측정합니다.
+    합계가 threshold_ms를 넘거나 무거운 모듈을 불러오면 회귀로 보고 False를 반환합니다.
+    """
+    print(f"\n[startup] python -X importtime, 기준 {threshold_ms:.0f}ms")
+    ok = True
+    with tempfile.TemporaryDirectory() as directory:
+        for script, args in STARTUP_SCRIPTS:
+            path = os.path.join(ROOT, script)
+            import_times(path, args, directory)  # .pyc 생성 등 첫 실행 비용 제외
+            modules, total = import_times(path, args, directory)
+            heavy = [name for name in HEAVY_MODULES if name in modules]
+            passed = total * 1000 <= threshold_ms and not heavy
+            ok &= passed
+            note = f"  무거운 모듈: {', '.join(heavy)}" if heavy else ''
+            print(f"{script + ' ' + ' '.join(args):<32} {total * 1000:8.1f}ms  {'OK' if passed else 'FAIL'}{note}")
+    return ok
@@ -0,0 +1,208 @@
+"""
+재현 가능한 벤치마크 모음 (python benchmark.py suite)
+fixtures.synthetic_page로 만든 페이지에서 단계별 처리량 / 최대 메모리를 재고 저장해 둔 기준값과 비교합니다.
+"""
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.common import best_time, peak_memory
+from crawler import YahooFinanceCrawler
+from stream_parser import iter_rows
+
+
+SUITE_SIZES = (10, 1000, 100000)
+SUITE_STAGES = ('parse', 'extract', 'stream', 'format', 'export_xlsx', 'export_csv')
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+
+
+def suite_environment() -> dict:
+    """결과를 비교할 때 함께 확인할 실행 환경"""
+    import platform
+    from crawler import default_parser
+    from export import default_engine
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'parser': default_parser(),
+        'excel_engine': default_engine(),
+        'pandas': pd.__version__,
+    }
+
+
+def bench_suite(sizes=SUITE_SIZES, seed: int = 0, tree_max_rows: int = 10000) -> dict:
+    """
+    fixtures.synthetic_page로 만든 페이지에서 단계별 처리량과 최대 메모리를 잽니다.
+
+    - parse / extract: parse_html_table의 트리 생성 / 행 추출 (METRICS의 parse, extract 단계 시간).
+      전체 트리가 메모리에 올라가므로 tree_max_rows보다 큰 페이지에서는 건너뜁니다.
+      최대 메모리는 parse 항목에 트리 생성과 추출을 합쳐 기록합니다.
+    - stream: stream_parser.iter_rows (행 단위로 잘린 청크 입력)
+    - format: export.build_export_frame (엑셀 표시 형식)
+    - export_xlsx / export_csv: write_excel(write_only) / CsvSink로 파일 쓰기
+
+    Args:
+        sizes: 측정할 행 수 목록
+        seed: 합성 데이터 시드 (기준값과 같아야 비교 의미가 있습니다)
+        tree_max_rows: parse / extract를 측정할 최대 행 수
+
+    Returns:
+        {'environment': ..., 'seed': ..., 'results': {행 수: {단계: {'seconds', 'rows_per_sec', 'peak_mb'}}}}
+    """
+    from export import build_export_frame, write_excel
+    from fixtures import PAGE_HEAD, PAGE_TAIL, expected_stocks, synthetic_rows
+    from metrics import METRICS
+    from sinks import CsvSink
+
+    crawler = YahooFinanceCrawler()
+    results = {}
+
+    def record(n_rows, stage, seconds, peak):
+        results[str(n_rows)][stage] = {
+            'seconds': seconds,
+            'rows_per_sec': n_rows / seconds if seconds else None,
+            'peak_mb': None if peak is None else peak / 1e6,
+        }
+        peak_text = '' if peak is None else f"  peak {peak / 1e6:8.1f}MB"
+        print(f"{stage:<32} {seconds:8.3f}s  {n_rows / seconds:10,.0f} rows/s{peak_text}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for n_rows in sizes:
+            results[str(n_rows)] = {}
+            chunks = [PAGE_HEAD, *synthetic_rows(n_rows, seed), PAGE_TAIL]
+            expected = expected_stocks(n_rows, seed)
+            print(f"\n[suite] {n_rows:,}행, HTML {sum(map(len, chunks)) / 1e6:.1f}MB")
+
+            if n_rows <= tree_max_rows:
+                html_content = ''.join(chunks)
+                spans = []
+
+                def parse():
+                    METRICS.reset()
+                    stocks = crawler.parse_html_table(html_content)
+                    data = METRICS.to_dict()['spans']
+                    spans.append((data['parse']['total'], data['extract']['total']))
+                    return stocks
+
+                runs, _ = best_time(parse)
+                if runs[0] != expected:
+                    raise AssertionError("parse_html_table 결과가 합성 데이터와 다릅니다.")
+                record(n_rows, 'parse', min(parse_time for parse_time, _ in spans),
+                       peak_memory(lambda: crawler.parse_html_table(html_content)))
+                record(n_rows, 'extract', min(extract_time for _, extract_time in spans), None)
+                del html_content, runs
+                METRICS.reset()
+            else:
+                print(f"{'parse / extract':<32} 건너뜀 ({tree_max_rows:,}행 초과: 전체 트리가 메모리에 올라감)")
+
+            runs, seconds = best_time(lambda: list(iter_rows(chunks)))
+            if runs[0] != expected:
+                raise AssertionError("iter_rows 결과가 합성 데이터와 다릅니다.")
+            stocks = runs[0]
+            del runs
+            record(n_rows, 'stream', seconds, peak_memory(lambda: sum(1 for _ in iter_rows(chunks))))
+            del chunks
+
+            _, seconds = best_time(lambda: build_export_frame(stocks, crawler=crawler))
+            record(n_rows, 'format', seconds, peak_memory(lambda: build_export_frame(stocks, crawler=crawler)))
+
+            path = f"{directory}/out.xlsx"
+            write_xlsx = lambda: write_excel(stocks, path, write_only=True, crawler=crawler)
+            _, seconds = best_time(write_xlsx)
+            record(n_rows, 'export_xlsx', seconds, peak_memory(write_xlsx))
+
+            path = f"{directory}/out.csv"
+            write_csv = lambda: CsvSink().write(stocks, path, crawler)
+            _, seconds = best_time(write_csv)
+            record(n_rows, 'export_csv', seconds, peak_memory(write_csv))
+
+    return {
+        'environment': suite_environment(),
+        'seed': seed,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+
+def compare_suite(current: dict, baseline: dict, tolerance: float = 0.15, min_peak_mb: float = 1.0) -> bool:
+    """
+    bench_suite 결과를 기준값과 비교한 보고서를 출력합니다.
+    시간이 tolerance보다 많이 늘었거나, 최대 메모리가 tolerance보다 많이 (그리고 min_peak_mb 이상) 늘면 회귀입니다.
+
+    Returns:
+        회귀가 없으면 True
+    """
+    print(f"\n[compare] 기준값 {baseline.get('created_at', '?')} 대비 (허용 범위 {tolerance:.0%})")
+    differences = {key: (baseline['environment'].get(key), value)
+                   for key, value in current['environment'].items() if baseline['environment'].get(key) != value}
+    for key, (old, new) in differences.items():
+        print(f"   ⚠️  실행 환경이 다릅니다: {key} {old} -> {new}")
+    if baseline.get('seed') != current['seed']:
+        print(f"   ⚠️  합성 데이터 시드가 다릅니다: {baseline.get('seed')} -> {current['seed']}")
+
+    print(f"{'행 수':>8} {'단계':<12} {'기준(s)':>9} {'현재(s)':>9} {'시간':>8} {'기준(MB)':>9} {'현재(MB)':>9}  결과")
+    ok = True
+    for size, stages in current['results'].items():
+        for stage, now in stages.items():
+            before = baseline['results'].get(size, {}).get(stage)
+            if before is None:
+                print(f"{int(size):>8,} {stage:<12} {'-':>9} {now['seconds']:>9.3f} {'':>8} {'':>9} {'':>9}  새 항목")
+                continue
+            ratio = now['seconds'] / before['seconds']
+            problems = []
+            if ratio > 1 + tolerance:
+                problems.append('시간')
+            peak_before, peak_now = before.get('peak_mb'), now.get('peak_mb')
+            if (peak_before is not None and peak_now is not None
+                    and peak_now > peak_before * (1 + tolerance) and peak_now - peak_before >= min_peak_mb):
+                problems.append('메모리')
+            ok &= not problems
+            verdict = f"REGRESSION ({', '.join(problems)})" if problems else ('faster' if ratio < 1 - tolerance
+                                                                                  else 'OK')
+            memory = (f"{peak_before:>9.1f} {peak_now:>9.1f}" if peak_before is not None and peak_now is not None
+                      else f"{'-':>9} {'-':>9}")
+            print(f"{int(size):>8,} {stage:<12} {before['seconds']:>9.3f} {now['seconds']:>9.3f} "
+                  f"{ratio - 1:>+8.1%} {memory}  {verdict}")
+    return ok
+
+
+def run_suite(argv) -> int:
+    """python benchmark.py suite ... 의 진입점. 회귀가 있으면 1을 반환합니다."""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(prog='benchmark.py suite',
+                                     description='합성 스크리너 페이지로 단계별 처리량과 메모리를 측정합니다.')
+    parser.add_argument('--sizes', default=','.join(map(str, SUITE_SIZES)),
+                        help='측정할 행 수 (쉼표로 구분, 기본값: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='합성 데이터 시드 (기본값: 0)')
+    parser.add_argument('--tree-max-rows', type=int, default=10000,
+                        help='parse / extract(전체 트리)를 측정할 최대 행 수 (기본값: 10000)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='기준값 파일 (기본값: %(default)s)')
+    parser.add_argument('--save-baseline', action='store_true', help='이번 결과를 기준값으로 저장합니다')
+    parser.add_argument('--output', help='이번 결과를 저장할 JSON 파일')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='회귀로 보지 않을 증가 비율 (기본값: 0.15 = 15%%)')
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    current = bench_suite(sizes, seed=args.seed, tree_max_rows=args.tree_max_rows)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 기준값을 {args.baseline}에 저장했습니다.")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\n기준값 파일 {args.baseline}이 없습니다. --save-baseline으로 먼저 저장하세요.")
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    return 0 if compare_suite(current, baseline, args.tolerance) else 1
@@ -0,0 +1,440 @@
+"""
+Selenium 브라우저 풀
+Chrome 드라이버 N개를 띄워 둔 채로 여러 크롤링에 재사용합니다.
+URL은 큐를 통해 쉬고 있는 드라이버에 배정되고, 일정 페이지 수를 처리했거나
+상태 확인에 실패한 드라이버는 새 드라이버로 교체됩니다.
+
+페이지 전체(page_source)를 WebDriver로 넘겨받아 다시 파싱하지 않고, 스크립트 하나(TABLE_SCRIPT)를
+페이지 안에서 실행해 스키마의 컬럼 값만 담은 작은 JSON을 받습니다. 스크립트가 행을 찾지 못하면
+(표 없이 JSON만 포함된 페이지 등) 예전처럼 page_source를 파싱합니다.
+Chrome은 이미지 / 글꼴 / 광고 요청을 막고(BLOCKED_URLS) DOM이 준비되면 바로 행을 확인합니다.
+
+드라이버는 driver_factory로 만들기 때문에, get / find_elements / execute_script /
+page_source / quit 를 흉내내는 가짜 객체(fixtures.FakeDriver)로 Chrome 없이도 동작을 확인할 수 있습니다.
+"""
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+from crawler import DEFAULT_MAX_ROWS, ROW_TESTID, YahooFinanceCrawler
+from metrics import METRICS
+from parse_errors import ParseReport
+from schema import CompiledSchema
+
+
+# selenium.webdriver.common.by.By.CSS_SELECTOR 값 (selenium 없이도 쓸 수 있도록 문자열로 둡니다)
+CSS_SELECTOR = 'css selector'
+ROW_SELECTOR = f'tr[data-testid="{ROW_TESTID}"]'
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+
+# Chrome DevTools의 Network.setBlockedURLs 패턴 (표를 그리는 데 필요 없는 요청)
+BLOCKED_URLS = (
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.mp4', '*.webm',
+    '*doubleclick.net*', '*googlesyndication.com*', '*googletagservices.com*', '*adservice.google.*',
+    '*amazon-adsystem.com*', '*taboola.com*', '*outbrain.com*', '*scorecardresearch.com*',
+    '*criteo.*', '*/rq/darla/*', '*ads.yahoo.com*',
+)
+
+# 페이지 안에서 표 행을 추출하는 스크립트
+# arguments: 행의 data-testid, 필드 명세(script_spec), 최대 행 수(0이면 전체)
+# 반환값: 행마다 필드 순서대로 값(없으면 null)을 담은 배열의 JSON 문자열
+# 값 찾기는 schema._soup_extractor와 같습니다: 선택자 단계마다 첫 번째 하위 요소, 속성이 없으면
+# 공백을 제거한 텍스트 조각을 이은 값 (BeautifulSoup get_text(strip=True)와 같음)
+TABLE_SCRIPT = """
+var rowTestid = arguments[0], spec = arguments[1], maxRows = arguments[2];
+function matches(el, attrs) {
+  for (var name in attrs) {
+    var value = el.getAttribute(name);
+    if (value === null) return false;
+    if (name === 'class' ? value.split(/\\s+/).indexOf(attrs[name]) < 0 : value !== attrs[name]) return false;
+  }
+  return true;
+}
+function find(node, step, limit) {
+  var found = [], els = node.getElementsByTagName(step[0]);
+  for (var i = 0; i < els.length && found.length < limit; i++) {
+    if (matches(els[i], step[1])) found.push(els[i]);
+  }
+  return found;
+}
+function text(node) {
+  var out = '', kids = node.childNodes;
+  for (var i = 0; i < kids.length; i++) {
+    if (kids[i].nodeType === 3) out += kids[i].nodeValue.trim();
+    else if (kids[i].nodeType === 1) out += text(kids[i]);
+  }
+  return out;
+}
+function extract(cell, field) {
+  var steps = field[1], attribute = field[2], count = field[3], node = cell;
+  if (!steps.length) return text(cell);
+  for (var i = 0; i < steps.length - 1; i++) {
+    var path = find(node, steps[i], 1);
+    if (!path.length) return null;
+    node = path[0];
+  }
+  var nodes = find(node, steps[steps.length - 1], count);
+  if (nodes.length < count) return null;
+  if (count > 1) return nodes.map(text).join(field[4]);
+  if (attribute !== null) {
+    var value = nodes[0].getAttribute(attribute);
+    if (value !== null) return value;
+  }
+  return text(nodes[0]);
+}
+var cells = {};
+for (var i = 0; i < spec.length; i++) cells[spec[i][0]] = i;
+var rows = [], trs = document.getElementsByTagName('tr');
+for (var r = 0; r < trs.length && !(maxRows && rows.length >= maxRows); r++) {
+  if (trs[r].getAttribute('data-testid') !== rowTestid) continue;
+  var row = [], kids = trs[r].childNodes;
+  for (var j = 0; j < spec.length; j++) row.push(null);
+  for (var k = 0; k < kids.length; k++) {
+    if (kids[k].nodeName !== 'TD') continue;
+    var index = cells.hasOwnProperty(kids[k].getAttribute('data-testid-cell'))
+      ? cells[kids[k].getAttribute('data-testid-cell')] : -1;
+    if (index < 0) continue;
+    try { row[index] = extract(kids[k], spec[index]); } catch (e) { row[index] = null; }
+  }
+  rows.push(row);
+}
+return JSON.stringify(rows);
+"""
+
+
+def script_spec(schema: CompiledSchema) -> List[list]:
+    """TABLE_SCRIPT에 넘길 필드 명세: 필드마다 [셀 testid, [[태그, 속성], ...], 속성, 개수, 구분자]"""
+    return [[field.cell, [[tag, attrs] for tag, attrs in field.steps], field.attribute, field.count, field.join]
+            for field in schema.fields]
+
+
+def stocks_from_script(rows: List[list], schema: CompiledSchema, report: Optional[ParseReport] = None) -> List[Dict]:
+    """
+    TABLE_SCRIPT가 돌려준 행 배열을 주식 데이터 딕셔너리로 바꿉니다 (필드 변환 함수 적용).
+    parse_html_table과 같이 행마다 report에 누락을 기록하고, 값이 하나도 없는 행은 버립니다.
+    """
+    fields = schema.fields
+    stocks = []
+    for index, values in enumerate(rows):
+        stock = {}
+        for field, value in zip(fields, values):
+            if value is not None:
+                stock[field.column] = field.converter(value) if field.converter else value
+        if stock:
+            stocks.append(stock)
+        if report is not None:
+            report.check_row(stock, index)
+    return stocks
+
+
+def block_resources(driver, patterns: Sequence[str] = BLOCKED_URLS) -> bool:
+    """
+    Chrome DevTools 프로토콜로 patterns와 일치하는 요청(이미지, 글꼴, 광고)을 막습니다.
+    DevTools 명령을 지원하지 않는 드라이버면 아무것도 하지 않고 False를 반환합니다.
+    """
+    if not patterns or not hasattr(driver, 'execute_cdp_cmd'):
+        return False
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+    return True
+
+
+class PageNotReadyError(Exception):
+    """제한 시간 안에 테이블 행이 나타나지 않았을 때 발생합니다."""
+
+
+def chrome_driver_factory(blocked_urls: Optional[Sequence[str]] = BLOCKED_URLS):
+    """
+    헤드리스 Chrome 드라이버를 만드는 함수를 반환합니다.
+    ChromeDriver 설치 경로는 한 번만 확인하고 이후 드라이버 생성에 재사용합니다.
+    selenium이 없으면 ImportError가 발생합니다.
+
+    Args:
+        blocked_urls: 막을 요청의 URL 패턴 (None이면 막지 않음). 이미지는 브라우저 설정으로도 끕니다.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    driver_path = ChromeDriverManager().install()
+
+    def create():
+        chrome_options = Options()
+        chrome_options.add_argument('--headless')  # 브라우저 창을 띄우지 않음
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--window-size=1920,1080')
+        chrome_options.add_argument(f'user-agent={USER_AGENT}')
+        # 모든 하위 리소스를 기다리지 않고 DOM이 준비되면 돌아옵니다 (행이 그려졌는지는 직접 확인합니다)
+        chrome_options.page_load_strategy = 'eager'
+        if blocked_urls:
+            chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+        if blocked_urls:
+            block_resources(driver, blocked_urls)
+        return driver
+
+    return create
+
+
+def wait_for_stable_rows(driver, stable_ms: int = 500, timeout: float = 30, poll_interval: float = 0.1,
+                         clock: Callable[[], float] = time.monotonic,
+                         sleep: Callable[[float], None] = time.sleep) -> int:
+    """
+    테이블 행 수가 stable_ms 동안 변하지 않을 때까지 기다립니다.
+    고정된 time.sleep 대신 렌더링이 끝난 시점을 직접 확인합니다.
+
+    Args:
+        driver: WebDriver (또는 find_elements를 가진 가짜 객체)
+        stable_ms: 행 수가 유지되어야 하는 시간 (밀리초)
+        timeout: 최대 대기 시간 (초)
+        poll_interval: 행 수를 확인하는 간격 (초)
+
+    Returns:
+        안정된 시점의 행 수
+
+    Raises:
+        PageNotReadyError: timeout 안에 행이 하나도 나타나지 않은 경우
+    """
+    deadline = clock() + timeout
+    last_count = -1
+    stable_since = clock()
+
+    while True:
+        count = len(driver.find_elements(CSS_SELECTOR, ROW_SELECTOR))
+        now = clock()
+        if count != last_count:
+            last_count = count
+            stable_since = now
+        elif count > 0 and (now - stable_since) * 1000 >= stable_ms:
+            return count
+
+        if now >= deadline:
+            if last_count > 0:
+                return last_count
+            raise PageNotReadyError(f"{timeout}초 안에 테이블 행이 나타나지 않았습니다.")
+        sleep(poll_interval)
+
+
+class _PooledDriver:
+    """드라이버와 처리한 페이지 수"""
+
+    __slots__ = ('driver', 'pages')
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class BrowserPool:
+    """
+    재사용 가능한 브라우저 풀
+
+    사용 예:
+        with BrowserPool(size=2) as pool:
+            results = pool.crawl_many(urls)
+    """
+
+    def __init__(self, size: int = 2, driver_factory: Optional[Callable] = None, max_pages_per_driver: int = 50,
+                 stable_ms: int = 500, ready_timeout: float = 30, poll_interval: float = 0.1,
+                 crawler: Optional[YahooFinanceCrawler] = None, in_page: bool = True):
+        """
+        Args:
+            size: 유지할 드라이버 수
+            driver_factory: 새 드라이버를 만드는 함수 (기본값: 헤드리스 Chrome)
+            max_pages_per_driver: 이 수만큼 페이지를 처리한 드라이버는 새로 만듭니다
+            stable_ms: 행 수가 이 시간 동안 변하지 않으면 로딩 완료로 봅니다
+            ready_timeout: 페이지당 최대 대기 시간 (초)
+            poll_interval: 행 수 확인 간격 (초)
+            crawler: HTML 파싱에 사용할 크롤러 (추출할 컬럼, 오류 예산, 속도 제한)
+            in_page: True이면 페이지 안에서 TABLE_SCRIPT로 행을 추출하고,
+                     False이면 page_source 전체를 받아 파싱합니다
+        """
+        self.size = size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.stable_ms = stable_ms
+        self.ready_timeout = ready_timeout
+        self.poll_interval = poll_interval
+        self.crawler = crawler or YahooFinanceCrawler()
+        self.in_page = in_page
+
+        self._driver_factory = driver_factory
+        self._idle: "queue.Queue[Optional[_PooledDriver]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+        # 드라이버는 처음 필요할 때 만듭니다 (빈 자리는 None으로 표시)
+        for _ in range(size):
+            self._idle.put(None)
+
+    # --- 드라이버 관리 ------------------------------------------------
+
+    def _new_driver(self) -> _PooledDriver:
+        with self._lock:
+            if self._driver_factory is None:
+                self._driver_factory = chrome_driver_factory()
+            factory = self._driver_factory
+            self._created += 1
+        with METRICS.span('browser_launch'):
+            return _PooledDriver(factory())
+
+    @staticmethod
+    def _quit(pooled: _PooledDriver):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_healthy(pooled: _PooledDriver) -> bool:
+        try:
+            return pooled.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def _acquire(self) -> _PooledDriver:
+        if self._closed:
+            raise RuntimeError("닫힌 브라우저 풀입니다.")
+        pooled = self._idle.get()
+        try:
+            if pooled is not None and (pooled.pages >= self.max_pages_per_driver or not self._is_healthy(pooled)):
+                self._quit(pooled)
+                pooled = None
+            if pooled is None:
+                pooled = self._new_driver()
+        except BaseException:
+            self._idle.put(None)
+            raise
+        return pooled
+
+    def _release(self, pooled: Optional[_PooledDriver]):
+        if self._closed and pooled is not None:
+            self._quit(pooled)
+            pooled = None
+        self._idle.put(pooled)
+
+    def start(self):
+        """드라이버를 미리 모두 띄워 둡니다."""
+        warm = [self._acquire() for _ in range(self.size)]
+        for pooled in warm:
+            self._release(pooled)
+
+    def close(self):
+        """풀의 모든 드라이버를 종료합니다."""
+        self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if pooled is not None:
+                self._quit(pooled)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def drivers_created(self) -> int:
+        """지금까지 만든 드라이버 수 (교체 포함)"""
+        return self._created
+
+    # --- 크롤링 -------------------------------------------------------
+
+    def fetch(self, url: str, max_rows: Optional[int] = DEFAULT_MAX_ROWS) -> List[Dict]:
+        """
+        쉬고 있는 드라이버로 URL을 열고 테이블이 안정되면 행을 추출합니다.
+        in_page이면 페이지 안에서 스크립트로 값만 받고, 행을 찾지 못했거나 스크립트가 실패하면 page_source를 파싱합니다.
+
+        Args:
+            url: Yahoo Finance URL
+            max_rows: 최대 추출할 행 수 (None이면 전체)
+
+        Returns:
+            주식 데이터 딕셔너리 리스트
+
+        Raises:
+            ParserBrokenError: 실패한 행이 크롤러의 오류 예산을 넘은 경우
+        """
+        # 크롤러의 속도 제한을 함께 지킵니다 (드라이버를 잡기 전에 기다립니다)
+        if self.crawler.rate_limiter is not None:
+            self.crawler.rate_limiter.acquire(url)
+        schema = self.crawler.schema
+        rows = None
+        html_content = None
+        pooled = self._acquire()
+        try:
+            pooled.pages += 1
+            METRICS.incr('browser_pages')
+            with METRICS.span('browser_load'):
+                pooled.driver.get(url)
+            with METRICS.span('browser_wait'):
+                wait_for_stable_rows(pooled.driver, self.stable_ms, self.ready_timeout, self.poll_interval)
+            if self.in_page:
+                rows = self._extract_in_page(pooled.driver, schema, max_rows)
+            if not rows:
+                html_content = pooled.driver.page_source
+                METRICS.incr('browser_bytes', len(html_content))
+        except PageNotReadyError:
+            self._release(pooled)
+            raise
+        except Exception:
+            # 드라이버 상태를 알 수 없으므로 버리고 새로 만들게 합니다
+            self._quit(pooled)
+            self._release(None)
+            raise
+        self._release(pooled)
+
+        if html_content is not None:
+            stocks = self.crawler.parse_html_table(html_content)
+            return stocks[:max_rows] if max_rows else stocks
+
+        report = ParseReport(url, self.crawler.error_budget, columns=schema.columns)
+        with METRICS.span('extract'):
+            stocks = stocks_from_script(rows, schema, report)
+        METRICS.incr('rows_parsed', len(stocks))
+        report.finish(len(stocks))
+        return stocks
+
+    @staticmethod
+    def _extract_in_page(driver, schema: CompiledSchema, max_rows: Optional[int]) -> Optional[List[list]]:
+        """TABLE_SCRIPT를 실행해 행 배열을 받습니다. 스크립트가 실패하면 None을 반환합니다."""
+        try:
+            with METRICS.span('browser_extract'):
+                payload = driver.execute_script(TABLE_SCRIPT, ROW_TESTID, script_spec(schema), max_rows or 0)
+            rows = json.loads(payload)
+        except Exception:
+            METRICS.incr('browser_script_fallbacks')
+            return None
+        METRICS.incr('browser_bytes', len(payload))
+        return rows
+
+    def crawl_many(self, urls: List[str], max_rows: Optional[int] = DEFAULT_MAX_ROWS) -> Dict[str, List[Dict]]:
+        """
+        여러 URL을 풀의 드라이버들에 나누어 크롤링합니다.
+
+        Returns:
+            URL -> 주식 데이터 딕셔너리 리스트 (실패한 URL은 빈 리스트)
+        """
+        def fetch_one(url):
+            try:
+                return self.fetch(url, max_rows)
+            except Exception as e:
+                print(f"❌ Selenium 크롤링 오류 ({url}): {e}")
+                return []
+
+        unique_urls = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=max(1, self.size)) as executor:
+            return dict(zip(unique_urls, executor.map(fetch_one, unique_urls)))
@@ -0,0 +1,287 @@
+"""
+저장된 스크리너 HTML 스냅샷 대량 파싱
+폴더 / glob 패턴의 HTML 파일을 여러 프로세스에 나누어 파싱하고, 결과를 part 파일
+(기본값: Parquet)로 나누어 씁니다. 중간에 멈춰도 다시 실행하면 체크포인트 이후부터 이어서 처리합니다.
+
+사용법: python bulk_parse.py snapshots/ "archive/2024-*/*.html" -o bulk_output --workers 8
+
+- 작업 프로세스는 파일 하나를 스트리밍 파서로 읽고, 행을 튜플로 묶어 돌려줍니다.
+  결과는 imap_unordered로 끝나는 대로 하나씩 받으므로 전체 결과를 한 번에 피클하지 않습니다.
+- 받은 행은 part_rows개가 모일 때마다 part-NNNNN 파일로 쓰고, 그 다음에 체크포인트를 갱신합니다.
+  (part 파일과 체크포인트 모두 임시 파일에 쓴 뒤 바꿔치기하므로 쓰다 만 파일이 남지 않습니다)
+- 체크포인트(_checkpoint.json)에는 처리한 파일마다 part 파일과 그 안의 행 위치를 기록합니다.
+  실패한 파일은 기록하지 않으므로 다음 실행에서 다시 시도합니다.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from importlib.util import find_spec
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from metrics import METRICS
+from schema import DEFAULT_SCHEMA, compile_schema, parse_columns
+from sinks import SINKS, get_sink
+from stream_parser import iter_rows
+
+
+# 행 튜플의 값 순서 (컬럼명, 전체 컬럼을 추출할 때)
+FIELDS = DEFAULT_SCHEMA.columns
+
+# 행에 없는 필드 (P/E의 None과 구분합니다)
+_ABSENT = ...
+
+# '_'로 시작하는 파일은 pyarrow가 데이터셋을 읽을 때 무시합니다 (pd.read_parquet('bulk_output'))
+CHECKPOINT_NAME = '_checkpoint.json'
+HTML_EXTENSIONS = ('.html', '.htm')
+
+
+def find_html_files(inputs: List[str]) -> List[str]:
+    """
+    파일 / 폴더(하위 폴더 포함) / glob 패턴에서 HTML 파일 목록을 정렬해 반환합니다.
+    같은 파일은 한 번만 포함합니다.
+    """
+    found = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, names in os.walk(item):
+                found.update(os.path.join(root, name) for name in names
+                             if name.lower().endswith(HTML_EXTENSIONS))
+        elif os.path.isfile(item):
+            found.add(item)
+        else:
+            found.update(path for path in glob.glob(item, recursive=True) if os.path.isfile(path))
+    return sorted(os.path.abspath(path) for path in found)
+
+
+def parse_file(path: str, chunk_size: int = 256 * 1024,
+               columns: Optional[Sequence[str]] = None) -> Tuple[str, Optional[List[tuple]], Optional[str]]:
+    """
+    작업 프로세스에서 HTML 파일 하나를 파싱합니다.
+    바이트로 읽어 디코딩하므로 잘못된 UTF-8 바이트가 섞인 스냅샷도 처리하고,
+    표 행이 없으면 페이지에 포함된 JSON에서 행을 찾습니다.
+
+    Args:
+        columns: 추출할 컬럼 (None이면 전체). 스키마는 프로세스마다 한 번만 컴파일됩니다.
+
+    Returns:
+        (경로, 스키마 컬럼 순서의 행 튜플 리스트, 오류 메시지). 실패하면 행 대신 None과 오류 메시지를 반환합니다.
+    """
+    try:
+        schema = compile_schema(columns)
+        with open(path, 'rb') as f:
+            stocks = list(iter_rows(iter(lambda: f.read(chunk_size), b''), schema=schema))
+            if not stocks:
+                # 표가 JavaScript로 그려진 페이지: 포함된 <script> JSON에서 찾습니다
+                from json_source import extract_embedded_rows
+                f.seek(0)
+                stocks = schema.project(extract_embedded_rows(f.read()))
+        rows = [tuple(stock.get(field, _ABSENT) for field in schema.columns) for stock in stocks]
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+    return path, rows, None
+
+
+def _to_dict(row: tuple, fields: Sequence[str] = FIELDS) -> Dict:
+    return {field: value for field, value in zip(fields, row) if value is not _ABSENT}
+
+
+def default_format() -> str:
+    """열 단위 형식(Parquet)을 쓸 수 있으면 parquet, 아니면 csv"""
+    return 'parquet' if find_spec('pyarrow') is not None else 'csv'
+
+
+class BulkParser:
+    """
+    HTML 파일 목록을 여러 프로세스로 파싱해 part 파일로 저장합니다.
+
+    사용 예:
+        BulkParser('bulk_output', workers=8).run(find_html_files(['snapshots/']))
+    """
+
+    def __init__(self, output_dir: str, format: Optional[str] = None, workers: Optional[int] = None,
+                 chunk_size: int = 4, part_rows: int = 50000, quiet: bool = False,
+                 columns: Optional[Sequence[str]] = None):
+        """
+        Args:
+            output_dir: part 파일과 체크포인트를 저장할 폴더
+            format: 출력 형식 (SINKS의 이름, 기본값: parquet 또는 csv)
+            workers: 작업 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 처리)
+            chunk_size: 작업 프로세스에 한 번에 넘길 파일 수
+            part_rows: part 파일 하나에 모을 최소 행 수
+            quiet: True이면 진행 상황을 출력하지 않습니다
+            columns: 추출 / 저장할 컬럼 (None이면 전체). 선택하지 않은 셀은 파싱하지 않습니다.
+
+        Raises:
+            ValueError: 체크포인트의 형식 / 컬럼이 지정한 것과 다르거나, 알 수 없는 컬럼명인 경우
+        """
+        schema = compile_schema(columns)
+        self.output_dir = output_dir
+        self.format = format or default_format()
+        self.fields = schema.columns
+        self.columns = list(schema.columns) if schema.projected else None
+        self.sink = get_sink(self.format, columns=self.columns)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.part_rows = part_rows
+        self.quiet = quiet
+        self.checkpoint_path = os.path.join(output_dir, CHECKPOINT_NAME)
+        os.makedirs(output_dir, exist_ok=True)
+        self.checkpoint = self._load_checkpoint()
+
+    # --- 체크포인트 ---------------------------------------------------
+
+    def _load_checkpoint(self) -> Dict:
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            if checkpoint.get('format') != self.format:
+                raise ValueError(f"체크포인트의 출력 형식({checkpoint.get('format')})과 "
+                                 f"지정한 형식({self.format})이 다릅니다. 다른 출력 폴더를 쓰세요.")
+            if checkpoint.get('columns') != self.columns:
+                raise ValueError(f"체크포인트의 컬럼({checkpoint.get('columns') or '전체'})과 "
+                                 f"지정한 컬럼({self.columns or '전체'})이 다릅니다. 다른 출력 폴더를 쓰세요.")
+            return checkpoint
+        return {'format': self.format, 'columns': self.columns, 'parts': [], 'files': {}}
+
+    def _save_checkpoint(self):
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.checkpoint, f, ensure_ascii=False)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _remove_orphan_parts(self):
+        """체크포인트에 기록되기 전에 멈춘 실행이 남긴 part 파일을 지웁니다."""
+        known = set(self.checkpoint['parts'])
+        for name in os.listdir(self.output_dir):
+            if name.startswith('part-') and name not in known:
+                os.remove(os.path.join(self.output_dir, name))
+
+    def pending(self, paths: List[str]) -> List[str]:
+        """체크포인트에 없는(아직 처리하지 않은) 파일"""
+        done = self.checkpoint['files']
+        return [path for path in paths if path not in done]
+
+    # --- 실행 ---------------------------------------------------------
+
+    def _results(self, paths: List[str]) -> Iterator[Tuple[str, Optional[List[tuple]], Optional[str]]]:
+        parse = partial(parse_file, columns=self.columns)
+        if self.workers == 1 or len(paths) <= 1:
+            return map(parse, paths)
+        import multiprocessing
+        pool = multiprocessing.Pool(min(self.workers, len(paths)))
+        return _close_after(pool, pool.imap_unordered(parse, paths, chunksize=self.chunk_size))
+
+    def _flush(self, buffer: List[tuple], sources: List[Tuple[str, int]]):
+        """모은 행을 part 파일 하나로 쓰고 체크포인트에 기록합니다."""
+        name = f"part-{len(self.checkpoint['parts']):05d}{self.sink.extension}"
+        path = os.path.join(self.output_dir, name)
+        tmp_path = os.path.join(self.output_dir, f"tmp-{name}")
+        self.sink.write([_to_dict(row, self.fields) for row in buffer], tmp_path)
+        os.replace(tmp_path, path)
+
+        offset = 0
+        for source, count in sources:
+            self.checkpoint['files'][source] = [name, offset, count]
+            offset += count
+        self.checkpoint['parts'].append(name)
+        self._save_checkpoint()
+
+    def run(self, paths: List[str]) -> Dict:
+        """
+        paths 중 아직 처리하지 않은 파일을 파싱해 저장합니다.
+
+        Returns:
+            {'files': 처리한 파일 수, 'rows': 저장한 행 수, 'failed': {경로: 오류}, 'skipped': 건너뛴 파일 수,
+             'seconds': 걸린 시간}
+        """
+        self._remove_orphan_parts()
+        todo = self.pending(paths)
+        stats = {'files': 0, 'rows': 0, 'failed': {}, 'skipped': len(paths) - len(todo), 'seconds': 0.0}
+        if stats['skipped'] and not self.quiet:
+            print(f"↩️  체크포인트에서 이어서 처리합니다: {stats['skipped']}개 파일 건너뜀")
+        if not todo:
+            return stats
+
+        start = time.perf_counter()
+        buffer: List[tuple] = []
+        sources: List[Tuple[str, int]] = []
+        with METRICS.span('bulk_parse'):
+            for path, rows, error in self._results(todo):
+                if error is not None:
+                    stats['failed'][path] = error
+                    METRICS.incr('bulk_files_failed')
+                    if not self.quiet:
+                        print(f"❌ {path}: {error}")
+                    continue
+                buffer.extend(rows)
+                sources.append((path, len(rows)))
+                stats['files'] += 1
+                stats['rows'] += len(rows)
+                METRICS.incr('bulk_files')
+                if len(buffer) >= self.part_rows:
+                    self._flush(buffer, sources)
+                    buffer, sources = [], []
+                    if not self.quiet:
+                        elapsed = time.perf_counter() - start
+                        print(f"📦 {stats['files']:,}/{len(todo):,}개 파일, {stats['rows']:,}행 "
+                              f"({stats['files'] / elapsed:.1f} files/s)")
+            if sources:
+                self._flush(buffer, sources)
+        stats['seconds'] = time.perf_counter() - start
+        return stats
+
+
+def _close_after(pool, results):
+    """결과를 모두 받은 뒤(또는 중단되면) 프로세스 풀을 정리합니다."""
+    try:
+        yield from results
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='저장된 스크리너 HTML 파일을 여러 프로세스로 파싱해 저장합니다.')
+    parser.add_argument('inputs', nargs='+', help='HTML 파일, 폴더 또는 glob 패턴')
+    parser.add_argument('-o', '--output', default='bulk_output',
+                        help='part 파일과 체크포인트를 저장할 폴더 (기본값: %(default)s)')
+    parser.add_argument('--format', choices=sorted(SINKS),
+                        help='출력 형식 (기본값: pyarrow가 있으면 parquet, 없으면 csv)')
+    parser.add_argument('--workers', type=int, default=None, help='작업 프로세스 수 (기본값: CPU 수)')
+    parser.add_argument('--chunk-size', type=int, default=4, help='프로세스에 한 번에 넘길 파일 수 (기본값: 4)')
+    parser.add_argument('--part-rows', type=int, default=50000,
+                        help='part 파일 하나에 모을 행 수 (기본값: 50000)')
+    parser.add_argument('--fields', help='추출할 컬럼 (쉼표로 구분, 예: "Symbol,Price,Change %%", 기본값: 전체)')
+    args = parser.parse_args()
+
+    paths = find_html_files(args.inputs)
+    if not paths:
+        print("처리할 HTML 파일이 없습니다.")
+        sys.exit(1)
+
+    try:
+        bulk = BulkParser(args.output, args.format, args.workers, args.chunk_size, args.part_rows,
+                          columns=parse_columns(args.fields))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"🚀 {len(paths):,}개 파일, 작업 프로세스 {bulk.workers}개, 형식 {bulk.format}")
+    stats = bulk.run(paths)
+
+    if stats['files']:
+        print(f"✅ {stats['files']:,}개 파일에서 {stats['rows']:,}행을 {args.output}에 저장했습니다. "
+              f"({stats['seconds']:.1f}초, {stats['files'] / stats['seconds']:.1f} files/s)")
+    else:
+        print("새로 처리한 파일이 없습니다.")
+    if stats['failed']:
+        print(f"⚠️  {len(stats['failed'])}개 파일이 실패했습니다. 다시 실행하면 다시 시도합니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,187 +1,628 @@
 """
 Yahoo Finance 주식 데이터 크롤러
 테이블에서 주식 정보를 추출하여 엑셀 파일로 저장합니다.
+
+무거운 의존성(requests, BeautifulSoup, pandas)은 그것이 필요한 메서드 안에서 가져옵니다.
+그래서 사용법만 출력하거나 입력 파일이 없어 끝나는 실행은 이 모듈을 빠르게 불러옵니다.
 """
 import re
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-from typing import List, Dict
+import threading
+from importlib.util import find_spec
+from typing import Dict, Iterator, List, Optional, Tuple
+from metrics import METRICS
+from schema import compile_schema
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 import time
 
 
+# 진입점(스크립트)에서 기본으로 추출할 최대 행 수
+DEFAULT_MAX_ROWS = 50
+
+# 스크리너 페이지 하나에 요청할 기본 행 수 (Yahoo Finance의 count 파라미터)
+DEFAULT_PAGE_SIZE = 100
+
+# 주식 데이터 행을 가리키는 tr 태그의 data-testid 값
+ROW_TESTID = 'data-table-v2-row'
+
+
+def default_parser() -> str:
+    """사용 가능한 가장 빠른 BeautifulSoup 파서 이름을 반환합니다. (lxml을 실제로 불러오지는 않습니다)"""
+    return 'lxml' if find_spec('lxml') is not None else 'html.parser'
+
+
 class YahooFinanceCrawler:
     """Yahoo Finance 주식 데이터 크롤러 클래스"""
     
-    def __init__(self):
+    def __init__(self, parser: Optional[str] = None, pool_size: int = 10, cache=None, use_api: bool = True,
+                 api_url: Optional[str] = None, error_budget=None, fields: Optional[List[str]] = None,
+                 rate_limiter=None):
+        """
+        Args:
+            parser: BeautifulSoup 파서 ('lxml' 또는 'html.parser').
+                    지정하지 않으면 lxml이 설치된 경우 lxml을 사용합니다.
+            pool_size: 호스트별로 유지할 keep-alive 연결 수
+            cache: 응답 캐시 (http_cache.ResponseCache). None이면 매번 새로 받습니다.
+            use_api: True이면 스크리너 URL은 HTML보다 먼저 스크리너 JSON API로 가져옵니다
+            api_url: 스크리너 API 주소 (기본값: json_source.API_URL, 로컬 테스트 서버용)
+            error_budget: 실패한 행의 허용 비율 (parse_errors.ErrorBudget, 기본값: 50%).
+                          넘으면 ParserBrokenError로 크롤링을 멈춥니다.
+            fields: 추출 / 저장할 컬럼명 (None이면 전체, schema.DEFAULT_FIELDS 참고).
+                    선택하지 않은 컬럼의 셀은 파싱하지 않습니다.
+            rate_limiter: 호스트별 속도 제한과 429 / 503 재시도 (rate_limit.RateLimiter).
+                          None이면 제한 없이 요청하고 재시도하지 않습니다.
+        
+        Raises:
+            ValueError: fields에 알 수 없는 컬럼명이 있는 경우
+        """
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
         self.base_url = "https://finance.yahoo.com"
+        self.parser = parser or default_parser()
+        self.cache = cache
+        self.use_api = use_api
+        self.api_url = api_url
+        self._api_disabled = False
+        self._differs = {}
+        self.error_budget = error_budget
+        self.reports = {}
+        self.schema = compile_schema(fields)
+        self.rate_limiter = rate_limiter
+        
+        self.pool_size = pool_size
+        self._session = None
+        self._session_lock = threading.Lock()
     
-    def parse_html_table(self, html_content: str) -> List[Dict]:
+    @property
+    def session(self):
+        """
+        모든 요청이 keep-alive 연결 풀을 공유하도록 재사용하는 requests 세션
+        (requests는 처음 네트워크 요청을 할 때 불러옵니다)
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    session = requests.Session()
+                    session.headers.update(self.headers)
+                    adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_size,
+                                                            pool_maxsize=self.pool_size)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+    
+    def _get(self, url: str, **kwargs):
+        """세션으로 GET 요청을 보냅니다 (rate_limiter가 있으면 속도 제한과 재시도를 거칩니다)"""
+        if self.rate_limiter is None:
+            return self.session.get(url, **kwargs)
+        return self.rate_limiter.request(self.session.get, url, **kwargs)
+    
+    def parse_html_table(self, html_content: str, report=None) -> List[Dict]:
         """
         HTML 테이블에서 주식 데이터를 추출합니다.
+        필드 추출 실패는 행 번호, 컬럼, 선택자와 함께 report에 기록합니다.
         
         Args:
             html_content: HTML 문자열
+            report: 실패를 기록할 parse_errors.ParseReport (None이면 이 호출에서 만들고 마무리합니다)
             
         Returns:
             주식 데이터 딕셔너리 리스트
+            
+        Raises:
+            ParserBrokenError: 실패한 행이 오류 예산을 넘었거나, 표 셀은 있는데 행을 찾지 못한 경우
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        rows = soup.find_all('tr', {'data-testid': 'data-table-v2-row'})
+        from bs4 import BeautifulSoup, SoupStrainer
+        from parse_errors import ParseReport
+        
+        own_report = report is None
+        if own_report:
+            report = ParseReport(budget=self.error_budget, columns=self.schema.columns)
+        
+        # 데이터 행(tr)만 트리로 만들고 나머지 마크업은 건너뜁니다
+        with METRICS.span('parse'):
+            only_rows = SoupStrainer('tr', attrs={'data-testid': ROW_TESTID})
+            soup = BeautifulSoup(html_content, self.parser, parse_only=only_rows)
+            rows = soup.find_all('tr', {'data-testid': ROW_TESTID})
         
         stocks = []
-        for row in rows:
-            try:
-                stock_data = self._extract_row_data(row)
+        extract_row = self.schema.extract_row
+        with METRICS.span('extract'):
+            for index, row in enumerate(rows):
+                issues = []
+                stock_data = extract_row(row, issues, index)
                 if stock_data:
                     stocks.append(stock_data)
-            except Exception as e:
-                print(f"행 파싱 오류: {e}")
-                continue
+                report.check_row(stock_data or {}, index, issues)
+        
+        if not rows:
+            # 표가 JavaScript로 그려지는 페이지: 페이지에 포함된 JSON에서 찾습니다
+            stocks = self._embedded_rows(html_content)
+            if not stocks:
+                report.check_empty(html_content)
         
+        METRICS.incr('rows_parsed', len(stocks))
+        if own_report:
+            report.finish(len(stocks))
         return stocks
     
-    def _extract_row_data(self, row) -> Dict:
-        """개별 행에서 데이터를 추출합니다."""
-        stock = {}
-        
-        # Symbol (티커)
-        ticker_cell = row.find('td', {'data-testid-cell': 'ticker'})
-        if ticker_cell:
-            symbol_link = ticker_cell.find('a', {'data-testid': 'table-cell-ticker'})
-            if symbol_link:
-                symbol_span = symbol_link.find('span', class_='symbol')
-                if symbol_span:
-                    stock['Symbol'] = symbol_span.get_text(strip=True)
-        
-        # Name (회사명)
-        name_cell = row.find('td', {'data-testid-cell': 'companyshortname.raw'})
-        if name_cell:
-            name_div = name_cell.find('div', class_='companyName')
-            if name_div:
-                stock['Name'] = name_div.get_text(strip=True)
-        
-        # Price (가격)
-        price_cell = row.find('td', {'data-testid-cell': 'intradayprice'})
-        if price_cell:
-            price_streamer = price_cell.find('fin-streamer', {'data-field': 'regularMarketPrice'})
-            if price_streamer:
-                stock['Price'] = price_streamer.get('data-value', price_streamer.get_text(strip=True))
-        
-        # Change (변동액)
-        change_cell = row.find('td', {'data-testid-cell': 'intradaypricechange'})
-        if change_cell:
-            change_streamer = change_cell.find('fin-streamer', {'data-field': 'regularMarketChange'})
-            if change_streamer:
-                stock['Change'] = change_streamer.get('data-value', change_streamer.get_text(strip=True))
-        
-        # Change % (변동률)
-        percent_cell = row.find('td', {'data-testid-cell': 'percentchange'})
-        if percent_cell:
-            percent_streamer = percent_cell.find('fin-streamer', {'data-field': 'regularMarketChangePercent'})
-            if percent_streamer:
-                stock['Change %'] = percent_streamer.get('data-value', percent_streamer.get_text(strip=True))
-        
-        # Volume (거래량)
-        volume_cell = row.find('td', {'data-testid-cell': 'dayvolume'})
-        if volume_cell:
-            volume_streamer = volume_cell.find('fin-streamer', {'data-field': 'regularMarketVolume'})
-            if volume_streamer:
-                stock['Volume'] = volume_streamer.get('data-value', volume_streamer.get_text(strip=True))
-        
-        # Avg Vol (3M) (3개월 평균 거래량)
-        avgvol_cell = row.find('td', {'data-testid-cell': 'avgdailyvol3m'})
-        if avgvol_cell:
-            stock['Avg Vol (3M)'] = avgvol_cell.get_text(strip=True)
-        
-        # Market Cap (시가총액)
-        marketcap_cell = row.find('td', {'data-testid-cell': 'intradaymarketcap'})
-        if marketcap_cell:
-            marketcap_streamer = marketcap_cell.find('fin-streamer', {'data-field': 'marketCap'})
-            if marketcap_streamer:
-                stock['Market Cap'] = marketcap_streamer.get('data-value', marketcap_streamer.get_text(strip=True))
-        
-        # P/E Ratio (TTM)
-        pe_cell = row.find('td', {'data-testid-cell': 'peratio.lasttwelvemonths'})
-        if pe_cell:
-            pe_text = pe_cell.get_text(strip=True)
-            stock['P/E Ratio (TTM)'] = pe_text if pe_text != '--' else None
-        
-        # 52 Wk Change %
-        wk52_change_cell = row.find('td', {'data-testid-cell': 'fiftytwowkpercentchange'})
-        if wk52_change_cell:
-            wk52_streamer = wk52_change_cell.find('fin-streamer', {'data-field': 'fiftyTwoWeekChangePercent'})
-            if wk52_streamer:
-                stock['52 Wk Change %'] = wk52_streamer.get('data-value', wk52_streamer.get_text(strip=True))
-        
-        # 52 Wk Range
-        wk52_range_cell = row.find('td', {'data-testid-cell': 'fiftyTwoWeekRange'})
-        if wk52_range_cell:
-            labels = wk52_range_cell.find('div', class_='labels')
-            if labels:
-                spans = labels.find_all('span')
-                if len(spans) >= 2:
-                    stock['52 Wk Range'] = f"{spans[0].get_text(strip=True)} - {spans[1].get_text(strip=True)}"
-        
-        return stock if stock else None
+    def _embedded_rows(self, html_content) -> List[Dict]:
+        """HTML에 포함된 <script> JSON의 주식 데이터 (없으면 빈 리스트, 선택한 컬럼만)"""
+        from json_source import extract_embedded_rows
+        stocks = extract_embedded_rows(html_content)
+        if stocks:
+            METRICS.incr('embedded_json_pages')
+        return self.schema.project(stocks)
+    
+    def parse_rows(self, html_content: str) -> List['StockRow']:
+        """
+        HTML 테이블에서 숫자 필드를 변환한 StockRow 리스트를 추출합니다.
+        
+        Args:
+            html_content: HTML 문자열
+            
+        Returns:
+            StockRow 리스트
+        """
+        from stock_row import StockRow
+        return [StockRow.from_dict(stock) for stock in self.parse_html_table(html_content)]
+    
+    def parse_table(self, html_content: str) -> 'StockTable':
+        """
+        HTML 테이블을 열 단위 StockTable로 추출합니다. 행이 많은 페이지에서 메모리를 아낍니다.
+        
+        Args:
+            html_content: HTML 문자열
+            
+        Returns:
+            StockTable
+        """
+        from stock_row import StockTable
+        return StockTable.from_rows(self.parse_html_table(html_content))
     
-    def crawl_from_url(self, url: str, max_rows: int = 50) -> List[Dict]:
+    def crawl_from_url(self, url: str, max_rows: Optional[int] = DEFAULT_MAX_ROWS, paginate: bool = False,
+                       page_size: Optional[int] = None, max_workers: int = 4) -> List[Dict]:
         """
         URL에서 주식 데이터를 크롤링합니다.
         
         Args:
             url: Yahoo Finance URL
-            max_rows: 최대 추출할 행 수
+            max_rows: 최대 추출할 행 수 (페이지 모드에서 None이면 마지막 페이지까지)
+            paginate: True이면 start/count 오프셋으로 여러 페이지를 병렬로 가져옵니다
+            page_size: 페이지당 행 수 (기본값: URL의 count 또는 DEFAULT_PAGE_SIZE)
+            max_workers: 페이지 모드에서 동시에 가져올 페이지 수
             
         Returns:
-            주식 데이터 딕셔너리 리스트
+            주식 데이터 딕셔너리 리스트 (실패하면 빈 리스트, 원인은 self.reports[url])
         """
+        from parse_errors import ParserBrokenError
+        
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            stocks = self.parse_html_table(response.text)
-            return stocks[:max_rows]
+            return self.fetch(url, max_rows, paginate, page_size, max_workers)
+        except ParserBrokenError as e:
+            print(f"❌ {e} ({url})")
+            return []
         except Exception as e:
             print(f"URL 크롤링 오류: {e}")
             return []
     
-    def save_to_excel(self, stocks: List[Dict], filename: str = 'stock_data.xlsx'):
+    def fetch(self, url: str, max_rows: Optional[int] = DEFAULT_MAX_ROWS, paginate: bool = False,
+              page_size: Optional[int] = None, max_workers: int = 4) -> List[Dict]:
+        """
+        crawl_from_url과 같지만 오류를 삼키지 않고 그대로 발생시킵니다.
+        (재시도나 백오프를 직접 결정해야 하는 호출자용, 예: poller.Poller)
+        파싱 결과(상태, 실패한 행 / 필드 수)는 self.reports[url]에 남습니다.
+        
+        Raises:
+            requests.RequestException: 연결 실패, 4xx/5xx 응답 (429 포함) 등
+            ParserBrokenError: 페이지 구조가 바뀌어 행을 추출하지 못하는 경우
+        """
+        from parse_errors import ParseReport, ParserBrokenError
+        
+        report = ParseReport(url, self.error_budget, columns=self.schema.columns)
+        with self._session_lock:
+            self.reports[url] = report
+        try:
+            with METRICS.span('fetch'):
+                stocks = self._fetch_api(url, max_rows, page_size) if self.use_api else None
+                if not stocks:
+                    if paginate:
+                        stocks = self._crawl_pages(url, max_rows, page_size, max_workers, report)
+                    else:
+                        stocks = self._fetch_rows(url, max_rows, report)
+        except ParserBrokenError:
+            raise
+        except Exception as e:
+            report.fail(e)
+            raise
+        report.finish(len(stocks))
+        return stocks
+    
+    def diff(self, url: str, stocks: List[Dict]) -> Iterator[Dict]:
+        """
+        url의 직전 결과와 stocks를 Symbol 기준으로 비교한 변경 이벤트를 돌려줍니다.
+        (row_diff 참고: add / change / remove, 처음 호출하면 모든 행이 add)
+        
+        Args:
+            url: 결과를 구분할 URL
+            stocks: 새 결과
+            
+        Returns:
+            변경 이벤트 이터레이터
+        """
+        from row_diff import RowDiffer
+        with self._session_lock:
+            differ = self._differs.get(url)
+            if differ is None:
+                differ = self._differs[url] = RowDiffer()
+        with METRICS.span('diff'):
+            events = list(differ.diff(stocks))
+        METRICS.incr('diff_events', len(events))
+        return iter(events)
+    
+    def fetch_changes(self, url: str, max_rows: Optional[int] = DEFAULT_MAX_ROWS, **options) -> Iterator[Dict]:
+        """
+        fetch로 가져온 결과를 직전 결과와 비교해 바뀐 부분만 돌려줍니다.
+        
+        Args:
+            url: Yahoo Finance URL
+            max_rows: 최대 추출할 행 수
+            **options: fetch 인자 (paginate, page_size, max_workers)
+            
+        Raises:
+            requests.RequestException: fetch와 같습니다 (실패하면 직전 결과를 그대로 유지합니다)
+        """
+        return self.diff(url, self.fetch(url, max_rows, **options))
+    
+    def _fetch_api(self, url: str, max_rows: Optional[int], page_size: Optional[int] = None) -> Optional[List[Dict]]:
+        """
+        스크리너 URL이면 HTML 대신 스크리너 JSON API에서 행을 가져옵니다.
+        스크리너 URL이 아니거나 API 요청이 실패하면 None을 반환해 HTML 경로로 넘어갑니다.
+        (401 / 403 / 404 응답을 받으면 이 크롤러에서는 더 이상 API를 시도하지 않습니다)
+        """
+        import json_source
+        
+        scr_id = json_source.screener_id(url)
+        if scr_id is None or self._api_disabled:
+            return None
+        
+        import requests
+        
+        start, count = json_source.page_range(url)
+        base = self.api_url or json_source.API_URL
+        stocks = []
+        try:
+            with METRICS.span('api'):
+                while max_rows is None or len(stocks) < max_rows:
+                    wanted = json_source.API_MAX_COUNT if max_rows is None else max_rows - len(stocks)
+                    batch = min(wanted, page_size or count or json_source.API_MAX_COUNT, json_source.API_MAX_COUNT)
+                    page, total = self._api_page(json_source.api_url(scr_id, start, batch, base))
+                    stocks.extend(page)
+                    start += len(page)
+                    if len(page) < batch or (total is not None and start >= total):
+                        break
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code in (401, 403, 404):
+                self._api_disabled = True
+            METRICS.incr('api_fallbacks')
+            return None
+        except (requests.RequestException, ValueError):
+            METRICS.incr('api_fallbacks')
+            return None
+        
+        if max_rows is not None:
+            stocks = stocks[:max_rows]
+        METRICS.incr('api_rows', len(stocks))
+        METRICS.incr('rows_parsed', len(stocks))
+        return self.schema.project(stocks)
+    
+    def _api_page(self, request_url: str) -> Tuple[List[Dict], Optional[int]]:
+        """
+        스크리너 API 한 페이지의 (행 리스트, 전체 행 수)를 가져옵니다.
+        캐시가 있으면 _fetch_rows와 같이 TTL 안에는 요청하지 않고, TTL이 지나면 조건부 요청을 보내
+        304 응답이면 저장해 둔 행을 다시 씁니다. (폴링할 때 같은 JSON을 매번 내려받지 않습니다)
+        
+        Raises:
+            requests.HTTPError: 4xx/5xx 응답
+            ValueError: JSON이 아닌 응답
+        """
+        import json_source
+        
+        entry = self.cache.get(request_url) if self.cache is not None else None
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.record('hit', entry)
+            METRICS.incr('cache_hits')
+            return [dict(row) for row in entry.rows], entry.total
+        
+        headers = entry.validators() if entry is not None else {}
+        response = self._get(request_url, headers=headers, timeout=10)
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(entry)
+            self.cache.record('revalidated', entry)
+            METRICS.incr('cache_revalidated')
+            return [dict(row) for row in entry.rows], entry.total
+        
+        response.raise_for_status()
+        METRICS.incr('bytes_downloaded', len(response.content))
+        data = response.json()
+        page = json_source.rows_from_payload(data)
+        total = json_source.payload_total(data)
+        if self.cache is not None:
+            from http_cache import CacheEntry
+            self.cache.record('miss')
+            METRICS.incr('cache_misses')
+            self.cache.put(CacheEntry(
+                request_url, [dict(row) for row in page], True,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+                body=response.content,
+                size=len(response.content),
+                total=total,
+            ))
+        return page, total
+    
+    def _crawl_pages(self, url: str, max_rows: Optional[int], page_size: Optional[int],
+                     max_workers: int, report=None) -> List[Dict]:
+        """
+        스크리너 페이지를 start 오프셋 순서대로 max_workers개씩 병렬로 가져옵니다.
+        Symbol 기준으로 중복을 제거하며, max_rows를 채우거나 행 수가 page_size보다
+        적은 페이지(마지막 페이지)를 만나면 멈춥니다.
+        """
+        parts = urlsplit(url)
+        query = dict(parse_qsl(parts.query))
+        start = int(query.pop('start', 0) or 0)
+        page_size = page_size or int(query.pop('count', 0) or 0) or DEFAULT_PAGE_SIZE
+        query.pop('count', None)
+        
+        def page_url(offset):
+            page_query = dict(query, start=offset, count=page_size)
+            return urlunsplit(parts._replace(query=urlencode(page_query)))
+        
+        def fetch(offset):
+            return self._fetch_rows(page_url(offset), page_size, report)
+        
+        from concurrent.futures import ThreadPoolExecutor
+        
+        stocks = []
+        seen = set()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            while True:
+                offsets = [start + i * page_size for i in range(max(1, max_workers))]
+                start = offsets[-1] + page_size
+                added = 0
+                for page in executor.map(fetch, offsets):
+                    for stock in page:
+                        symbol = stock.get('Symbol')
+                        if symbol in seen:
+                            continue
+                        if symbol is not None:
+                            seen.add(symbol)
+                        stocks.append(stock)
+                        added += 1
+                        if max_rows is not None and len(stocks) >= max_rows:
+                            return stocks
+                    if len(page) < page_size:
+                        return stocks
+                # 서버가 start를 무시하고 같은 행만 돌려주는 경우 무한 반복을 막습니다
+                if added == 0:
+                    return stocks
+    
+    def _fetch_rows(self, url: str, max_rows: Optional[int], report=None) -> List[Dict]:
+        """
+        캐시가 있으면 캐시를 거쳐, 없으면 바로 URL의 행을 가져옵니다.
+        (캐시에서 꺼낸 행은 저장할 때 이미 검사했으므로 report에 다시 기록하지 않습니다)
+        """
+        if self.cache is None:
+            return list(self.iter_rows_from_url(url, max_rows, report=report))
+        
+        from http_cache import CacheEntry
+        from stream_parser import iter_rows
+        
+        # 일부 컬럼만 추출하는 크롤러는 전체 컬럼을 저장한 항목과 섞이지 않도록 키를 나눕니다
+        cache_key = f"{url}#{self.schema.key}" if self.schema.projected else url
+        entry = self.cache.get(cache_key)
+        if entry is not None and not entry.covers(max_rows):
+            entry = None
+        
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.record('hit', entry)
+            METRICS.incr('cache_hits')
+            return [dict(row) for row in entry.rows[:max_rows]]
+        
+        headers = entry.validators() if entry is not None else {}
+        # 응답 헤더까지(request)와 본문을 기다린 시간(download)을 파싱 시간(parse)과 따로 기록합니다
+        with METRICS.span('request'):
+            response = self._get(url, headers=headers, timeout=10, stream=True)
+        with response:
+            if response.status_code == 304 and entry is not None:
+                self.cache.touch(entry)
+                self.cache.record('revalidated', entry)
+                METRICS.incr('cache_revalidated')
+                return [dict(row) for row in entry.rows[:max_rows]]
+            
+            response.raise_for_status()
+            body = []
+            finished = []
+            
+            def tee_chunks():
+                for chunk in METRICS.timed(response.iter_content(16 * 1024), 'download'):
+                    body.append(chunk)
+                    METRICS.incr('bytes_downloaded', len(chunk))
+                    yield chunk
+                finished.append(True)
+            
+            stocks = list(iter_rows(tee_chunks(), max_rows, response.encoding or 'utf-8', report, self.schema))
+            raw = b''.join(body)
+            complete = bool(finished)
+            if not stocks and complete:
+                stocks = self._embedded_rows(raw)[:max_rows]
+                if not stocks and report is not None:
+                    report.check_empty(raw)
+            
+            self.cache.record('miss')
+            METRICS.incr('cache_misses')
+            METRICS.incr('rows_parsed', len(stocks))
+            self.cache.put(CacheEntry(
+                cache_key, [dict(row) for row in stocks], complete,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+                body=raw if complete else None,
+                size=len(raw),
+            ))
+            return stocks
+    
+    def iter_rows_from_url(self, url: str, max_rows: Optional[int] = None,
+                           chunk_size: int = 16 * 1024, report=None) -> Iterator[Dict]:
+        """
+        URL 응답을 받는 대로 파싱하여 주식 데이터를 하나씩 내보냅니다.
+        max_rows개를 채우면 나머지 응답은 내려받지 않고 연결을 닫습니다.
+        
+        Args:
+            url: Yahoo Finance URL
+            max_rows: 최대 추출할 행 수 (None이면 전체)
+            chunk_size: 소켓에서 한 번에 읽을 바이트 수
+            report: 행마다 필드 누락을 기록할 parse_errors.ParseReport
+            
+        Yields:
+            주식 데이터 딕셔너리
+            
+        Raises:
+            ParserBrokenError: report의 오류 예산을 넘은 경우 (나머지 응답은 내려받지 않습니다)
+        """
+        from stream_parser import iter_rows
+        
+        # 표 행이 나오기 전까지만 응답을 보관합니다 (행이 하나도 없으면 포함된 JSON에서 찾습니다)
+        body = []
+        
+        def counted(chunks):
+            for chunk in chunks:
+                METRICS.incr('bytes_downloaded', len(chunk))
+                if body is not None:
+                    body.append(chunk)
+                yield chunk
+        
+        with METRICS.span('request'):
+            response = self._get(url, timeout=10, stream=True)
+        with response:
+            response.raise_for_status()
+            encoding = response.encoding or 'utf-8'
+            count = 0
+            try:
+                chunks = METRICS.timed(response.iter_content(chunk_size), 'download')
+                for stock in iter_rows(counted(chunks), max_rows, encoding, report, self.schema):
+                    count += 1
+                    body = None
+                    yield stock
+                if count == 0:
+                    html_content = b''.join(body).decode(encoding, errors='replace')
+                    for stock in self._embedded_rows(html_content)[:max_rows]:
+                        count += 1
+                        yield stock
+                    if count == 0 and report is not None:
+                        report.check_empty(html_content)
+            finally:
+                METRICS.incr('rows_parsed', count)
+    
+    def crawl_many(self, urls: List[str], max_rows: int = DEFAULT_MAX_ROWS, max_workers: int = 8,
+                   per_host_limit: int = 4, paginate: bool = False,
+                   page_size: Optional[int] = None) -> Dict[str, List[Dict]]:
+        """
+        여러 URL을 동시에 크롤링합니다.
+        요청은 세션의 연결 풀을 공유하고, 응답 파싱도 작업 스레드에서 이루어집니다.
+        
+        Args:
+            urls: Yahoo Finance URL 리스트
+            max_rows: URL별 최대 추출할 행 수 (페이지 모드에서 None이면 마지막 페이지까지)
+            max_workers: 동시에 처리할 최대 URL 수
+            per_host_limit: 같은 호스트로 동시에 보낼 최대 요청 수
+            paginate: True이면 URL마다 crawl_from_url의 페이지 모드로 가져옵니다.
+                      한 URL의 페이지 요청 수는 per_host_limit을 같은 호스트의 URL 수로 나눈 값이므로
+                      호스트별 동시 요청 수는 그대로 per_host_limit을 넘지 않습니다
+            page_size: 페이지당 행 수 (페이지 모드)
+            
+        Returns:
+            URL -> 주식 데이터 딕셔너리 리스트 (실패한 URL은 빈 리스트)
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        host_slots = {}
+        host_urls = {}
+        for url in unique_urls:
+            host = urlsplit(url).netloc
+            if host not in host_slots:
+                host_slots[host] = threading.BoundedSemaphore(per_host_limit)
+            host_urls[host] = host_urls.get(host, 0) + 1
+        
+        def crawl_one(url):
+            host = urlsplit(url).netloc
+            with host_slots[host]:
+                if paginate:
+                    page_workers = max(1, per_host_limit // host_urls[host])
+                    return self.crawl_from_url(url, max_rows, paginate=True, page_size=page_size,
+                                               max_workers=page_workers)
+                return self.crawl_from_url(url, max_rows)
+        
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique_urls)))) as executor:
+            results = executor.map(crawl_one, unique_urls)
+            return dict(zip(unique_urls, results))
+    
+    def save_to_excel(self, stocks: List[Dict], filename: str = 'stock_data.xlsx', numeric: bool = False,
+                      write_only: bool = False):
         """
         주식 데이터를 엑셀 파일로 저장합니다.
         
         Args:
-            stocks: 주식 데이터 딕셔너리 리스트
+            stocks: 주식 데이터 딕셔너리 리스트 (또는 StockTable)
             filename: 저장할 파일명
+            numeric: True이면 값을 숫자로 저장하고 엑셀 셀 서식으로 표시합니다
+            write_only: True이면 행을 나누어 스트리밍으로 저장합니다 (대용량용)
         """
-        if not stocks:
+        if stocks is None or len(stocks) == 0:
             print("저장할 데이터가 없습니다.")
             return
         
-        # 데이터 정리 및 포맷팅
-        df_data = []
-        for stock in stocks:
-            row = {}
-            row['Symbol'] = stock.get('Symbol', '')
-            row['Name'] = stock.get('Name', '')
-            row['Price'] = self._format_number(stock.get('Price', ''))
-            row['Change'] = self._format_number(stock.get('Change', ''))
-            row['Change %'] = self._format_percent(stock.get('Change %', ''))
-            row['Volume'] = self._format_number(stock.get('Volume', ''))
-            row['Avg Vol (3M)'] = stock.get('Avg Vol (3M)', '')
-            row['Market Cap'] = self._format_market_cap(stock.get('Market Cap', ''))
-            row['P/E Ratio (TTM)'] = stock.get('P/E Ratio (TTM)', '')
-            row['52 Wk Change %'] = self._format_percent(stock.get('52 Wk Change %', ''))
-            row['52 Wk Range'] = stock.get('52 Wk Range', '')
-            df_data.append(row)
-        
-        df = pd.DataFrame(df_data)
-        df.to_excel(filename, index=False, engine='openpyxl')
-        print(f"데이터가 {filename}에 저장되었습니다. (총 {len(df_data)}개 행)")
-    
+        from export import write_excel
+        with METRICS.span('save'):
+            count = write_excel(stocks, filename, numeric=numeric, write_only=write_only, crawler=self,
+                                columns=self._export_columns())
+        print(f"데이터가 {filename}에 저장되었습니다. (총 {count}개 행)")
+
+    def save(self, stocks: List[Dict], filename: str, format: Optional[str] = None, **options) -> int:
+        """
+        주식 데이터를 지정한 형식으로 저장합니다.
+
+        Args:
+            stocks: 주식 데이터 딕셔너리 리스트 (또는 StockTable)
+            filename: 저장할 파일명
+            format: 'xlsx', 'csv', 'jsonl', 'parquet', 'sqlite' 또는 Sink 인스턴스
+                    (None이면 파일 확장자로 정하고, 모르는 확장자면 xlsx)
+            **options: 형식별 옵션 (numeric, write_only, append, table, replace, columns 등)
+                       columns를 주지 않으면 크롤러가 추출하는 컬럼(fields)을 저장합니다
+
+        Returns:
+            저장한 행 수
+        """
+        if stocks is None or len(stocks) == 0:
+            print("저장할 데이터가 없습니다.")
+            return 0
+
+        from sinks import Sink, format_for_filename, get_sink
+        if isinstance(format, Sink):
+            sink = format
+        else:
+            options.setdefault('columns', self._export_columns())
+            sink = get_sink(format or format_for_filename(filename) or 'xlsx', **options)
+        with METRICS.span('save'):
+            count = sink.write(stocks, filename, crawler=self)
+        print(f"데이터가 {filename}에 저장되었습니다. (총 {count}개 행)")
+        return count
+
+    def _export_columns(self) -> Optional[List[str]]:
+        """저장할 컬럼 (일부 컬럼만 추출하는 크롤러면 그 컬럼, 아니면 None = 전체)"""
+        return list(self.schema.columns) if self.schema.projected else None
+
     def _format_number(self, value):
         """숫자 포맷팅"""
         if not value or value == '':
@@ -231,12 +672,16 @@ def main():
     # 사용자가 제공한 HTML을 파일에서 읽거나 직접 사용할 수 있습니다
     # 여기서는 URL을 사용하는 예시를 보여드립니다
     
-    # 방법 1: HTML 파일에서 읽기
+    # 방법 1: HTML 파일에서 읽기 (이전에 파싱한 내용은 캐시에서 바로 가져옵니다)
+    from parse_errors import ParserBrokenError
     try:
-        with open('input.html', 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        stocks = crawler.parse_html_table(html_content)
+        from parse_cache import ParseCache
+        stocks = ParseCache().parse_file('input.html', crawler)
         print(f"HTML 파일에서 {len(stocks)}개의 주식 데이터를 추출했습니다.")
+    except ParserBrokenError as e:
+        print(f"❌ {e}")
+        print(f"   {e.report.summary()}")
+        stocks = []
     except FileNotFoundError:
         print("input.html 파일을 찾을 수 없습니다.")
         print("Yahoo Finance URL을 사용하거나 HTML을 input.html 파일로 저장해주세요.")
@@ -248,8 +693,7 @@ def main():
         stocks = []
     
     if stocks:
-        # 50개로 제한
-        stocks = stocks[:50]
+        stocks = stocks[:DEFAULT_MAX_ROWS]
         crawler.save_to_excel(stocks, 'stock_data.xlsx')
     else:
         print("추출된 데이터가 없습니다.")
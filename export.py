@@ -0,0 +1,333 @@
+"""
+엑셀 내보내기 엔진
+행마다 딕셔너리를 새로 만들고 셀마다 포맷 함수를 부르는 대신,
+열 단위로 DataFrame을 만들고 숫자 변환을 pandas 벡터 연산으로 처리합니다.
+
+- 텍스트 모드 (기본값): 기존 save_to_excel과 똑같은 문자열('1,234', '+8.92%', '$7.164B')을 씁니다.
+- 숫자 모드 (numeric=True): 값은 숫자로 두고 엑셀 셀 서식으로 표시만 바꿉니다.
+- 스트리밍 모드 (write_only=True): chunk_size 행씩 나누어 변환하고 xlsxwriter constant_memory
+  (없으면 openpyxl write-only) 워크북에 바로 쓰므로 행 수와 관계없이 메모리 사용량이 일정합니다.
+"""
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from schema import DEFAULT_SCHEMA, compile_schema
+
+
+# 엑셀 파일의 열 순서 (전체 컬럼, 열별 형식은 schema.DEFAULT_FIELDS에 있습니다)
+EXPORT_COLUMNS = list(DEFAULT_SCHEMA.columns)
+
+# 숫자 모드에서 열별 엑셀 셀 서식 (퍼센트 열은 100으로 나눈 값을 저장합니다)
+NUMBER_FORMATS = {field.column: field.number_format for field in DEFAULT_SCHEMA.fields if field.number_format}
+
+
+def _to_float(values: np.ndarray) -> np.ndarray:
+    """
+    문자열 배열을 한 번에 float 배열로 변환합니다. 변환할 수 없는 값은 NaN입니다.
+    float()과 같은 결과가 나와야 하므로 pd.to_numeric(마지막 자리 반올림이 다름) 대신
+    astype(float)을 쓰고, 변환할 수 없는 값이 섞여 있을 때만 값별로 변환합니다.
+    """
+    try:
+        return values.astype(float)
+    except (TypeError, ValueError):
+        return np.fromiter((_safe_float(value) for value in values), dtype=float, count=len(values))
+
+
+def _safe_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _blank(values: np.ndarray) -> np.ndarray:
+    """기존 포맷 함수의 `if not value` 조건 (None, NaN, 빈 문자열)"""
+    return pd.isna(values) | (values == '')
+
+
+def format_number_column(values) -> np.ndarray:
+    """_format_number를 열 전체에 적용합니다. 숫자 문자열은 천 단위 구분 기호를 붙입니다."""
+    values = np.asarray(values, dtype=object)
+    result = values.copy()
+    nums = _to_float(values)
+    ok = ~np.isnan(nums)
+
+    # data-value 형식의 문자열만 (기존 replace('.').replace('-').isdigit() 조건) 포맷합니다
+    ok_index = np.flatnonzero(ok)
+    plain = np.fromiter((type(value) is str and value.replace('.', '').replace('-', '').isdigit()
+                         for value in values[ok_index]), dtype=bool, count=len(ok_index))
+    ok_index = ok_index[plain]
+
+    nums = nums[ok_index]
+    whole = (nums == np.trunc(nums)) & (np.abs(nums) < 2 ** 63)
+    result[ok_index[whole]] = [f"{num:,}" for num in nums[whole].astype(np.int64).tolist()]
+    huge = ~whole & (nums == np.trunc(nums))
+    result[ok_index[huge]] = [f"{int(num):,}" for num in nums[huge].tolist()]
+    whole |= huge
+    result[ok_index[~whole]] = [f"{num:,.2f}" for num in nums[~whole].tolist()]
+    result[_blank(values)] = ''
+    return result
+
+
+def format_percent_column(values, fallback) -> np.ndarray:
+    """_format_percent를 열 전체에 적용합니다. ('8.91648' -> '+8.92%')"""
+    values = np.asarray(values, dtype=object)
+    result = values.copy()
+    nums = _to_float(values)
+    ok = ~np.isnan(nums)
+
+    result[ok] = [f"+{num:.2f}%" if num >= 0 else f"{num:.2f}%" for num in nums[ok].tolist()]
+    _apply_fallback(result, values, ok, fallback)
+    return result
+
+
+def format_market_cap_column(values, fallback) -> np.ndarray:
+    """_format_market_cap을 열 전체에 적용합니다. ('7164238007.24' -> '$7.164B')"""
+    values = np.asarray(values, dtype=object)
+    result = values.copy()
+    nums = _to_float(values)
+    ok = ~np.isnan(nums)
+
+    nums = nums[ok]
+    conditions = [nums >= 1e12, nums >= 1e9, nums >= 1e6]
+    scaled = np.select(conditions, [nums / 1e12, nums / 1e9, nums / 1e6], nums)
+    unit = np.select(conditions, [1, 2, 3], 0)
+    suffixes = ('', 'T', 'B', 'M')
+    result[ok] = [f"${num:.3f}{suffixes[u]}" if u else f"${num:,.0f}"
+                  for num, u in zip(scaled.tolist(), unit.tolist())]
+    _apply_fallback(result, values, ok, fallback)
+    return result
+
+
+def _apply_fallback(result: np.ndarray, values: np.ndarray, ok: np.ndarray, fallback):
+    """
+    pandas가 숫자로 읽지 못한 나머지 값(' 1e3', 'nan' 등 드문 경우)은
+    기존 포맷 함수로 처리해 결과를 그대로 맞춥니다.
+    """
+    blank = _blank(values)
+    rest = ~ok & ~blank
+    if rest.any():
+        result[rest] = [fallback(value) for value in values[rest]]
+    result[blank] = ''
+
+
+def export_plan(columns=None):
+    """저장할 열의 Field 목록 (columns가 None이면 전체, 순서는 DEFAULT_FIELDS를 따름)"""
+    return compile_schema(columns).export_plan()
+
+
+def build_export_frame(stocks, numeric: bool = False, crawler=None, percent_fraction: bool = True,
+                       columns=None) -> pd.DataFrame:
+    """
+    주식 데이터를 엑셀용 DataFrame으로 만듭니다.
+    열마다 스키마의 형식(Field.export / numeric)에 따라 변환합니다.
+
+    Args:
+        stocks: 주식 데이터 딕셔너리 리스트 또는 StockTable
+        numeric: True이면 숫자 열을 숫자로 둡니다 (퍼센트 열은 100으로 나눔,
+                 Volume / Avg Vol (3M)은 반올림한 Int64)
+        crawler: 드문 값의 포맷에 쓸 YahooFinanceCrawler (기본값: 새 인스턴스)
+        percent_fraction: 숫자 모드에서 퍼센트 열을 100으로 나눌지 여부
+            (엑셀 % 서식용, CSV / Parquet 등에서는 False로 '8.92'를 8.92로 둡니다)
+        columns: 저장할 컬럼명 (None이면 전체)
+
+    Returns:
+        스키마 순서의 DataFrame (기본값: EXPORT_COLUMNS)
+    """
+    plan = export_plan(columns)
+    if not isinstance(stocks, list) and hasattr(stocks, 'to_dicts'):
+        if numeric:
+            frame = _frame_from_table(stocks, percent_fraction)
+            return frame if columns is None else frame[[field.column for field in plan]]
+        stocks = stocks.to_dicts()
+
+    df = pd.DataFrame.from_records(stocks, columns=[field.column for field in plan])
+    if numeric:
+        from normalize import FIELD_KINDS, normalize_column
+        for field in plan:
+            column = field.column
+            if field.numeric:
+                df[column] = normalize_column(df[column].to_numpy())
+                if FIELD_KINDS.get(column) == 'int':
+                    df[column] = _int_column(df[column].to_numpy())
+                elif percent_fraction and field.export == 'percent':
+                    df[column] = df[column] / 100
+            elif field.export == 'text':
+                df[column] = df[column].fillna('')
+        return df
+
+    if crawler is None and any(field.export in ('percent', 'market_cap') for field in plan):
+        from crawler import YahooFinanceCrawler
+        crawler = YahooFinanceCrawler()
+    for field in plan:
+        column = field.column
+        if field.export == 'text':
+            df[column] = df[column].fillna('')
+        elif field.export == 'number':
+            df[column] = format_number_column(df[column])
+        elif field.export == 'percent':
+            df[column] = format_percent_column(df[column], crawler._format_percent)
+        elif field.export == 'market_cap':
+            df[column] = format_market_cap_column(df[column], crawler._format_market_cap)
+    return df
+
+
+def _frame_from_table(table, percent_fraction: bool = True) -> pd.DataFrame:
+    """StockTable의 열 배열로 숫자 모드 DataFrame(전체 컬럼)을 바로 만듭니다."""
+    arrays = table.to_numpy()
+    percent_scale = 100 if percent_fraction else 1
+    low, high = arrays['week52_low'], arrays['week52_high']
+    has_range = ~(np.isnan(low) | np.isnan(high))
+    week52_range = np.full(len(table), '', dtype=object)
+    week52_range[has_range] = [f"{lo:.2f} - {hi:.2f}" for lo, hi in zip(low[has_range], high[has_range])]
+    return pd.DataFrame({
+        'Symbol': arrays['symbol'],
+        'Name': arrays['name'],
+        'Price': arrays['price'],
+        'Change': arrays['change'],
+        'Change %': arrays['change_percent'] / percent_scale,
+        'Volume': _int_column(arrays['volume']),
+        'Avg Vol (3M)': _int_column(arrays['avg_volume']),
+        'Market Cap': arrays['market_cap'],
+        'P/E Ratio (TTM)': arrays['pe_ratio'],
+        '52 Wk Change %': arrays['week52_change_percent'] / percent_scale,
+        '52 Wk Range': week52_range,
+    }, columns=EXPORT_COLUMNS)
+
+
+def _int_column(values: np.ndarray) -> pd.arrays.IntegerArray:
+    """정수 필드(normalize.FIELD_KINDS의 'int')의 float 배열을 반올림한 nullable Int64 배열 (NaN은 <NA>)"""
+    return pd.array(np.round(values), dtype='Int64')
+
+
+def _chunks(stocks: Iterable, size: int) -> Iterator[List]:
+    if hasattr(stocks, 'to_dicts') and not isinstance(stocks, list):
+        stocks = iter(stocks)
+        rows = (row.to_dict() for row in stocks)
+    else:
+        rows = iter(stocks)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def default_engine() -> str:
+    """사용할 엑셀 엔진. xlsxwriter가 설치되어 있으면 더 빠른 xlsxwriter를 씁니다."""
+    try:
+        import xlsxwriter  # noqa: F401
+        return 'xlsxwriter'
+    except ImportError:
+        return 'openpyxl'
+
+
+def write_excel(stocks, filename: str, numeric: bool = False, write_only: bool = False,
+                chunk_size: int = 10000, crawler=None, engine: Optional[str] = None, columns=None) -> int:
+    """
+    주식 데이터를 엑셀 파일로 씁니다.
+
+    Args:
+        stocks: 주식 데이터 딕셔너리 리스트(또는 이터러블) 또는 StockTable
+        filename: 저장할 파일명
+        numeric: True이면 값은 숫자로 두고 스키마의 셀 서식(Field.number_format)을 씁니다
+        write_only: True이면 chunk_size 행씩 스트리밍으로 씁니다 (메모리 일정)
+        chunk_size: 스트리밍 모드에서 한 번에 변환할 행 수
+        crawler: 드문 값의 포맷에 쓸 YahooFinanceCrawler
+        engine: 'xlsxwriter' 또는 'openpyxl' (기본값: default_engine())
+        columns: 저장할 컬럼명 (None이면 전체)
+
+    Returns:
+        저장한 행 수
+    """
+    engine = engine or default_engine()
+    if write_only:
+        if engine == 'xlsxwriter':
+            return _write_streaming_xlsxwriter(stocks, filename, numeric, chunk_size, crawler, columns)
+        return _write_streaming_openpyxl(stocks, filename, numeric, chunk_size, crawler, columns)
+
+    plan = export_plan(columns)
+    df = build_export_frame(stocks, numeric, crawler, columns=columns)
+    with pd.ExcelWriter(filename, engine=engine) as writer:
+        df.to_excel(writer, index=False)
+        if numeric:
+            worksheet = writer.sheets['Sheet1']
+            if engine == 'xlsxwriter':
+                # 열 서식은 서식이 없는 셀 전체에 적용되므로 셀마다 지정할 필요가 없습니다
+                for index, field in enumerate(plan):
+                    if field.number_format:
+                        worksheet.set_column(index, index, None, writer.book.add_format(
+                            {'num_format': field.number_format}))
+            else:
+                for index, field in enumerate(plan, start=1):
+                    number_format = field.number_format
+                    if number_format is None:
+                        continue
+                    for (cell,) in worksheet.iter_rows(min_row=2, min_col=index, max_col=index):
+                        cell.number_format = number_format
+    return len(df)
+
+
+def _frames(stocks, numeric: bool, chunk_size: int, crawler, columns=None) -> Iterator[pd.DataFrame]:
+    """chunk_size 행씩 변환한 DataFrame (NaN은 None으로 바꿉니다)"""
+    for chunk in _chunks(stocks, chunk_size):
+        df = build_export_frame(chunk, numeric, crawler, columns=columns)
+        yield df.astype(object).where(df.notna(), None)
+
+
+def _write_streaming_xlsxwriter(stocks, filename: str, numeric: bool, chunk_size: int, crawler,
+                                columns=None) -> int:
+    import xlsxwriter
+
+    plan = export_plan(columns)
+    workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
+    worksheet = workbook.add_worksheet('Sheet1')
+    worksheet.write_row(0, 0, [field.column for field in plan])
+    if numeric:
+        for index, field in enumerate(plan):
+            if field.number_format:
+                worksheet.set_column(index, index, None, workbook.add_format({'num_format': field.number_format}))
+
+    count = 0
+    for frame in _frames(stocks, numeric, chunk_size, crawler, columns):
+        for values in frame.itertuples(index=False, name=None):
+            count += 1
+            worksheet.write_row(count, 0, values)
+
+    workbook.close()
+    return count
+
+
+def _write_streaming_openpyxl(stocks, filename: str, numeric: bool, chunk_size: int, crawler,
+                              columns=None) -> int:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    plan = export_plan(columns)
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet('Sheet1')
+    worksheet.append([field.column for field in plan])
+    formats = [field.number_format if numeric else None for field in plan]
+
+    count = 0
+    for frame in _frames(stocks, numeric, chunk_size, crawler, columns):
+        for values in frame.itertuples(index=False, name=None):
+            if numeric:
+                row = []
+                for value, number_format in zip(values, formats):
+                    if number_format is not None and value is not None:
+                        cell = WriteOnlyCell(worksheet, value=value)
+                        cell.number_format = number_format
+                        row.append(cell)
+                    else:
+                        row.append(value)
+                worksheet.append(row)
+            else:
+                worksheet.append(values)
+        count += len(frame)
+
+    workbook.save(filename)
+    return count
@@ -1,7 +1,9 @@
 """
 사용자가 제공한 HTML 테이블에서 주식 데이터를 추출합니다.
 """
-from crawler import YahooFinanceCrawler
+from crawler import YahooFinanceCrawler, DEFAULT_MAX_ROWS
+from parse_cache import ParseCache
+from parse_errors import ParserBrokenError
 
 
 # 사용자가 제공한 HTML (일부)
@@ -15,23 +17,24 @@ def main():
     # 사용자가 제공한 HTML을 파일로 저장하거나 직접 사용
     print("HTML 테이블에서 주식 데이터를 추출합니다...")
     
-    # 파일에서 읽기 시도
+    # 파일에서 읽기 시도 (이전에 파싱한 내용은 캐시에서 바로 가져옵니다)
     try:
-        with open('input.html', 'r', encoding='utf-8') as f:
-            html_content = f.read()
+        stocks = ParseCache().parse_file('input.html', crawler)
         print("input.html 파일에서 읽었습니다.")
     except FileNotFoundError:
         print("input.html 파일을 찾을 수 없습니다.")
         print("전체 HTML 테이블을 input.html 파일로 저장하거나,")
         print("브라우저에서 페이지 소스 보기(Ctrl+U)로 전체 HTML을 복사하여 저장하세요.")
         return
-    
-    # HTML 파싱
-    stocks = crawler.parse_html_table(html_content)
+    except ParserBrokenError as e:
+        print(f"\n❌ {e}")
+        print(f"   {e.report.summary()}")
+        print("HTML 형식을 확인해주세요. <table> 태그와 <tbody> 내부의 <tr> 태그가 필요합니다.")
+        return
     
     if stocks:
-        # 50개로 제한
-        stocks = stocks[:50]
+        # 최대 행 수로 제한
+        stocks = stocks[:DEFAULT_MAX_ROWS]
         print(f"\n총 {len(stocks)}개의 주식 데이터를 추출했습니다.")
         
         # 엑셀 파일로 저장
@@ -41,11 +44,7 @@ def main():
         # 미리보기 출력
         print("\n=== 추출된 데이터 미리보기 (처음 5개) ===")
         for i, stock in enumerate(stocks[:5], 1):
-            print(f"\n{i}. {stock.get('Symbol', 'N/A')} - {stock.get('Name', 'N/A')}")
-            print(f"   가격: ${stock.get('Price', 'N/A')}")
-            print(f"   변동: {stock.get('Change', 'N/A')} ({stock.get('Change %', 'N/A')})")
-            print(f"   거래량: {stock.get('Volume', 'N/A')}")
-            print(f"   시가총액: {stock.get('Market Cap', 'N/A')}")
+            print('\n'.join(crawler.schema.preview_lines(i, stock)))
     else:
         print("\n추출된 데이터가 없습니다.")
         print("HTML 형식을 확인해주세요. <table> 태그와 <tbody> 내부의 <tr> 태그가 필요합니다.")
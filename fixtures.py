@@ -0,0 +1,475 @@
+"""
+합성 Yahoo Finance 스크리너 HTML
+사용자가 제공한 스크리너 표(html_sample)의 실제 마크업(data-testid-cell 셀, fin-streamer 태그)을 그대로 두고
+값만 행마다 다르게 채운 페이지를 만듭니다. 같은 seed면 항상 같은 페이지가 나오므로
+벤치마크 결과를 다른 시점 / 다른 브랜치와 비교할 수 있습니다.
+같은 값으로 스크리너 API 응답과 JSON만 포함된(표가 JavaScript로 그려지는) 페이지도 만듭니다.
+Chrome 없이 browser_pool을 확인할 수 있는 가짜 드라이버(FakeDriver)도 있습니다.
+node.js가 있으면 FakeDriver(node=True)가 browser_pool.TABLE_SCRIPT를 실제 JavaScript로 실행합니다.
+테스트와 벤치마크가 함께 쓰는 로컬 HTTP 서버(FixtureServer)와 스크리너 페이지 / API 응답 함수도 여기에 있습니다.
+
+    html_content = synthetic_page(1000, seed=0)
+    assert crawler.parse_html_table(html_content) == expected_stocks(1000, seed=0)
+"""
+import html
+import json
+import random
+import re
+import shutil
+import subprocess
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Union
+from urllib.parse import parse_qsl, urlsplit
+
+from json_source import display_volume
+
+
+# 사용자가 제공한 스크리너 표 HTML (데이터 행 하나)
+html_sample = """<table class="yf-1uayyp1 bd"><thead class="yf-1uayyp1"><tr class="yf-1uayyp1"><th data-testid-header="ticker" class="[&amp;_.symbol]:tw-text-md yf-1uayyp1 so lpin shad"><div class="colCont yf-1uayyp1"> Symbol</div></th><th data-testid-header="companyshortname.raw" class="leftAlignHeader companyName yf-1uayyp1 so"><div class="colCont yf-1uayyp1"> Name</div></th><th data-testid-header="sparkline" class=" yf-1uayyp1"><div class="colCont yf-1uayyp1"> <span data-svelte-h="svelte-1uypmr0">&nbsp;</span></div></th><th data-testid-header="intradayprice" class="yf-1uayyp1 so"><div class="colCont yf-1uayyp1"> <div class="container yf-1d5e06g"><span>Price</span> </div></div></th><th data-testid-header="intradaypricechange" class="yf-1uayyp1 so"><div class="colCont yf-1uayyp1"> Change</div></th><th data-testid-header="percentchange" class="yf-1uayyp1 so sorted"><div class="colCont yf-1uayyp1"><div aria-hidden="true" class="icon fin-icon inherit-icn sz-medium yf-sv6wwp"><svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24"><path d="M16.59 8.59 12 13.17 7.41 8.59 6 10l6 6 6-6z"></path></svg></div> Change %</div></th><th data-testid-header="dayvolume" class="yf-1uayyp1 so"><div class="colCont yf-1uayyp1"> Volume</div></th><th data-testid-header="avgdailyvol3m" class="yf-1uayyp1 so"><div class="colCont yf-1uayyp1"> Avg Vol (3M)</div></th><th data-testid-header="intradaymarketcap" class="yf-1uayyp1 so"><div class="colCont yf-1uayyp1"> Market Cap</div></th><th data-testid-header="peratio.lasttwelvemonths" class="yf-1uayyp1 so"><div class="colCont yf-1uayyp1"> <div class="yf-10yevti"><span>P/E Ratio </span><span>(TTM) </span></div></div></th><th data-testid-header="fiftytwowkpercentchange" class="yf-1uayyp1 so"><div class="colCont yf-1uayyp1"> <div class="yf-10yevti"><span>52 Wk </span><span>Change % </span></div></div></th><th data-testid-header="fiftyTwoWeekRange" class=" yf-1uayyp1"><div class="colCont yf-1uayyp1"> 52 Wk Range</div></th> </tr></thead> <tbody><tr class="row yf-1uayyp1" data-testid="data-table-v2-row" data-testid-row="0"><td data-testid-cell="ticker" class="[&amp;_.symbol]:tw-text-md yf-1uayyp1 lpin shad" style="--_depth: false;"><div style="display: contents; --background-color:transparent; --hover-bg-color:transparent; --hover-color:var(--enabled-active-emph); --text-color:var(--enabled-active-emph); --hover-focus-color:var(--hovered-emph-same); --text-decoration:underline;"><span class="ticker-wrapper yf-1pdfbgz"><a data-testid="table-cell-ticker" class="ticker medium [&amp;_.symbol]:tw-text-md hover noPadding yf-1pdfbgz" aria-label="Companhia Paranaense de Energia" data-ylk="elm:qte;elmt:link;itc:0;sec:stocks-datatable;slk:ELPC" href="/quote/ELPC/" title="Companhia Paranaense de Energia" data-rapid_p="24" data-v9y="1"> <div class="name yf-1pdfbgz"><span class="symbol yf-1pdfbgz">ELPC </span> </div>  </a> </span></div> </td><td data-testid-cell="companyshortname.raw" class="leftAlignHeader companyName yf-1uayyp1" style="--_depth: false;"><div title="Companhia Paranaense de Energia" class="leftAlignHeader companyName yf-362rys enableMaxWidth">Companhia Paranaense de Energia</div> </td><td data-testid-cell="sparkline" class=" yf-1uayyp1" style="--_depth: false;"><div class="yf-1rh4oll expandWidth enableMaxWidth"><a class="none-link fin-size-small yf-119g04z" data-ylk="elm:chart;elmt:link;itc:0;sec:stocks-datatable;slk:ELPC" href="/chart/ELPC" aria-label="Advanced Chart" data-rapid_p="25" data-v9y="1"><figure class=" yf-qqbabn" data-testid="sparkline"><canvas aria-label="ELPC chart" class=" yf-qqbabn" width="50" height="20" style="width: 50px; height: 20px;"></canvas></figure> </a></div> </td><td data-testid-cell="intradayprice" class=" yf-1uayyp1" style="--_depth: false;"><div class=""><fin-streamer data-test="change" data-symbol="ELPC" data-field="regularMarketPrice" data-trend="none" data-value="9.65" active="">9.65</fin-streamer> <div class="hide-desktop hide-mw txt-positive"><fin-streamer data-test="colorChange" data-field="regularMarketChange" data-trend="txt" data-value="0.79" active="">+0.79</fin-streamer> <fin-streamer data-test="colorChange" data-template="({fmt})" data-field="regularMarketChangePercent" data-trend="txt" data-value="8.91648" active="">(+8.92%)</fin-streamer></div></div> </td><td data-testid-cell="intradaypricechange" class=" yf-1uayyp1" style="--_depth: false;"><fin-streamer class="txt-positive" data-test="colorChange" data-symbol="ELPC" data-field="regularMarketChange" data-trend="txt" data-pricehint="2" data-value="0.79" data-tstyle="default" active="">+0.79</fin-streamer> </td><td data-testid-cell="percentchange" class=" yf-1uayyp1" style="--_depth: false;"><fin-streamer class="txt-positive" data-test="colorChange" data-symbol="ELPC" data-field="regularMarketChangePercent" data-trend="txt" data-pricehint="2" data-value="8.91648" data-tstyle="default" active="">+8.92%</fin-streamer> </td><td data-testid-cell="dayvolume" class=" yf-1uayyp1" style="--_depth: false;"><fin-streamer data-test="change" data-symbol="ELPC" data-field="regularMarketVolume" data-trend="none" data-value="30234" active="">30,234</fin-streamer> </td><td data-testid-cell="avgdailyvol3m" class=" yf-1uayyp1" style="--_depth: false;">7,850 </td><td data-testid-cell="intradaymarketcap" class=" yf-1uayyp1" style="--_depth: false;"><fin-streamer data-test="change" data-symbol="ELPC" data-field="marketCap" data-trend="none" data-value="7164238007.24378" active="">7.164B</fin-streamer> </td><td data-testid-cell="peratio.lasttwelvemonths" class=" yf-1uayyp1" style="--_depth: false;">13.90 </td><td data-testid-cell="fiftytwowkpercentchange" class=" yf-1uayyp1" style="--_depth: false;"><fin-streamer class="txt-positive" data-test="colorChange" data-symbol="ELPC" data-field="fiftyTwoWeekChangePercent" data-trend="txt" data-pricehint="2" data-value="66.260086" data-tstyle="default" active="">+66.26%</fin-streamer> </td><td data-testid-cell="fiftyTwoWeekRange" class=" yf-1uayyp1" style="--_depth: false;"><div class="container yf-wummfw" role="img" aria-label="Graph showing stock performance over fifty two week range"><div class="line yf-wummfw" style="top: 11px;height: 2px;"><div class="candle yf-wummfw" style="top: 0;height: 2px;left: 110.00px;width: 6px;"></div> <svg width="8" height="10" viewBox="0 0 80 110" xmlns="http://www.w3.org/2000/svg" style="top: -12px; left: 113px;" class="yf-wummfw"><path d="M 0 40 A 40 40 0 0 1 80 40 L 40 110 Z"></path></svg></div> <div class="labels yf-wummfw"><span>5.04</span> <span>10.51</span></div></div> </td></tr></tbody></table>"""
+
+
+_ROW_START = html_sample.index('<tr class="row')
+_ROW_END = html_sample.index('</tr>', _ROW_START) + len('</tr>')
+PAGE_HEAD = html_sample[:_ROW_START]
+PAGE_TAIL = html_sample[_ROW_END:]
+
+# html_sample의 값을 자리표시자로 바꾼 행 템플릿 (순서가 중요합니다: 긴 문자열부터 바꿉니다)
+_TEMPLATE_REPLACEMENTS = [
+    ('{', '{{'),
+    ('}', '}}'),
+    ('data-testid-row="0"', 'data-testid-row="{index}"'),
+    ('itc:0;', 'itc:{index};'),
+    ('Companhia Paranaense de Energia', '{name}'),
+    ('class="txt-positive" data-test="colorChange" data-symbol="ELPC" data-field="fiftyTwoWeekChangePercent"',
+     'class="{trend52}" data-test="colorChange" data-symbol="ELPC" data-field="fiftyTwoWeekChangePercent"'),
+    ('txt-positive', '{trend}'),
+    ('ELPC', '{symbol}'),
+    ('data-value="9.65" active="">9.65<', 'data-value="{price}" active="">{price_text}<'),
+    ('data-value="0.79"', 'data-value="{change}"'),
+    ('>+0.79<', '>{change_text}<'),
+    ('data-value="8.91648"', 'data-value="{change_percent}"'),
+    ('>(+8.92%)<', '>({change_percent_text})<'),
+    ('>+8.92%<', '>{change_percent_text}<'),
+    ('data-value="30234" active="">30,234<', 'data-value="{volume}" active="">{volume_text}<'),
+    ('>7,850 <', '>{avg_volume} <'),
+    ('data-value="7164238007.24378" active="">7.164B<', 'data-value="{market_cap}" active="">{market_cap_text}<'),
+    ('>13.90 <', '>{pe} <'),
+    ('data-value="66.260086"', 'data-value="{week52_change}"'),
+    ('>+66.26%<', '>{week52_change_text}<'),
+    ('<span>5.04</span> <span>10.51</span>', '<span>{low}</span> <span>{high}</span>'),
+]
+
+
+def _build_template() -> str:
+    template = html_sample[_ROW_START:_ROW_END]
+    for old, new in _TEMPLATE_REPLACEMENTS:
+        if old not in template:
+            raise ValueError(f"html_sample에서 템플릿 위치를 찾을 수 없습니다: {old}")
+        template = template.replace(old, new)
+    return template
+
+
+ROW_TEMPLATE = _build_template()
+
+_WORDS = ('Global', 'American', 'Pacific', 'Energy', 'Holdings', 'Capital', 'Systems', 'Bio', 'Pharma', 'Tech',
+          'Financial', 'Resources', 'Motors', 'Networks', 'Partners', 'Industries', 'Mining', 'Realty', '& Co.')
+
+
+def _signed(value: float, suffix: str = '') -> str:
+    return f"{'+' if value >= 0 else ''}{value:.2f}{suffix}"
+
+
+def synthetic_values(n_rows: int, seed: int = 0) -> Iterator[Dict]:
+    """행마다 템플릿에 채울 값을 만듭니다."""
+    rng = random.Random(seed)
+    for index in range(n_rows):
+        price = round(rng.lognormvariate(3, 1.2), 2) or 0.01
+        change = round(price * rng.gauss(0, 0.04), 2)
+        change_percent = round(change / price * 100, 5)
+        volume = int(rng.lognormvariate(12, 2))
+        avg_volume = int(volume * rng.uniform(0.3, 3))
+        market_cap = round(price * rng.lognormvariate(18, 2), 5)
+        pe = None if rng.random() < 0.2 else f"{rng.uniform(1, 120):.2f}"
+        week52_change = round(rng.uniform(-80, 300), 6)
+        low = round(price * rng.uniform(0.3, 1), 2)
+        high = round(price * rng.uniform(1, 2.5), 2)
+        name = ' '.join(rng.sample(_WORDS, rng.randint(1, 3)))
+        yield {
+            'index': index,
+            'symbol': f"{chr(65 + index % 26)}{index:06d}",
+            'name': name,
+            'price': repr(price),
+            'price_text': f"{price:,.2f}",
+            'change': repr(change),
+            'change_text': _signed(change),
+            'change_percent': repr(change_percent),
+            'change_percent_text': _signed(change_percent, '%'),
+            'trend': 'txt-positive' if change >= 0 else 'txt-negative',
+            'volume': str(volume),
+            'volume_text': f"{volume:,}",
+            'avg_volume': display_volume(avg_volume),
+            'market_cap': repr(market_cap),
+            'market_cap_text': display_volume(market_cap),
+            'pe': '--' if pe is None else pe,
+            'week52_change': repr(week52_change),
+            'week52_change_text': _signed(week52_change, '%'),
+            'trend52': 'txt-positive' if week52_change >= 0 else 'txt-negative',
+            'low': f"{low:.2f}",
+            'high': f"{high:.2f}",
+            # JSON 응답용 원래 값
+            'raw': {'price': price, 'change': change, 'change_percent': change_percent, 'volume': volume,
+                    'avg_volume': avg_volume, 'market_cap': market_cap, 'pe': pe,
+                    'week52_change': week52_change, 'low': low, 'high': high},
+        }
+
+
+def synthetic_rows(n_rows: int, seed: int = 0) -> Iterator[str]:
+    """데이터 행(<tr>...</tr>) HTML을 하나씩 만듭니다."""
+    for values in synthetic_values(n_rows, seed):
+        escaped = dict(values, name=html.escape(values['name']))
+        yield ROW_TEMPLATE.format(**escaped)
+
+
+def synthetic_page(n_rows: int, seed: int = 0) -> str:
+    """n_rows개 행을 가진 스크리너 페이지 HTML"""
+    return PAGE_HEAD + ''.join(synthetic_rows(n_rows, seed)) + PAGE_TAIL
+
+
+def expected_stocks(n_rows: int, seed: int = 0) -> List[Dict]:
+    """synthetic_page(n_rows, seed)를 parse_html_table로 파싱했을 때 나와야 하는 결과"""
+    return [{
+        'Symbol': values['symbol'],
+        'Name': values['name'],
+        'Price': values['price'],
+        'Change': values['change'],
+        'Change %': values['change_percent'],
+        'Volume': values['volume'],
+        'Avg Vol (3M)': values['avg_volume'],
+        'Market Cap': values['market_cap'],
+        'P/E Ratio (TTM)': None if values['pe'] == '--' else values['pe'],
+        '52 Wk Change %': values['week52_change'],
+        '52 Wk Range': f"{values['low']} - {values['high']}",
+    } for values in synthetic_values(n_rows, seed)]
+
+
+def synthetic_quotes(n_rows: int, seed: int = 0) -> List[Dict]:
+    """synthetic_page와 같은 값을 스크리너 API의 종목(quote) 형식으로 만듭니다."""
+    quotes = []
+    for values in synthetic_values(n_rows, seed):
+        raw = values['raw']
+        quote = {
+            'symbol': values['symbol'],
+            'shortName': values['name'],
+            'regularMarketPrice': raw['price'],
+            'regularMarketChange': raw['change'],
+            'regularMarketChangePercent': raw['change_percent'],
+            'regularMarketVolume': raw['volume'],
+            'averageDailyVolume3Month': raw['avg_volume'],
+            'marketCap': raw['market_cap'],
+            'fiftyTwoWeekChangePercent': raw['week52_change'],
+            'fiftyTwoWeekLow': raw['low'],
+            'fiftyTwoWeekHigh': raw['high'],
+        }
+        if raw['pe'] is not None:
+            quote['trailingPE'] = float(raw['pe'])
+        quotes.append(quote)
+    return quotes
+
+
+def synthetic_api_response(quotes: List[Dict], start: int = 0, count: int = 25) -> str:
+    """스크리너 API(screener/predefined/saved) 응답 JSON 문자열 (start부터 count개)"""
+    page = quotes[start:start + count]
+    return json.dumps({'finance': {'result': [{
+        'id': 'day_gainers', 'start': start, 'count': len(page), 'total': len(quotes), 'quotes': page,
+    }], 'error': None}})
+
+
+def synthetic_embedded_page(n_rows: int, seed: int = 0) -> str:
+    """
+    표 행 없이 스크리너 데이터를 SvelteKit <script> JSON으로만 담은 페이지
+    (requests로 받은 JavaScript 렌더링 페이지와 같은 모양)
+    """
+    body = synthetic_api_response(synthetic_quotes(n_rows, seed), 0, n_rows)
+    blob = json.dumps({'status': 200, 'statusText': 'OK', 'headers': {}, 'body': body})
+    return (PAGE_HEAD + PAGE_TAIL
+            + '<script type="application/json" data-sveltekit-fetched '
+              'data-url="https://query1.finance.yahoo.com/v1/finance/screener/predefined/saved?scrIds=day_gainers">'
+            + blob.replace('<', '\\u003c') + '</script>')
+
+
+def run_table_script(html_content: str, row_testid: str, spec: List[list], max_rows: int = 0) -> str:
+    """
+    browser_pool.TABLE_SCRIPT를 BeautifulSoup으로 흉내냅니다 (같은 인자, 같은 JSON 문자열).
+    선택자 단계마다 첫 번째 하위 요소를 찾고, 텍스트는 공백을 제거한 텍스트 조각을 잇습니다.
+    """
+    from bs4 import BeautifulSoup
+
+    def extract(cell, field):
+        _, steps, attribute, count, join = field
+        if not steps:
+            return cell.get_text(strip=True)
+        node = cell
+        for tag, attrs in steps[:-1]:
+            node = node.find(tag, attrs)
+            if node is None:
+                return None
+        tag, attrs = steps[-1]
+        nodes = node.find_all(tag, attrs, limit=count)
+        if len(nodes) < count:
+            return None
+        if count > 1:
+            return join.join(node.get_text(strip=True) for node in nodes)
+        if attribute is not None and nodes[0].get(attribute) is not None:
+            return nodes[0].get(attribute)
+        return nodes[0].get_text(strip=True)
+
+    cells = {field[0]: index for index, field in enumerate(spec)}
+    rows = []
+    for tr in BeautifulSoup(html_content, 'html.parser').find_all('tr', {'data-testid': row_testid}):
+        if max_rows and len(rows) >= max_rows:
+            break
+        row = [None] * len(spec)
+        for td in tr.find_all('td', recursive=False):
+            index = cells.get(td.get('data-testid-cell'))
+            if index is not None:
+                row[index] = extract(td, spec[index])
+        rows.append(row)
+    return json.dumps(rows)
+
+
+# TABLE_SCRIPT가 쓰는 DOM 기능(getElementsByTagName, getAttribute, childNodes, nodeType, nodeValue, nodeName)만
+# 흉내내는 node.js 실행기. 표준 입력으로 {doc: 문서 트리, script: 스크립트, args: 인자}를 받아 반환값을 출력합니다.
+NODE_DOM_SHIM = r"""
+const data = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+function build(d) {
+  if (d.t !== 1) {
+    return {nodeType: d.t, nodeValue: d.t === 3 ? d.v : null, nodeName: d.t === 3 ? '#text' : '#comment', childNodes: []};
+  }
+  const el = {
+    nodeType: 1, nodeName: d.n, childNodes: d.k.map(build),
+    getAttribute(name) { return Object.prototype.hasOwnProperty.call(d.a, name) ? d.a[name] : null; },
+    getElementsByTagName(tag) {
+      const out = [], wanted = tag.toUpperCase();
+      (function walk(node) {
+        for (const child of node.childNodes) {
+          if (child.nodeType !== 1) continue;
+          if (child.nodeName === wanted) out.push(child);
+          walk(child);
+        }
+      })(el);
+      return out;
+    },
+  };
+  return el;
+}
+global.document = build(data.doc);
+process.stdout.write(String(new Function(data.script).apply(null, data.args)));
+"""
+
+
+def node_available() -> bool:
+    """node.js 실행 파일이 있는지"""
+    return shutil.which('node') is not None
+
+
+def _dom_tree(node) -> Dict:
+    """BeautifulSoup 노드를 NODE_DOM_SHIM이 읽는 JSON 트리로 바꿉니다"""
+    from bs4 import Comment, NavigableString
+
+    if isinstance(node, Comment):
+        return {'t': 8}
+    if isinstance(node, NavigableString):
+        return {'t': 3, 'v': str(node)}
+    return {'t': 1, 'n': node.name.upper(), 'a': dict(node.attrs), 'k': [_dom_tree(child) for child in node.children]}
+
+
+def run_script_in_node(script: str, html_content: str, *args, timeout: float = 30) -> str:
+    """
+    페이지 HTML을 document로 두고 script를 node.js에서 실행해 반환값을 문자열로 돌려줍니다.
+    (arguments는 args, 브라우저의 execute_script와 같습니다)
+
+    Raises:
+        FileNotFoundError: node.js가 없는 경우
+        subprocess.CalledProcessError: 스크립트가 실패한 경우
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, 'html.parser', multi_valued_attributes=None)
+    doc = {'t': 1, 'n': '#DOCUMENT', 'a': {}, 'k': [_dom_tree(child) for child in soup.children]}
+    result = subprocess.run(['node', '-e', NODE_DOM_SHIM],
+                            input=json.dumps({'doc': doc, 'script': script, 'args': list(args)}),
+                            capture_output=True, text=True, encoding='utf-8', timeout=timeout, check=True)
+    return result.stdout
+
+
+class FakeDriver:
+    """
+    BrowserPool을 Chrome 없이 확인하기 위한 가짜 WebDriver
+
+    get(url)한 페이지의 HTML을 page_source로 돌려주고, 표 추출 스크립트(browser_pool.TABLE_SCRIPT)는
+    run_table_script(파이썬으로 흉내낸 것)로, node=True이면 node.js에서 스크립트 그대로 실행합니다.
+    실행한 스크립트, DevTools 명령, page_source를 읽은 횟수를 기록합니다.
+
+        pool = BrowserPool(size=1, driver_factory=lambda: FakeDriver({url: synthetic_page(50)}))
+    """
+
+    def __init__(self, pages: Union[Dict[str, str], Callable[[str], Optional[str]]], fail_script: bool = False,
+                 node: bool = False):
+        """
+        Args:
+            pages: URL -> HTML 딕셔너리 또는 URL을 받아 HTML을 돌려주는 함수
+            fail_script: True이면 표 추출 스크립트가 실패합니다 (page_source로 넘어가는지 확인용)
+            node: True이면 표 추출 스크립트를 node.js로 실행합니다 (run_script_in_node)
+        """
+        self.pages = pages
+        self.fail_script = fail_script
+        self.node = node
+        self.current_url: Optional[str] = None
+        self.scripts: List[str] = []
+        self.cdp_commands: List[tuple] = []
+        self.page_source_reads = 0
+        self.quit_called = False
+        self._html = ''
+
+    def get(self, url: str):
+        self.current_url = url
+        html_content = self.pages(url) if callable(self.pages) else self.pages.get(url)
+        self._html = html_content or '<html><body></body></html>'
+
+    @property
+    def page_source(self) -> str:
+        self.page_source_reads += 1
+        return self._html
+
+    def find_elements(self, by: str, selector: str) -> list:
+        from browser_pool import ROW_SELECTOR
+        if selector != ROW_SELECTOR:
+            return []
+        testid = re.escape(ROW_SELECTOR.split('"')[1])
+        return re.findall(r'<tr\b[^>]*\bdata-testid="' + testid + '"', self._html)
+
+    def execute_script(self, script: str, *args):
+        from browser_pool import TABLE_SCRIPT
+        self.scripts.append(script)
+        if script.strip() == 'return 1':
+            return 1
+        if script == TABLE_SCRIPT:
+            if self.fail_script:
+                raise RuntimeError("javascript error: 스크립트 실행 실패")
+            if self.node:
+                return run_script_in_node(script, self._html, *args)
+            return run_table_script(self._html, *args)
+        raise NotImplementedError(f"FakeDriver가 지원하지 않는 스크립트입니다: {script[:40]!r}")
+
+    def execute_cdp_cmd(self, cmd: str, params: Dict) -> Dict:
+        self.cdp_commands.append((cmd, params))
+        return {}
+
+    def quit(self):
+        self.quit_called = True
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    """max_rows로 응답을 끝까지 읽지 않고 끊는 연결은 정상 동작이므로 오류를 출력하지 않습니다."""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+class FixtureServer:
+    """
+    Yahoo Finance를 대신하는 로컬 HTTP 서버
+    pages는 경로 -> HTML 딕셔너리 또는 경로(쿼리 포함)를 받아 HTML을 돌려주는 함수이며,
+    함수가 (상태 코드, 헤더 딕셔너리)를 돌려주면 본문 없이 그 상태로 응답합니다 (429 등).
+    latency초(또는 경로를 받아 초를 돌려주는 함수)만큼 지연시켜 네트워크 왕복을 흉내냅니다.
+    """
+
+    def __init__(self, pages, latency: float = 0.0):
+        self.pages = pages
+        self.latency = latency
+        self.requests = 0
+        self.not_modified = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server.requests += 1
+                latency = server.latency(self.path) if callable(server.latency) else server.latency
+                if latency:
+                    time.sleep(latency)
+                pages = server.pages
+                body = pages(self.path) if callable(pages) else pages.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                if isinstance(body, tuple):
+                    status, headers = body
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                data = body.encode('utf-8')
+                etag = f'"{zlib.crc32(data):08x}"'
+                if self.headers.get('If-None-Match') == etag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = _QuietHTTPServer(('127.0.0.1', 0), Handler)
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}{path}"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def paged_screener(total_rows: int, default_count: int = 25):
+    """start/count 쿼리를 해석해 해당 구간의 행만 담은 페이지를 돌려주는 함수를 만듭니다."""
+    row = html_sample[_ROW_START:_ROW_END]
+
+    def page(path):
+        query = dict(parse_qsl(urlsplit(path).query))
+        start = int(query.get('start', 0))
+        count = int(query.get('count', default_count))
+        rows = [row.replace('ELPC', f"S{i:05d}") for i in range(start, min(start + count, total_rows))]
+        return PAGE_HEAD + ''.join(rows) + PAGE_TAIL
+
+    return page
+
+
+def screener_api(quotes, path: str = '/v1/finance/screener/predefined/saved'):
+    """스크리너 API를 흉내내는 함수를 만듭니다. start/count 쿼리에 맞는 구간의 JSON을 돌려줍니다."""
+    def api(request_path):
+        parts = urlsplit(request_path)
+        if parts.path != path:
+            return None
+        query = dict(parse_qsl(parts.query))
+        return synthetic_api_response(quotes, int(query.get('start', 0)), int(query.get('count', 25)))
+    return api
@@ -0,0 +1,272 @@
+"""
+조건부 GET 응답 캐시
+URL별로 응답 본문, 검증자(ETag / Last-Modified), 파싱된 행을 메모리와 디스크에 보관합니다.
+TTL 안의 요청은 네트워크 없이 캐시된 행을 돌려주고, TTL이 지나면
+If-None-Match / If-Modified-Since 로 재검증하여 304 응답이면 다시 파싱하지 않습니다.
+"""
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class CacheEntry:
+    """URL 하나에 대한 캐시 항목"""
+
+    __slots__ = ('url', 'etag', 'last_modified', 'body', 'rows', 'complete', 'stored_at', 'size', 'total')
+
+    def __init__(self, url: str, rows: List[Dict], complete: bool, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, body: Optional[bytes] = None,
+                 stored_at: float = 0.0, size: int = 0, total: Optional[int] = None):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.rows = rows
+        self.complete = complete      # 응답을 끝까지 읽어 모든 행을 파싱했는지 여부
+        self.stored_at = stored_at
+        self.size = size              # 원본 응답 본문 크기 (바이트)
+        self.total = total            # API 응답이 알려 준 전체 행 수 (HTML 항목은 None)
+
+    def covers(self, max_rows: Optional[int]) -> bool:
+        """요청한 행 수를 이 항목만으로 돌려줄 수 있는지 확인합니다."""
+        return self.complete or (max_rows is not None and len(self.rows) >= max_rows)
+
+    def validators(self) -> Dict[str, str]:
+        """재검증 요청에 넣을 조건부 헤더"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def memory_size(self) -> int:
+        """캐시 용량 계산에 쓰는 대략적인 크기"""
+        return len(self.body) if self.body is not None else self.size
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name in self.__slots__:
+            setattr(self, name, state.get(name))
+
+
+class ResponseCache:
+    """
+    메모리(LRU) + 디스크 2단계 응답 캐시
+
+    사용 예:
+        crawler = YahooFinanceCrawler(cache=ResponseCache('.http_cache', ttl=30))
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: float = 60, max_entries: int = 256,
+                 max_bytes: int = 64 * 1024 * 1024, max_disk_bytes: int = 256 * 1024 * 1024,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            directory: 디스크 캐시 폴더 (None이면 메모리에만 보관)
+            ttl: 재검증 없이 캐시를 그대로 쓰는 시간 (초)
+            max_entries: 메모리에 보관할 최대 항목 수
+            max_bytes: 메모리에 보관할 응답 본문의 최대 총 크기
+            max_disk_bytes: 디스크 캐시의 최대 총 크기
+            clock: 현재 시각을 돌려주는 함수
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.clock = clock
+
+        self.hits = 0            # TTL 안이라 요청 없이 응답
+        self.revalidated = 0     # 304 Not Modified 로 응답
+        self.misses = 0          # 전체 응답을 새로 받음
+        self.bytes_saved = 0     # 내려받지 않은 응답 본문 크기
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # 디스크 캐시의 파일별 크기와 합계 (처음 저장할 때 폴더를 한 번 읽고, 그 뒤로는 저장할 때마다 갱신합니다)
+        self._disk_sizes: Optional[Dict[str, int]] = None
+        self._disk_bytes = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    # --- 조회 / 저장 --------------------------------------------------
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """URL의 캐시 항목을 찾습니다. 메모리에 없으면 디스크에서 읽습니다."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+                return entry
+
+        entry = self._load(url)
+        if entry is not None:
+            with self._lock:
+                self._remember(entry)
+        return entry
+
+    def put(self, entry: CacheEntry):
+        """캐시 항목을 저장합니다."""
+        entry.stored_at = self.clock()
+        with self._lock:
+            self._remember(entry)
+        self._store(entry)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """TTL 안의 항목인지 확인합니다."""
+        return self.clock() - entry.stored_at < self.ttl
+
+    def touch(self, entry: CacheEntry):
+        """304 응답을 받은 항목의 TTL을 다시 시작합니다."""
+        self.put(entry)
+
+    def clear(self):
+        """메모리와 디스크의 모든 항목을 지웁니다."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._disk_sizes = None
+            self._disk_bytes = 0
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith('.cache'):
+                    os.remove(os.path.join(self.directory, name))
+
+    def record(self, kind: str, entry: Optional[CacheEntry] = None):
+        """hit / revalidated / miss 카운터를 올립니다."""
+        with self._lock:
+            if kind == 'hit':
+                self.hits += 1
+            elif kind == 'revalidated':
+                self.revalidated += 1
+            else:
+                self.misses += 1
+            if entry is not None and kind != 'miss':
+                self.bytes_saved += entry.size
+
+    def stats(self) -> Dict[str, int]:
+        """캐시 카운터를 딕셔너리로 반환합니다."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+                'bytes_saved': self.bytes_saved,
+                'entries': len(self._entries),
+                'memory_bytes': self._bytes,
+            }
+
+    # --- 메모리 LRU ---------------------------------------------------
+
+    def _remember(self, entry: CacheEntry):
+        old = self._entries.pop(entry.url, None)
+        if old is not None:
+            self._bytes -= old.memory_size()
+        self._entries[entry.url] = entry
+        self._bytes += entry.memory_size()
+
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.memory_size()
+
+    # --- 디스크 -------------------------------------------------------
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{key}.cache")
+
+    def _load(self, url: str) -> Optional[CacheEntry]:
+        if not self.directory:
+            return None
+        path = self._path(url)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # 쓰다 만 파일, 다른 버전의 CacheEntry 등 읽을 수 없는 항목은 지웁니다
+            self._drop(path)
+            return None
+        if not isinstance(entry, CacheEntry) or entry.url != url:
+            return None
+        try:
+            os.utime(path)  # 최근 사용 시각 갱신 (디스크 LRU)
+        except OSError:
+            pass
+        return entry
+
+    def _store(self, entry: CacheEntry):
+        if not self.directory:
+            return
+        path = self._path(entry.url)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = f.tell()
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._disk_sizes is None:
+                self._scan_disk()
+            else:
+                self._disk_bytes += size - self._disk_sizes.get(path, 0)
+                self._disk_sizes[path] = size
+            over = self._disk_bytes > self.max_disk_bytes
+        if over:
+            self._evict_disk()
+
+    def _drop(self, path: str):
+        """디스크 항목 하나를 지웁니다."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        with self._lock:
+            if self._disk_sizes is not None:
+                self._disk_bytes -= self._disk_sizes.pop(path, 0)
+
+    def _scan_disk(self) -> List[Tuple[float, int, str]]:
+        """
+        폴더를 읽어 파일별 크기와 합계를 다시 셉니다 (잠금을 잡은 채로 호출).
+        다른 프로세스가 같은 폴더에 쓴 항목도 여기서 반영됩니다.
+
+        Returns:
+            (최근 사용 시각, 크기, 경로) 리스트
+        """
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.cache'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        self._disk_sizes = {path: size for _, size, path in files}
+        self._disk_bytes = sum(self._disk_sizes.values())
+        return files
+
+    def _evict_disk(self):
+        """디스크 캐시가 max_disk_bytes를 넘으면 오래 쓰지 않은 항목부터 지웁니다."""
+        with self._lock:
+            files = self._scan_disk()
+            for _, size, path in sorted(files):
+                if self._disk_bytes <= self.max_disk_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                self._disk_bytes -= size
+                del self._disk_sizes[path]
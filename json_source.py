@@ -0,0 +1,200 @@
+"""
+JSON 데이터 경로
+스크리너 표의 fin-streamer 값은 페이지가 받아 오는 스크리너 JSON에서 나옵니다.
+HTML을 렌더링하거나 파싱하지 않고 그 JSON에서 바로 같은 형식의 행을 만듭니다.
+
+- 스크리너 API 응답 (query1.finance.yahoo.com/v1/finance/screener/predefined/saved)
+- 페이지에 포함된 <script> JSON (SvelteKit data-sveltekit-fetched 블록, root.App.main 상태)
+
+행 딕셔너리의 키와 값 형식은 parse_html_table과 같습니다.
+(예: Price '9.65', Change % '8.91648', Avg Vol (3M) '7,850', P/E None, 52 Wk Range '5.04 - 10.51')
+"""
+import json
+import re
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# 사전 정의 스크리너 API
+API_URL = 'https://query1.finance.yahoo.com/v1/finance/screener/predefined/saved'
+
+# API가 한 번에 돌려주는 최대 행 수
+API_MAX_COUNT = 250
+
+# finance.yahoo.com/markets/stocks/<이름>/ 형식 URL -> 스크리너 ID
+SCREENER_ALIASES = {
+    'gainers': 'day_gainers',
+    'losers': 'day_losers',
+    'most-active': 'most_actives',
+    '52-week-gainers': 'fifty_two_wk_gainers',
+    '52-week-losers': 'fifty_two_wk_losers',
+}
+
+_SCRIPT_PATTERN = re.compile(r'<script\b([^>]*)>(.*?)</script\s*>', re.DOTALL | re.IGNORECASE)
+_APP_STATE_PATTERN = re.compile(r'root\.App\.main\s*=\s*(\{.*?\});\s*(?:\n|\(function|$)', re.DOTALL)
+
+
+def screener_id(url: str) -> Optional[str]:
+    """
+    스크리너 페이지 URL에서 스크리너 ID를 찾습니다. 스크리너 페이지가 아니면 None을 반환합니다.
+
+    예: .../screener/predefined/day_gainers -> 'day_gainers', .../markets/stocks/losers/ -> 'day_losers'
+    """
+    parts = [part for part in urlsplit(url).path.split('/') if part]
+    if len(parts) >= 3 and parts[-3:-1] == ['screener', 'predefined']:
+        return parts[-1]
+    if len(parts) >= 3 and parts[-3:-1] == ['markets', 'stocks']:
+        return SCREENER_ALIASES.get(parts[-1])
+    return None
+
+
+def api_url(scr_id: str, start: int = 0, count: int = 25, base: str = API_URL) -> str:
+    """스크리너 API 요청 URL (값은 서식 없는 숫자로 받습니다)"""
+    query = {'scrIds': scr_id, 'start': start, 'count': count, 'formatted': 'false',
+             'lang': 'en-US', 'region': 'US'}
+    return f"{base}?{urlencode(query)}"
+
+
+def page_range(url: str):
+    """스크리너 URL의 start / count 쿼리 값 (없으면 0, None)"""
+    query = dict(parse_qsl(urlsplit(url).query))
+    count = int(query.get('count', 0) or 0) or None
+    return int(query.get('start', 0) or 0), count
+
+
+# --- 값 변환 ----------------------------------------------------------
+
+def _raw(value):
+    """서식 있는 응답({'raw': 9.65, 'fmt': '9.65'})과 없는 응답 모두에서 원래 값을 꺼냅니다."""
+    if isinstance(value, dict):
+        return value.get('raw')
+    return value
+
+
+def display_volume(value: float) -> str:
+    """화면의 평균 거래량 표시 형식 ('7,850', '1.234M', '2.100B')"""
+    for limit, suffix in ((1e12, 'T'), (1e9, 'B'), (1e6, 'M')):
+        if value >= limit:
+            return f"{value / limit:.3f}{suffix}"
+    return f"{value:,.0f}"
+
+
+def quote_to_row(quote: Dict) -> Dict:
+    """
+    API의 종목 하나(quote)를 parse_html_table과 같은 형식의 딕셔너리로 바꿉니다.
+    응답에 없는 값은 HTML에서 셀이 없을 때처럼 키를 넣지 않습니다.
+    """
+    stock = {}
+    symbol = quote.get('symbol')
+    if symbol:
+        stock['Symbol'] = symbol
+    name = quote.get('shortName') or quote.get('longName') or quote.get('displayName')
+    if name:
+        stock['Name'] = name
+
+    for column, key in (('Price', 'regularMarketPrice'), ('Change', 'regularMarketChange'),
+                        ('Change %', 'regularMarketChangePercent'), ('Volume', 'regularMarketVolume'),
+                        ('Market Cap', 'marketCap'), ('52 Wk Change %', 'fiftyTwoWeekChangePercent')):
+        value = _raw(quote.get(key))
+        if value is not None:
+            stock[column] = str(value)
+
+    avg_volume = quote.get('averageDailyVolume3Month')
+    if isinstance(avg_volume, dict) and avg_volume.get('fmt'):
+        stock['Avg Vol (3M)'] = avg_volume['fmt']
+    elif avg_volume is not None:
+        stock['Avg Vol (3M)'] = display_volume(avg_volume)
+
+    # P/E가 없으면 화면에는 '--'가 표시되고 HTML 경로는 None을 돌려줍니다
+    pe = _raw(quote.get('trailingPE'))
+    stock['P/E Ratio (TTM)'] = None if pe is None else f"{pe:.2f}"
+
+    low, high = _raw(quote.get('fiftyTwoWeekLow')), _raw(quote.get('fiftyTwoWeekHigh'))
+    if low is not None and high is not None:
+        stock['52 Wk Range'] = f"{low:.2f} - {high:.2f}"
+    return stock
+
+
+# --- JSON에서 종목 목록 찾기 ------------------------------------------
+
+def _is_quote_list(value) -> bool:
+    return (isinstance(value, list) and bool(value) and isinstance(value[0], dict)
+            and 'symbol' in value[0] and 'regularMarketPrice' in value[0])
+
+
+def find_quotes(data, max_depth: int = 12) -> Optional[List[Dict]]:
+    """
+    JSON 데이터에서 종목(quote) 목록을 찾습니다.
+    API 응답(finance.result[0].quotes), SvelteKit 블록({'body': 'JSON 문자열'}),
+    페이지 상태(root.App.main의 ScreenerResultsStore.results.rows) 등 어떤 구조든 찾아 들어갑니다.
+    """
+    if max_depth < 0:
+        return None
+    if _is_quote_list(data):
+        return data
+    if isinstance(data, dict):
+        body = data.get('body')
+        if isinstance(body, str) and 'symbol' in body:
+            try:
+                return find_quotes(json.loads(body), max_depth - 1)
+            except ValueError:
+                return None
+        children: Iterable = data.values()
+    elif isinstance(data, list):
+        children = data
+    else:
+        return None
+    for child in children:
+        if isinstance(child, (dict, list)):
+            quotes = find_quotes(child, max_depth - 1)
+            if quotes:
+                return quotes
+    return None
+
+
+def rows_from_payload(data) -> List[Dict]:
+    """JSON 데이터(파싱한 객체 또는 문자열 / 바이트)에서 주식 데이터 딕셔너리 리스트를 만듭니다."""
+    if isinstance(data, (str, bytes)):
+        data = json.loads(data)
+    quotes = find_quotes(data) or []
+    return [quote_to_row(quote) for quote in quotes]
+
+
+def payload_total(data) -> Optional[int]:
+    """API 응답에 있는 전체 종목 수 (finance.result[0].total)"""
+    try:
+        return int(data['finance']['result'][0]['total'])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+def extract_embedded_rows(html_content) -> List[Dict]:
+    """
+    HTML에 포함된 <script> JSON에서 주식 데이터를 찾습니다.
+    표가 JavaScript로 그려져 HTML에 행이 없는 페이지에서도 데이터를 얻을 수 있습니다.
+
+    Args:
+        html_content: HTML 문자열 또는 바이트
+
+    Returns:
+        주식 데이터 딕셔너리 리스트 (찾지 못하면 빈 리스트)
+    """
+    if isinstance(html_content, bytes):
+        html_content = html_content.decode('utf-8', errors='replace')
+    if 'symbol' not in html_content:
+        return []
+
+    for attributes, content in _SCRIPT_PATTERN.findall(html_content):
+        if 'symbol' not in content:
+            continue
+        if 'json' in attributes.lower():
+            candidates = [content]
+        else:
+            candidates = [match.group(1) for match in _APP_STATE_PATTERN.finditer(content)]
+        for candidate in candidates:
+            try:
+                rows = rows_from_payload(candidate.strip())
+            except ValueError:
+                continue
+            if rows:
+                return rows
+    return []
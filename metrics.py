@@ -0,0 +1,232 @@
+"""
+실행 계측(instrumentation)
+크롤링의 각 단계(HTTP 요청, 파싱, 행 추출, 브라우저 대기, 저장)에 걸린 시간과
+카운터(내려받은 바이트, 파싱한 행, 실패한 행, 캐시 적중 등)를 모읍니다.
+
+    from metrics import METRICS
+    with METRICS.span('fetch'):
+        ...
+    METRICS.incr('rows_parsed', len(stocks))
+
+결과는 JSON 또는 Prometheus 텍스트 형식(node_exporter textfile collector용)으로 저장할 수 있습니다.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional
+
+
+# Prometheus 지표 이름 앞에 붙일 접두사
+PREFIX = 'yfcrawler'
+
+
+class _SpanStats:
+    """단계 하나의 호출 횟수와 시간 합계 / 최대값"""
+
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class Metrics:
+    """
+    단계별 시간과 카운터를 모으는 레지스트리 (스레드 안전)
+
+    보통은 모듈 전역의 METRICS를 쓰고, 테스트나 벤치마크에서는 reset()으로 비웁니다.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started_at = time.time()
+        self._spans: Dict[str, _SpanStats] = {}
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str):
+        """with 블록의 실행 시간을 name 단계에 더합니다. (예외가 나도 기록합니다)"""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.observe(name, self.clock() - start)
+
+    def observe(self, name: str, seconds: float):
+        """이미 잰 시간을 name 단계에 더합니다."""
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                stats = self._spans[name] = _SpanStats()
+            stats.count += 1
+            stats.total += seconds
+            if seconds > stats.max:
+                stats.max = seconds
+
+    def timed(self, iterable: Iterable, name: str) -> Iterator:
+        """
+        iterable의 값을 그대로 내보내며, 다음 값을 기다린 시간만 합쳐 name 단계에 한 번 기록합니다.
+        (예: 스트리밍 응답에서 소켓을 기다린 시간만 재고, 조각을 처리하는 시간은 빼고 잽니다)
+        """
+        waited = 0.0
+        iterator = iter(iterable)
+        try:
+            while True:
+                start = self.clock()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    waited += self.clock() - start
+                yield item
+        finally:
+            self.observe(name, waited)
+
+    def incr(self, name: str, value: float = 1):
+        """카운터를 value만큼 올립니다."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set(self, name: str, value: float):
+        """게이지(마지막 값만 의미 있는 값, 예: 최대 메모리)를 설정합니다."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def counter(self, name: str) -> float:
+        """카운터의 현재 값"""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def reset(self):
+        """모든 기록을 지웁니다."""
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+            self._gauges.clear()
+            self.started_at = time.time()
+
+    # --- 출력 ---------------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        """기록을 딕셔너리로 반환합니다. (시간은 초)"""
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'elapsed': time.time() - self.started_at,
+                'spans': {name: {'count': stats.count, 'total': stats.total, 'max': stats.max}
+                          for name, stats in sorted(self._spans.items())},
+                'counters': dict(sorted(self._counters.items())),
+                'gauges': dict(sorted(self._gauges.items())),
+            }
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식으로 반환합니다."""
+        data = self.to_dict()
+        lines = [
+            f"# HELP {PREFIX}_stage_seconds_total 단계별 누적 실행 시간",
+            f"# TYPE {PREFIX}_stage_seconds_total counter",
+        ]
+        lines += [f'{PREFIX}_stage_seconds_total{{stage="{name}"}} {stats["total"]:.6f}'
+                  for name, stats in data['spans'].items()]
+        lines += [f"# HELP {PREFIX}_stage_calls_total 단계별 실행 횟수",
+                  f"# TYPE {PREFIX}_stage_calls_total counter"]
+        lines += [f'{PREFIX}_stage_calls_total{{stage="{name}"}} {stats["count"]}'
+                  for name, stats in data['spans'].items()]
+        lines += [f"# HELP {PREFIX}_stage_max_seconds 단계별 가장 오래 걸린 한 번의 시간",
+                  f"# TYPE {PREFIX}_stage_max_seconds gauge"]
+        lines += [f'{PREFIX}_stage_max_seconds{{stage="{name}"}} {stats["max"]:.6f}'
+                  for name, stats in data['spans'].items()]
+        for name, value in data['counters'].items():
+            lines.append(f"# TYPE {PREFIX}_{name}_total counter")
+            lines.append(f"{PREFIX}_{name}_total {_number(value)}")
+        for name, value in data['gauges'].items():
+            lines.append(f"# TYPE {PREFIX}_{name} gauge")
+            lines.append(f"{PREFIX}_{name} {_number(value)}")
+        lines.append(f"# TYPE {PREFIX}_run_seconds gauge")
+        lines.append(f"{PREFIX}_run_seconds {data['elapsed']:.6f}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """
+        기록을 파일로 저장합니다. 확장자가 .prom이면 Prometheus 형식, 그 밖에는 JSON입니다.
+        수집기가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 바꿔치기합니다.
+        """
+        if path.endswith('.prom'):
+            content = self.to_prometheus()
+        else:
+            import json
+            content = json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def summary(self) -> str:
+        """사람이 읽기 위한 단계별 시간 요약"""
+        data = self.to_dict()
+        lines = [f"{'단계':<24} {'횟수':>6} {'합계(s)':>10} {'최대(s)':>10}"]
+        for name, stats in sorted(data['spans'].items(), key=lambda item: -item[1]['total']):
+            lines.append(f"{name:<24} {stats['count']:>6} {stats['total']:>10.3f} {stats['max']:>10.3f}")
+        for name, value in {**data['counters'], **data['gauges']}.items():
+            lines.append(f"{name:<24} {_number(value):>6}")
+        return '\n'.join(lines)
+
+
+def _number(value: float) -> str:
+    """정수 값은 지수 표기 없이 씁니다. (바이트 수 등)"""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+# 프로세스 전역 레지스트리
+METRICS = Metrics()
+
+
+class Profiler:
+    """
+    --profile / --tracemalloc 명령줄 옵션용 도우미
+    cProfile 결과는 .prof 파일(snakeviz 등으로 열 수 있음)로 저장하고 상위 함수를 출력합니다.
+    """
+
+    def __init__(self, profile_path: Optional[str] = None, trace_memory: bool = False, top: int = 15):
+        """
+        Args:
+            profile_path: cProfile 결과를 저장할 경로 (None이면 cProfile을 쓰지 않음)
+            trace_memory: True이면 tracemalloc으로 메모리 사용량 상위 위치를 출력합니다
+            top: 출력할 항목 수
+        """
+        self.profile_path = profile_path
+        self.trace_memory = trace_memory
+        self.top = top
+        self._profile = None
+
+    def __enter__(self):
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.profile_path:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self._profile is not None:
+            import pstats
+            self._profile.disable()
+            self._profile.dump_stats(self.profile_path)
+            print(f"\n📈 cProfile 결과를 {self.profile_path}에 저장했습니다. (누적 시간 상위 {self.top}개)")
+            pstats.Stats(self._profile).sort_stats('cumulative').print_stats(self.top)
+        if self.trace_memory:
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            METRICS.set('peak_memory_bytes', peak)
+            print(f"\n🧠 최대 메모리 사용량: {peak / 1e6:.1f}MB (할당 위치 상위 {self.top}개)")
+            for stat in snapshot.statistics('lineno')[:self.top]:
+                print(f"   {stat}")
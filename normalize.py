@@ -0,0 +1,191 @@
+"""
+숫자 값 정규화
+화면 / data-value / 저장 파일에 섞여 있는 숫자 표기를 한 규칙표로 float으로 바꿉니다.
+
+    '9.65' -> 9.65        '7,850' -> 7850.0      '1.2M' -> 1200000.0     '$7.164B' -> 7164000000.0
+    '+8.92%' -> 8.92      '−0.45' -> -0.45       '--', 'N/A', '' -> None (열 변환에서는 NaN)
+
+퍼센트 값은 화면 표기 그대로(8.92) 둡니다. 값 하나는 to_number, 열 전체는 normalize_column으로 변환합니다.
+"""
+import re
+from typing import Dict, Iterable, Optional
+
+
+# 끝 글자 -> 배수 (퍼센트는 화면 표기 그대로 두므로 1)
+SUFFIX_SCALES = {'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12, '%': 1.0}
+_SCALES = {**SUFFIX_SCALES, **{suffix.lower(): scale for suffix, scale in SUFFIX_SCALES.items()}}
+
+# 값이 없다는 뜻의 표기 (대소문자 구분 없음, 앞뒤 공백 무시)
+MISSING_TOKENS = frozenset(('', '-', '--', '---', 'n/a', 'na', 'nan', 'none', 'null', '∞', '-∞'))
+_MISSING = MISSING_TOKENS | {token.upper() for token in MISSING_TOKENS} | {'None', 'Null', 'NaN'}
+
+# 드문 표기를 정리할 때 지우는 문자: 천 단위 구분 기호, 통화 기호, 공백
+_STRIP = str.maketrans('', '', ',$ \u00a0')
+
+# 유니코드 마이너스 / 대시 -> '-'
+_SIGNS = str.maketrans({'\u2212': '-', '\u2013': '-', '\u2014': '-'})
+
+# 정리한 뒤의 숫자 형식: 부호, 숫자, 지수, 접미사, 퍼센트
+_NUMBER = re.compile(r'^([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)([KMBTkmbt]?)(%?)$')
+
+# 필드별 변환 규칙 (parse_html_table의 컬럼명 -> 'float' | 'int')
+FIELD_KINDS = {
+    'Price': 'float',
+    'Change': 'float',
+    'Change %': 'float',
+    'Volume': 'int',
+    'Avg Vol (3M)': 'int',
+    'Market Cap': 'float',
+    'P/E Ratio (TTM)': 'float',
+    '52 Wk Change %': 'float',
+}
+
+
+def to_number(value) -> Optional[float]:
+    """
+    숫자 표기 하나를 float으로 변환합니다. 변환할 수 없거나 값이 없으면 None을 반환합니다.
+
+    Args:
+        value: 문자열, 숫자 또는 None
+    """
+    if value is None:
+        return None
+    if type(value) is not str:
+        if isinstance(value, (int, float)):
+            return None if value != value else float(value)
+        value = str(value)
+    # 흔한 표기('9.65', '7,850', '1.2M', '+8.92%')는 끝 글자 표 조회와 float() 한 번으로 끝냅니다
+    text = value.strip()
+    if text in _MISSING:
+        return None
+    scale = _SCALES.get(text[-1])
+    if scale is not None:
+        text = text[:-1]
+    if ',' in text:
+        text = text.replace(',', '')
+    try:
+        number = float(text)
+    except ValueError:
+        return _parse_text(value)
+    if number != number:
+        return None
+    return number * scale if scale is not None else number
+
+
+def _parse_text(text: str) -> Optional[float]:
+    """통화 기호, 유니코드 마이너스, 괄호 음수 같은 드문 표기를 규칙표로 해석합니다."""
+    text = text.strip()
+    if text.lower() in MISSING_TOKENS:
+        return None
+    text = text.translate(_SIGNS).translate(_STRIP)
+    negative = text.startswith('(') and text.endswith(')')
+    if negative:
+        text = text[1:-1]
+    match = _NUMBER.match(text)
+    if match is None:
+        return None
+    digits, suffix, _ = match.groups()
+    number = float(digits)
+    if suffix:
+        number *= SUFFIX_SCALES[suffix.upper()]
+    return -number if negative else number
+
+
+def to_int(value) -> Optional[int]:
+    """to_number와 같지만 정수로 반환합니다."""
+    number = to_number(value)
+    return int(round(number)) if number is not None else None
+
+
+def normalize_column(values: Iterable, chunk_size: int = 8192) -> 'np.ndarray':
+    """
+    값 열 전체를 float64 배열로 변환합니다. 변환할 수 없거나 값이 없으면 NaN입니다.
+    결과는 값마다 to_number를 부른 것과 같습니다.
+
+    문자열을 고정 길이 유니코드 배열로 바꾼 뒤 글자 코드 행렬에서 바로 숫자를 계산합니다.
+    (숫자 자리 -> 정수 가수, 소수점 뒤 자릿수 k -> 가수 / 10**k, 끝 글자 -> 배수)
+    가수가 2**53보다 작고 k <= 22이면 두 값 모두 float으로 정확하므로 나눗셈 결과가 float(text)와 같습니다.
+    이 형식에 맞지 않는 값('--', '$7.164B', 15자리가 넘는 숫자 등)만 to_number로 하나씩 변환합니다.
+
+    Args:
+        values: 문자열 / 숫자 / None 이터러블
+        chunk_size: 한 번에 글자 코드 행렬로 만들 값 수 (메모리 사용량 제한)
+    """
+    import numpy as np
+
+    values = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=object)
+    try:
+        return values.astype(np.float64)
+    except (TypeError, ValueError):
+        pass
+    result = np.empty(len(values))
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        result[start:start + len(chunk)] = _normalize_chunk(chunk, np)
+    return result
+
+
+# 글자 코드 -> 끝 글자 배수 (배수가 아닌 글자는 0)
+_SCALE_CODES = [0.0] * 128
+for _suffix, _scale in _SCALES.items():
+    _SCALE_CODES[ord(_suffix)] = _scale
+del _suffix, _scale
+
+_MISSING_LIST = sorted(_MISSING)
+
+_MAX_DIGITS = 15
+
+
+def _normalize_chunk(values, np) -> 'np.ndarray':
+    texts = values.astype(str)
+    count = len(texts)
+    width = max(texts.dtype.itemsize // 4, 1)
+    codes = texts.view(np.uint32).reshape(count, width)
+    rows = np.arange(count)
+
+    lengths = (codes != 0).sum(axis=1)
+    last = codes[rows, np.maximum(lengths - 1, 0)]
+    scale = np.asarray(_SCALE_CODES)[np.where(last < 128, last, 0)]
+    has_suffix = scale != 0
+    scale[~has_suffix] = 1.0
+
+    # 숫자로 쓰지 않는 글자: 끝의 배수 글자, 맨 앞의 부호, 천 단위 구분 기호, 통화 기호, 빈 자리
+    ignored = (codes == 0) | (codes == ord(',')) | (codes == ord('$'))
+    ignored[rows[has_suffix], lengths[has_suffix] - 1] = True
+    first = codes[:, 0]
+    ignored[:, 0] |= (first == ord('+')) | (first == ord('-'))
+    is_digit = (codes >= ord('0')) & (codes <= ord('9'))
+    is_dot = codes == ord('.')
+    n_digits = is_digit.sum(axis=1)
+    simple = ((is_digit | is_dot | ignored).all(axis=1) & (is_dot.sum(axis=1) <= 1)
+              & (n_digits > 0) & (n_digits <= _MAX_DIGITS))
+
+    # 자리마다 뒤에 오는 숫자 수 -> 10의 거듭제곱
+    digits_after = is_digit[:, ::-1].cumsum(axis=1, dtype=np.int8)[:, ::-1] - is_digit
+    powers = (10 ** np.arange(_MAX_DIGITS + 1, dtype=np.int64))[np.clip(digits_after, 0, _MAX_DIGITS)]
+    mantissa = (np.where(is_digit, codes - ord('0'), 0) * powers).sum(axis=1)
+    after_dot = is_dot.cumsum(axis=1, dtype=np.int8) > 0
+    decimals = (is_digit & after_dot).sum(axis=1)
+
+    numbers = mantissa / 10.0 ** decimals
+    numbers[first == ord('-')] *= -1
+    numbers *= scale
+
+    missing = np.isin(texts, _MISSING_LIST)
+    numbers[missing] = np.nan
+    rest = np.flatnonzero(~simple & ~missing)
+    if len(rest):
+        numbers[rest] = [np.nan if number is None else number for number in map(to_number, values[rest])]
+    return numbers
+
+
+def normalize_row(stock: Dict) -> Dict:
+    """
+    parse_html_table 형식의 행에서 숫자 필드를 숫자로 바꾼 새 딕셔너리를 반환합니다.
+    (Volume, Avg Vol (3M)은 int, 나머지는 float, 값이 없으면 None, 숫자가 아닌 필드는 그대로)
+    """
+    row = dict(stock)
+    for column, kind in FIELD_KINDS.items():
+        if column in row:
+            row[column] = to_int(row[column]) if kind == 'int' else to_number(row[column])
+    return row
@@ -0,0 +1,216 @@
+"""
+내용 주소 기반(content-addressed) 파싱 결과 캐시
+같은 HTML 스냅샷을 다시 처리할 때 BeautifulSoup을 거치지 않고 저장된 행을 돌려줍니다.
+
+- 문서 단위: 파일 전체를 mmap으로 읽어 빠른 비암호 해시를 구하고,
+  해시가 같으면 저장된 결과 파일(바이너리)을 그대로 읽습니다.
+- 행 단위: 문서가 달라졌으면 각 데이터 행(<tr>...</tr>)의 해시를 구해
+  처음 보는 행만 다시 파싱합니다. 몇 행만 바뀐 스냅샷은 그 행들만 파싱됩니다.
+"""
+import marshal
+import mmap
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from crawler import ROW_TESTID
+from metrics import METRICS
+
+try:
+    import xxhash
+except ImportError:  # 선택 의존성: 없으면 zlib 체크섬 조합을 씁니다
+    xxhash = None
+
+
+# 결과 파일 형식 버전. 결과 파일 이름에는 크롤러 스키마의 키(CompiledSchema.key)가 붙으므로
+# 추출 규칙이나 추출하는 컬럼이 바뀌면 예전 결과를 쓰지 않습니다.
+_FORMAT = b'YFPC1'
+
+_ROW_PATTERN = re.compile(
+    rb'<tr\b[^>]*\bdata-testid=["\']' + ROW_TESTID.encode('ascii') + rb'["\'][^>]*>.*?</tr\s*>',
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def content_hash(data) -> str:
+    """
+    bytes / mmap 등 버퍼의 빠른 비암호 해시를 16진 문자열로 반환합니다.
+    xxhash가 설치되어 있으면 xxh3_64를, 없으면 crc32 + adler32 + 길이를 씁니다.
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return f"{zlib.crc32(data):08x}{zlib.adler32(data):08x}{len(data):x}"
+
+
+def split_rows(data) -> List[Tuple[int, int]]:
+    """HTML 버퍼에서 데이터 행 <tr>...</tr> 구간의 (시작, 끝) 위치 리스트를 반환합니다."""
+    return [match.span() for match in _ROW_PATTERN.finditer(data)]
+
+
+class ParseCache:
+    """
+    파싱 결과 캐시
+
+    사용 예:
+        cache = ParseCache()
+        stocks = cache.parse_file('input.html', crawler)
+    """
+
+    def __init__(self, directory: str = '.parse_cache', max_rows_kept: int = 200000):
+        """
+        Args:
+            directory: 결과 파일을 저장할 폴더
+            max_rows_kept: 행 단위 캐시에 보관할 최대 행 수 (오래된 행부터 버립니다)
+        """
+        self.directory = directory
+        self.max_rows_kept = max_rows_kept
+        self.document_hits = 0
+        self.rows_reused = 0
+        self.rows_parsed = 0
+
+        # 스키마 키 -> 행 해시 -> 행 (추출하는 컬럼이 다른 크롤러의 행과 섞이지 않도록 나눕니다)
+        self._rows: Dict[str, "OrderedDict[str, Dict]"] = {}
+        self._rows_dirty = set()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    # --- 공개 API -----------------------------------------------------
+
+    def parse_file(self, path: str, crawler) -> List[Dict]:
+        """
+        HTML 파일을 파싱합니다. 같은 내용을 이미 파싱했다면 저장된 결과를 돌려줍니다.
+
+        Args:
+            path: HTML 파일 경로
+            crawler: 캐시에 없는 행을 파싱할 YahooFinanceCrawler
+
+        Returns:
+            주식 데이터 딕셔너리 리스트
+        """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return self._parse(data, crawler)
+
+    def parse_html(self, html_content: str, crawler) -> List[Dict]:
+        """HTML 문자열을 파싱합니다. parse_file과 같은 캐시를 씁니다."""
+        return self._parse(html_content.encode('utf-8'), crawler)
+
+    def stats(self) -> Dict[str, int]:
+        """캐시 카운터를 딕셔너리로 반환합니다."""
+        return {
+            'document_hits': self.document_hits,
+            'rows_reused': self.rows_reused,
+            'rows_parsed': self.rows_parsed,
+        }
+
+    # --- 내부 구현 ----------------------------------------------------
+
+    def _parse(self, data, crawler) -> List[Dict]:
+        schema_key = crawler.schema.key
+        doc_path = os.path.join(self.directory, f"{schema_key}-{content_hash(data)}.rows")
+        stocks = self._read(doc_path)
+        if stocks is not None:
+            self.document_hits += 1
+            METRICS.incr('parse_cache_hits')
+            return stocks
+
+        spans = split_rows(data)
+        if not spans:
+            # 행 구간을 찾지 못하면 (마크업이 예상과 다름) 문서 전체를 파싱합니다
+            stocks = crawler.parse_html_table(bytes(data).decode('utf-8', errors='replace'))
+            self.rows_parsed += len(stocks)
+        else:
+            stocks = self._parse_rows(data, spans, crawler, schema_key)
+
+        self._write(doc_path, stocks)
+        self._save_rows()
+        return stocks
+
+    def _parse_rows(self, data, spans, crawler, schema_key: str) -> List[Dict]:
+        """
+        행 구간마다 캐시에 없는 행만 파싱합니다.
+        문서 전체의 행을 보고서 하나에 기록하므로 오류 예산은 parse_html_table과 같이 문서 단위로 판단합니다.
+        """
+        from bs4 import BeautifulSoup, SoupStrainer
+        from parse_errors import ParseReport
+
+        report = ParseReport(budget=crawler.error_budget, columns=crawler.schema.columns)
+        extract_row = crawler.schema.extract_row
+        only_rows = SoupStrainer('tr', attrs={'data-testid': ROW_TESTID})
+        known = self._row_store(schema_key)
+        stocks = []
+        reused = 0
+        parsed = 0
+        for index, (start, end) in enumerate(spans):
+            segment = data[start:end]
+            key = content_hash(segment)
+            with self._lock:
+                stock = known.get(key)
+            if stock is not None:
+                self.rows_reused += 1
+                reused += 1
+                report.check_row(stock, index)
+            else:
+                soup = BeautifulSoup(bytes(segment).decode('utf-8', errors='replace'), crawler.parser,
+                                     parse_only=only_rows)
+                row = soup.find('tr', {'data-testid': ROW_TESTID})
+                issues = []
+                stock = extract_row(row, issues, index) if row is not None else None
+                self.rows_parsed += 1
+                parsed += 1
+                report.check_row(stock or {}, index, issues)
+                if not stock:
+                    continue
+                with self._lock:
+                    known[key] = stock
+                    self._rows_dirty.add(schema_key)
+            stocks.append(dict(stock))
+        report.finish(len(stocks))
+
+        with self._lock:
+            while len(known) > self.max_rows_kept:
+                known.popitem(last=False)
+        if reused:
+            METRICS.incr('parse_cache_rows_reused', reused)
+        METRICS.incr('rows_parsed', parsed)
+        return stocks
+
+    def _row_store(self, schema_key: str) -> "OrderedDict[str, Dict]":
+        with self._lock:
+            rows = self._rows.get(schema_key)
+            if rows is None:
+                rows = self._rows[schema_key] = OrderedDict(self._read(self._row_store_path(schema_key)) or [])
+            return rows
+
+    def _row_store_path(self, schema_key: str) -> str:
+        return os.path.join(self.directory, f"{schema_key}-rows.idx")
+
+    def _save_rows(self):
+        with self._lock:
+            dirty = [(schema_key, list(self._rows[schema_key].items())) for schema_key in self._rows_dirty]
+            self._rows_dirty = set()
+        for schema_key, items in dirty:
+            self._write(self._row_store_path(schema_key), items)
+
+    @staticmethod
+    def _read(path: str):
+        try:
+            with open(path, 'rb') as f:
+                if f.read(len(_FORMAT)) != _FORMAT:
+                    return None
+                return marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def _write(path: str, value):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_FORMAT)
+            marshal.dump(value, f)
+        os.replace(tmp_path, path)
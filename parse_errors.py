@@ -0,0 +1,248 @@
+"""
+파싱 오류 기록과 오류 예산
+행마다 필드 추출 실패(행 번호, 컬럼, 선택자)를 기록하고, 실패한 행이 예산을 넘으면
+마크업이 바뀐 것으로 보고 ParserBrokenError로 크롤링을 일찍 멈춥니다.
+(브라우저를 띄워도 같은 파서로 파싱하므로 Selenium 폴백을 건너뛸 수 있습니다)
+
+결과 상태:
+    ok       모든 행을 문제없이 추출
+    partial  일부 필드 / 행이 실패했지만 예산 안
+    empty    페이지에 표가 없음 (JavaScript로 그려지는 페이지 등, 브라우저로 다시 시도할 만함)
+    broken   표는 있는데 행을 인식하지 못했거나 실패한 행이 예산을 넘음 (파서를 고쳐야 함)
+    error    네트워크 오류 등으로 파싱 전에 실패
+"""
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from metrics import METRICS
+from schema import DEFAULT_SCHEMA
+
+
+# 컬럼명 -> 값을 찾는 CSS 선택자 (오류 기록용)
+FIELD_SELECTORS = DEFAULT_SCHEMA.selectors
+
+# 표 셀은 있는데 행을 하나도 인식하지 못하면 마크업이 바뀐 것으로 봅니다
+# (fin-streamer는 페이지 상단 시장 요약에도 있으므로 표시로 쓰지 않습니다)
+TABLE_MARKERS = ('data-testid-cell=',)
+
+
+class ParserBrokenError(Exception):
+    """마크업이 바뀌어 파서가 행을 추출하지 못할 때 발생합니다. report에 실패 내역이 있습니다."""
+
+    def __init__(self, message: str, report: 'ParseReport'):
+        super().__init__(message)
+        self.report = report
+
+
+class ErrorBudget:
+    """
+    크롤링 하나에서 허용하는 실패한 행의 비율
+    행에 필수 컬럼이 없거나 필드 추출 중 예외가 나면 실패한 행입니다.
+    """
+
+    def __init__(self, max_failure_rate: float = 0.5, min_rows: int = 10,
+                 required: Tuple[str, ...] = ('Symbol', 'Price')):
+        """
+        Args:
+            max_failure_rate: 실패한 행이 이 비율을 넘으면 중단합니다
+            min_rows: 이만큼 행을 본 뒤부터 중단 여부를 판단합니다 (행이 더 적은 페이지는 모든 행이 실패할 때만)
+            required: 없으면 행이 실패한 것으로 보는 컬럼
+        """
+        self.max_failure_rate = max_failure_rate
+        self.min_rows = min_rows
+        self.required = tuple(required)
+
+    def exceeded(self, rows: int, failed: int, final: bool = False) -> bool:
+        """rows개 중 failed개가 실패했을 때 예산을 넘었는지 여부 (final이면 페이지 끝)"""
+        if rows >= self.min_rows:
+            return failed > rows * self.max_failure_rate
+        return final and rows > 0 and failed == rows
+
+
+class FieldIssue:
+    """필드 추출 실패 하나"""
+
+    __slots__ = ('row', 'column', 'selector', 'kind', 'message')
+
+    def __init__(self, row: int, column: str, kind: str = 'missing', message: Optional[str] = None):
+        """
+        Args:
+            row: 페이지 안에서의 행 번호 (0부터)
+            column: 컬럼명
+            kind: 'missing' (값을 찾지 못함) 또는 'error' (추출 중 예외)
+            message: 예외 메시지
+        """
+        self.row = row
+        self.column = column
+        self.selector = FIELD_SELECTORS.get(column, '')
+        self.kind = kind
+        self.message = message
+
+    def to_dict(self) -> Dict:
+        issue = {'row': self.row, 'column': self.column, 'selector': self.selector, 'kind': self.kind}
+        if self.message:
+            issue['message'] = self.message
+        return issue
+
+    def __repr__(self):
+        return f"FieldIssue(row={self.row}, column={self.column!r}, kind={self.kind!r})"
+
+
+class ParseReport:
+    """
+    크롤링 하나(URL 하나)의 파싱 결과 집계
+    여러 페이지를 병렬로 가져오는 경우에도 한 보고서에 모으므로 스레드에 안전하게 갱신합니다.
+
+    사용 예:
+        report = ParseReport(url)
+        for index, stock in enumerate(rows):
+            report.check_row(stock, index)
+        report.finish()
+    """
+
+    def __init__(self, url: Optional[str] = None, budget: Optional[ErrorBudget] = None, max_issues: int = 100,
+                 columns: Optional[Iterable[str]] = None):
+        """
+        Args:
+            url: 보고서를 구분할 URL
+            budget: 오류 예산 (None이면 기본값, 중단하지 않으려면 ErrorBudget(max_failure_rate=1.0))
+            max_issues: 보관할 필드 실패 기록 수 (개수는 모두 셉니다)
+            columns: 누락을 검사할 컬럼 (None이면 전체, 일부만 추출하는 크롤러는 추출하는 컬럼만)
+        """
+        self.url = url
+        self.budget = budget or ErrorBudget()
+        self.max_issues = max_issues
+        self.columns = tuple(columns) if columns is not None else tuple(FIELD_SELECTORS)
+        self.status: Optional[str] = None
+        self.error: Optional[str] = None
+        self.http_status: Optional[int] = None
+        self.rows = 0
+        self.failed_rows = 0
+        self.field_errors: Dict[str, int] = {}
+        self.issues: List[FieldIssue] = []
+        self._lock = threading.Lock()
+
+    # --- 기록 ---------------------------------------------------------
+
+    def record(self, issue: FieldIssue):
+        """필드 실패 하나를 기록합니다."""
+        with self._lock:
+            self._record(issue)
+
+    def _record(self, issue: FieldIssue):
+        self.field_errors[issue.column] = self.field_errors.get(issue.column, 0) + 1
+        if len(self.issues) < self.max_issues:
+            self.issues.append(issue)
+
+    def check_row(self, stock: Dict, index: Optional[int] = None, issues: List[FieldIssue] = ()) -> bool:
+        """
+        HTML 표에서 추출한 행 하나를 검사합니다. 찾지 못한 컬럼을 기록하고, 실패한 행이 예산을 넘으면
+        ParserBrokenError를 발생시킵니다.
+
+        Args:
+            stock: 추출한 행
+            index: 행 번호 (None이면 지금까지 본 행 수)
+            issues: 추출 중에 이미 기록한 실패 (예외 등)
+
+        Returns:
+            행이 실패하지 않았으면 True
+        """
+        with self._lock:
+            if index is None:
+                index = self.rows
+            self.rows += 1
+            failed = any(issue.kind == 'error' for issue in issues)
+            for issue in issues:
+                self._record(issue)
+            reported = {issue.column for issue in issues}
+            for column in self.columns:
+                if column not in stock and column not in reported:
+                    self._record(FieldIssue(index, column))
+                    if column in self.budget.required:
+                        failed = True
+            if failed:
+                self.failed_rows += 1
+            if self.budget.exceeded(self.rows, self.failed_rows):
+                self._broken(f"{self.rows}개 행 중 {self.failed_rows}개 행을 추출하지 못했습니다")
+        return not failed
+
+    def check_empty(self, html_content) -> None:
+        """
+        행을 하나도 찾지 못한 페이지를 분류합니다.
+        표 셀 마크업이 있으면 파서가 행을 인식하지 못한 것이므로 ParserBrokenError를 발생시키고,
+        없으면 빈 페이지(empty)로 기록합니다.
+        """
+        if isinstance(html_content, bytes):
+            html_content = html_content.decode('utf-8', errors='replace')
+        with self._lock:
+            if html_content and any(marker in html_content for marker in TABLE_MARKERS):
+                self._broken("표 셀은 있지만 데이터 행(tr)을 찾지 못했습니다")
+            if self.rows == 0:
+                self.status = 'empty'
+
+    def _broken(self, message: str):
+        self.status = 'broken'
+        self.error = message
+        METRICS.incr('parse_broken')
+        raise ParserBrokenError(f"파서가 페이지 구조를 인식하지 못합니다: {message}", self)
+
+    def fail(self, error: BaseException):
+        """파싱 전에 실패한 크롤링(네트워크 오류 등)으로 기록합니다."""
+        with self._lock:
+            if self.status != 'broken':
+                self.status = 'error'
+                self.error = f"{type(error).__name__}: {error}"
+                response = getattr(error, 'response', None)
+                if response is not None:
+                    self.http_status = response.status_code
+
+    def finish(self, rows: Optional[int] = None) -> str:
+        """
+        크롤링이 끝났을 때 최종 상태를 정합니다. 행이 적은 페이지에서 모든 행이 실패했으면
+        ParserBrokenError를 발생시킵니다.
+
+        Args:
+            rows: 최종 결과 행 수 (API / 포함된 JSON처럼 검사하지 않은 행도 포함)
+
+        Returns:
+            상태 문자열
+        """
+        with self._lock:
+            if self.status in ('broken', 'error'):
+                return self.status
+            if self.budget.exceeded(self.rows, self.failed_rows, final=True):
+                self._broken(f"{self.rows}개 행을 모두 추출하지 못했습니다")
+            if rows is not None and rows > 0 and self.rows == 0:
+                self.status = 'ok'
+            elif self.rows == 0:
+                self.status = self.status or 'empty'
+            else:
+                self.status = 'partial' if self.failed_rows or self.field_errors else 'ok'
+            if self.failed_rows:
+                METRICS.incr('rows_failed', self.failed_rows)
+            if self.field_errors:
+                METRICS.incr('field_errors', sum(self.field_errors.values()))
+            return self.status
+
+    # --- 내보내기 -----------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        """JSON으로 저장할 수 있는 요약 (필드 실패 기록은 max_issues개까지)"""
+        report = {'url': self.url, 'status': self.status, 'rows': self.rows, 'failed_rows': self.failed_rows,
+                  'field_errors': dict(self.field_errors), 'issues': [issue.to_dict() for issue in self.issues]}
+        if self.error:
+            report['error'] = self.error
+        if self.http_status is not None:
+            report['http_status'] = self.http_status
+        return report
+
+    def summary(self) -> str:
+        """한 줄 요약"""
+        text = f"{self.status}: {self.rows}행 검사, {self.failed_rows}행 실패"
+        if self.field_errors:
+            fields = ', '.join(f"{column} {count}" for column, count in
+                               sorted(self.field_errors.items(), key=lambda item: -item[1]))
+            text += f" (필드 누락: {fields})"
+        if self.error:
+            text += f" - {self.error}"
+        return text
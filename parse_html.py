@@ -1,7 +1,10 @@
 """
 제공된 HTML 테이블에서 주식 데이터를 추출하여 엑셀 파일로 저장합니다.
 """
-from crawler import YahooFinanceCrawler
+from crawler import YahooFinanceCrawler, DEFAULT_MAX_ROWS
+from parse_cache import ParseCache
+from parse_errors import ParserBrokenError
+import os
 import sys
 
 
@@ -9,34 +12,40 @@ def main():
     """HTML 문자열에서 직접 데이터 추출"""
     crawler = YahooFinanceCrawler()
     
-    # 사용자가 제공한 HTML (일부만 표시됨)
-    # 실제로는 전체 HTML이 필요합니다
-    html_content = """
-    <table class="yf-1uayyp1 bd">
-    <!-- 여기에 전체 HTML 테이블 내용이 들어갑니다 -->
-    </table>
-    """
-    
-    # 또는 파일에서 읽기
+    # HTML 파일 경로
     if len(sys.argv) > 1:
         html_file = sys.argv[1]
-        try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-        except FileNotFoundError:
+        if not os.path.exists(html_file):
             print(f"파일을 찾을 수 없습니다: {html_file}")
             return
     else:
-        print("사용법: python parse_html.py <html_file>")
+        print("사용법: python parse_html.py <html_file> [최대 행 수]")
         print("또는 HTML 내용을 input.html 파일로 저장하세요.")
         return
     
-    # HTML 파싱
-    stocks = crawler.parse_html_table(html_content)
+    # 최대 행 수 (0이면 제한 없음)
+    max_rows = DEFAULT_MAX_ROWS
+    if len(sys.argv) > 2:
+        try:
+            max_rows = int(sys.argv[2])
+        except ValueError:
+            max_rows = -1
+        if max_rows < 0:
+            print(f"최대 행 수는 0 이상의 정수여야 합니다: {sys.argv[2]}")
+            print("사용법: python parse_html.py <html_file> [최대 행 수]")
+            return
+    
+    # HTML 파싱 (이전에 파싱한 내용은 캐시에서 바로 가져옵니다)
+    try:
+        stocks = ParseCache().parse_file(html_file, crawler)
+    except ParserBrokenError as e:
+        print(f"❌ {e}")
+        print(f"   {e.report.summary()}")
+        return
     
     if stocks:
-        # 50개로 제한
-        stocks = stocks[:50]
+        if max_rows:
+            stocks = stocks[:max_rows]
         print(f"총 {len(stocks)}개의 주식 데이터를 추출했습니다.")
         
         # 엑셀 파일로 저장
@@ -45,8 +54,7 @@ def main():
         # 콘솔에 미리보기 출력
         print("\n=== 추출된 데이터 미리보기 ===")
         for i, stock in enumerate(stocks[:5], 1):
-            print(f"\n{i}. {stock.get('Symbol', 'N/A')} - {stock.get('Name', 'N/A')}")
-            print(f"   가격: {stock.get('Price', 'N/A')}, 변동률: {stock.get('Change %', 'N/A')}")
+            print('\n'.join(crawler.schema.preview_lines(i, stock)))
     else:
         print("추출된 데이터가 없습니다. HTML 형식을 확인해주세요.")
 
@@ -0,0 +1,615 @@
+"""
+로컬 파싱 서비스
+대시보드, 백필 작업, 폴러가 각자 crawler.py(pandas, BeautifulSoup)를 불러와 파싱하는 대신,
+오래 떠 있는 서비스 하나가 워밍업된 파서와 캐시를 유지한 채로 parse_html_table과 저장 기능을 제공합니다.
+
+- 전송: Unix 소켓(기본값) 또는 localhost TCP("127.0.0.1:8765"), 연결 하나로 여러 요청을 주고받습니다.
+- 요청 / 응답: [본문 길이(4)] + marshal 본문. 표는 행 딕셔너리 대신 열 단위로 보내며
+  (컬럼명 한 번 + 열마다 값 리스트), 숫자 열은 float64 버퍼 그대로 보냅니다.
+- 작업: 요청 하나에 문서를 여러 개 담을 수 있고(배치), 서비스는 batch_size개씩 묶어
+  작업 프로세스 풀에 나눠 줍니다. 작업 프로세스는 컬럼 조합별 크롤러와 ParseCache를 계속 재사용합니다.
+
+클라이언트(ParseClient)는 표준 라이브러리만 쓰므로 pandas / BeautifulSoup 없이 가볍게 불러올 수 있습니다.
+marshal은 신뢰할 수 있는 상대와만 주고받아야 하므로 같은 사용자만 접근할 수 있는 Unix 소켓(0600)이나
+루프백 TCP 주소로만 엽니다. 저장(save) 요청은 output_dir을 준 경우에만, 그 폴더 안의 파일에만 씁니다.
+
+사용 예:
+    python parse_service.py --workers 4 --output-dir out    # 서비스 실행 (.parse_service.sock)
+
+    from parse_service import ParseClient
+    with ParseClient() as client:
+        stocks = client.parse(html_content)
+        results = client.parse_many(htmls, fields=['Symbol', 'Price'])   # [(행 리스트, 오류), ...]
+        client.save(stocks, 'stock_data.parquet')                        # out/stock_data.parquet
+"""
+import argparse
+import ipaddress
+import marshal
+import os
+import re
+import socket
+import socketserver
+import struct
+import sys
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from metrics import METRICS
+
+
+_FORMAT = b'YFPS1'
+_LENGTH = struct.Struct('<I')
+# 잘못된 상대가 터무니없는 길이를 보내도 메모리를 다 쓰지 않도록 제한합니다
+MAX_MESSAGE = 1 << 30
+
+DEFAULT_ADDRESS = '.parse_service.sock' if hasattr(socket, 'AF_UNIX') else '127.0.0.1:8765'
+
+# 행에 컬럼이 없음을 나타내는 값 (None은 실제 값으로 쓰이므로 marshal이 지원하는 Ellipsis를 씁니다)
+_ABSENT = ...
+
+
+class ServiceError(Exception):
+    """서비스가 요청을 처리하지 못했을 때 발생합니다 (메시지는 서비스 쪽 예외)."""
+
+
+# --- 주소 / 프레임 ---------------------------------------------------------
+
+def parse_address(address: Union[str, Tuple[str, int]]):
+    """
+    'host:port'이면 (host, port) TCP 주소를, 그 밖에는 Unix 소켓 경로를 반환합니다.
+    """
+    if isinstance(address, tuple):
+        return address
+    match = re.fullmatch(r'([\w.-]+|\[[0-9a-fA-F:]+\]):(\d+)', address)
+    if match and os.sep not in address:
+        return match.group(1).strip('[]'), int(match.group(2))
+    return address
+
+
+def is_loopback(host: str) -> bool:
+    """이 컴퓨터에서만 접속할 수 있는 주소인지 (localhost, 127.0.0.0/8, ::1)"""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _read_exact(stream, size: int) -> Optional[bytes]:
+    data = stream.read(size)
+    if not data:
+        return None
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            raise ConnectionError("메시지를 받는 중에 연결이 끊겼습니다")
+        data += chunk
+    return data
+
+
+def read_message(stream):
+    """파일처럼 읽을 수 있는 소켓에서 메시지 하나를 읽습니다. 상대가 연결을 닫았으면 None을 반환합니다."""
+    header = _read_exact(stream, _LENGTH.size)
+    if header is None:
+        return None
+    (size,) = _LENGTH.unpack(header)
+    if size > MAX_MESSAGE:
+        raise ValueError(f"메시지가 너무 큽니다: {size:,}바이트")
+    body = _read_exact(stream, size) if size else b''
+    if body is None or not body.startswith(_FORMAT):
+        raise ValueError("알 수 없는 메시지 형식입니다")
+    return marshal.loads(body[len(_FORMAT):])
+
+
+def encode_message(message) -> bytes:
+    """메시지를 [길이] + 형식 표시 + marshal 본문으로 만듭니다."""
+    body = _FORMAT + marshal.dumps(message)
+    return _LENGTH.pack(len(body)) + body
+
+
+# --- 열 단위 인코딩 --------------------------------------------------------
+
+def encode_rows(stocks: Iterable[Dict], columns: Sequence[str]) -> Dict:
+    """
+    행 딕셔너리 리스트를 열 단위 표로 만듭니다.
+    행에 없는 컬럼은 Ellipsis로 표시해 디코딩할 때 키 자체를 빼므로 원래 딕셔너리와 같아집니다.
+    """
+    stocks = list(stocks)
+    return {
+        'columns': list(columns),
+        'rows': len(stocks),
+        'data': [[stock.get(column, _ABSENT) for stock in stocks] for column in columns],
+    }
+
+
+def decode_rows(table: Dict) -> List[Dict]:
+    """encode_rows로 만든 표를 행 딕셔너리 리스트로 되돌립니다."""
+    columns = table['columns']
+    if not columns:
+        return [{} for _ in range(table['rows'])]
+    return [{column: value for column, value in zip(columns, values) if value is not _ABSENT}
+            for values in zip(*table['data'])]
+
+
+def encode_frame(frame) -> Dict:
+    """
+    DataFrame을 열 단위 표로 만듭니다. 실수 / 정수 열은 값 리스트 대신 float64 / int64 버퍼로 보냅니다
+    (빈 값은 NaN). 그 밖의 열(빈 값이 있는 Int64 열 포함)은 빈 값을 None으로 바꾼 값 리스트로 보냅니다.
+    """
+    data = []
+    for column in frame.columns:
+        series = frame[column]
+        values = series.to_numpy()
+        if values.dtype.kind == 'f':
+            data.append(('f8', values.astype('<f8').tobytes()))
+        elif values.dtype.kind in 'iub':
+            data.append(('i8', values.astype('<i8').tobytes()))
+        else:
+            missing = series.isna().to_numpy().tolist()
+            data.append(('obj', [None if gone else value for value, gone in zip(values.tolist(), missing)]))
+    return {'columns': [str(column) for column in frame.columns], 'rows': len(frame), 'data': data}
+
+
+def decode_frame(table: Dict) -> Dict[str, list]:
+    """
+    encode_frame으로 만든 표를 {컬럼명: 값 리스트}로 되돌립니다 (pandas 없이 쓸 수 있습니다).
+    pandas가 있으면 pd.DataFrame(decode_frame(table))로 DataFrame을 만들 수 있습니다.
+    """
+    columns = {}
+    for name, (kind, values) in zip(table['columns'], table['data']):
+        if kind in ('f8', 'i8'):
+            buffer = array('d' if kind == 'f8' else 'q')
+            buffer.frombytes(values)
+            if sys.byteorder != 'little':
+                buffer.byteswap()
+            values = buffer.tolist()
+        columns[name] = values
+    return columns
+
+
+# --- 작업 프로세스 ---------------------------------------------------------
+
+# 작업 프로세스(또는 workers=0이면 서비스 프로세스)가 계속 재사용하는 크롤러와 캐시
+_crawlers: Dict[Optional[tuple], object] = {}
+_crawlers_lock = threading.Lock()
+_parse_cache = None
+
+
+def _init_worker(cache_dir: Optional[str] = None):
+    """작업 프로세스를 시작할 때 무거운 모듈을 미리 불러오고 캐시를 엽니다."""
+    global _parse_cache
+    import export  # noqa: F401  (pandas, numpy)
+    if cache_dir:
+        from parse_cache import ParseCache
+        _parse_cache = ParseCache(cache_dir)
+    _crawler(None)
+
+
+def _crawler(fields: Optional[Sequence[str]]):
+    """컬럼 조합별로 한 번만 만드는 크롤러 (알 수 없는 컬럼이면 ValueError)"""
+    key = tuple(fields) if fields else None
+    crawler = _crawlers.get(key)
+    if crawler is None:
+        with _crawlers_lock:
+            crawler = _crawlers.get(key)
+            if crawler is None:
+                from crawler import YahooFinanceCrawler
+                crawler = _crawlers[key] = YahooFinanceCrawler(fields=list(key) if key else None)
+    return crawler
+
+
+def _parse_batch(documents: List[Union[str, bytes]], fields: Optional[Sequence[str]],
+                 max_rows: Optional[int]) -> List[Tuple[Optional[Dict], Optional[str]]]:
+    """
+    문서 묶음을 파싱해 문서마다 (열 단위 표, 오류 메시지)를 반환합니다.
+    문서 하나가 실패해도 나머지 문서는 계속 파싱합니다.
+    """
+    crawler = _crawler(fields)
+    columns = crawler.schema.columns
+    results = []
+    for document in documents:
+        try:
+            if isinstance(document, bytes):
+                document = document.decode('utf-8', errors='replace')
+            if _parse_cache is not None:
+                stocks = _parse_cache.parse_html(document, crawler)
+            else:
+                stocks = crawler.parse_html_table(document)
+            if max_rows:
+                stocks = stocks[:max_rows]
+            results.append((encode_rows(stocks, columns), None))
+        except Exception as e:
+            results.append((None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _export(table: Dict, fields: Optional[Sequence[str]], numeric: bool, percent_fraction: bool) -> Dict:
+    """행을 저장용 DataFrame(export.build_export_frame)으로 변환해 열 단위 표로 반환합니다."""
+    from export import build_export_frame
+    crawler = _crawler(fields)
+    frame = build_export_frame(decode_rows(table), numeric, crawler, percent_fraction, crawler._export_columns())
+    return encode_frame(frame)
+
+
+def _save(table: Dict, filename: str, format: Optional[str], fields: Optional[Sequence[str]],
+          options: Dict) -> int:
+    """행을 서비스 쪽에서 파일로 저장합니다 (YahooFinanceCrawler.save). filename은 이미 검사한 경로입니다."""
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    return _crawler(fields).save(decode_rows(table), filename, format, **options)
+
+
+def resolve_output_path(output_dir: str, filename: str) -> str:
+    """
+    클라이언트가 보낸 파일명을 output_dir 안의 경로로 바꿉니다.
+
+    Raises:
+        ValueError: 절대 경로이거나 '..', 심볼릭 링크 등으로 output_dir 밖을 가리키는 경우
+    """
+    if not isinstance(filename, str) or not filename or os.path.isabs(filename):
+        raise ValueError(f"output_dir 안의 상대 경로만 저장할 수 있습니다: {filename!r}")
+    root = os.path.realpath(output_dir)
+    path = os.path.realpath(os.path.join(root, filename))
+    if os.path.commonpath([root, path]) != root or path == root:
+        raise ValueError(f"output_dir 밖에는 저장할 수 없습니다: {filename!r}")
+    return path
+
+
+# --- 서비스 ----------------------------------------------------------------
+
+class ParseService:
+    """
+    파싱 / 저장 요청을 받는 로컬 서비스
+
+    사용 예:
+        with ParseService('.parse_service.sock', workers=4) as service:
+            service.serve_forever()        # 또는 service.start()로 백그라운드 스레드에서 실행
+    """
+
+    def __init__(self, address: Union[str, Tuple[str, int]] = DEFAULT_ADDRESS, workers: Optional[int] = None,
+                 batch_size: int = 8, cache_dir: Optional[str] = None, output_dir: Optional[str] = None):
+        """
+        Args:
+            address: Unix 소켓 경로 또는 'host:port' (TCP는 127.0.0.1, ::1, localhost만 허용)
+            workers: 작업 프로세스 수 (None이면 CPU 수, 0이면 서비스 프로세스의 요청 스레드에서 바로 파싱)
+            batch_size: 작업 프로세스에 한 번에 넘길 문서 수
+            cache_dir: 주면 작업 프로세스마다 이 폴더의 ParseCache를 써서 같은 문서 / 같은 행은 다시 파싱하지 않습니다
+            output_dir: save 요청이 파일을 쓸 폴더 (None이면 save 요청을 거절합니다)
+
+        Raises:
+            ValueError: TCP 주소가 루프백 주소가 아닌 경우 (인증 없이 외부에 열지 않습니다)
+        """
+        self.address = parse_address(address)
+        if isinstance(self.address, tuple) and not is_loopback(self.address[0]):
+            raise ValueError(f"파싱 서비스는 루프백 주소(127.0.0.1, ::1, localhost)에서만 열 수 있습니다: "
+                             f"{self.address[0]}")
+        self.output_dir = output_dir
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.batch_size = max(1, batch_size)
+        self.cache_dir = cache_dir
+        self._executor = None
+        self._thread: Optional[threading.Thread] = None
+
+        service = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                while True:
+                    try:
+                        message = read_message(self.rfile)
+                    except (ValueError, ConnectionError, EOFError, TypeError):
+                        return
+                    if message is None:
+                        return
+                    try:
+                        response = service.dispatch(message)
+                        response['ok'] = True
+                    except Exception as e:
+                        METRICS.incr('service_errors')
+                        response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                    self.wfile.write(encode_message(response))
+
+        if isinstance(self.address, tuple):
+            base = socketserver.ThreadingTCPServer
+        else:
+            base = socketserver.ThreadingUnixStreamServer
+            _remove_stale_socket(self.address)
+
+        class Server(base):
+            daemon_threads = True
+            allow_reuse_address = True
+
+        if isinstance(self.address, tuple):
+            if ':' in self.address[0]:
+                Server.address_family = socket.AF_INET6
+            self.server = Server(self.address, Handler)
+        else:
+            # 같은 사용자만 연결할 수 있도록 소켓 파일을 처음부터 0600으로 만듭니다
+            umask = os.umask(0o177)
+            try:
+                self.server = Server(self.address, Handler)
+            finally:
+                os.umask(umask)
+
+        if self.workers > 0:
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(cache_dir,))
+            # 작업 프로세스를 미리 띄워 첫 요청부터 워밍업된 파서를 씁니다
+            for future in [self._executor.submit(os.getpid) for _ in range(self.workers)]:
+                future.result()
+        else:
+            _init_worker(cache_dir)
+
+    @property
+    def bound_address(self):
+        """실제로 연 주소 (TCP 포트를 0으로 주었을 때 확인용)"""
+        return self.server.server_address
+
+    def _run(self, function, *args):
+        if self._executor is None:
+            return function(*args)
+        return self._executor.submit(function, *args).result()
+
+    def dispatch(self, message: Dict) -> Dict:
+        """요청 하나를 처리해 응답 딕셔너리를 반환합니다."""
+        op = message.get('op')
+        METRICS.incr('service_requests')
+        with METRICS.span(f'service_{op}'):
+            if op == 'ping':
+                return {'pid': os.getpid(), 'workers': self.workers}
+            if op == 'parse':
+                return {'results': self._parse(message['documents'], message.get('fields'),
+                                               message.get('max_rows'))}
+            if op == 'export':
+                return {'frame': self._run(_export, message['table'], message.get('fields'),
+                                           bool(message.get('numeric')), message.get('percent_fraction', True))}
+            if op == 'save':
+                if self.output_dir is None:
+                    raise PermissionError("이 서비스는 저장 요청을 받지 않습니다 (--output-dir로 실행하세요)")
+                path = resolve_output_path(self.output_dir, message['filename'])
+                return {'count': self._run(_save, message['table'], path, message.get('format'),
+                                           message.get('fields'), message.get('options') or {})}
+            if op == 'stats':
+                return {'metrics': METRICS.to_dict()}
+        raise ValueError(f"알 수 없는 요청입니다: {op!r}")
+
+    def _parse(self, documents: List, fields, max_rows) -> List:
+        """문서를 batch_size개씩 나눠 작업 프로세스에 보내고 문서 순서대로 결과를 모읍니다."""
+        METRICS.incr('service_documents', len(documents))
+        batches = [documents[i:i + self.batch_size] for i in range(0, len(documents), self.batch_size)]
+        if self._executor is None:
+            parts = [_parse_batch(batch, fields, max_rows) for batch in batches]
+        else:
+            futures = [self._executor.submit(_parse_batch, batch, fields, max_rows) for batch in batches]
+            parts = [future.result() for future in futures]
+        return [result for part in parts for result in part]
+
+    def serve_forever(self):
+        """종료(close 또는 Ctrl+C)할 때까지 요청을 받습니다."""
+        self.server.serve_forever()
+
+    def start(self) -> 'ParseService':
+        """백그라운드 스레드에서 요청을 받기 시작합니다."""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        """요청 받기를 멈추고 작업 프로세스와 소켓 파일을 정리합니다."""
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server.server_close()
+        if not isinstance(self.address, tuple):
+            try:
+                os.unlink(self.address)
+            except OSError:
+                pass
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _remove_stale_socket(path: str):
+    """이전 서비스가 남긴 소켓 파일을 지웁니다. 다른 서비스가 실제로 듣고 있으면 OSError가 발생합니다."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise OSError(f"이미 실행 중인 서비스가 있습니다: {path}")
+
+
+# --- 클라이언트 ------------------------------------------------------------
+
+class ParseClient:
+    """
+    파싱 서비스 클라이언트 (표준 라이브러리만 사용)
+    연결은 처음 요청할 때 열고 이후 요청에 재사용합니다. 여러 스레드에서 같이 써도 요청은 하나씩 보냅니다.
+    """
+
+    def __init__(self, address: Union[str, Tuple[str, int]] = DEFAULT_ADDRESS, timeout: Optional[float] = 60.0):
+        """
+        Args:
+            address: 서비스 주소 (Unix 소켓 경로 또는 'host:port')
+            timeout: 응답을 기다릴 최대 시간 (초, None이면 무제한)
+        """
+        self.address = parse_address(address)
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        family = socket.AF_INET if isinstance(self.address, tuple) else socket.AF_UNIX
+        if isinstance(self.address, tuple) and ':' in self.address[0]:
+            family = socket.AF_INET6
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.address)
+        except OSError:
+            sock.close()
+            raise
+        self._socket = sock
+        self._reader = sock.makefile('rb')
+
+    def call(self, message: Dict) -> Dict:
+        """
+        요청 하나를 보내고 응답을 받습니다.
+
+        Raises:
+            ServiceError: 서비스가 요청을 처리하지 못한 경우
+            OSError: 서비스에 연결할 수 없거나 연결이 끊긴 경우 (다음 요청에서 다시 연결합니다)
+        """
+        with self._lock:
+            try:
+                if self._socket is None:
+                    self._connect()
+                self._socket.sendall(encode_message(message))
+                response = read_message(self._reader)
+                if response is None:
+                    raise ConnectionError("서비스가 연결을 닫았습니다")
+            except (OSError, ValueError):
+                self.close()
+                raise
+        if not response.get('ok'):
+            raise ServiceError(response.get('error'))
+        return response
+
+    def ping(self) -> Dict:
+        """서비스 상태 ({'pid', 'workers'})"""
+        return self.call({'op': 'ping'})
+
+    def parse_many(self, documents: Sequence[Union[str, bytes]], fields: Optional[Sequence[str]] = None,
+                   max_rows: Optional[int] = None) -> List[Tuple[Optional[List[Dict]], Optional[str]]]:
+        """
+        여러 HTML 문서를 요청 하나로 파싱합니다.
+
+        Args:
+            documents: HTML 문자열 또는 바이트 리스트
+            fields: 추출할 컬럼 (None이면 전체)
+            max_rows: 문서별 최대 행 수
+
+        Returns:
+            문서 순서대로 (주식 데이터 딕셔너리 리스트, 오류 메시지). 실패한 문서는 (None, 오류 메시지)입니다.
+
+        Raises:
+            ServiceError: fields에 알 수 없는 컬럼이 있는 경우 등
+        """
+        response = self.call({'op': 'parse', 'documents': list(documents),
+                              'fields': list(fields) if fields else None, 'max_rows': max_rows})
+        return [(decode_rows(table) if table is not None else None, error)
+                for table, error in response['results']]
+
+    def parse(self, document: Union[str, bytes], fields: Optional[Sequence[str]] = None,
+              max_rows: Optional[int] = None) -> List[Dict]:
+        """
+        HTML 문서 하나를 파싱합니다 (YahooFinanceCrawler.parse_html_table과 같은 결과).
+
+        Raises:
+            ServiceError: 파싱에 실패한 경우 (예: ParserBrokenError)
+        """
+        stocks, error = self.parse_many([document], fields, max_rows)[0]
+        if error is not None:
+            raise ServiceError(error)
+        return stocks
+
+    def export_frame(self, stocks: List[Dict], numeric: bool = False, fields: Optional[Sequence[str]] = None,
+                     percent_fraction: bool = True) -> Dict[str, list]:
+        """
+        export.build_export_frame의 결과를 {컬럼명: 값 리스트}로 받습니다.
+        pandas가 있으면 pd.DataFrame(결과)로 같은 DataFrame을 만들 수 있습니다.
+        """
+        columns = list(fields) if fields else _row_columns(stocks)
+        response = self.call({'op': 'export', 'table': encode_rows(stocks, columns),
+                              'fields': list(fields) if fields else None, 'numeric': numeric,
+                              'percent_fraction': percent_fraction})
+        return decode_frame(response['frame'])
+
+    def save(self, stocks: List[Dict], filename: str, format: Optional[str] = None,
+             fields: Optional[Sequence[str]] = None, **options) -> int:
+        """
+        서비스 쪽에서 YahooFinanceCrawler.save로 저장합니다.
+        filename은 서비스의 output_dir 안의 상대 경로입니다 (예: 'stock_data.parquet', 'daily/gainers.csv').
+
+        Returns:
+            저장한 행 수
+
+        Raises:
+            ServiceError: 서비스에 output_dir이 없거나 filename이 output_dir 밖을 가리키는 경우
+        """
+        columns = list(fields) if fields else _row_columns(stocks)
+        response = self.call({'op': 'save', 'table': encode_rows(stocks, columns),
+                              'filename': filename, 'format': format,
+                              'fields': list(fields) if fields else None, 'options': options})
+        return response['count']
+
+    def stats(self) -> Dict:
+        """서비스의 단계별 시간과 카운터 (metrics.Metrics.to_dict)"""
+        return self.call({'op': 'stats'})['metrics']
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _row_columns(stocks: Iterable[Dict]) -> List[str]:
+    """행들에 나오는 컬럼명 (처음 나온 순서)"""
+    columns = {}
+    for stock in stocks:
+        for column in stock:
+            columns.setdefault(column, None)
+    return list(columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='파싱 / 저장 요청을 받는 로컬 서비스를 실행합니다.')
+    parser.add_argument('--address', default=DEFAULT_ADDRESS,
+                        help="Unix 소켓 경로 또는 'host:port' (기본값: %(default)s)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='작업 프로세스 수 (기본값: CPU 수, 0이면 서비스 프로세스에서 파싱)')
+    parser.add_argument('--batch-size', type=int, default=8, help='작업 프로세스에 한 번에 넘길 문서 수 (기본값: 8)')
+    parser.add_argument('--cache-dir', help='ParseCache 폴더 (같은 문서 / 같은 행은 다시 파싱하지 않음)')
+    parser.add_argument('--output-dir', help='save 요청이 파일을 쓸 폴더 (주지 않으면 save 요청을 거절합니다)')
+    args = parser.parse_args()
+
+    try:
+        service = ParseService(args.address, args.workers, args.batch_size, args.cache_dir, args.output_dir)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+    with service:
+        address = service.bound_address
+        print(f"🚀 파싱 서비스 실행 중: {address} (작업 프로세스 {service.workers}개, Ctrl+C로 종료)")
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            print("\n⏹️  종료하는 중...")
+
+
+if __name__ == "__main__":
+    main()
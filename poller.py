@@ -0,0 +1,299 @@
+"""
+주기적 크롤링 데몬
+cron으로 매분 스크립트를 다시 실행하는 대신, 프로세스 하나가 YahooFinanceCrawler
+(세션의 keep-alive 연결, 응답 캐시, 파서)를 계속 살려 둔 채로 URL별 일정에 따라 크롤링합니다.
+
+- URL마다 자기 간격으로 돌며, 느린 스크리너는 작업 스레드 하나만 차지하므로 빠른 URL을 막지 않습니다.
+- 내용이 바뀌면 간격을 줄이고 (min_interval까지), 바뀌지 않으면 늘립니다 (max_interval까지).
+- 오류나 429 응답에는 지터(jitter)를 섞은 지수 백오프를 적용합니다 (Retry-After가 있으면 그보다 짧게 쉬지 않음).
+
+시계(clock)와 대기 함수(sleep), 난수(rng)를 주입할 수 있으므로 가짜 시계로 일정을 확인할 수 있고,
+max_workers=0이면 작업을 step() 안에서 바로 실행합니다.
+"""
+import random
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from crawler import DEFAULT_MAX_ROWS, YahooFinanceCrawler
+from metrics import METRICS
+from rate_limit import parse_retry_after
+
+
+class PollTarget:
+    """URL 하나의 일정과 상태"""
+
+    __slots__ = ('url', 'interval', 'min_interval', 'max_interval', 'next_run', 'failures', 'signature',
+                 'running', 'polls', 'changes', 'errors', 'last_error')
+
+    def __init__(self, url: str, interval: float, min_interval: float, max_interval: float, next_run: float):
+        self.url = url
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.next_run = next_run
+        self.failures = 0            # 연속 실패 횟수 (백오프 지수)
+        self.signature = None        # 마지막 결과의 체크섬 (변경 감지용)
+        self.running = False
+        self.polls = 0
+        self.changes = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+    def __repr__(self):
+        return f"PollTarget(url={self.url!r}, interval={self.interval:.1f}, failures={self.failures})"
+
+
+def retry_after_seconds(error: Exception, now: Optional[float] = None) -> Optional[float]:
+    """
+    requests.HTTPError의 Retry-After 헤더(초 또는 HTTP 날짜)를 초 단위로 반환합니다.
+    헤더가 없거나 해석할 수 없으면 None을 반환합니다.
+    """
+    response = getattr(error, 'response', None)
+    return parse_retry_after(response.headers.get('Retry-After') if response is not None else None, now)
+
+
+def rows_signature(stocks: List[Dict]) -> int:
+    """결과가 바뀌었는지 비교하기 위한 체크섬"""
+    return zlib.crc32(repr(stocks).encode('utf-8'))
+
+
+class Poller:
+    """
+    여러 URL을 각자의 간격으로 크롤링하는 데몬
+
+    사용 예:
+        poller = Poller(on_change=lambda url, stocks: crawler.save(stocks, 'stock_data.csv'))
+        poller.add('https://finance.yahoo.com/screener/predefined/day_gainers', interval=60)
+        poller.run()   # Ctrl+C 또는 poller.stop()으로 종료
+    """
+
+    def __init__(self, crawler: Optional[YahooFinanceCrawler] = None, interval: float = 60,
+                 min_interval: float = 15, max_interval: float = 600, max_backoff: float = 900,
+                 max_rows: Optional[int] = DEFAULT_MAX_ROWS,
+                 on_change: Optional[Callable[[str, List[Dict]], None]] = None,
+                 on_error: Optional[Callable[[str, Exception], None]] = None,
+                 max_workers: Optional[int] = None, clock: Callable[[], float] = time.monotonic,
+                 sleep: Optional[Callable[[float], None]] = None, rng: Optional[random.Random] = None,
+                 fetch_options: Optional[Dict] = None):
+        """
+        Args:
+            crawler: 계속 재사용할 크롤러 (기본값: 304 재검증용 응답 캐시를 가진 새 크롤러)
+            interval: URL별 시작 간격 (초)
+            min_interval: 내용이 자주 바뀔 때 줄어드는 최소 간격
+            max_interval: 내용이 바뀌지 않을 때 늘어나는 최대 간격
+            max_backoff: 오류가 반복될 때 기다리는 최대 시간
+            max_rows: URL별 최대 추출 개수 (None이면 전체)
+            on_change: 내용이 바뀌었을 때 (url, stocks)로 호출됩니다 (첫 결과 포함)
+            on_error: 크롤링이 실패했을 때 (url, 예외)로 호출됩니다
+            max_workers: 동시에 크롤링할 URL 수 (None이면 URL 수만큼 늘어나고, 0이면 step()에서 바로 실행)
+            clock: 현재 시각 함수 (초)
+            sleep: 대기 함수 (기본값: 작업이 끝나면 바로 깨어나는 대기)
+            rng: 백오프 지터에 쓸 난수 생성기
+            fetch_options: crawler.fetch에 넘길 추가 인자 (예: {'paginate': True, 'page_size': 100})
+        """
+        if crawler is None:
+            from http_cache import ResponseCache
+            crawler = YahooFinanceCrawler(cache=ResponseCache(ttl=0))
+        self.crawler = crawler
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_backoff = max_backoff
+        self.max_rows = max_rows
+        self.on_change = on_change
+        self.on_error = on_error
+        self.max_workers = max_workers
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.fetch_options = dict(fetch_options or {})
+
+        self.targets: Dict[str, PollTarget] = {}
+        self._sleep = sleep
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pool_size = 0
+        self._retired: List[ThreadPoolExecutor] = []
+
+    # --- 일정 관리 ----------------------------------------------------
+
+    def add(self, url: str, interval: Optional[float] = None, min_interval: Optional[float] = None,
+            max_interval: Optional[float] = None) -> PollTarget:
+        """URL을 일정에 추가합니다. 추가한 직후 첫 크롤링 대상이 됩니다."""
+        interval = self.interval if interval is None else interval
+        target = PollTarget(
+            url, interval,
+            min(interval, self.min_interval if min_interval is None else min_interval),
+            max(interval, self.max_interval if max_interval is None else max_interval),
+            self.clock(),
+        )
+        with self._lock:
+            self.targets[url] = target
+        self._wake.set()
+        return target
+
+    def remove(self, url: str):
+        """URL을 일정에서 뺍니다. 진행 중인 크롤링의 결과는 버립니다."""
+        with self._lock:
+            self.targets.pop(url, None)
+
+    def _schedule(self, target: PollTarget, changed: Optional[bool], error: Optional[Exception]):
+        """크롤링 결과에 따라 다음 실행 시각을 정합니다."""
+        now = self.clock()
+        if error is not None:
+            target.failures += 1
+            # 지터를 섞은 지수 백오프: [delay/2, delay] 구간에서 고릅니다
+            delay = min(self.max_backoff, target.interval * 2 ** (target.failures - 1))
+            delay = self.rng.uniform(delay / 2, delay)
+            retry_after = retry_after_seconds(error)
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_backoff))
+            target.next_run = now + delay
+            return
+
+        target.failures = 0
+        if changed:
+            target.interval = max(target.min_interval, target.interval / 2)
+        else:
+            target.interval = min(target.max_interval, target.interval * 1.5)
+        target.next_run = now + target.interval
+
+    # --- 실행 ---------------------------------------------------------
+
+    def _poll(self, target: PollTarget):
+        """URL 하나를 크롤링하고 다음 일정을 정합니다."""
+        changed = None
+        error = None
+        try:
+            stocks = self.crawler.fetch(target.url, self.max_rows, **self.fetch_options)
+            if not self._is_current(target):
+                return
+            signature = rows_signature(stocks)
+            changed = signature != target.signature
+            target.polls += 1
+            METRICS.incr('polls')
+            if changed:
+                if self.on_change is not None:
+                    self.on_change(target.url, stocks)
+                target.changes += 1
+                METRICS.incr('poll_changes')
+            # on_change(예: 저장)가 성공한 뒤에만 기록하므로, 실패하면 다음 크롤링에서 같은 결과를 다시 넘깁니다
+            target.signature = signature
+        except Exception as e:
+            error = e
+            if not self._is_current(target):
+                return
+            target.errors += 1
+            METRICS.incr('poll_errors')
+            target.last_error = f"{type(e).__name__}: {e}"
+            if self.on_error is not None:
+                self.on_error(target.url, e)
+        finally:
+            with self._lock:
+                if self.targets.get(target.url) is target:
+                    self._schedule(target, changed, error)
+                target.running = False
+            self._wake.set()
+
+    def _is_current(self, target: PollTarget) -> bool:
+        """target이 아직 일정에 있는지 (remove()로 빠졌거나 같은 URL로 다시 추가되었으면 False)"""
+        with self._lock:
+            return self.targets.get(target.url) is target
+
+    def step(self) -> float:
+        """
+        실행할 시각이 된 URL을 모두 시작합니다.
+
+        Returns:
+            다음 URL을 실행할 때까지 남은 시간 (초)
+        """
+        now = self.clock()
+        with self._lock:
+            due = [target for target in self.targets.values() if not target.running and target.next_run <= now]
+            for target in due:
+                target.running = True
+
+        for target in due:
+            if self.max_workers == 0:
+                self._poll(target)
+            else:
+                self._pool().submit(self._poll, target)
+
+        with self._lock:
+            waiting = [target.next_run for target in self.targets.values() if not target.running]
+        if not waiting:
+            return self.max_interval
+        return max(0.0, min(waiting) - self.clock())
+
+    def _pool(self) -> ThreadPoolExecutor:
+        workers = self.max_workers or max(1, len(self.targets))
+        if self._executor is None or self._pool_size < workers:
+            # URL이 늘어 작업 스레드가 모자라면 더 큰 풀로 바꿉니다 (이전 풀의 작업은 그대로 끝까지 실행됩니다)
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._retired.append(self._executor)
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='poller')
+            self._pool_size = workers
+        return self._executor
+
+    def run(self, duration: Optional[float] = None):
+        """
+        stop()이 호출되거나 duration초가 지날 때까지 일정대로 크롤링합니다.
+
+        Args:
+            duration: 실행할 시간 (초, None이면 계속)
+        """
+        until = None if duration is None else self.clock() + duration
+        try:
+            while not self._stopped.is_set():
+                wait = self.step()
+                if until is not None:
+                    remaining = until - self.clock()
+                    if remaining <= 0:
+                        break
+                    wait = min(wait, remaining)
+                self._wait(wait)
+        finally:
+            self.close()
+
+    def _wait(self, seconds: float):
+        if self._sleep is not None:
+            self._sleep(seconds)
+            return
+        # 작업이 끝나거나 URL이 추가되면 바로 깨어납니다
+        self._wake.wait(seconds)
+        self._wake.clear()
+
+    def stop(self):
+        """run()을 멈춥니다."""
+        self._stopped.set()
+        self._wake.set()
+
+    def close(self):
+        """작업 스레드를 정리합니다. 진행 중인 크롤링은 끝날 때까지 기다립니다."""
+        for executor in self._retired:
+            executor.shutdown(wait=True)
+        self._retired = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._pool_size = 0
+
+    def stats(self) -> Dict[str, Dict]:
+        """URL별 상태를 딕셔너리로 반환합니다."""
+        with self._lock:
+            return {
+                url: {
+                    'interval': round(target.interval, 2),
+                    'polls': target.polls,
+                    'changes': target.changes,
+                    'errors': target.errors,
+                    'failures': target.failures,
+                    'last_error': target.last_error,
+                }
+                for url, target in self.targets.items()
+            }
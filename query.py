@@ -0,0 +1,533 @@
+"""
+크롤링 결과 질의 엔진
+여러 번 크롤링한 결과를 메모리에 열 단위(NumPy 배열)로 쌓아 두고 바로 질의합니다.
+
+- Symbol 해시 색인: 종목별 가장 최근 행의 위치 (같은 종목이 다시 들어오면 이전 행은 과거 행이 됩니다)
+- 정렬 색인: Price, Change %, Volume, Market Cap 열을 값 순서로 정렬한 위치 배열.
+  범위 조건은 이진 탐색으로 후보를 줄이고, 조건 없는 상위 k개는 색인 끝에서 바로 꺼냅니다.
+- 나머지 조건과 정렬은 배열 연산(마스크, argpartition)으로 처리합니다.
+
+    engine = QueryEngine(stocks)
+    engine.query().where('market_cap', '>', 1e9).top(20, 'change_percent').rows()
+    engine.query().filter('volume > 5 * avg_volume').rows()
+
+명령줄: python query.py stock_data.csv --where "market_cap > 1B" --top 20 --by change_percent
+        (python stock_crawler.py query ... 도 같습니다)
+"""
+import argparse
+import os
+import re
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from normalize import normalize_column
+from stock_row import NUMERIC_COLUMNS, TEXT_COLUMNS, StockRow, StockTable, parse_number
+
+
+# 정렬 색인을 만들어 두는 열
+INDEXED_COLUMNS = ('price', 'change_percent', 'volume', 'market_cap')
+
+# 엑셀 열 이름 -> 엔진 열 이름 (질의에서 둘 다 쓸 수 있습니다)
+COLUMN_ALIASES = {
+    'Symbol': 'symbol', 'Name': 'name', 'Price': 'price', 'Change': 'change', 'Change %': 'change_percent',
+    'Volume': 'volume', 'Avg Vol (3M)': 'avg_volume', 'Market Cap': 'market_cap', 'P/E Ratio (TTM)': 'pe_ratio',
+    '52 Wk Change %': 'week52_change_percent',
+}
+
+_OPS = {
+    '>': np.greater, '>=': np.greater_equal, '<': np.less, '<=': np.less_equal,
+    '==': np.equal, '!=': np.not_equal,
+}
+
+_CONDITION = re.compile(r'^\s*(.+?)\s*(>=|<=|==|!=|>|<)\s*(.+?)\s*$')
+
+
+def column_name(name: str) -> str:
+    """엑셀 열 이름이나 엔진 열 이름을 엔진 열 이름으로 바꿉니다."""
+    name = COLUMN_ALIASES.get(name, name)
+    if name not in NUMERIC_COLUMNS and name not in TEXT_COLUMNS:
+        raise ValueError(f"알 수 없는 열입니다: {name} (가능한 열: {', '.join(TEXT_COLUMNS + NUMERIC_COLUMNS)})")
+    return name
+
+
+class QueryEngine:
+    """
+    크롤링 결과를 쌓아 두고 질의하는 열 단위 저장소
+
+    사용 예:
+        engine = QueryEngine()
+        engine.add(crawler.fetch(url))        # 크롤링할 때마다 추가
+        engine.query().where('volume', '>', 'avg_volume', scale=5).rows()
+    """
+
+    def __init__(self, stocks=None, indexed: Iterable[str] = INDEXED_COLUMNS):
+        """
+        Args:
+            stocks: 처음에 넣을 데이터 (add와 같은 형식)
+            indexed: 정렬 색인을 만들 숫자 열
+        """
+        self.indexed = tuple(column_name(name) for name in indexed)
+        self.symbol_index: Dict[str, int] = {}
+        self._size = 0
+        self._numeric = {name: np.empty(0) for name in NUMERIC_COLUMNS}
+        self._text = {name: np.empty(0, dtype=object) for name in TEXT_COLUMNS}
+        self._latest = np.empty(0, dtype=bool)
+        self._sorted: Dict[str, tuple] = {}
+        if stocks is not None:
+            self.add(stocks)
+
+    def __len__(self) -> int:
+        """종목 수 (종목별 최근 행 수)"""
+        return len(self.symbol_index)
+
+    @property
+    def total_rows(self) -> int:
+        """과거 행을 포함한 전체 행 수"""
+        return self._size
+
+    # --- 데이터 추가 --------------------------------------------------
+
+    def add(self, stocks) -> int:
+        """
+        크롤링 결과를 추가합니다. 이미 있는 종목은 새 행이 최근 행이 됩니다.
+
+        Args:
+            stocks: 딕셔너리 리스트, StockRow 리스트 또는 StockTable
+
+        Returns:
+            추가한 행 수
+        """
+        if not isinstance(stocks, StockTable):
+            stocks = StockTable.from_rows(stocks)
+        return self.add_columns(stocks.to_numpy())
+
+    def add_columns(self, columns: Dict[str, Union[np.ndarray, list]]) -> int:
+        """
+        열 이름 -> 배열 딕셔너리로 추가합니다. (StockTable.to_numpy()와 같은 형식, 없는 숫자 열은 NaN)
+        대량 데이터를 행 객체 없이 바로 넣을 때 씁니다.
+        """
+        symbols = np.asarray(columns['symbol'], dtype=object)
+        count = len(symbols)
+        start = self._size
+        self._reserve(start + count)
+        end = start + count
+
+        for name in TEXT_COLUMNS:
+            values = columns.get(name)
+            self._text[name][start:end] = '' if values is None else np.asarray(values, dtype=object)
+        for name in NUMERIC_COLUMNS:
+            values = columns.get(name)
+            self._numeric[name][start:end] = np.nan if values is None else np.asarray(values, dtype=np.float64)
+
+        latest = self._latest
+        latest[start:end] = True
+        index = self.symbol_index
+        for position, symbol in enumerate(symbols.tolist(), start):
+            previous = index.get(symbol)
+            if previous is not None:
+                latest[previous] = False
+            index[symbol] = position
+
+        self._size = end
+        self._sorted.clear()
+        return count
+
+    def _reserve(self, size: int):
+        """배열 용량을 두 배씩 늘립니다. (추가할 때마다 전체를 복사하지 않도록)"""
+        capacity = len(self._latest)
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2, 1024)
+        for columns in (self._numeric, self._text):
+            for name, values in columns.items():
+                grown = np.empty(capacity, dtype=values.dtype)
+                grown[:self._size] = values[:self._size]
+                columns[name] = grown
+        latest = np.zeros(capacity, dtype=bool)
+        latest[:self._size] = self._latest[:self._size]
+        self._latest = latest
+
+    # --- 색인 ---------------------------------------------------------
+
+    def column(self, name: str) -> np.ndarray:
+        """열 전체 배열 (과거 행 포함, 복사하지 않음)"""
+        name = column_name(name)
+        columns = self._numeric if name in self._numeric else self._text
+        return columns[name][:self._size]
+
+    def latest_positions(self) -> np.ndarray:
+        """종목별 최근 행의 위치"""
+        return np.flatnonzero(self._latest[:self._size])
+
+    def sorted_index(self, name: str):
+        """
+        최근 행을 name 열 값 순서로 정렬한 (위치 배열, 값 배열). 값이 없는(NaN) 행은 빠집니다.
+        처음 쓸 때 만들고, 데이터가 추가되면 다시 만듭니다.
+        """
+        name = column_name(name)
+        cached = self._sorted.get(name)
+        if cached is None:
+            values = self.column(name)
+            positions = self.latest_positions()
+            positions = positions[~np.isnan(values[positions])]
+            order = positions[np.argsort(values[positions], kind='stable')]
+            cached = self._sorted[name] = (order, values[order])
+        return cached
+
+    def build_indexes(self):
+        """정렬 색인을 미리 모두 만듭니다."""
+        for name in self.indexed:
+            self.sorted_index(name)
+
+    # --- 질의 ---------------------------------------------------------
+
+    def query(self) -> 'Query':
+        """새 질의를 시작합니다."""
+        return Query(self)
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """종목의 최근 행 (없으면 None)"""
+        position = self.symbol_index.get(symbol)
+        return None if position is None else self.row(position)
+
+    def row(self, position: int) -> Dict:
+        """position 위치의 행을 parse_html_table과 같은 형식의 딕셔너리로 반환합니다."""
+        values = {name: self._text[name][position] for name in TEXT_COLUMNS}
+        for name in NUMERIC_COLUMNS:
+            value = float(self._numeric[name][position])
+            if np.isnan(value):
+                value = None
+            elif name in ('volume', 'avg_volume'):
+                value = int(value)
+            values[name] = value
+        return StockRow(**values).to_dict()
+
+
+class Query:
+    """
+    QueryEngine 질의. 메서드를 이어 붙여 조건을 쌓고 rows() / positions() / count()로 실행합니다.
+    조건은 모두 AND로 묶이며, 값이 없는(NaN) 행은 조건을 만족하지 않습니다.
+    """
+
+    def __init__(self, engine: QueryEngine):
+        self.engine = engine
+        self._conditions = []
+        self._symbols: Optional[List[str]] = None
+        self._sort: Optional[str] = None
+        self._descending = True
+        self._limit: Optional[int] = None
+        self._history = False
+
+    def where(self, column: str, op: str, value: Union[float, str], scale: float = 1.0) -> 'Query':
+        """
+        조건을 추가합니다.
+
+        Args:
+            column: 숫자 열 이름 ('market_cap' 또는 'Market Cap')
+            op: '>', '>=', '<', '<=', '==', '!='
+            value: 비교할 숫자 또는 다른 숫자 열 이름
+            scale: value에 곱할 배수 (예: where('volume', '>', 'avg_volume', scale=5))
+        """
+        if op not in _OPS:
+            raise ValueError(f"지원하지 않는 비교 연산자입니다: {op}")
+        column = column_name(column)
+        if isinstance(value, str):
+            value = column_name(value)
+        else:
+            value = float(value)
+        self._conditions.append((column, op, value, float(scale)))
+        return self
+
+    def filter(self, expression: str) -> 'Query':
+        """
+        문자열 조건을 추가합니다.
+        예: 'market_cap > 1B', 'Change % >= 5', 'volume > 5 * avg_volume', 'pe_ratio < price'
+        """
+        match = _CONDITION.match(expression)
+        if match is None:
+            raise ValueError(f"조건을 해석할 수 없습니다: {expression}")
+        column, op, right = match.groups()
+        number = parse_number(right)
+        if number is not None:
+            return self.where(column, op, number)
+        # '5 * avg_volume' / 'avg_volume * 5' / 'avg_volume'
+        factor, other = 1.0, right
+        if '*' in right:
+            first, _, second = (part.strip() for part in right.partition('*'))
+            number = parse_number(first)
+            factor, other = (number, second) if number is not None else (parse_number(second), first)
+            if factor is None:
+                raise ValueError(f"조건을 해석할 수 없습니다: {expression}")
+        return self.where(column, op, other, scale=factor)
+
+    def symbols(self, symbols: Iterable[str]) -> 'Query':
+        """지정한 종목만 봅니다. (Symbol 해시 색인으로 찾습니다)"""
+        self._symbols = list(symbols)
+        return self
+
+    def sort(self, column: str, descending: bool = True) -> 'Query':
+        """column 값으로 정렬합니다. 값이 없는 행은 결과에서 빠집니다."""
+        self._sort = column_name(column)
+        self._descending = descending
+        return self
+
+    def limit(self, count: int) -> 'Query':
+        self._limit = count
+        return self
+
+    def top(self, count: int, column: str, descending: bool = True) -> 'Query':
+        """column 기준 상위 count개 (descending=False이면 하위)"""
+        return self.sort(column, descending).limit(count)
+
+    def include_history(self) -> 'Query':
+        """종목별 최근 행뿐 아니라 과거 크롤링의 행도 모두 봅니다."""
+        self._history = True
+        return self
+
+    # --- 실행 ---------------------------------------------------------
+
+    def _candidates(self):
+        """
+        조건을 적용하기 전의 후보 위치와 남은 조건을 정합니다.
+        정렬 색인이 있는 열의 숫자 조건이 있으면 가장 좁은 범위를 이진 탐색으로 잘라 냅니다.
+        """
+        engine = self.engine
+        conditions = list(self._conditions)
+        if self._symbols is not None:
+            index = engine.symbol_index
+            positions = [index[symbol] for symbol in self._symbols if symbol in index]
+            return np.array(positions, dtype=np.intp), conditions
+        if self._history:
+            return np.arange(engine.total_rows), conditions
+
+        best = None
+        for condition in conditions:
+            column, op, value, _ = condition
+            if column not in engine.indexed or isinstance(value, str) or op == '!=':
+                continue
+            order, values = engine.sorted_index(column)
+            lo, hi = 0, len(values)
+            if op in ('>', '<='):
+                cut = np.searchsorted(values, value, 'right')
+            else:
+                cut = np.searchsorted(values, value, 'left')
+            if op in ('>', '>='):
+                lo = cut
+            elif op in ('<', '<='):
+                hi = cut
+            else:
+                lo, hi = cut, np.searchsorted(values, value, 'right')
+            if best is None or hi - lo < best[1] - best[0]:
+                best = (lo, hi, order, condition)
+        if best is None:
+            return engine.latest_positions(), conditions
+        lo, hi, order, condition = best
+        conditions.remove(condition)
+        return np.sort(order[lo:hi]), conditions
+
+    def positions(self) -> np.ndarray:
+        """조건을 만족하는 행의 위치 (정렬 / 개수 제한 적용)"""
+        engine = self.engine
+
+        # 조건 없는 상위 k개: 정렬 색인 끝에서 바로 꺼냅니다
+        if (self._sort in engine.indexed and not self._conditions and self._symbols is None
+                and not self._history):
+            order, _ = engine.sorted_index(self._sort)
+            if self._descending:
+                order = order[::-1]
+            return order[:self._limit] if self._limit is not None else order
+
+        positions, conditions = self._candidates()
+        for column, op, value, scale in conditions:
+            left = engine.column(column)[positions]
+            right = engine.column(value)[positions] * scale if isinstance(value, str) else value * scale
+            matched = _OPS[op](left, right)
+            if op == '!=':
+                # NaN != x는 참이지만 값이 없는 행은 어떤 조건도 만족하지 않습니다
+                matched &= ~(np.isnan(left) | np.isnan(right))
+            positions = positions[matched]
+
+        if self._sort is not None:
+            keys = engine.column(self._sort)[positions]
+            present = ~np.isnan(keys)
+            positions, keys = positions[present], keys[present]
+            if self._descending:
+                keys = -keys
+            if self._limit is not None and self._limit < len(positions):
+                # 전체를 정렬하지 않고 상위 k개만 골라 그 안에서 정렬합니다
+                chosen = np.argpartition(keys, self._limit - 1)[:self._limit]
+                positions, keys = positions[chosen], keys[chosen]
+            positions = positions[np.argsort(keys, kind='stable')]
+        if self._limit is not None:
+            positions = positions[:self._limit]
+        return positions
+
+    def count(self) -> int:
+        return len(self.positions())
+
+    def rows(self) -> List[Dict]:
+        """결과를 parse_html_table과 같은 형식의 딕셔너리 리스트로 반환합니다."""
+        return [self.engine.row(position) for position in self.positions().tolist()]
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.rows())
+
+
+# --- 파일 불러오기 ------------------------------------------------------
+
+def _frame_columns(df, percent_fraction: bool = False) -> Dict[str, np.ndarray]:
+    """
+    sinks로 저장한 파일을 읽은 DataFrame을 엔진 열 배열로 바꿉니다.
+
+    Raises:
+        ValueError: 종목을 구분할 Symbol 컬럼이 없는 경우
+    """
+    import pandas as pd
+
+    if 'Symbol' not in df:
+        found = ', '.join(map(str, df.columns[:10])) or '없음'
+        raise ValueError(f"Symbol 컬럼이 없어 종목을 구분할 수 없습니다 (있는 컬럼: {found})")
+    columns = {'symbol': df['Symbol'].astype(str).to_numpy(dtype=object),
+               'name': df['Name'].fillna('').astype(str).to_numpy(dtype=object) if 'Name' in df else None}
+    for source, name in COLUMN_ALIASES.items():
+        if name in TEXT_COLUMNS or source not in df:
+            continue
+        values = df[source]
+        if pd.api.types.is_numeric_dtype(values):
+            # Int64처럼 값이 없는 칸이 <NA>인 열도 NaN으로 바꿉니다
+            numbers = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            if percent_fraction and name in ('change_percent', 'week52_change_percent'):
+                numbers = numbers * 100
+        else:
+            # 엑셀 텍스트 모드 값 ('+8.92%', '$7.164B', '1,234')
+            numbers = normalize_column(values.to_numpy())
+        columns[name] = numbers
+    if '52 Wk Range' in df:
+        ranges = df['52 Wk Range'].fillna('').astype(str).str.split(' - ', n=1, expand=True)
+        if ranges.shape[1] == 2:
+            columns['week52_low'] = normalize_column(ranges[0].to_numpy())
+            columns['week52_high'] = normalize_column(ranges[1].to_numpy())
+    return columns
+
+
+def load_file(engine: QueryEngine, path: str) -> int:
+    """
+    저장된 결과 파일을 엔진에 추가합니다.
+    xlsx / csv / jsonl / parquet / sqlite(stocks 테이블), 스냅샷 저장소(.snap, 모든 스냅샷을 시간 순서로),
+    bulk_parse 출력 폴더(part 파일들)를 읽을 수 있습니다.
+
+    Returns:
+        추가한 행 수
+    """
+    if os.path.isdir(path):
+        return sum(load_file(engine, os.path.join(path, name)) for name in sorted(os.listdir(path))
+                   if name.startswith('part-'))
+    if path.endswith('.snap'):
+        from snapshot_store import SnapshotStore
+        with SnapshotStore(path) as store:
+            return sum(engine.add(store.snapshot_at(timestamp)) for timestamp in store.timestamps)
+
+    import pandas as pd
+    from sinks import format_for_filename
+
+    kind = format_for_filename(path)
+    if kind == 'xlsx':
+        df = pd.read_excel(path)
+    elif kind == 'csv':
+        df = pd.read_csv(path)
+    elif kind == 'jsonl':
+        df = pd.read_json(path, lines=True)
+    elif kind == 'parquet':
+        df = pd.read_parquet(path)
+    elif kind == 'sqlite':
+        import sqlite3
+        with sqlite3.connect(path) as connection:
+            df = pd.read_sql('SELECT * FROM stocks', connection)
+    else:
+        raise ValueError(f"읽을 수 없는 파일 형식입니다: {path}")
+    if df.empty:
+        return 0
+    # 엑셀 숫자 모드(--numeric)는 퍼센트를 100으로 나눈 값으로 저장합니다
+    try:
+        columns = _frame_columns(df, percent_fraction=kind == 'xlsx')
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from None
+    return engine.add_columns(columns)
+
+
+# --- 명령줄 -------------------------------------------------------------
+
+def _display(value, width: int) -> str:
+    if value is None:
+        return f"{'-':>{width}}"
+    return f"{value:>{width}}"
+
+
+def print_rows(rows: List[Dict]):
+    """결과를 표로 출력합니다."""
+    header = (f"{'Symbol':<10} {'Name':<24} {'Price':>10} {'Change %':>9} {'Volume':>13} {'Avg Vol':>10} "
+              f"{'Market Cap':>16} {'P/E':>8}")
+    print(header)
+    print('-' * len(header))
+    for row in rows:
+        change = parse_number(row.get('Change %'))
+        market_cap = parse_number(row.get('Market Cap'))
+        volume = parse_number(row.get('Volume'))
+        print(f"{row.get('Symbol', ''):<10} {row.get('Name', '')[:24]:<24} "
+              f"{_display(row.get('Price'), 10)} "
+              f"{_display(None if change is None else f'{change:+.2f}%', 9)} "
+              f"{_display(None if volume is None else f'{volume:,.0f}', 13)} "
+              f"{_display(row.get('Avg Vol (3M)'), 10)} "
+              f"{_display(None if market_cap is None else f'{market_cap:,.0f}', 16)} "
+              f"{_display(row.get('P/E Ratio (TTM)'), 8)}")
+
+
+def main(argv=None) -> int:
+    """python query.py ... / python stock_crawler.py query ... 의 진입점"""
+    parser = argparse.ArgumentParser(
+        prog='query', description='저장된 크롤링 결과를 불러와 조건 / 정렬로 질의합니다.',
+        epilog='예: query stock_data.csv --where "market_cap > 1B" --top 20 --by change_percent')
+    parser.add_argument('sources', nargs='+',
+                        help='결과 파일 (xlsx, csv, jsonl, parquet, db, snap) 또는 bulk_parse 출력 폴더')
+    parser.add_argument('--where', action='append', default=[], metavar='EXPR',
+                        help="조건 (여러 번 쓸 수 있음). 예: 'market_cap > 1B', 'volume > 5 * avg_volume'")
+    parser.add_argument('--symbols', help='쉼표로 구분한 종목 티커')
+    parser.add_argument('--by', help='정렬할 열 (예: change_percent, market_cap)')
+    parser.add_argument('--asc', action='store_true', help='오름차순으로 정렬합니다 (기본값: 내림차순)')
+    parser.add_argument('--top', type=int, help='결과 개수')
+    parser.add_argument('--history', action='store_true', help='과거 크롤링의 행도 모두 질의합니다')
+    parser.add_argument('-o', '--output', help='결과를 저장할 파일 (확장자로 형식 선택)')
+    args = parser.parse_args(argv)
+
+    engine = QueryEngine()
+    try:
+        for source in args.sources:
+            load_file(engine, source)
+        query = engine.query()
+        for expression in args.where:
+            query.filter(expression)
+        if args.symbols:
+            query.symbols(symbol.strip() for symbol in args.symbols.split(',') if symbol.strip())
+        if args.by:
+            query.sort(args.by, descending=not args.asc)
+        if args.top is not None:
+            query.limit(args.top)
+        if args.history:
+            query.include_history()
+        rows = query.rows()
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"🔎 {len(engine):,}개 종목 ({engine.total_rows:,}행) 중 {len(rows):,}개\n")
+    print_rows(rows)
+    if args.output and rows:
+        from crawler import YahooFinanceCrawler
+        YahooFinanceCrawler().save(rows, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""
+호스트별 요청 속도 제한과 재시도
+여러 URL을 동시에 크롤링해도 같은 호스트에는 정해진 속도(rate)와 순간 허용량(burst)을 넘지 않도록 요청을 늦춥니다.
+
+- 토큰 버킷을 GCRA 방식으로 계산하므로 호스트마다 "다음 요청이 허용되는 시각" 하나만 저장합니다.
+  같은 RateLimiter를 쓰는 스레드끼리는 잠금으로, 여러 프로세스는 path의 상태 파일(파일 잠금)로 공유합니다.
+- 429 / 503 응답은 Retry-After(초 또는 HTTP 날짜)만큼 호스트 전체를 막아, 다른 작업자도 그동안 요청하지 않습니다.
+- 재시도는 요청당 max_retries번, 전체적으로는 RetryBudget(요청 수 대비 비율)까지만 허용합니다.
+
+asyncio 작업에서는 acquire() 대신 reserve()로 기다릴 시간을 받아 await asyncio.sleep(...)으로 기다리면 됩니다.
+"""
+import json
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from metrics import METRICS
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# 재시도할 응답 코드 (Retry-After가 있으면 그만큼 호스트 전체를 막습니다)
+RETRY_STATUSES = (429, 503)
+# 다른 코드도 일시적인 서버 오류이므로 재시도하지만 호스트를 막지는 않습니다
+TRANSIENT_STATUSES = (500, 502, 504)
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Retry-After 헤더 값(초 또는 HTTP 날짜)을 초 단위로 반환합니다.
+    값이 없거나 해석할 수 없으면 None을 반환합니다.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when - (time.time() if now is None else now))
+
+
+def host_of(url: str) -> str:
+    """속도 제한을 나누는 기준 (호스트:포트)"""
+    return urlsplit(url).netloc.lower() or url
+
+
+class RetryBudget:
+    """
+    재시도 예산: 지금까지의 요청 수 대비 재시도 비율을 제한합니다.
+    서버가 계속 실패할 때 모든 요청이 max_retries번씩 재시도해 부하를 몇 배로 키우는 것을 막습니다.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10):
+        """
+        Args:
+            ratio: 요청 수 대비 허용할 재시도 비율 (0.2이면 요청 100개에 재시도 20번)
+            min_retries: 요청 수와 관계없이 허용할 재시도 수 (처음 몇 요청에서도 재시도할 수 있도록)
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        """새 요청 하나를 기록합니다 (재시도는 제외)."""
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self) -> bool:
+        """예산이 남아 있으면 재시도 하나를 쓰고 True를 반환합니다."""
+        with self._lock:
+            if self.retries >= self.min_retries + self.ratio * self.requests:
+                return False
+            self.retries += 1
+            return True
+
+
+class RateLimiter:
+    """
+    호스트별 토큰 버킷 속도 제한기 겸 재시도 정책
+
+    사용 예:
+        limiter = RateLimiter(rate=2, burst=4, path='.rate_limit.json')   # 프로세스끼리 공유
+        crawler = YahooFinanceCrawler(rate_limiter=limiter)
+    """
+
+    def __init__(self, rate: float = 2.0, burst: int = 4, per_host: Optional[Dict[str, Tuple[float, int]]] = None,
+                 path: Optional[str] = None, max_retries: int = 3, backoff: float = 1.0, max_backoff: float = 30.0,
+                 max_retry_after: float = 120.0, budget: Optional[RetryBudget] = None,
+                 clock: Callable[[], float] = time.time, sleep: Callable[[float], None] = time.sleep,
+                 rng: Optional[random.Random] = None):
+        """
+        Args:
+            rate: 호스트별 초당 요청 수 (0이면 제한하지 않고 재시도만 합니다)
+            burst: 쉬고 있던 호스트에 한 번에 보낼 수 있는 요청 수
+            per_host: 호스트별로 다른 (rate, burst) (예: {'query1.finance.yahoo.com': (1, 2)})
+            path: 상태 파일 경로. 주면 같은 파일을 쓰는 모든 프로세스가 속도 제한을 공유합니다
+            max_retries: 요청 하나의 최대 재시도 횟수
+            backoff: Retry-After가 없을 때 첫 재시도 전 대기 시간 (재시도마다 두 배, 지터 포함)
+            max_backoff: 재시도 전 최대 대기 시간
+            max_retry_after: 이보다 긴 Retry-After는 재시도하지 않고 응답을 그대로 돌려줍니다
+                             (호출자의 백오프, 예: poller.Poller에 맡깁니다)
+            budget: 재시도 예산 (기본값: RetryBudget())
+            clock: 현재 시각 함수 (프로세스끼리 공유하려면 벽시계 시각이어야 합니다)
+            sleep: 대기 함수
+            rng: 지터에 쓸 난수 생성기
+        """
+        self.rate = rate
+        self.burst = burst
+        self.per_host = dict(per_host or {})
+        self.path = path
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.budget = budget or RetryBudget()
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        # 호스트별로 다음 요청이 허용되는 시각(TAT)에서 버스트 허용치를 뺀 값이 기준이 됩니다
+        self._tat: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    # --- 상태 저장 ----------------------------------------------------
+
+    def _limits(self, host: str) -> Tuple[float, float]:
+        """호스트의 (요청 간격, 버스트 허용치) (초)"""
+        rate, burst = self.per_host.get(host, (self.rate, self.burst))
+        if rate <= 0:
+            return 0.0, 0.0
+        interval = 1.0 / rate
+        return interval, interval * (max(1, burst) - 1)
+
+    def _update(self, host: str, update: Callable[[float], Tuple[float, float]]) -> float:
+        """
+        잠금을 잡은 채로 호스트의 TAT를 읽어 update(tat) -> (새 tat, 결과)를 적용하고 결과를 반환합니다.
+        path가 있으면 파일 잠금 아래에서 상태 파일을 읽고 씁니다.
+        """
+        with self._lock:
+            if self.path is None:
+                tat, result = update(self._tat.get(host, 0.0))
+                self._tat[host] = tat
+                return result
+
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                _lock_file(fd)
+                try:
+                    raw = b''
+                    while True:
+                        chunk = os.read(fd, 64 * 1024)
+                        if not chunk:
+                            break
+                        raw += chunk
+                    try:
+                        state = json.loads(raw) if raw else {}
+                    except ValueError:
+                        state = {}
+                    tat, result = update(float(state.get(host, 0.0)))
+                    state[host] = tat
+                    # 한 시간 넘게 요청이 없던 호스트는 지웁니다
+                    now = self.clock()
+                    state = {key: value for key, value in state.items() if value > now - 3600}
+                    data = json.dumps(state).encode('utf-8')
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    os.write(fd, data)
+                    os.ftruncate(fd, len(data))
+                finally:
+                    _unlock_file(fd)
+            finally:
+                os.close(fd)
+            return result
+
+    # --- 속도 제한 ----------------------------------------------------
+
+    def reserve(self, url: str) -> float:
+        """
+        요청 하나의 자리를 예약하고, 그 자리까지 기다려야 하는 시간(초)을 반환합니다.
+        기다리지 않으므로 asyncio 작업에서도 쓸 수 있습니다.
+        """
+        host = host_of(url)
+        interval, tolerance = self._limits(host)
+        now = self.clock()
+
+        def take(tat):
+            start = max(now, tat - tolerance)
+            if interval == 0:
+                # 속도 제한 없이 Retry-After로 막힌 시간만 지킵니다
+                return tat, start - now
+            return max(tat, start) + interval, start - now
+
+        return self._update(host, take)
+
+    def acquire(self, url: str) -> float:
+        """요청을 보내도 될 때까지 기다립니다. 기다린 시간(초)을 반환합니다."""
+        wait = self.reserve(url)
+        if wait > 0:
+            METRICS.incr('rate_limit_waits')
+            METRICS.observe('rate_limit_wait', wait)
+            self.sleep(wait)
+        return wait
+
+    def penalize(self, url: str, seconds: float):
+        """
+        호스트 전체를 seconds초 동안 막습니다 (Retry-After).
+        풀린 뒤에도 버스트 없이 rate 간격으로 요청이 이어지도록 합니다.
+        """
+        host = host_of(url)
+        interval, tolerance = self._limits(host)
+        until = self.clock() + seconds
+
+        def block(tat):
+            return max(tat, until + tolerance), None
+
+        self._update(host, block)
+
+    # --- 재시도 -------------------------------------------------------
+
+    def _backoff(self, attempt: int) -> float:
+        """지터를 섞은 지수 백오프: [delay/2, delay] 구간에서 고릅니다"""
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return self.rng.uniform(delay / 2, delay)
+
+    def request(self, get: Callable, url: str, **kwargs):
+        """
+        속도 제한을 지키며 get(url, **kwargs)를 호출하고, 일시적인 실패는 재시도합니다.
+
+        Args:
+            get: 요청 함수 (예: requests.Session.get)
+            url: 요청 URL
+            **kwargs: get에 넘길 인자
+
+        Returns:
+            응답. 재시도 횟수나 예산을 다 쓰면 마지막 응답(429 등)을 그대로 반환하므로
+            호출자는 평소처럼 raise_for_status()로 처리합니다.
+
+        Raises:
+            requests.ConnectionError, requests.Timeout: 재시도해도 연결하지 못한 경우
+        """
+        import requests
+
+        self.budget.record_request()
+        attempt = 0
+        while True:
+            self.acquire(url)
+            try:
+                response = get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries or not self.budget.try_spend():
+                    METRICS.incr('retries_exhausted')
+                    raise
+                self.sleep(self._backoff(attempt))
+                attempt += 1
+                METRICS.incr('retries')
+                continue
+
+            status = response.status_code
+            if status not in RETRY_STATUSES and status not in TRANSIENT_STATUSES:
+                return response
+
+            if status == 429:
+                METRICS.incr('rate_limited')
+            retry_after = parse_retry_after(response.headers.get('Retry-After'), self.clock())
+            if retry_after is not None and retry_after > self.max_retry_after:
+                # 재시도는 하지 않지만, 그동안 다른 작업자도 이 호스트에 요청하지 않도록 막습니다
+                if status in RETRY_STATUSES:
+                    self.penalize(url, retry_after)
+                return response
+            delay = self._backoff(attempt) if retry_after is None else retry_after
+            if status in RETRY_STATUSES:
+                # 다른 작업자도 같은 호스트에 요청하지 않도록 호스트 전체를 막습니다
+                self.penalize(url, delay)
+            if attempt >= self.max_retries or not self.budget.try_spend():
+                METRICS.incr('retries_exhausted')
+                return response
+
+            response.close()
+            if status not in RETRY_STATUSES:
+                self.sleep(delay)
+            attempt += 1
+            METRICS.incr('retries')
+
+
+def _lock_file(fd: int):
+    """상태 파일에 배타적 잠금을 겁니다 (다른 프로세스가 풀 때까지 기다립니다)"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+
+def _unlock_file(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
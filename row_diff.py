@@ -0,0 +1,158 @@
+"""
+크롤링 사이의 행 단위 변경 감지
+직전 결과를 Symbol로 색인해 두고, 새 결과와 비교해 바뀐 부분만 이벤트로 내보냅니다.
+
+    {"op": "add", "symbol": "ELPC", "row": {...}}                          새로 나타난 종목
+    {"op": "change", "symbol": "ELPC", "fields": {"Price": ["9.65", "9.71"]}}   바뀐 필드의 [이전 값, 새 값]
+    {"op": "remove", "symbol": "ELPC"}                                      사라진 종목
+
+행마다 해시를 저장해 두므로 비교는 O(n)이고, 해시가 다른 행만 필드 단위로 비교합니다.
+한쪽에만 있는 필드는 없는 쪽 값을 None으로 씁니다.
+"""
+import json
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+
+class RowIndex:
+    """결과 하나를 Symbol -> 행, Symbol -> 행 해시로 색인한 것"""
+
+    __slots__ = ('rows', 'hashes')
+
+    def __init__(self, stocks: Iterable[Dict] = ()):
+        self.rows: Dict[str, Dict] = {}
+        self.hashes: Dict[str, int] = {}
+        for stock in stocks:
+            symbol = stock.get('Symbol')
+            if symbol is None:
+                continue
+            self.rows[symbol] = stock
+            self.hashes[symbol] = hash(tuple(stock.items()))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.rows
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        return self.rows.get(symbol)
+
+
+def changed_fields(old: Dict, new: Dict) -> Dict[str, list]:
+    """두 행에서 값이 다른 필드의 {필드: [이전 값, 새 값]}"""
+    fields = {}
+    for key, value in new.items():
+        before = old.get(key)
+        if before != value:
+            fields[key] = [before, value]
+    for key, before in old.items():
+        if key not in new and before is not None:
+            fields[key] = [before, None]
+    return fields
+
+
+def diff_index(old: RowIndex, new: RowIndex) -> Iterator[Dict]:
+    """
+    두 색인의 차이를 이벤트로 내보냅니다. (새 결과의 순서대로 add / change, 그 다음 remove)
+
+    Yields:
+        {'op': 'add' | 'change' | 'remove', 'symbol': ..., ('row' | 'fields'): ...}
+    """
+    old_hashes = old.hashes
+    for symbol, row_hash in new.hashes.items():
+        before = old_hashes.get(symbol)
+        if before is None:
+            yield {'op': 'add', 'symbol': symbol, 'row': new.rows[symbol]}
+        elif before != row_hash:
+            fields = changed_fields(old.rows[symbol], new.rows[symbol])
+            if fields:
+                yield {'op': 'change', 'symbol': symbol, 'fields': fields}
+    new_hashes = new.hashes
+    for symbol in old_hashes:
+        if symbol not in new_hashes:
+            yield {'op': 'remove', 'symbol': symbol}
+
+
+class RowDiffer:
+    """
+    직전 결과를 기억하면서 새 결과가 들어올 때마다 변경 이벤트를 만듭니다.
+
+    사용 예:
+        differ = RowDiffer()
+        for event in differ.diff(crawler.fetch(url)):
+            print(event)
+    """
+
+    def __init__(self, stocks: Iterable[Dict] = ()):
+        self.index = RowIndex(stocks)
+        self.stats = {'add': 0, 'change': 0, 'remove': 0}
+
+    def diff(self, stocks: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        stocks를 직전 결과와 비교합니다. 처음 호출하면 모든 행이 add입니다.
+        색인은 바로 새 결과로 바뀌므로, 돌려받은 이터레이터를 끝까지 읽지 않아도 다음 비교에 영향이 없습니다.
+
+        Returns:
+            변경 이벤트 이터레이터
+        """
+        old, self.index = self.index, RowIndex(stocks)
+        return self._counted(diff_index(old, self.index))
+
+    def _counted(self, events: Iterator[Dict]) -> Iterator[Dict]:
+        for event in events:
+            self.stats[event['op']] += 1
+            yield event
+
+
+def write_jsonl(events: Iterable[Dict], f: TextIO, **fields) -> int:
+    """
+    변경 이벤트를 한 줄에 하나씩 JSON으로 씁니다.
+
+    Args:
+        events: 변경 이벤트 이터러블
+        f: 텍스트 파일 객체
+        **fields: 모든 줄에 덧붙일 값 (예: url=..., ts=...)
+
+    Returns:
+        쓴 이벤트 수
+    """
+    count = 0
+    for event in events:
+        if fields:
+            event = {**fields, **event}
+        f.write(json.dumps(event, ensure_ascii=False, separators=(',', ':')))
+        f.write('\n')
+        count += 1
+    return count
+
+
+def read_jsonl(f: TextIO) -> Iterator[Dict]:
+    """write_jsonl로 쓴 이벤트를 다시 읽습니다."""
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def apply_events(stocks: List[Dict], events: Iterable[Dict]) -> List[Dict]:
+    """
+    이전 결과에 변경 이벤트를 적용한 결과를 만듭니다. (소비자가 전체를 다시 받지 않고 상태를 맞출 때)
+    새로 추가된 행은 끝에 붙습니다.
+    """
+    rows = {stock.get('Symbol'): dict(stock) for stock in stocks}
+    for event in events:
+        symbol = event['symbol']
+        if event['op'] == 'add':
+            rows[symbol] = dict(event['row'])
+        elif event['op'] == 'remove':
+            rows.pop(symbol, None)
+        else:
+            row = rows.setdefault(symbol, {'Symbol': symbol})
+            for key, (_, value) in event['fields'].items():
+                row[key] = value
+    return list(rows.values())
+
+
+def timestamp() -> str:
+    """이벤트에 붙일 현재 시각 (UTC, ISO 8601)"""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
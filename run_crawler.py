@@ -2,7 +2,9 @@
 Yahoo Finance 주식 데이터 크롤러 실행 스크립트
 사용자가 제공한 HTML 테이블에서 최대 50개의 주식 데이터를 추출하여 엑셀 파일로 저장합니다.
 """
-from crawler import YahooFinanceCrawler
+from crawler import YahooFinanceCrawler, DEFAULT_MAX_ROWS
+from parse_cache import ParseCache
+from parse_errors import ParserBrokenError
 import os
 
 
@@ -28,31 +30,32 @@ def main():
         print("\n또는 페이지 소스 보기(Ctrl+U)로 전체 HTML을 복사하여 저장하세요.")
         return
     
-    # HTML 파일 읽기
+    # HTML 파일 읽기 및 파싱 (이전에 파싱한 내용은 캐시에서 바로 가져옵니다)
+    print("\n데이터 추출 중...")
     try:
-        with open(html_file, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        print(f"\n✓ {html_file} 파일을 읽었습니다.")
+        stocks = ParseCache().parse_file(html_file, crawler)
+        print(f"✓ {html_file} 파일을 읽었습니다.")
+    except ParserBrokenError as e:
+        print(f"\n❌ {e}")
+        print(f"   {e.report.summary()}")
+        print("HTML 형식을 확인해주세요. <table> 태그와 <tbody> 내부의 <tr> 태그가 필요합니다.")
+        return
     except Exception as e:
         print(f"\n❌ 파일 읽기 오류: {e}")
         return
     
-    # HTML 파싱
-    print("\n데이터 추출 중...")
-    stocks = crawler.parse_html_table(html_content)
-    
     if not stocks:
         print("\n❌ 추출된 데이터가 없습니다.")
         print("HTML 형식을 확인해주세요. <table> 태그와 <tbody> 내부의 <tr> 태그가 필요합니다.")
         return
     
-    # 50개로 제한
+    # 최대 행 수로 제한
     original_count = len(stocks)
-    stocks = stocks[:50]
+    stocks = stocks[:DEFAULT_MAX_ROWS]
     
     print(f"✓ 총 {len(stocks)}개의 주식 데이터를 추출했습니다.")
-    if original_count > 50:
-        print(f"  (원본 데이터: {original_count}개, 50개로 제한)")
+    if original_count > DEFAULT_MAX_ROWS:
+        print(f"  (원본 데이터: {original_count}개, {DEFAULT_MAX_ROWS}개로 제한)")
     
     # 엑셀 파일로 저장
     output_file = 'stock_data.xlsx'
@@ -68,11 +71,7 @@ def main():
     print("데이터 미리보기 (처음 5개)")
     print("=" * 60)
     for i, stock in enumerate(stocks[:5], 1):
-        print(f"\n{i}. {stock.get('Symbol', 'N/A')} - {stock.get('Name', 'N/A')}")
-        print(f"   가격: ${stock.get('Price', 'N/A')}")
-        print(f"   변동: {stock.get('Change', 'N/A')} ({stock.get('Change %', 'N/A')})")
-        print(f"   거래량: {stock.get('Volume', 'N/A')}")
-        print(f"   시가총액: {stock.get('Market Cap', 'N/A')}")
+        print('\n'.join(crawler.schema.preview_lines(i, stock)))
     
     if len(stocks) > 5:
         print(f"\n... 외 {len(stocks) - 5}개 더")
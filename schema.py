@@ -0,0 +1,302 @@
+"""
+주식 데이터 필드 스키마
+컬럼마다 어느 셀(data-testid-cell)의 어느 요소에서 값을 꺼내는지, 어떻게 변환하는지,
+내보낼 때 어떤 형식으로 쓰는지를 한 곳(DEFAULT_FIELDS)에 선언합니다.
+
+선언은 작업마다 한 번 compile_schema(columns)로 컴파일합니다.
+    - 추출기: 셀 testid -> 그 필드만 처리하는 함수. 필요 없는 컬럼의 셀은 찾아보지도 않습니다.
+    - 스트리밍 파서(stream_parser)가 쓰는 요소 경로
+    - 내보내기 열 계획: 열 순서, 텍스트 모드 포맷, 숫자 모드 변환 / 엑셀 셀 서식
+
+새 컬럼은 DEFAULT_FIELDS에 Field 하나를 추가하면 추출, 오류 기록, 저장, 미리보기에 모두 반영됩니다.
+"""
+import re
+import zlib
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# 셀에 값이 없을 때의 표시 (None은 P/E '--'의 정상 값이므로 구분합니다)
+MISSING = object()
+
+# 선택자 한 단계: 태그 이름, .클래스, [속성="값"] (예: 'a[data-testid="table-cell-ticker"]', 'span.symbol')
+_STEP = re.compile(r'([A-Za-z][\w-]*)((?:\.[\w-]+|\[[\w-]+="[^"]*"\])*)$')
+_STEP_PART = re.compile(r'\.([\w-]+)|\[([\w-]+)="([^"]*)"\]')
+
+
+def _parse_selector(select: Optional[str]) -> Tuple[Tuple[str, Dict[str, str]], ...]:
+    """
+    공백으로 이어진 하위 요소 선택자를 (태그, 속성) 단계들로 바꿉니다.
+    클래스는 속성 'class'로 두며, 요소의 클래스 중 하나와 같으면 일치합니다.
+    """
+    if not select:
+        return ()
+    steps = []
+    for part in select.split():
+        match = _STEP.match(part)
+        if match is None:
+            raise ValueError(f"지원하지 않는 선택자입니다: {part!r} (태그, .클래스, [속성=\"값\"]만 쓸 수 있습니다)")
+        attrs = {}
+        for class_name, name, value in _STEP_PART.findall(match.group(2)):
+            if class_name:
+                attrs['class'] = class_name
+            else:
+                attrs[name] = value
+        steps.append((match.group(1).lower(), attrs))
+    return tuple(steps)
+
+
+def dash_to_none(text: str) -> Optional[str]:
+    """'--'(값 없음 표시)를 None으로 바꿉니다."""
+    return text if text != '--' else None
+
+
+class Field:
+    """
+    컬럼 하나의 선언
+
+    값은 셀 td[data-testid-cell=cell] 안에서 select 경로의 (첫) 요소를 찾아 꺼냅니다.
+    attribute가 있으면 그 속성 값을, 속성이 없거나 attribute가 None이면 공백을 제거한 텍스트를 씁니다.
+    select가 None이면 셀 전체의 텍스트입니다.
+    """
+
+    __slots__ = ('column', 'cell', 'select', 'attribute', 'count', 'join', 'converter',
+                 'export', 'numeric', 'number_format', 'label', 'preview', 'steps')
+
+    def __init__(self, column: str, cell: str, select: Optional[str] = None, attribute: Optional[str] = None,
+                 count: int = 1, join: str = ' ', converter: Optional[Callable[[str], object]] = None,
+                 export: str = 'text', numeric: bool = False, number_format: Optional[str] = None,
+                 label: Optional[str] = None, preview: Optional[str] = None):
+        """
+        Args:
+            column: 결과 딕셔너리 / 저장 파일의 컬럼명
+            cell: 셀의 data-testid-cell 값
+            select: 셀 안에서 값을 꺼낼 요소의 선택자 (예: 'div.labels span')
+            attribute: 텍스트 대신 읽을 속성 (예: 'data-value')
+            count: 1보다 크면 select와 일치하는 처음 count개 요소의 텍스트를 join으로 잇습니다
+                   (요소가 count개보다 적으면 값이 없는 것으로 봅니다)
+            join: count개 값을 이을 문자열
+            converter: 꺼낸 문자열에 적용할 함수 (예: dash_to_none)
+            export: 텍스트 모드 저장 형식
+                    'text' (값이 없으면 ''), 'raw' (그대로), 'number' ('1,234'), 'percent' ('+8.92%'),
+                    'market_cap' ('$7.164B')
+            numeric: 숫자 모드에서 숫자로 변환할지 여부 (export가 'percent'면 엑셀에서는 100으로 나눕니다)
+            number_format: 숫자 모드의 엑셀 셀 서식
+            label: 미리보기에 표시할 이름 (None이면 표시하지 않음)
+            preview: 미리보기 값의 형식 (예: '${Price}', 다른 컬럼도 쓸 수 있음, 기본값: 이 컬럼의 값)
+        """
+        self.column = column
+        self.cell = cell
+        self.select = select
+        self.attribute = attribute
+        self.count = count
+        self.join = join
+        self.converter = converter
+        self.export = export
+        self.numeric = numeric
+        self.number_format = number_format
+        self.label = label
+        self.preview = preview
+        self.steps = _parse_selector(select)
+
+    @property
+    def selector(self) -> str:
+        """값을 찾는 전체 CSS 선택자 (오류 기록용)"""
+        cell = f'td[data-testid-cell="{self.cell}"]'
+        return f"{cell} {self.select}" if self.select else cell
+
+    def signature(self) -> tuple:
+        """추출 결과에 영향을 주는 선언 (캐시 키용)"""
+        converter = getattr(self.converter, '__qualname__', repr(self.converter)) if self.converter else None
+        return (self.column, self.cell, self.select, self.attribute, self.count, self.join, converter)
+
+    def __repr__(self):
+        return f"Field({self.column!r}, {self.cell!r}, {self.select!r})"
+
+
+def _streamer(column: str, cell: str, data_field: str, **options) -> Field:
+    """fin-streamer 요소의 data-value (없으면 텍스트)를 읽는 필드"""
+    return Field(column, cell, f'fin-streamer[data-field="{data_field}"]', attribute='data-value', **options)
+
+
+# 스크리너 표의 컬럼 (이 순서로 저장합니다)
+DEFAULT_FIELDS: Tuple[Field, ...] = (
+    Field('Symbol', 'ticker', 'a[data-testid="table-cell-ticker"] span.symbol'),
+    Field('Name', 'companyshortname.raw', 'div.companyName'),
+    _streamer('Price', 'intradayprice', 'regularMarketPrice',
+              export='number', numeric=True, number_format='#,##0.00', label='가격', preview='${Price}'),
+    _streamer('Change', 'intradaypricechange', 'regularMarketChange',
+              export='number', numeric=True, number_format='+#,##0.00;-#,##0.00;0.00', label='변동',
+              preview='{Change} ({Change %})'),
+    _streamer('Change %', 'percentchange', 'regularMarketChangePercent',
+              export='percent', numeric=True, number_format='+0.00%;-0.00%;0.00%'),
+    _streamer('Volume', 'dayvolume', 'regularMarketVolume',
+              export='number', numeric=True, number_format='#,##0', label='거래량'),
+    Field('Avg Vol (3M)', 'avgdailyvol3m', numeric=True, number_format='#,##0'),
+    _streamer('Market Cap', 'intradaymarketcap', 'marketCap',
+              export='market_cap', numeric=True, label='시가총액',
+              number_format='[>=1000000000000]$#,##0.000,,,,"T";[>=1000000000]$#,##0.000,,,"B";$#,##0.000,,"M"'),
+    Field('P/E Ratio (TTM)', 'peratio.lasttwelvemonths', converter=dash_to_none,
+          export='raw', numeric=True, number_format='0.00'),
+    _streamer('52 Wk Change %', 'fiftytwowkpercentchange', 'fiftyTwoWeekChangePercent',
+              export='percent', numeric=True, number_format='+0.00%;-0.00%;0.00%'),
+    Field('52 Wk Range', 'fiftyTwoWeekRange', 'div.labels span', count=2, join=' - '),
+)
+
+
+def _soup_extractor(field: Field) -> Callable:
+    """BeautifulSoup 셀(td)에서 필드 값을 꺼내는 함수를 만듭니다. (값이 없으면 MISSING)"""
+    path = field.steps[:-1]
+    last_tag, last_attrs = field.steps[-1] if field.steps else (None, None)
+    attribute, count, join = field.attribute, field.count, field.join
+    convert = field.converter
+
+    if not field.steps:
+        def extract(cell):
+            return cell.get_text(strip=True)
+    elif count > 1:
+        def extract(cell):
+            node = cell
+            for tag, attrs in path:
+                node = node.find(tag, attrs)
+                if node is None:
+                    return MISSING
+            nodes = node.find_all(last_tag, last_attrs, limit=count)
+            if len(nodes) < count:
+                return MISSING
+            return join.join(node.get_text(strip=True) for node in nodes)
+    else:
+        def extract(cell):
+            node = cell
+            for tag, attrs in path:
+                node = node.find(tag, attrs)
+                if node is None:
+                    return MISSING
+            node = node.find(last_tag, last_attrs)
+            if node is None:
+                return MISSING
+            if attribute is not None:
+                value = node.get(attribute)
+                if value is not None:
+                    return value
+            return node.get_text(strip=True)
+
+    if convert is None:
+        return extract
+
+    def extract_converted(cell):
+        value = extract(cell)
+        return value if value is MISSING else convert(value)
+    return extract_converted
+
+
+class CompiledSchema:
+    """
+    컴파일된 스키마 (compile_schema로 만듭니다)
+    선택한 컬럼의 추출 함수와 내보내기 열 계획을 담습니다.
+    """
+
+    def __init__(self, fields: Sequence[Field], projected: bool = False):
+        self.fields: Tuple[Field, ...] = tuple(fields)
+        self.columns: Tuple[str, ...] = tuple(field.column for field in self.fields)
+        # 일부 컬럼만 선택했는지 여부 (API / 포함된 JSON 행도 잘라야 하는지)
+        self.projected = projected
+        self.cells: Dict[str, Field] = {field.cell: field for field in self.fields}
+        self.selectors: Dict[str, str] = {field.column: field.selector for field in self.fields}
+        self.key = f"{zlib.crc32(repr([field.signature() for field in self.fields]).encode('utf-8')):08x}"
+        self._extractors = {field.cell: (field.column, _soup_extractor(field)) for field in self.fields}
+
+    def extract_row(self, row, issues: Optional[List] = None, index: int = 0) -> Optional[Dict]:
+        """
+        BeautifulSoup 행(tr)에서 선택한 컬럼만 추출합니다. 각 셀은 한 번만 순회합니다.
+        셀 추출 중 예외가 나면 그 필드만 건너뛰고 issues에 기록합니다. (issues가 None이면 예외를 그대로 발생)
+
+        Returns:
+            주식 데이터 딕셔너리 (값이 하나도 없으면 None)
+        """
+        extractors = self._extractors
+        stock = {}
+        for cell in row.find_all('td', recursive=False):
+            spec = extractors.get(cell.get('data-testid-cell'))
+            if spec is None:
+                continue
+            column, extract = spec
+            try:
+                value = extract(cell)
+            except Exception as e:
+                if issues is None:
+                    raise
+                from parse_errors import FieldIssue
+                issues.append(FieldIssue(index, column, 'error', f"{type(e).__name__}: {e}"))
+                continue
+            if value is not MISSING:
+                stock[column] = value
+        return stock if stock else None
+
+    def project(self, stocks: List[Dict]) -> List[Dict]:
+        """선택하지 않은 컬럼을 뺀 행 리스트 (API / 포함된 JSON처럼 모든 컬럼이 오는 경로용)"""
+        if not self.projected:
+            return stocks
+        columns = self.columns
+        return [{column: stock[column] for column in columns if column in stock} for stock in stocks]
+
+    def export_plan(self) -> Tuple[Field, ...]:
+        """저장할 열과 열별 형식 (DEFAULT_FIELDS 순서)"""
+        return self.fields
+
+    def preview_lines(self, index: int, stock: Dict) -> List[str]:
+        """미리보기 한 항목: 'Symbol - Name' 줄과 label이 있는 컬럼마다 한 줄 (선택하지 않은 컬럼은 생략)"""
+        title = stock.get('Symbol', 'N/A')
+        if 'Name' in self.selectors:
+            title = f"{title} - {stock.get('Name', 'N/A')}"
+        lines = [f"\n{index}. {title}"]
+        values = _PreviewValues(stock)
+        for field in self.fields:
+            if field.label:
+                value = field.preview.format_map(values) if field.preview else values[field.column]
+                lines.append(f"   {field.label}: {value}")
+        return lines
+
+
+class _PreviewValues(dict):
+    """미리보기 형식에 넣을 값 (없는 컬럼은 'N/A')"""
+
+    def __missing__(self, column):
+        return 'N/A'
+
+
+def parse_columns(text: Optional[str]) -> Optional[List[str]]:
+    """명령줄의 'Symbol,Price,Change %' 형식을 컬럼 리스트로 바꿉니다. (빈 값이면 None)"""
+    if not text:
+        return None
+    return [column.strip() for column in text.split(',') if column.strip()]
+
+
+def compile_schema(columns: Optional[Iterable[str]] = None) -> CompiledSchema:
+    """
+    선택한 컬럼만 처리하는 스키마를 컴파일합니다. 같은 컬럼 조합은 한 번만 컴파일합니다.
+
+    Args:
+        columns: 필요한 컬럼명 (None이면 전체). 순서와 관계없이 DEFAULT_FIELDS 순서를 따릅니다.
+
+    Raises:
+        ValueError: 알 수 없는 컬럼명
+    """
+    if columns is None:
+        return _compile(None)
+    return _compile(frozenset(columns))
+
+
+@lru_cache(maxsize=32)
+def _compile(columns: Optional[frozenset]) -> CompiledSchema:
+    if columns is None:
+        return CompiledSchema(DEFAULT_FIELDS)
+    known = {field.column for field in DEFAULT_FIELDS}
+    unknown = sorted(columns - known)
+    if unknown:
+        raise ValueError(f"알 수 없는 컬럼: {', '.join(unknown)} (사용 가능: {', '.join(field.column for field in DEFAULT_FIELDS)})")
+    fields = [field for field in DEFAULT_FIELDS if field.column in columns]
+    return CompiledSchema(fields, projected=len(fields) < len(DEFAULT_FIELDS))
+
+
+DEFAULT_SCHEMA = compile_schema()
@@ -0,0 +1,246 @@
+"""
+출력 싱크(sink)
+주식 데이터를 엑셀 외의 형식으로도 저장할 수 있도록 형식마다 Sink 구현을 둡니다.
+
+- xlsx: 기존 엑셀 저장 (export.write_excel)
+- csv: 텍스트 파일, 어디서나 읽을 수 있음
+- jsonl: 한 줄에 한 행씩 JSON, 기존 파일 뒤에 이어 쓸 수 있음
+- parquet: 열 단위 바이너리, 숫자 타입이 그대로 보존됨 (pyarrow 또는 fastparquet 필요)
+- sqlite: SQLite 테이블에 executemany로 한 트랜잭션에 넣음
+
+엑셀 외의 형식은 기본으로 숫자 열을 숫자로 저장합니다 (퍼센트는 '8.92%' -> 8.92).
+numeric=False를 주면 엑셀 텍스트 모드와 같은 문자열로 저장합니다.
+
+형식 목록(SINKS)은 명령줄 인자 해석에도 쓰이므로, pandas를 쓰는 export 모듈은
+실제로 파일을 쓸 때 불러옵니다.
+"""
+import os
+from typing import Dict, Optional, Sequence, Type
+
+
+class Sink:
+    """
+    출력 형식 하나를 담당하는 기본 클래스
+
+    새 형식은 이 클래스를 상속해 write를 구현하고 register_sink로 등록합니다.
+    """
+
+    name = ''
+    extension = ''
+
+    def __init__(self, numeric: bool = True, chunk_size: int = 10000, columns: Optional[Sequence[str]] = None):
+        """
+        Args:
+            numeric: True이면 숫자 열을 숫자로 저장합니다
+            chunk_size: 한 번에 변환할 행 수
+            columns: 저장할 컬럼명 (None이면 전체, 순서는 schema.DEFAULT_FIELDS를 따름)
+        """
+        self.numeric = numeric
+        self.chunk_size = chunk_size
+        self.columns = columns
+
+    def write(self, stocks, filename: str, crawler=None) -> int:
+        """
+        주식 데이터를 파일에 씁니다.
+
+        Args:
+            stocks: 주식 데이터 딕셔너리 리스트(또는 이터러블) 또는 StockTable
+            filename: 저장할 파일명
+            crawler: 드문 값의 포맷에 쓸 YahooFinanceCrawler
+
+        Returns:
+            저장한 행 수
+        """
+        raise NotImplementedError
+
+    def frame(self, stocks, crawler=None):
+        """전체 데이터를 DataFrame 하나로 변환합니다."""
+        from export import build_export_frame
+        return build_export_frame(stocks, self.numeric, crawler, percent_fraction=False, columns=self.columns)
+
+    def frames(self, stocks, crawler=None):
+        """chunk_size 행씩 변환한 DataFrame을 차례로 돌려줍니다."""
+        from export import _chunks
+        if not isinstance(stocks, list) and hasattr(stocks, 'to_dicts') and self.numeric:
+            # StockTable은 열 배열에서 바로 만들 수 있으므로 나누지 않습니다
+            yield self.frame(stocks, crawler)
+            return
+        for chunk in _chunks(stocks, self.chunk_size):
+            yield self.frame(chunk, crawler)
+
+
+class ExcelSink(Sink):
+    """엑셀 파일 (기존 save_to_excel과 같은 결과)"""
+
+    name = 'xlsx'
+    extension = '.xlsx'
+
+    def __init__(self, numeric: bool = False, chunk_size: int = 10000, write_only: bool = False,
+                 columns: Optional[Sequence[str]] = None):
+        super().__init__(numeric, chunk_size, columns)
+        self.write_only = write_only
+
+    def write(self, stocks, filename: str, crawler=None) -> int:
+        from export import write_excel
+        return write_excel(stocks, filename, numeric=self.numeric, write_only=self.write_only,
+                           chunk_size=self.chunk_size, crawler=crawler, columns=self.columns)
+
+
+class CsvSink(Sink):
+    """CSV 파일 (UTF-8, 첫 줄은 열 이름)"""
+
+    name = 'csv'
+    extension = '.csv'
+
+    def write(self, stocks, filename: str, crawler=None) -> int:
+        count = 0
+        with open(filename, 'w', encoding='utf-8', newline='') as f:
+            for df in self.frames(stocks, crawler):
+                df.to_csv(f, index=False, header=count == 0)
+                count += len(df)
+        if count == 0:
+            self.frame([]).to_csv(filename, index=False)
+        return count
+
+
+class JsonLinesSink(Sink):
+    """JSON Lines 파일. append=True이면 기존 파일 뒤에 이어 씁니다."""
+
+    name = 'jsonl'
+    extension = '.jsonl'
+
+    def __init__(self, numeric: bool = True, chunk_size: int = 10000, append: bool = False,
+                 columns: Optional[Sequence[str]] = None):
+        super().__init__(numeric, chunk_size, columns)
+        self.append = append
+
+    def write(self, stocks, filename: str, crawler=None) -> int:
+        count = 0
+        with open(filename, 'a' if self.append else 'w', encoding='utf-8') as f:
+            for df in self.frames(stocks, crawler):
+                if len(df):
+                    # NaN / <NA>는 null로 씁니다 (object로 바꿔야 <NA>가 섞인 Int64 열이 1.0이 아닌 1로 나옵니다,
+                    # lines=True 출력은 줄바꿈으로 끝납니다)
+                    records = df.astype(object).where(df.notna(), None)
+                    f.write(records.to_json(orient='records', lines=True, force_ascii=False))
+                count += len(df)
+        return count
+
+
+class ParquetSink(Sink):
+    """Parquet 파일 (열 단위, 타입 보존). pyarrow 또는 fastparquet이 필요합니다."""
+
+    name = 'parquet'
+    extension = '.parquet'
+
+    def write(self, stocks, filename: str, crawler=None) -> int:
+        df = self.frame(stocks, crawler)
+        try:
+            df.to_parquet(filename, index=False)
+        except ImportError:
+            raise ImportError("Parquet 저장에는 pyarrow가 필요합니다: pip install pyarrow") from None
+        return len(df)
+
+
+class SqliteSink(Sink):
+    """
+    SQLite 데이터베이스 파일
+    테이블이 없으면 만들고, 모든 행을 한 트랜잭션 안에서 executemany로 넣습니다.
+    """
+
+    name = 'sqlite'
+    extension = '.db'
+
+    def __init__(self, numeric: bool = True, chunk_size: int = 10000, table: str = 'stocks',
+                 replace: bool = False, columns: Optional[Sequence[str]] = None):
+        """
+        Args:
+            table: 저장할 테이블 이름
+            replace: True이면 기존 테이블을 지우고 새로 만듭니다 (False이면 이어서 추가)
+        """
+        super().__init__(numeric, chunk_size, columns)
+        self.table = table
+        self.replace = replace
+
+    def _column_types(self):
+        from normalize import FIELD_KINDS
+        from schema import compile_schema
+
+        def column_type(field):
+            if not (self.numeric and field.numeric):
+                return 'TEXT'
+            return 'INTEGER' if FIELD_KINDS.get(field.column) == 'int' else 'REAL'
+        return [(field.column, column_type(field)) for field in compile_schema(self.columns).export_plan()]
+
+    def write(self, stocks, filename: str, crawler=None) -> int:
+        import sqlite3
+
+        column_types = self._column_types()
+        table = _quote(self.table)
+        columns = ', '.join(f"{_quote(column)} {kind}" for column, kind in column_types)
+        names = ', '.join(_quote(column) for column, _ in column_types)
+        placeholders = ', '.join('?' * len(column_types))
+
+        count = 0
+        connection = sqlite3.connect(filename)
+        try:
+            with connection:  # 하나의 트랜잭션: 실패하면 전체를 되돌립니다
+                if self.replace:
+                    connection.execute(f"DROP TABLE IF EXISTS {table}")
+                connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+                for df in self.frames(stocks, crawler):
+                    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+                    connection.executemany(f"INSERT INTO {table} ({names}) VALUES ({placeholders})", rows)
+                    count += len(df)
+        finally:
+            connection.close()
+        return count
+
+
+def _quote(identifier: str) -> str:
+    """SQL 식별자를 큰따옴표로 감쌉니다 ('Change %' 같은 열 이름용)."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+# 형식 이름 -> Sink 클래스
+SINKS: Dict[str, Type[Sink]] = {}
+
+# 확장자 -> 형식 이름 (대표 확장자 외의 별칭)
+_EXTENSION_ALIASES = {'.json': 'jsonl', '.sqlite': 'sqlite', '.sqlite3': 'sqlite', '.pq': 'parquet'}
+
+
+def register_sink(sink_class: Type[Sink]) -> Type[Sink]:
+    """새 출력 형식을 등록합니다. (데코레이터로도 쓸 수 있습니다)"""
+    SINKS[sink_class.name] = sink_class
+    return sink_class
+
+
+for _sink_class in (ExcelSink, CsvSink, JsonLinesSink, ParquetSink, SqliteSink):
+    register_sink(_sink_class)
+
+
+def get_sink(name: str, **options) -> Sink:
+    """
+    형식 이름으로 Sink를 만듭니다.
+
+    Args:
+        name: 'xlsx', 'csv', 'jsonl', 'parquet', 'sqlite' 또는 register_sink로 등록한 이름
+        **options: Sink 생성자 인자 (numeric, write_only, append, table 등)
+
+    Raises:
+        ValueError: 등록되지 않은 형식인 경우
+    """
+    try:
+        sink_class = SINKS[name]
+    except KeyError:
+        raise ValueError(f"지원하지 않는 출력 형식입니다: {name} (가능한 형식: {', '.join(SINKS)})") from None
+    return sink_class(**options)
+
+
+def format_for_filename(filename: str) -> Optional[str]:
+    """파일 확장자에 맞는 형식 이름을 반환합니다. 모르는 확장자면 None을 반환합니다."""
+    extension = os.path.splitext(filename)[1].lower()
+    for name, sink_class in SINKS.items():
+        if sink_class.extension == extension:
+            return name
+    return _EXTENSION_ALIASES.get(extension)
@@ -0,0 +1,370 @@
+"""
+시계열 스냅샷 저장소
+주기적으로 크롤링한 parse_html_table 결과를 덮어쓰지 않고 하나의 파일에 이어 씁니다.
+
+매 스냅샷을 통째로 저장하지 않고, 이전 스냅샷과 비교해 바뀐 필드만 기록합니다 (델타 인코딩).
+델타는 필드별로 (종목 번호 리스트, 값 리스트) 형태로 묶어 저장하고 (열 단위 인코딩),
+keyframe_interval개마다 전체 상태(키프레임)를 넣어 두어 임의 시각의 테이블을
+가까운 키프레임부터 몇 개의 델타만 적용해 빠르게 복원합니다.
+
+파일 형식:
+    헤더 b'YFSS1'
+    레코드 반복: [본문 길이(4) | 시각(8, float) | 키프레임 여부(1)] + marshal 본문
+"""
+import bisect
+import marshal
+import os
+import struct
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+_FORMAT = b'YFSS1'
+_RECORD_HEADER = struct.Struct('<IdB')
+
+# 필드가 없어졌음을 나타내는 값 (None은 실제 값으로 쓰이므로 marshal이 지원하는 Ellipsis를 씁니다)
+_DELETED = ...
+
+
+class SnapshotStore:
+    """
+    추가 전용(append-only) 스냅샷 저장소
+
+    사용 예:
+        store = SnapshotStore('stock_history.snap')
+        store.append(crawler.parse_html_table(html_content))
+        table = store.snapshot_at(time.time() - 3600)       # 한 시간 전의 테이블
+        prices = store.history('AAPL', start, end)          # 종목 하나의 변화
+    """
+
+    def __init__(self, path: str, keyframe_interval: int = 60, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            path: 저장소 파일 경로 (없으면 새로 만듭니다)
+            keyframe_interval: 이 개수의 스냅샷마다 전체 상태를 저장합니다
+            clock: append에 시각을 주지 않았을 때 쓸 현재 시각 함수
+        """
+        self.path = path
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.clock = clock
+
+        self._timestamps: List[float] = []
+        self._offsets: List[int] = []
+        self._keyframes: List[int] = []          # 키프레임인 레코드 번호
+        self._keyframe_lookup = set()
+        self._symbols: List[str] = []            # 종목 번호 -> Symbol
+        self._symbol_ids: Dict[str, int] = {}
+        self._symbol_records: Dict[int, List[int]] = {}   # 종목 번호 -> 그 종목이 바뀐 레코드 번호
+
+        # 마지막 스냅샷의 상태 (다음 델타 계산용)
+        self._state: Dict[int, Dict] = {}
+        self._order: List[int] = []
+
+        # 마지막으로 복원한 상태 (순서대로 조회할 때 처음부터 다시 적용하지 않도록)
+        self._cursor: Optional[Tuple[int, Dict[int, Dict], List[int]]] = None
+
+        self._lock = threading.Lock()
+        self._load()
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(_FORMAT)
+            self._file.flush()
+
+    # --- 기록 ---------------------------------------------------------
+
+    def append(self, stocks: List[Dict], timestamp: Optional[float] = None) -> int:
+        """
+        스냅샷 하나를 추가합니다.
+
+        Args:
+            stocks: parse_html_table 형식의 주식 데이터 딕셔너리 리스트
+            timestamp: 스냅샷 시각 (기본값: clock())
+
+        Returns:
+            기록한 필드 수 (키프레임이면 전체 필드 수)
+
+        Raises:
+            ValueError: 마지막 스냅샷보다 이른 시각인 경우
+        """
+        timestamp = self.clock() if timestamp is None else float(timestamp)
+        with self._lock:
+            if self._timestamps and timestamp < self._timestamps[-1]:
+                raise ValueError(f"스냅샷 시각은 이전 시각({self._timestamps[-1]})보다 빠를 수 없습니다: {timestamp}")
+
+            new_symbols = []
+            order = []
+            current = {}
+            for stock in stocks:
+                symbol = stock.get('Symbol')
+                if not symbol:
+                    continue
+                symbol_id = self._symbol_ids.get(symbol)
+                if symbol_id is None:
+                    symbol_id = len(self._symbols)
+                    self._symbols.append(symbol)
+                    self._symbol_ids[symbol] = symbol_id
+                    new_symbols.append(symbol)
+                if symbol_id not in current:
+                    order.append(symbol_id)
+                current[symbol_id] = stock
+
+            index = len(self._timestamps)
+            keyframe = index % self.keyframe_interval == 0
+            changes, touched = _diff({} if keyframe else self._state, current)
+            # 키프레임에도 빠진 종목을 적어 두어 종목별 조회(history)가 빠진 시점을 알 수 있게 합니다
+            removed = [symbol_id for symbol_id in self._state if symbol_id not in current]
+            body = marshal.dumps((new_symbols, changes, removed,
+                                  order if keyframe or order != self._order else None))
+
+            offset = self._file.tell()
+            self._file.write(_RECORD_HEADER.pack(len(body), timestamp, keyframe))
+            self._file.write(body)
+            self._file.flush()
+
+            self._index_record(index, timestamp, offset, keyframe, touched | set(removed))
+            self._state = {symbol_id: dict(stock) for symbol_id, stock in current.items()}
+            self._order = order
+            return sum(len(ids) for ids, _ in changes.values())
+
+    def close(self):
+        """파일을 닫습니다."""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- 조회 ---------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    @property
+    def timestamps(self) -> List[float]:
+        """저장된 스냅샷 시각 리스트"""
+        return list(self._timestamps)
+
+    @property
+    def symbols(self) -> List[str]:
+        """한 번이라도 나온 종목 리스트"""
+        return list(self._symbols)
+
+    def snapshot_at(self, timestamp: float) -> List[Dict]:
+        """
+        timestamp 시점(그 시각 또는 그 이전의 마지막 스냅샷)의 테이블을 복원합니다.
+
+        Returns:
+            parse_html_table과 같은 형식의 딕셔너리 리스트 (시각이 첫 스냅샷보다 이르면 빈 리스트)
+        """
+        with self._lock:
+            index = bisect.bisect_right(self._timestamps, timestamp) - 1
+            if index < 0:
+                return []
+            state, order = self._replay(index)
+            return [dict(state[symbol_id]) for symbol_id in order]
+
+    def history(self, symbol: str, start: Optional[float] = None,
+                end: Optional[float] = None) -> List[Tuple[float, Dict]]:
+        """
+        종목 하나의 [start, end] 구간 변화를 반환합니다.
+
+        Args:
+            symbol: 종목 티커
+            start: 시작 시각 (None이면 처음부터). 그 시점의 상태가 첫 항목이 됩니다.
+            end: 끝 시각 (None이면 마지막까지)
+
+        Returns:
+            (시각, 그 시각의 주식 데이터 딕셔너리) 리스트.
+            종목이 바뀐 스냅샷만 포함하며, 목록에서 빠진 시점은 빈 딕셔너리로 표시합니다.
+        """
+        with self._lock:
+            symbol_id = self._symbol_ids.get(symbol)
+            if symbol_id is None or not self._timestamps:
+                return []
+            records = self._symbol_records[symbol_id]
+            first = 0 if start is None else bisect.bisect_left(self._timestamps, start)
+            last = len(self._timestamps) - 1 if end is None else bisect.bisect_right(self._timestamps, end) - 1
+            if first > last:
+                return []
+
+            # start 이전 마지막 키프레임부터 이 종목이 바뀐 레코드만 적용합니다
+            keyframe = self._keyframe_before(first)
+            stock: Optional[Dict] = None      # None이면 그 시점 목록에 없는 종목
+            result = []
+            with open(self.path, 'rb') as f:
+                for index in records[bisect.bisect_left(records, keyframe):bisect.bisect_right(records, last)]:
+                    if index > first and not result and stock is not None:
+                        # 구간 시작 시점의 상태를 첫 항목으로 넣습니다
+                        result.append((self._timestamps[first], dict(stock)))
+                    _, changes, removed, _ = self._read(f, index)
+                    if symbol_id in removed:
+                        stock = None
+                    else:
+                        stock = _apply_one({} if stock is None or index in self._keyframe_lookup else stock,
+                                           changes, symbol_id)
+                    if index >= first:
+                        result.append((self._timestamps[index], dict(stock or {})))
+            if not result and stock is not None:
+                result.append((self._timestamps[first], dict(stock)))
+            return result
+
+    def stats(self) -> Dict[str, int]:
+        """저장소 크기 정보를 딕셔너리로 반환합니다."""
+        return {
+            'snapshots': len(self._timestamps),
+            'keyframes': len(self._keyframes),
+            'symbols': len(self._symbols),
+            'file_bytes': os.path.getsize(self.path),
+        }
+
+    # --- 내부 구현 ----------------------------------------------------
+
+    def _index_record(self, index: int, timestamp: float, offset: int, keyframe: bool, touched):
+        self._timestamps.append(timestamp)
+        self._offsets.append(offset)
+        if keyframe:
+            self._keyframes.append(index)
+            self._keyframe_lookup.add(index)
+        for symbol_id in touched:
+            self._symbol_records.setdefault(symbol_id, []).append(index)
+
+    def _keyframe_before(self, index: int) -> int:
+        return self._keyframes[bisect.bisect_right(self._keyframes, index) - 1]
+
+    def _read(self, f, index: int):
+        f.seek(self._offsets[index])
+        length, _, _ = _RECORD_HEADER.unpack(f.read(_RECORD_HEADER.size))
+        return marshal.loads(f.read(length))
+
+    def _replay(self, index: int) -> Tuple[Dict[int, Dict], List[int]]:
+        """index번 레코드까지 적용한 (상태, 순서)를 만듭니다."""
+        keyframe = self._keyframe_before(index)
+        cursor = self._cursor
+        if cursor is not None and keyframe <= cursor[0] <= index:
+            start, state, order = cursor[0] + 1, cursor[1], cursor[2]
+        else:
+            start, state, order = keyframe, {}, []
+
+        if start <= index:
+            # 필요한 레코드를 파일에서 한 번에 읽습니다
+            state = {symbol_id: dict(stock) for symbol_id, stock in state.items()}
+            with open(self.path, 'rb') as f:
+                f.seek(self._offsets[start])
+                for position in range(start, index + 1):
+                    length, _, _ = _RECORD_HEADER.unpack(f.read(_RECORD_HEADER.size))
+                    _, changes, removed, new_order = marshal.loads(f.read(length))
+                    if position in self._keyframe_lookup:
+                        state = {}
+                    for symbol_id in removed:
+                        state.pop(symbol_id, None)
+                    _apply(state, changes)
+                    if new_order is not None:
+                        order = new_order
+            self._cursor = (index, state, order)
+        return state, order
+
+    def _load(self):
+        """기존 파일의 레코드 위치를 읽어 색인을 만들고 마지막 상태를 복원합니다."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+
+        with open(self.path, 'rb') as f:
+            if f.read(len(_FORMAT)) != _FORMAT:
+                raise ValueError(f"스냅샷 저장소 파일이 아닙니다: {self.path}")
+            valid_end = f.tell()
+            state: Dict[int, Dict] = {}
+            order: List[int] = []
+            while True:
+                offset = f.tell()
+                header = f.read(_RECORD_HEADER.size)
+                if len(header) < _RECORD_HEADER.size:
+                    break
+                length, timestamp, keyframe = _RECORD_HEADER.unpack(header)
+                body = f.read(length)
+                if len(body) < length:
+                    break
+                try:
+                    new_symbols, changes, removed, new_order = marshal.loads(body)
+                except (EOFError, ValueError, TypeError):
+                    break
+
+                for symbol in new_symbols:
+                    self._symbol_ids[symbol] = len(self._symbols)
+                    self._symbols.append(symbol)
+                touched = {symbol_id for ids, _ in changes.values() for symbol_id in ids}
+                self._index_record(len(self._timestamps), timestamp, offset, bool(keyframe), touched | set(removed))
+
+                if keyframe:
+                    state = {}
+                for symbol_id in removed:
+                    state.pop(symbol_id, None)
+                _apply(state, changes)
+                if new_order is not None:
+                    order = new_order
+                valid_end = f.tell()
+
+        # 기록 도중 중단되어 잘린 마지막 레코드는 버립니다
+        if valid_end < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_end)
+        self._state = state
+        self._order = order
+
+
+def _diff(previous: Dict[int, Dict], current: Dict[int, Dict]):
+    """
+    두 상태를 비교해 필드별 변경 내용 {필드: (종목 번호 리스트, 값 리스트)}와
+    바뀐 종목 번호 집합을 반환합니다.
+    """
+    changes: Dict[str, Tuple[List[int], List]] = {}
+    touched = set()
+    for symbol_id, stock in current.items():
+        old = previous.get(symbol_id)
+        if old is None:
+            old = {}
+        elif old == stock:
+            continue
+        for field, value in stock.items():
+            if field not in old or old[field] != value:
+                ids, values = changes.setdefault(field, ([], []))
+                ids.append(symbol_id)
+                values.append(value)
+                touched.add(symbol_id)
+        for field in old:
+            if field not in stock:
+                ids, values = changes.setdefault(field, ([], []))
+                ids.append(symbol_id)
+                values.append(_DELETED)
+                touched.add(symbol_id)
+    return changes, touched
+
+
+def _apply(state: Dict[int, Dict], changes):
+    """변경 내용을 상태에 적용합니다."""
+    for field, (ids, values) in changes.items():
+        for symbol_id, value in zip(ids, values):
+            stock = state.get(symbol_id)
+            if stock is None:
+                stock = state[symbol_id] = {}
+            if value is _DELETED:
+                stock.pop(field, None)
+            else:
+                stock[field] = value
+
+
+def _apply_one(stock: Dict, changes, symbol_id: int) -> Dict:
+    """변경 내용 중 종목 하나의 것만 적용합니다."""
+    for field, (ids, values) in changes.items():
+        try:
+            position = ids.index(symbol_id)
+        except ValueError:
+            continue
+        value = values[position]
+        if value is _DELETED:
+            stock.pop(field, None)
+        else:
+            stock[field] = value
+    return stock
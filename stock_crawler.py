@@ -1,89 +1,257 @@
 """
 Yahoo Finance 주식 데이터 자동 크롤러
-Python 파일 하나만 실행하면 자동으로 데이터를 가져와 엑셀 파일로 저장합니다.
+Python 파일 하나만 실행하면 자동으로 데이터를 가져와 엑셀(또는 --format으로 고른 형식) 파일로 저장합니다.
 """
-from crawler import YahooFinanceCrawler
-import time
+from crawler import YahooFinanceCrawler, DEFAULT_MAX_ROWS
+from metrics import METRICS, Profiler
+from schema import DEFAULT_SCHEMA, parse_columns
+from sinks import SINKS
+from collections import Counter
+from typing import Dict
+from urllib.parse import urlsplit
+import argparse
+import atexit
+import hashlib
+import re
 import sys
 
 
-def crawl_with_selenium(url: str, max_rows: int = 50):
+# 프로세스 안에서 재사용하는 브라우저 풀 (처음 Selenium이 필요할 때 만듭니다)
+_browser_pool = None
+
+
+def get_browser_pool(size: int = 1, crawler=None):
+    """
+    공유 브라우저 풀을 반환합니다. 프로그램이 끝날 때 드라이버를 종료합니다.
+    crawler를 주면 처음 풀을 만들 때 그 크롤러의 파서와 속도 제한을 씁니다.
+    """
+    global _browser_pool
+    if _browser_pool is None:
+        from browser_pool import BrowserPool
+        _browser_pool = BrowserPool(size=size, crawler=crawler)
+        atexit.register(close_browser_pool)
+    return _browser_pool
+
+
+def close_browser_pool():
+    """공유 브라우저 풀의 모든 드라이버를 종료합니다."""
+    global _browser_pool
+    if _browser_pool is not None:
+        _browser_pool.close()
+        _browser_pool = None
+        print("🔒 브라우저를 종료했습니다.")
+
+
+def crawl_with_selenium(url: str, max_rows: int = DEFAULT_MAX_ROWS, crawler=None):
     """
     Selenium을 사용하여 Yahoo Finance 페이지에서 데이터를 크롤링합니다.
     JavaScript로 동적 로딩되는 페이지에 필요합니다.
+    브라우저는 공유 풀에서 빌려 쓰므로 두 번째 호출부터는 Chrome을 다시 띄우지 않습니다.
     """
     try:
-        from selenium import webdriver
-        from selenium.webdriver.chrome.service import Service
-        from selenium.webdriver.chrome.options import Options
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        from webdriver_manager.chrome import ChromeDriverManager
+        import selenium  # noqa: F401
+        import webdriver_manager  # noqa: F401
     except ImportError:
         print("❌ Selenium이 설치되지 않았습니다.")
         print("다음 명령어로 설치하세요: pip install selenium webdriver-manager")
         return []
     
-    print("🌐 브라우저를 시작하는 중...")
+    pool = get_browser_pool(crawler=crawler)
+    if pool.drivers_created == 0:
+        print("🌐 브라우저를 시작하는 중...")
     
-    # Chrome 옵션 설정
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')  # 브라우저 창을 띄우지 않음
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--window-size=1920,1080')
-    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-    
-    driver = None
     try:
-        # ChromeDriver 자동 설치 및 설정
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
         print(f"📡 페이지 로딩 중: {url}")
-        driver.get(url)
-        
-        # 테이블이 로드될 때까지 대기 (최대 30초)
         print("⏳ 데이터 로딩 대기 중...")
-        wait = WebDriverWait(driver, 30)
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'tr[data-testid="data-table-v2-row"]')))
-        
-        # 추가 대기 (JavaScript 렌더링 완료를 위해)
-        time.sleep(3)
-        
-        # HTML 가져오기
-        html_content = driver.page_source
-        
-        # 크롤러로 파싱
-        crawler = YahooFinanceCrawler()
-        stocks = crawler.parse_html_table(html_content)
-        
-        return stocks[:max_rows] if stocks else []
-        
+        return pool.fetch(url, max_rows)
     except Exception as e:
         print(f"❌ Selenium 크롤링 오류: {e}")
         return []
-    finally:
-        if driver:
-            driver.quit()
-            print("🔒 브라우저를 종료했습니다.")
 
 
-def crawl_with_requests(url: str, max_rows: int = 50):
+def output_filenames(urls, extension: str = '.xlsx') -> Dict[str, str]:
+    """
+    URL별 출력 파일명을 만듭니다. URL이 하나면 stock_data, 여러 개면 스크리너 이름(경로의 마지막 부분)을 붙입니다.
+    쿼리나 호스트만 다른 URL처럼 이름이 겹치면 전체 URL의 짧은 해시를 더 붙여 서로 덮어쓰지 않게 합니다.
+    (해시는 실행마다 같으므로 --daemon / --history 파일도 같은 이름을 계속 씁니다)
+    """
+    urls = list(dict.fromkeys(urls))
+    if len(urls) == 1:
+        return {urls[0]: f"stock_data{extension}"}
+    names = {}
+    for url in urls:
+        name = urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1] or 'stock_data'
+        names[url] = f"stock_data_{re.sub(r'[^A-Za-z0-9_-]', '_', name)}"
+    counts = Counter(names.values())
+    return {url: (f"{name}_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]}" if counts[name] > 1 else name)
+                 + extension
+            for url, name in names.items()}
+
+
+def write_parse_log(path: str, reports):
+    """URL별 파싱 결과(상태, 실패한 행 / 필드 수, 필드 실패 기록)를 한 줄에 하나씩 JSON으로 이어 씁니다."""
+    import json
+    from row_diff import timestamp
+    
+    with open(path, 'a', encoding='utf-8') as f:
+        for report in reports:
+            f.write(json.dumps({'ts': timestamp(), **report.to_dict()}, ensure_ascii=False) + '\n')
+
+
+def make_rate_limiter(args):
+    """
+    명령줄 인자로 호스트별 속도 제한기를 만듭니다 (--rate-file이면 여러 프로세스가 공유).
+    --rate, --rate-file, --max-retries를 하나도 주지 않으면 None(제한, 재시도 없음)을 반환합니다.
+    """
+    if not (args.rate or args.rate_file or args.max_retries):
+        return None
+    from rate_limit import RateLimiter
+    return RateLimiter(rate=args.rate, burst=args.burst, path=args.rate_file, max_retries=args.max_retries)
+
+
+def print_preview(stocks, schema=DEFAULT_SCHEMA):
+    """처음 5개 주식 데이터를 출력합니다. (스키마에서 미리보기 이름(label)이 있는 컬럼만)"""
+    print("\n" + "=" * 70)
+    print("데이터 미리보기 (처음 5개)")
+    print("=" * 70)
+    for i, stock in enumerate(stocks[:5], 1):
+        print('\n'.join(schema.preview_lines(i, stock)))
+    
+    if len(stocks) > 5:
+        print(f"\n... 외 {len(stocks) - 5}개 더")
+
+
+def run_daemon(args, crawler, urls, max_rows):
     """
-    requests를 사용하여 Yahoo Finance 페이지에서 데이터를 크롤링합니다.
-    간단하지만 JavaScript로 동적 로딩되는 경우 작동하지 않을 수 있습니다.
+    --daemon 모드: 크롤러 하나로 URL별 일정대로 계속 크롤링합니다.
+    내용이 바뀔 때마다 출력 파일을 새로 쓰고, --history이면 스냅샷 저장소에도,
+    --diff이면 바뀐 행만 JSONL로 기록합니다.
     """
-    print(f"📡 페이지 요청 중: {url}")
-    crawler = YahooFinanceCrawler()
-    stocks = crawler.crawl_from_url(url, max_rows)
-    return stocks
+    from poller import Poller
+    from row_diff import timestamp, write_jsonl
+    from snapshot_store import SnapshotStore
+    
+    filenames = output_filenames(urls, SINKS[args.format].extension)
+    options = {'numeric': True} if args.numeric else {}
+    stores = {}
+    if args.history:
+        stores = {url: SnapshotStore(name) for url, name in output_filenames(urls, '.snap').items()}
+    diff_file = None
+    if args.diff:
+        diff_file = sys.stdout if args.diff == '-' else open(args.diff, 'a', encoding='utf-8')
+    
+    def log_report(url):
+        if args.parse_log and url in crawler.reports:
+            write_parse_log(args.parse_log, [crawler.reports[url]])
+    
+    def on_change(url, stocks):
+        log_report(url)
+        if stocks:
+            crawler.save(stocks, filenames[url], args.format, **options)
+            if url in stores:
+                stores[url].append(stocks)
+        if diff_file is not None:
+            count = write_jsonl(crawler.diff(url, stocks), diff_file, ts=timestamp(), url=url)
+            diff_file.flush()
+            if diff_file is not sys.stdout:
+                print(f"📝 {url}: 변경 {count}건을 {args.diff}에 기록했습니다.")
+        if args.metrics:
+            METRICS.write(args.metrics)
+    
+    def on_error(url, error):
+        print(f"❌ 크롤링 오류 ({url}): {error}")
+        log_report(url)
+        if args.metrics:
+            METRICS.write(args.metrics)
+    
+    fetch_options = {'paginate': True, 'page_size': args.page_size} if args.paginate else None
+    poller = Poller(crawler, interval=args.interval, min_interval=args.min_interval, max_interval=args.max_interval,
+                    max_rows=max_rows, on_change=on_change, on_error=on_error, fetch_options=fetch_options)
+    for url in urls:
+        poller.add(url)
+    
+    print(f"🔁 데몬 모드: {args.interval:g}초 간격으로 시작합니다 (Ctrl+C로 종료)")
+    try:
+        poller.run()
+    except KeyboardInterrupt:
+        print("\n⏹️  종료하는 중...")
+        poller.stop()
+    finally:
+        poller.close()
+        for store in stores.values():
+            store.close()
+        if diff_file is not None and diff_file is not sys.stdout:
+            diff_file.close()
+    
+    for url, stats in poller.stats().items():
+        print(f"  {url}: {stats['polls']}회 크롤링, {stats['changes']}회 변경, {stats['errors']}회 오류")
+
+
+def parse_args(argv=None):
+    """명령줄 인자를 해석합니다."""
+    parser = argparse.ArgumentParser(description="Yahoo Finance 주식 데이터 자동 크롤러")
+    parser.add_argument('urls', nargs='*', help="크롤링할 Yahoo Finance URL (여러 개면 동시에 크롤링)")
+    parser.add_argument('--max-rows', type=int, default=DEFAULT_MAX_ROWS,
+                        help=f"URL별 최대 추출 개수, 0이면 제한 없음 (기본값: {DEFAULT_MAX_ROWS})")
+    parser.add_argument('--paginate', action='store_true',
+                        help="start/count 오프셋으로 여러 페이지를 병렬로 가져옵니다")
+    parser.add_argument('--page-size', type=int, default=None, help="페이지당 행 수 (--paginate와 함께 사용)")
+    parser.add_argument('--format', default='xlsx', choices=sorted(SINKS),
+                        help="출력 형식 (기본값: xlsx)")
+    parser.add_argument('--numeric', action='store_true',
+                        help="엑셀에서도 값을 숫자로 저장합니다 (다른 형식은 항상 숫자로 저장)")
+    parser.add_argument('--daemon', action='store_true',
+                        help="종료하지 않고 URL별 간격으로 계속 크롤링합니다 (Ctrl+C로 종료)")
+    parser.add_argument('--interval', type=float, default=60,
+                        help="--daemon 모드의 시작 간격(초). 내용 변화에 따라 --min-interval ~ --max-interval로 조절됩니다")
+    parser.add_argument('--min-interval', type=float, default=15, help="--daemon 모드의 최소 간격 (초)")
+    parser.add_argument('--max-interval', type=float, default=600, help="--daemon 모드의 최대 간격 (초)")
+    parser.add_argument('--history', action='store_true',
+                        help="--daemon 모드에서 바뀐 결과를 스냅샷 저장소(.snap)에도 이어서 기록합니다")
+    parser.add_argument('--diff', metavar='PATH',
+                        help="--daemon 모드에서 바뀐 행(추가/삭제/필드 변경)만 JSONL로 이어서 기록합니다 ('-'이면 화면)")
+    parser.add_argument('--fields', metavar='COLUMNS',
+                        help="추출 / 저장할 컬럼 (쉼표로 구분, 예: \"Symbol,Price,Change %%\", 기본값: 전체)")
+    parser.add_argument('--rate', type=float, default=0,
+                        help="호스트별 초당 최대 요청 수 (예: 2, 기본값: 0 = 제한 없음)")
+    parser.add_argument('--burst', type=int, default=4, help="쉬고 있던 호스트에 한 번에 보낼 수 있는 요청 수 (기본값: 4)")
+    parser.add_argument('--rate-file', metavar='PATH',
+                        help="속도 제한 상태 파일. 같은 파일을 쓰는 여러 프로세스가 호스트별 제한을 함께 지킵니다")
+    parser.add_argument('--max-retries', type=int, default=0,
+                        help="429 / 503 / 연결 오류를 재시도할 횟수 (Retry-After 준수, 예: 3, 기본값: 0 = 재시도 안 함)")
+    parser.add_argument('--parse-log', metavar='PATH',
+                        help="URL별 파싱 결과(ok / partial / empty / broken / error, 실패한 행과 필드)를 JSONL로 기록합니다")
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="단계별 시간과 카운터를 저장합니다 (.prom이면 Prometheus 텍스트, 그 밖에는 JSON)")
+    parser.add_argument('--profile', metavar='PATH', help="cProfile 결과를 PATH(.prof)에 저장하고 상위 함수를 출력합니다")
+    parser.add_argument('--tracemalloc', action='store_true', help="메모리 사용량 상위 위치를 출력합니다")
+    args = parser.parse_args(argv)
+    if args.max_rows < 0:
+        parser.error("--max-rows는 0 이상이어야 합니다 (0이면 제한 없음)")
+    if args.page_size is not None and args.page_size <= 0:
+        parser.error("--page-size는 1 이상이어야 합니다")
+    return args
 
 
 def main():
     """메인 실행 함수"""
+    # python stock_crawler.py query ... : 저장된 결과 질의 (query.py)
+    if len(sys.argv) > 1 and sys.argv[1] == 'query':
+        from query import main as query_main
+        sys.exit(query_main(sys.argv[2:]))
+    args = parse_args()
+    
+    with Profiler(args.profile, args.tracemalloc):
+        run(args)
+    
+    if args.metrics:
+        METRICS.write(args.metrics)
+        print(f"\n⏱️  단계별 시간 ({args.metrics}에 저장)")
+        print(METRICS.summary())
+
+
+def run(args):
+    """명령줄 인자대로 크롤링하고 저장합니다."""
     print("=" * 70)
     print("Yahoo Finance 주식 데이터 자동 크롤러")
     print("=" * 70)
@@ -93,29 +261,86 @@ def main():
     # 예시: 상승주, 하락주, 거래량 상위 등
     default_url = "https://finance.yahoo.com/screener/predefined/day_gainers"
     
-    # 명령줄 인자로 URL 받기
-    if len(sys.argv) > 1:
-        url = sys.argv[1]
-    else:
-        url = default_url
+    # 명령줄 인자로 URL 받기 (여러 개를 주면 동시에 크롤링)
+    urls = args.urls or [default_url]
+    multiple = len(urls) > 1
+    filenames = output_filenames(urls, SINKS[args.format].extension)
     
-    max_rows = 50
+    max_rows = args.max_rows or None
     
-    print(f"\n📊 크롤링 대상: {url}")
-    print(f"📈 최대 추출 개수: {max_rows}개\n")
+    # 데몬 모드는 바뀌지 않은 페이지를 304로 재검증하도록 응답 캐시를 씁니다
+    cache = None
+    if args.daemon:
+        from http_cache import ResponseCache
+        cache = ResponseCache(ttl=0)
+    try:
+        crawler = YahooFinanceCrawler(cache=cache, fields=parse_columns(args.fields),
+                                      rate_limiter=make_rate_limiter(args))
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    
+    if args.daemon:
+        run_daemon(args, crawler, urls, max_rows)
+        return
+    
+    print(f"\n📊 크롤링 대상: {', '.join(urls)}")
+    print(f"📈 최대 추출 개수: {f'{max_rows}개' if max_rows else '제한 없음'}\n")
     
     # 방법 1: requests로 시도 (빠르지만 JavaScript 페이지는 실패할 수 있음)
     print("방법 1: 간단한 HTTP 요청 시도 중...")
-    stocks = crawl_with_requests(url, max_rows)
+    if multiple:
+        print(f"📡 {len(urls)}개 {'URL의 여러 페이지를' if args.paginate else '페이지'} 동시 요청 중...")
+        results = crawler.crawl_many(urls, max_rows, paginate=args.paginate, page_size=args.page_size)
+    elif args.paginate:
+        print("📡 여러 페이지를 병렬로 요청 중...")
+        results = {urls[0]: crawler.crawl_from_url(urls[0], max_rows, paginate=True, page_size=args.page_size)}
+    else:
+        print(f"📡 페이지 요청 중: {urls[0]}")
+        results = {urls[0]: crawler.crawl_from_url(urls[0], max_rows)}
     
     # 방법 2: 실패하면 Selenium 사용 (느리지만 JavaScript 페이지도 처리 가능)
-    if not stocks:
-        print("\n방법 1 실패. 방법 2: 브라우저 자동화 시도 중...")
-        print("(이 방법은 Chrome 브라우저가 필요하며 시간이 더 걸릴 수 있습니다)")
-        stocks = crawl_with_selenium(url, max_rows)
+    for url, stocks in results.items():
+        report = crawler.reports.get(url)
+        if report is not None and report.status == 'partial':
+            print(f"⚠️  {url}: {report.summary()}")
+        if not stocks and report is not None and report.status == 'broken':
+            # 브라우저로 받아도 같은 파서로 파싱하므로 Selenium을 띄우지 않습니다
+            print(f"\n❌ 파서가 페이지 구조를 인식하지 못해 브라우저 자동화를 건너뜁니다 ({url})")
+            print(f"   {report.summary()}")
+            continue
+        if not stocks and report is not None and report.http_status == 429:
+            # 요청 제한에 걸린 상태에서 브라우저로 다시 요청하면 차단이 길어질 수 있습니다
+            print(f"\n❌ 요청 제한(429)이 풀리지 않아 브라우저 자동화를 건너뜁니다 ({url})")
+            print(f"   {report.summary()}")
+            continue
+        if not stocks:
+            print(f"\n방법 1 실패 ({url}). 방법 2: 브라우저 자동화 시도 중...")
+            print("(이 방법은 Chrome 브라우저가 필요하며 시간이 더 걸릴 수 있습니다)")
+            results[url] = crawler.schema.project(crawl_with_selenium(url, max_rows, crawler))
     
-    if not stocks:
-        print("\n❌ 데이터를 추출할 수 없습니다.")
+    if args.parse_log:
+        write_parse_log(args.parse_log, crawler.reports.values())
+        print(f"📝 파싱 결과를 {args.parse_log}에 기록했습니다.")
+    
+    saved = []
+    for url, stocks in results.items():
+        if not stocks:
+            print(f"\n❌ 데이터를 추출할 수 없습니다: {url}")
+            continue
+        
+        # 결과 출력
+        print(f"\n✅ {url}: 총 {len(stocks)}개의 주식 데이터를 추출했습니다.")
+        
+        # 선택한 형식으로 저장
+        output_file = filenames[url]
+        options = {'numeric': True} if args.numeric else {}
+        crawler.save(stocks, output_file, args.format, **options)
+        saved.append(output_file)
+        
+        print_preview(stocks, crawler.schema)
+    
+    if not saved:
         print("\n가능한 원인:")
         print("1. 인터넷 연결 문제")
         print("2. Yahoo Finance 페이지 구조 변경")
@@ -125,30 +350,8 @@ def main():
         print("- Chrome 브라우저가 설치되어 있는지 확인")
         return
     
-    # 결과 출력
-    print(f"\n✅ 총 {len(stocks)}개의 주식 데이터를 추출했습니다.")
-    
-    # 엑셀 파일로 저장
-    crawler = YahooFinanceCrawler()
-    output_file = 'stock_data.xlsx'
-    crawler.save_to_excel(stocks, output_file)
-    
-    # 미리보기 출력
-    print("\n" + "=" * 70)
-    print("데이터 미리보기 (처음 5개)")
-    print("=" * 70)
-    for i, stock in enumerate(stocks[:5], 1):
-        print(f"\n{i}. {stock.get('Symbol', 'N/A')} - {stock.get('Name', 'N/A')}")
-        print(f"   가격: ${stock.get('Price', 'N/A')}")
-        print(f"   변동: {stock.get('Change', 'N/A')} ({stock.get('Change %', 'N/A')})")
-        print(f"   거래량: {stock.get('Volume', 'N/A')}")
-        print(f"   시가총액: {stock.get('Market Cap', 'N/A')}")
-    
-    if len(stocks) > 5:
-        print(f"\n... 외 {len(stocks) - 5}개 더")
-    
     print("\n" + "=" * 70)
-    print(f"✅ 완료! '{output_file}' 파일을 확인하세요.")
+    print(f"✅ 완료! {', '.join(repr(f) for f in saved)} 파일을 확인하세요.")
     print("=" * 70)
 
 
@@ -0,0 +1,220 @@
+"""
+타입이 있는 주식 데이터 레코드
+문자열 딕셔너리 대신 숫자를 한 번만 변환해 두는 StockRow와,
+많은 행을 열(column) 단위 배열로 보관하는 StockTable을 제공합니다.
+두 형식 모두 기존 딕셔너리 형식(parse_html_table의 결과)으로 되돌릴 수 있습니다.
+"""
+import math
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from normalize import normalize_column, to_int, to_number
+
+
+# 숫자 변환은 normalize 모듈의 규칙표를 씁니다 ('9.65', '7,850', '1.2M', '+8.92%', '$7.164B', '--' -> None)
+parse_number = to_number
+parse_int = to_int
+
+
+def _format_float(value: Optional[float]) -> Optional[str]:
+    if value is None:
+        return None
+    if not math.isfinite(value) or value != int(value):
+        return repr(value)
+    return str(int(value))
+
+
+class StockRow:
+    """주식 한 종목의 데이터 (숫자 필드는 float/int, 값이 없으면 None)"""
+
+    __slots__ = ('symbol', 'name', 'price', 'change', 'change_percent', 'volume', 'avg_volume',
+                 'market_cap', 'pe_ratio', 'week52_change_percent', 'week52_low', 'week52_high')
+
+    def __init__(self, symbol: str = '', name: str = '', price: Optional[float] = None,
+                 change: Optional[float] = None, change_percent: Optional[float] = None,
+                 volume: Optional[int] = None, avg_volume: Optional[int] = None,
+                 market_cap: Optional[float] = None, pe_ratio: Optional[float] = None,
+                 week52_change_percent: Optional[float] = None, week52_low: Optional[float] = None,
+                 week52_high: Optional[float] = None):
+        self.symbol = symbol
+        self.name = name
+        self.price = price
+        self.change = change
+        self.change_percent = change_percent
+        self.volume = volume
+        self.avg_volume = avg_volume
+        self.market_cap = market_cap
+        self.pe_ratio = pe_ratio
+        self.week52_change_percent = week52_change_percent
+        self.week52_low = week52_low
+        self.week52_high = week52_high
+
+    @classmethod
+    def from_dict(cls, stock: Dict) -> 'StockRow':
+        """parse_html_table 형식의 딕셔너리에서 StockRow를 만듭니다."""
+        low = high = None
+        week52_range = stock.get('52 Wk Range')
+        if week52_range:
+            low_text, _, high_text = week52_range.partition(' - ')
+            low, high = parse_number(low_text), parse_number(high_text)
+
+        return cls(
+            symbol=stock.get('Symbol', ''),
+            name=stock.get('Name', ''),
+            price=parse_number(stock.get('Price')),
+            change=parse_number(stock.get('Change')),
+            change_percent=parse_number(stock.get('Change %')),
+            volume=parse_int(stock.get('Volume')),
+            avg_volume=parse_int(stock.get('Avg Vol (3M)')),
+            market_cap=parse_number(stock.get('Market Cap')),
+            pe_ratio=parse_number(stock.get('P/E Ratio (TTM)')),
+            week52_change_percent=parse_number(stock.get('52 Wk Change %')),
+            week52_low=low,
+            week52_high=high,
+        )
+
+    def to_dict(self) -> Dict:
+        """기존 딕셔너리 형식(값은 문자열)으로 변환합니다. 값이 없는 필드는 넣지 않습니다."""
+        stock = {}
+        if self.symbol:
+            stock['Symbol'] = self.symbol
+        if self.name:
+            stock['Name'] = self.name
+        for column, value in (('Price', self.price), ('Change', self.change), ('Change %', self.change_percent),
+                              ('Volume', self.volume)):
+            if value is not None:
+                stock[column] = _format_float(value)
+        if self.avg_volume is not None:
+            stock['Avg Vol (3M)'] = f"{self.avg_volume:,}"
+        if self.market_cap is not None:
+            stock['Market Cap'] = _format_float(self.market_cap)
+        stock['P/E Ratio (TTM)'] = f"{self.pe_ratio:.2f}" if self.pe_ratio is not None else None
+        if self.week52_change_percent is not None:
+            stock['52 Wk Change %'] = _format_float(self.week52_change_percent)
+        if self.week52_low is not None and self.week52_high is not None:
+            stock['52 Wk Range'] = f"{self.week52_low:.2f} - {self.week52_high:.2f}"
+        return stock
+
+    def __eq__(self, other):
+        if not isinstance(other, StockRow):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"StockRow(symbol={self.symbol!r}, price={self.price!r}, change_percent={self.change_percent!r})"
+
+
+# StockTable의 열 구성: 문자열 열과 숫자 열 (숫자 열은 float64 배열, 값이 없으면 NaN)
+TEXT_COLUMNS = ('symbol', 'name')
+NUMERIC_COLUMNS = ('price', 'change', 'change_percent', 'volume', 'avg_volume', 'market_cap', 'pe_ratio',
+                   'week52_change_percent', 'week52_low', 'week52_high')
+_INT_COLUMNS = frozenset(('volume', 'avg_volume'))
+
+# 숫자 열 -> parse_html_table의 컬럼명 (52주 범위는 따로 나눕니다)
+_DICT_COLUMNS = {
+    'price': 'Price', 'change': 'Change', 'change_percent': 'Change %', 'volume': 'Volume',
+    'avg_volume': 'Avg Vol (3M)', 'market_cap': 'Market Cap', 'pe_ratio': 'P/E Ratio (TTM)',
+    'week52_change_percent': '52 Wk Change %',
+}
+
+_NAN = float('nan')
+
+
+class StockTable:
+    """
+    열 단위 주식 데이터 컨테이너
+    숫자 열은 array('d')에 저장하므로 행마다 객체를 만들지 않고,
+    to_numpy()로 복사 없이 NumPy 배열을 얻을 수 있습니다.
+    """
+
+    def __init__(self):
+        self.columns: Dict[str, object] = {name: [] for name in TEXT_COLUMNS}
+        self.columns.update({name: array('d') for name in NUMERIC_COLUMNS})
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> 'StockTable':
+        """StockRow 또는 딕셔너리 이터러블에서 테이블을 만듭니다."""
+        if isinstance(rows, list) and rows and all(type(row) is dict for row in rows):
+            return cls.from_dicts(rows)
+        table = cls()
+        for row in rows:
+            table.append(row)
+        return table
+
+    @classmethod
+    def from_dicts(cls, stocks: List[Dict]) -> 'StockTable':
+        """
+        parse_html_table 형식의 딕셔너리 리스트에서 테이블을 만듭니다.
+        행마다 StockRow를 만드는 대신 필드별로 값을 모아 normalize_column으로 열 전체를 한 번에 변환합니다.
+        결과는 행마다 append한 것과 같습니다.
+        """
+        import numpy as np
+
+        table = cls()
+        table.columns['symbol'] = [stock.get('Symbol', '') for stock in stocks]
+        table.columns['name'] = [stock.get('Name', '') for stock in stocks]
+        arrays = {name: normalize_column([stock.get(column) for stock in stocks])
+                  for name, column in _DICT_COLUMNS.items()}
+        for name in _INT_COLUMNS:
+            arrays[name] = np.round(arrays[name])
+
+        lows, highs = [], []
+        for stock in stocks:
+            week52_range = stock.get('52 Wk Range')
+            if week52_range:
+                low, _, high = week52_range.partition(' - ')
+            else:
+                low = high = None
+            lows.append(low)
+            highs.append(high)
+        arrays['week52_low'], arrays['week52_high'] = normalize_column(lows), normalize_column(highs)
+
+        for name in NUMERIC_COLUMNS:
+            table.columns[name].frombytes(np.ascontiguousarray(arrays[name], dtype=np.float64).tobytes())
+        return table
+
+    def append(self, row):
+        """StockRow 또는 딕셔너리 한 행을 추가합니다."""
+        if isinstance(row, dict):
+            row = StockRow.from_dict(row)
+        columns = self.columns
+        for name in TEXT_COLUMNS:
+            columns[name].append(getattr(row, name))
+        for name in NUMERIC_COLUMNS:
+            value = getattr(row, name)
+            columns[name].append(_NAN if value is None else value)
+
+    def __len__(self) -> int:
+        return len(self.columns['symbol'])
+
+    def row(self, index: int) -> StockRow:
+        """index번째 행을 StockRow로 반환합니다."""
+        values = {name: self.columns[name][index] for name in TEXT_COLUMNS}
+        for name in NUMERIC_COLUMNS:
+            value = self.columns[name][index]
+            if math.isnan(value):
+                value = None
+            elif name in _INT_COLUMNS:
+                value = int(value)
+            values[name] = value
+        return StockRow(**values)
+
+    def __iter__(self) -> Iterator[StockRow]:
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def to_dicts(self) -> List[Dict]:
+        """기존 딕셔너리 형식의 리스트로 변환합니다."""
+        return [row.to_dict() for row in self]
+
+    def to_numpy(self) -> Dict:
+        """
+        열 이름 -> NumPy 배열 딕셔너리
+        숫자 열은 복사 없이 버퍼를 공유하므로, 반환된 배열이 살아 있는 동안에는 append할 수 없습니다.
+        """
+        import numpy as np
+
+        arrays = {name: np.array(self.columns[name], dtype=object) for name in TEXT_COLUMNS}
+        for name in NUMERIC_COLUMNS:
+            arrays[name] = np.frombuffer(self.columns[name], dtype=np.float64)
+        return arrays
@@ -0,0 +1,254 @@
+"""
+Yahoo Finance 테이블 스트리밍 파서
+HTML을 조각(chunk) 단위로 받아, 각 행의 </tr>이 닫히는 즉시 주식 데이터를 내보냅니다.
+문서 전체를 메모리에 올리지 않으므로 페이지 크기와 관계없이 메모리 사용량이 일정합니다.
+"""
+import codecs
+from collections import deque
+from html.parser import HTMLParser
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Union
+
+from crawler import ROW_TESTID
+from metrics import METRICS
+from schema import CompiledSchema, DEFAULT_SCHEMA
+
+
+class RowStreamParser(HTMLParser):
+    """
+    이벤트 기반 행 파서
+    feed()로 HTML 조각을 넣으면 완성된 행이 rows 큐에 쌓입니다.
+    추출 결과는 CompiledSchema.extract_row(BeautifulSoup 경로)와 같은 딕셔너리입니다.
+
+    셀마다 스키마 필드의 선택자 단계를 차례로 맞춰 가며, 마지막 단계의 요소에서 속성을 읽거나
+    닫는 태그까지 텍스트를 모읍니다. 스키마에 없는 셀은 건너뜁니다.
+    """
+
+    def __init__(self, schema: Optional[CompiledSchema] = None):
+        super().__init__(convert_charrefs=True)
+        self.rows: Deque[Dict] = deque()
+        self._cells = (schema or DEFAULT_SCHEMA).cells
+        self._stock: Optional[Dict] = None
+        self._field = None
+        self._cell_text: List[str] = []
+        # 맞춘 선택자 단계마다 [태그, 같은 태그의 중첩 깊이]
+        self._path: List[list] = []
+        self._values: List[str] = []
+        self._capture: Optional[List[str]] = None
+        self._capture_tag: Optional[str] = None
+        self._capture_depth = 0
+        self._text: List[str] = []
+
+    # --- 값 수집 -----------------------------------------------------
+
+    def _start_capture(self, tag: str):
+        self._capture = []
+        self._capture_tag = tag
+        self._capture_depth = 1
+
+    def _finish_capture(self) -> str:
+        text = ''.join(self._capture)
+        self._capture = None
+        self._capture_tag = None
+        return text
+
+    def _add_value(self, value: str):
+        field = self._field
+        if field.count > 1:
+            self._values.append(value)
+        else:
+            self._stock[field.column] = field.converter(value) if field.converter else value
+
+    # --- HTMLParser 콜백 ---------------------------------------------
+
+    def handle_starttag(self, tag, attrs):
+        if self._text:
+            self._flush_text()
+        if tag == 'tr':
+            attrs = dict(attrs)
+            if attrs.get('data-testid') == ROW_TESTID:
+                self._stock = {}
+            return
+
+        if self._stock is None:
+            return
+
+        if tag == 'td':
+            self._field = self._cells.get(dict(attrs).get('data-testid-cell'))
+            self._cell_text = []
+            return
+
+        field = self._field
+        if field is None:
+            return
+
+        if self._capture is not None:
+            if tag == self._capture_tag:
+                self._capture_depth += 1
+            return
+
+        steps = field.steps
+        if not steps or field.column in self._stock:
+            return
+
+        path = self._path
+        step_tag, step_attrs = steps[len(path)]
+        if tag == step_tag and _matches(attrs, step_attrs):
+            if len(path) + 1 < len(steps):
+                path.append([tag, 1])
+            elif field.attribute is not None and field.count == 1:
+                for name, value in attrs:
+                    if name == field.attribute:
+                        self._add_value(value or '')
+                        return
+                self._start_capture(tag)
+            else:
+                self._start_capture(tag)
+        elif path and tag == path[-1][0]:
+            path[-1][1] += 1
+
+    def handle_endtag(self, tag):
+        if self._text:
+            self._flush_text()
+        if self._stock is None:
+            return
+
+        if self._capture is not None and tag == self._capture_tag:
+            self._capture_depth -= 1
+            if self._capture_depth == 0:
+                self._add_value(self._finish_capture())
+            return
+
+        path = self._path
+        if path and tag == path[-1][0]:
+            path[-1][1] -= 1
+            if path[-1][1] == 0:
+                path.pop()
+        elif tag == 'td':
+            self._close_cell()
+        elif tag == 'tr':
+            self._close_cell()
+            if self._stock:
+                self.rows.append(self._stock)
+            self._stock = None
+
+    def handle_data(self, data):
+        # 텍스트 노드는 조각 경계에서 나뉘어 들어올 수 있으므로 다음 태그까지 모아 둡니다
+        if self._field is not None:
+            self._text.append(data)
+
+    def _flush_text(self):
+        stripped = ''.join(self._text).strip()
+        self._text = []
+        if not stripped:
+            return
+        if self._capture is not None:
+            self._capture.append(stripped)
+        if self._field is not None and not self._field.steps:
+            self._cell_text.append(stripped)
+
+    def _close_cell(self):
+        field = self._field
+        if field is None:
+            return
+        if not field.steps:
+            self._add_value(''.join(self._cell_text))
+        elif field.count > 1 and len(self._values) >= field.count and field.column not in self._stock:
+            self._stock[field.column] = field.join.join(self._values[:field.count])
+        self._field = None
+        self._cell_text = []
+        self._capture = None
+        self._path = []
+        self._values = []
+
+
+def _matches(attrs, wanted: Dict[str, str]) -> bool:
+    """HTMLParser 속성 리스트가 선택자 단계의 속성(클래스는 여러 클래스 중 하나)과 모두 일치하는지 여부"""
+    if not wanted:
+        return True
+    found = 0
+    for name, value in attrs:
+        expected = wanted.get(name)
+        if expected is None:
+            continue
+        if value is None or (expected not in value.split() if name == 'class' else value != expected):
+            return False
+        found += 1
+    return found == len(wanted)
+
+
+def iter_rows(stream: Union[Iterable[str], Iterable[bytes]], max_rows: Optional[int] = None,
+              encoding: str = 'utf-8', report=None, schema: Optional[CompiledSchema] = None) -> Iterator[Dict]:
+    """
+    HTML 조각 스트림에서 주식 데이터를 하나씩 내보냅니다.
+
+    Args:
+        stream: 문자열 또는 바이트 조각을 내는 이터러블
+                (requests의 iter_content(), 파일 핸들 등)
+        max_rows: 최대 추출 행 수. 도달하면 스트림을 더 읽지 않습니다.
+        encoding: 바이트 조각을 디코딩할 인코딩
+        report: 행마다 필드 누락을 기록할 parse_errors.ParseReport
+                (오류 예산을 넘으면 ParserBrokenError가 발생하고 스트림을 더 읽지 않습니다)
+        schema: 추출할 컬럼 (schema.compile_schema, 기본값: 전체)
+
+    Yields:
+        주식 데이터 딕셔너리
+    """
+    if max_rows is not None and max_rows <= 0:
+        return
+
+    parser = RowStreamParser(schema)
+    decoder = None
+    count = 0
+    # 조각을 디코딩하고 파싱(행 추출 포함)하는 데 쓴 시간만 재서 parse 단계에 한 번 기록합니다.
+    # 조각을 기다린 시간(네트워크)은 호출자가 METRICS.timed로 따로 잽니다.
+    clock = METRICS.clock
+    parsing = 0.0
+
+    try:
+        for chunk in stream:
+            start = clock()
+            if isinstance(chunk, bytes):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+                chunk = decoder.decode(chunk)
+            parser.feed(chunk)
+            parsing += clock() - start
+
+            while parser.rows:
+                row = parser.rows.popleft()
+                if report is not None:
+                    report.check_row(row)
+                yield row
+                count += 1
+                if max_rows is not None and count >= max_rows:
+                    return
+
+        start = clock()
+        if decoder is not None:
+            parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+        parsing += clock() - start
+        for row in parser.rows:
+            if report is not None:
+                report.check_row(row)
+            yield row
+            count += 1
+            if max_rows is not None and count >= max_rows:
+                return
+    finally:
+        METRICS.observe('parse', parsing)
+
+
+def iter_file_rows(path: str, max_rows: Optional[int] = None, chunk_size: int = 64 * 1024,
+                   schema: Optional[CompiledSchema] = None) -> Iterator[Dict]:
+    """
+    HTML 파일(예: input.html)에서 주식 데이터를 스트리밍으로 추출합니다.
+
+    Args:
+        path: HTML 파일 경로
+        max_rows: 최대 추출 행 수
+        chunk_size: 한 번에 읽을 문자 수
+        schema: 추출할 컬럼 (기본값: 전체)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from iter_rows(iter(lambda: f.read(chunk_size), ''), max_rows, schema=schema)
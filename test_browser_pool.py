@@ -0,0 +1,136 @@
+"""
+BrowserPool 테스트: Chrome 대신 fixtures.FakeDriver로 드라이버 재사용, 교체, 로딩 대기를 확인합니다.
+"""
+import json
+
+import pytest
+
+from browser_pool import (BrowserPool, PageNotReadyError, TABLE_SCRIPT, script_spec, stocks_from_script,
+                          wait_for_stable_rows)
+from crawler import ROW_TESTID, YahooFinanceCrawler
+from fixtures import (FakeDriver, expected_stocks, html_sample, node_available, run_script_in_node,
+                      run_table_script, synthetic_page)
+from schema import parse_columns
+
+
+PAGES = {f'https://example.com/{seed}': synthetic_page(10, seed) for seed in range(6)}
+
+
+class DriverFactory:
+    """만든 FakeDriver를 기억하는 driver_factory"""
+
+    def __init__(self, pages=PAGES, **options):
+        self.pages = pages
+        self.options = options
+        self.drivers = []
+
+    def __call__(self):
+        driver = FakeDriver(self.pages, **self.options)
+        self.drivers.append(driver)
+        return driver
+
+
+def make_pool(factory, **options):
+    options.setdefault('stable_ms', 0)
+    options.setdefault('poll_interval', 0)
+    return BrowserPool(driver_factory=factory, **options)
+
+
+def test_drivers_are_reused_across_urls():
+    factory = DriverFactory()
+    with make_pool(factory, size=2) as pool:
+        results = pool.crawl_many(list(PAGES), max_rows=None)
+        assert pool.drivers_created == 2
+    for seed, url in enumerate(PAGES):
+        assert results[url] == expected_stocks(10, seed)
+    assert all(driver.quit_called for driver in factory.drivers)
+
+
+def test_driver_is_recycled_after_max_pages():
+    factory = DriverFactory()
+    with make_pool(factory, size=1, max_pages_per_driver=2) as pool:
+        for url in list(PAGES)[:5]:
+            pool.fetch(url)
+        assert pool.drivers_created == 3
+    assert [driver.quit_called for driver in factory.drivers] == [True, True, True]
+
+
+def test_unhealthy_driver_is_replaced():
+    factory = DriverFactory()
+    url = next(iter(PAGES))
+    with make_pool(factory, size=1) as pool:
+        pool.fetch(url)
+        factory.drivers[0].execute_script = lambda script, *args: 1 / 0
+        assert pool.fetch(url, max_rows=None) == expected_stocks(10, 0)
+        assert pool.drivers_created == 2
+        assert factory.drivers[0].quit_called
+
+
+def test_missing_table_raises_not_ready():
+    factory = DriverFactory(pages={'https://example.com/empty': '<html><body></body></html>'})
+    with make_pool(factory, size=1, ready_timeout=0) as pool:
+        with pytest.raises(PageNotReadyError):
+            pool.fetch('https://example.com/empty')
+        assert pool.drivers_created == 1
+
+
+class GrowingTable:
+    """find_elements를 부를 때마다 counts의 다음 행 수를 돌려주는 드라이버"""
+
+    def __init__(self, counts):
+        self.counts = list(counts)
+
+    def find_elements(self, by, selector):
+        count = self.counts.pop(0) if len(self.counts) > 1 else self.counts[0]
+        return [None] * count
+
+
+def test_wait_for_stable_rows_waits_until_count_settles():
+    now = [0.0]
+    driver = GrowingTable([0, 5, 20, 25, 25, 25, 25, 25])
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    count = wait_for_stable_rows(driver, stable_ms=250, timeout=10, poll_interval=0.125,
+                                 clock=lambda: now[0], sleep=sleep)
+    assert count == 25
+    assert now[0] == 0.625              # 25행이 처음 보인 0.375초부터 250ms 유지
+
+
+# --- 페이지 안 추출 스크립트 (TABLE_SCRIPT) ---------------------------------
+
+needs_node = pytest.mark.skipif(not node_available(), reason="node.js가 없어 TABLE_SCRIPT를 실행할 수 없습니다")
+
+
+def pages_with_gaps():
+    """가격이 없는 행과 P/E가 '--'인 행이 섞인 페이지"""
+    html_content = synthetic_page(30, seed=5)
+    found = html_content.index('data-field="regularMarketPrice"', html_content.index('data-testid-row="4"'))
+    start = html_content.rfind('<fin-streamer', 0, found)
+    end = html_content.index('</fin-streamer>', found) + len('</fin-streamer>')
+    return [html_content[:start] + html_content[end:], html_sample]
+
+
+@needs_node
+@pytest.mark.parametrize('fields', [None, 'Symbol,P/E Ratio (TTM),52 Wk Range'])
+@pytest.mark.parametrize('max_rows', [0, 3])
+def test_table_script_matches_parse_html_table(fields, max_rows):
+    crawler = YahooFinanceCrawler(fields=parse_columns(fields))
+    schema = crawler.schema
+    for html_content in pages_with_gaps():
+        payload = run_script_in_node(TABLE_SCRIPT, html_content, ROW_TESTID, script_spec(schema), max_rows)
+        expected = crawler.parse_html_table(html_content)
+        assert stocks_from_script(json.loads(payload), schema) == (expected[:max_rows] if max_rows else expected)
+        # 파이썬으로 흉내낸 run_table_script도 스크립트와 같은 결과를 내야 합니다
+        twin = run_table_script(html_content, ROW_TESTID, script_spec(schema), max_rows)
+        assert json.loads(twin) == json.loads(payload)
+
+
+@needs_node
+def test_pool_extracts_in_page_with_node():
+    factory = DriverFactory(node=True)
+    with make_pool(factory, size=1) as pool:
+        url = next(iter(PAGES))
+        assert pool.fetch(url, max_rows=None) == expected_stocks(10, 0)
+    assert factory.drivers[0].page_source_reads == 0
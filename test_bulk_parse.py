@@ -0,0 +1,109 @@
+"""
+bulk_parse 테스트: 중간에 멈춘 실행을 체크포인트부터 이어서 처리하고,
+체크포인트에 없는 part 파일을 지우며, 파일마다 기록한 part 위치가 맞는지 확인합니다.
+"""
+import json
+import os
+
+import pytest
+
+from bulk_parse import CHECKPOINT_NAME, BulkParser, find_html_files
+from fixtures import expected_stocks, synthetic_embedded_page, synthetic_page
+
+N_FILES = 8
+
+
+def rows_per_file(index: int) -> int:
+    return 5 + index
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    directory = tmp_path / 'snapshots' / 'day'
+    directory.mkdir(parents=True)
+    for index in range(N_FILES):
+        page = synthetic_embedded_page if index == 3 else synthetic_page
+        (directory / f"{index:02d}.html").write_text(page(rows_per_file(index), seed=index), encoding='utf-8')
+    (directory / 'notes.txt').write_text('not html')
+    return find_html_files([str(tmp_path / 'snapshots')])
+
+
+def read_part(output_dir, name):
+    with open(os.path.join(output_dir, name), encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def check_output(output_dir, paths):
+    """체크포인트의 (part, 위치, 행 수)가 가리키는 행이 파일마다 파싱한 결과와 같은지 확인합니다."""
+    with open(os.path.join(output_dir, CHECKPOINT_NAME), encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    assert sorted(checkpoint['files']) == sorted(paths)
+    parts = {name: read_part(output_dir, name) for name in checkpoint['parts']}
+    assert sorted(name for name in os.listdir(output_dir) if name.startswith('part-')) == sorted(parts)
+    for path, (name, offset, count) in checkpoint['files'].items():
+        index = int(os.path.basename(path)[:2])
+        symbols = [row['Symbol'] for row in parts[name][offset:offset + count]]
+        assert symbols == [stock['Symbol'] for stock in expected_stocks(rows_per_file(index), seed=index)]
+    assert sum(len(rows) for rows in parts.values()) == sum(map(rows_per_file, range(N_FILES)))
+
+
+def test_run_writes_parts_and_checkpoint(tmp_path, snapshots):
+    output_dir = str(tmp_path / 'out')
+    stats = BulkParser(output_dir, 'jsonl', workers=1, part_rows=20, quiet=True).run(snapshots)
+    assert (stats['files'], stats['skipped'], stats['failed']) == (N_FILES, 0, {})
+    check_output(output_dir, snapshots)
+
+    # 다시 실행하면 모두 건너뜁니다
+    stats = BulkParser(output_dir, 'jsonl', workers=1, quiet=True).run(snapshots)
+    assert (stats['files'], stats['skipped']) == (0, N_FILES)
+
+
+def test_interrupted_run_resumes_and_removes_orphans(tmp_path, snapshots, monkeypatch):
+    output_dir = str(tmp_path / 'out')
+    saves = []
+    save_checkpoint = BulkParser._save_checkpoint
+
+    def crash_on_third_save(self):
+        saves.append(1)
+        if len(saves) == 3:
+            raise KeyboardInterrupt          # part 파일은 썼지만 체크포인트는 갱신하지 못한 채 멈춤
+        save_checkpoint(self)
+
+    monkeypatch.setattr(BulkParser, '_save_checkpoint', crash_on_third_save)
+    with pytest.raises(KeyboardInterrupt):
+        BulkParser(output_dir, 'jsonl', workers=1, part_rows=10, quiet=True).run(snapshots)
+    monkeypatch.setattr(BulkParser, '_save_checkpoint', save_checkpoint)
+    # 체크포인트에 없는, 예전 실행이 남긴 part 파일
+    open(os.path.join(output_dir, 'part-00099.jsonl'), 'w').close()
+
+    resumed = BulkParser(output_dir, 'jsonl', workers=1, part_rows=10, quiet=True)
+    done = len(resumed.checkpoint['files'])
+    assert 0 < done < N_FILES
+    stats = resumed.run(snapshots)
+    assert (stats['skipped'], stats['files']) == (done, N_FILES - done)
+    assert not os.path.exists(os.path.join(output_dir, 'part-00099.jsonl'))
+    check_output(output_dir, snapshots)
+
+
+def test_failed_file_is_retried(tmp_path, snapshots):
+    output_dir = str(tmp_path / 'out')
+    missing = str(tmp_path / 'snapshots' / 'missing.html')
+    stats = BulkParser(output_dir, 'jsonl', workers=1, quiet=True).run(snapshots + [missing])
+    assert list(stats['failed']) == [missing]
+    assert BulkParser(output_dir, 'jsonl', workers=1, quiet=True).pending(snapshots + [missing]) == [missing]
+
+
+def test_worker_processes_give_same_rows(tmp_path, snapshots):
+    output_dir = str(tmp_path / 'out')
+    stats = BulkParser(output_dir, 'jsonl', workers=2, chunk_size=1, part_rows=15, quiet=True).run(snapshots)
+    assert stats['files'] == N_FILES
+    check_output(output_dir, snapshots)
+
+
+def test_checkpoint_settings_must_match(tmp_path, snapshots):
+    output_dir = str(tmp_path / 'out')
+    BulkParser(output_dir, 'jsonl', workers=1, quiet=True).run(snapshots[:1])
+    with pytest.raises(ValueError):
+        BulkParser(output_dir, 'csv', workers=1, quiet=True)
+    with pytest.raises(ValueError):
+        BulkParser(output_dir, 'jsonl', workers=1, quiet=True, columns=['Symbol', 'Price'])
@@ -0,0 +1,93 @@
+"""
+crawl_many 테스트: 로컬 서버에서 여러 URL을 동시에 가져오되 호스트별 동시 요청 수를 지키는지 확인합니다.
+"""
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+from crawler import YahooFinanceCrawler
+from fixtures import PAGE_HEAD, PAGE_TAIL, FixtureServer, expected_stocks, synthetic_page, synthetic_rows
+
+
+class CountingPages:
+    """동시에 처리 중인 요청 수의 최대값을 기록하는 페이지 함수"""
+
+    def __init__(self, delay: float = 0.1):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, path: str) -> str:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            seed = int(path.rsplit('/', 1)[-1])
+            return synthetic_page(10, seed)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_results_match_each_url():
+    pages = CountingPages(delay=0)
+    with FixtureServer(pages) as server:
+        urls = [server.url(f'/p/{seed}') for seed in range(5)]
+        results = YahooFinanceCrawler().crawl_many(urls + urls[:2], max_rows=None)
+    assert list(results) == urls                     # 중복 URL은 한 번만
+    for seed, url in enumerate(urls):
+        assert results[url] == expected_stocks(10, seed)
+
+
+def test_per_host_limit_is_respected():
+    pages = CountingPages(delay=0.1)
+    with FixtureServer(pages) as server:
+        urls = [server.url(f'/p/{seed}') for seed in range(6)]
+        results = YahooFinanceCrawler().crawl_many(urls, max_rows=None, max_workers=6, per_host_limit=2)
+    assert all(len(stocks) == 10 for stocks in results.values())
+    assert pages.peak == 2
+
+
+def test_failed_url_gives_empty_list():
+    with FixtureServer({'/ok': synthetic_page(3)}) as server:
+        results = YahooFinanceCrawler().crawl_many([server.url('/ok'), server.url('/missing')])
+    assert len(results[server.url('/ok')]) == 3
+    assert results[server.url('/missing')] == []
+
+
+class PagedScreeners(CountingPages):
+    """/p/<seed>?start=&count= 요청에 그 구간의 행만 담은 페이지를 돌려주는 페이지 함수"""
+
+    def __init__(self, n_rows: int, delay: float = 0.05):
+        super().__init__(delay)
+        self.rows = {}
+        self.n_rows = n_rows
+
+    def __call__(self, path: str) -> str:
+        parts = urlsplit(path)
+        seed = int(parts.path.rsplit('/', 1)[-1])
+        query = dict(parse_qsl(parts.query))
+        start, count = int(query['start']), int(query['count'])
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            rows = self.rows.setdefault(seed, list(synthetic_rows(self.n_rows, seed)))
+        try:
+            time.sleep(self.delay)
+            return PAGE_HEAD + ''.join(rows[start:start + count]) + PAGE_TAIL
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_paginated_urls_are_crawled_concurrently():
+    pages = PagedScreeners(45)
+    with FixtureServer(pages) as server:
+        urls = [server.url(f'/p/{seed}') for seed in range(3)]
+        results = YahooFinanceCrawler(use_api=False).crawl_many(urls, max_rows=None, per_host_limit=3,
+                                                                 paginate=True, page_size=10)
+    for seed, url in enumerate(urls):
+        assert results[url] == expected_stocks(45, seed)
+    assert pages.peak == 3                           # URL 3개가 동시에, 호스트 제한 안에서
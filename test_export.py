@@ -0,0 +1,97 @@
+"""
+export 테스트: 숫자 모드 DataFrame의 열 형식과, 엔진 / 스트리밍 모드별로 쓴 엑셀 파일을 다시 읽은 값을 확인합니다.
+"""
+import pandas as pd
+import pytest
+
+from crawler import YahooFinanceCrawler
+from export import EXPORT_COLUMNS, NUMBER_FORMATS, build_export_frame, write_excel
+from fixtures import synthetic_page
+from normalize import to_int
+from stock_row import StockTable
+
+
+def test_numeric_mode_rounds_integer_columns():
+    stocks = YahooFinanceCrawler().parse_html_table(synthetic_page(20))
+    stocks[0]['Volume'] = '--'
+    stocks[1]['Avg Vol (3M)'] = '1.045M'
+    df = build_export_frame(stocks, numeric=True)
+    for column in ('Volume', 'Avg Vol (3M)'):
+        assert df[column].dtype == 'Int64'
+        assert [None if value is pd.NA else value for value in df[column]] == [
+            to_int(stock[column]) for stock in stocks]
+    assert df['Price'].dtype == 'float64'
+    # StockTable에서 바로 만든 DataFrame도 같습니다
+    pd.testing.assert_frame_equal(build_export_frame(StockTable.from_dicts(stocks), numeric=True), df)
+
+
+def sample_stocks():
+    stocks = YahooFinanceCrawler().parse_html_table(synthetic_page(30))
+    stocks[0]['Volume'] = '--'
+    stocks[1]['P/E Ratio (TTM)'] = None
+    stocks[2]['Market Cap'] = '--'
+    return stocks
+
+
+def read_xlsx(filename):
+    """시트의 (머리글, 행 리스트, 열별 셀 서식). 빈 문자열 셀은 None으로 읽습니다."""
+    from openpyxl import load_workbook
+    worksheet = load_workbook(filename).active
+    cells = list(worksheet.iter_rows())
+    header = [cell.value for cell in cells[0]]
+    rows = [tuple(None if cell.value == '' else cell.value for cell in row) for row in cells[1:]]
+    formats = [{cell.number_format for cell in column if cell.value is not None}
+               for column in zip(*cells[1:])]
+    return header, rows, formats
+
+
+def frame_rows(df):
+    df = df.astype(object).where(df.notna(), None)
+    return [tuple(None if value == '' else value for value in row) for row in df.itertuples(index=False)]
+
+
+def assert_same_rows(rows, expected):
+    """엑셀 파일의 실수는 유효 숫자 15~17자리로 저장되므로 실수는 근사값으로 비교합니다."""
+    assert len(rows) == len(expected)
+    for row, wanted in zip(rows, expected):
+        assert row == pytest.approx(wanted, rel=1e-14)
+
+
+@pytest.mark.parametrize('engine', ['xlsxwriter', 'openpyxl'])
+@pytest.mark.parametrize('write_only', [False, True])
+@pytest.mark.parametrize('numeric', [False, True])
+def test_write_excel_round_trip(tmp_path, engine, write_only, numeric):
+    stocks = sample_stocks()
+    filename = str(tmp_path / 'stocks.xlsx')
+    assert write_excel(stocks, filename, numeric=numeric, write_only=write_only, chunk_size=7,
+                       engine=engine) == len(stocks)
+    expected = build_export_frame(stocks, numeric=numeric)
+    header, rows, formats = read_xlsx(filename)
+    assert header == EXPORT_COLUMNS
+    assert_same_rows(rows, frame_rows(expected))
+    if numeric and engine == 'openpyxl':
+        # xlsxwriter는 열 서식으로, openpyxl은 셀마다 서식을 지정합니다
+        for column, cell_formats in zip(header, formats):
+            if column in NUMBER_FORMATS:
+                assert cell_formats == {NUMBER_FORMATS[column]}, column
+
+
+def test_write_excel_selected_columns(tmp_path):
+    stocks = sample_stocks()
+    filename = str(tmp_path / 'stocks.xlsx')
+    columns = ['Price', 'Symbol', 'Change %']
+    write_excel(stocks, filename, numeric=True, write_only=True, columns=columns)
+    header, rows, _ = read_xlsx(filename)
+    assert header == ['Symbol', 'Price', 'Change %']           # 스키마 순서
+    assert_same_rows(rows, frame_rows(build_export_frame(stocks, numeric=True, columns=columns)))
+
+
+def test_text_mode_matches_crawler_formatting():
+    crawler = YahooFinanceCrawler()
+    stocks = sample_stocks()
+    df = build_export_frame(stocks, crawler=crawler)
+    for stock, row in zip(stocks, df.to_dict('records')):
+        assert row['Symbol'] == stock['Symbol']
+        assert row['Volume'] == crawler._format_number(stock['Volume'])
+        assert row['Change %'] == crawler._format_percent(stock['Change %'])
+        assert row['Market Cap'] == crawler._format_market_cap(stock['Market Cap'])
@@ -0,0 +1,137 @@
+"""
+ResponseCache 테스트: 손상된 항목 처리와 디스크 크기 제한,
+크롤러에서 TTL 안의 요청 생략과 TTL이 지난 뒤의 304 재검증을 확인합니다.
+"""
+import os
+
+import stream_parser
+from crawler import YahooFinanceCrawler
+from fixtures import FixtureServer, expected_stocks, synthetic_page
+from http_cache import CacheEntry, ResponseCache
+
+
+def entry(url: str, size: int = 1000) -> CacheEntry:
+    return CacheEntry(url, [{'Symbol': 'A'}], True, body=b'x' * size, size=size)
+
+
+def cache_files(directory) -> list:
+    return sorted(name for name in os.listdir(directory) if name.endswith('.cache'))
+
+
+def test_unreadable_entry_is_dropped(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.put(entry('https://example.com/a'))
+    path = cache._path('https://example.com/a')
+    with open(path, 'wb') as f:
+        # 없는 모듈의 객체: pickle.PickleError가 아닌 ModuleNotFoundError가 납니다
+        f.write(b'\x80\x04cmissing_module\nThing\n.')
+
+    assert ResponseCache(str(tmp_path)).get('https://example.com/a') is None
+    assert not os.path.exists(path)
+
+
+def test_disk_is_trimmed_to_max_bytes(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_disk_bytes=5000)
+    for index in range(10):
+        cache.put(entry(f'https://example.com/{index}'))
+        assert cache._disk_bytes <= 5000
+    sizes = sum(os.path.getsize(tmp_path / name) for name in cache_files(tmp_path))
+    assert sizes == cache._disk_bytes
+    assert 0 < len(cache_files(tmp_path)) < 10
+    # 가장 최근 항목은 남아 있어야 합니다
+    assert os.path.exists(cache._path('https://example.com/9'))
+
+
+def test_overwriting_entry_does_not_grow_total(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path))
+    listed = []
+    listdir = os.listdir
+    monkeypatch.setattr(os, 'listdir', lambda path: listed.append(path) or listdir(path))
+    for _ in range(5):
+        cache.put(entry('https://example.com/a'))
+    assert len(listed) == 1                 # 폴더는 처음 한 번만 읽습니다
+    assert cache._disk_bytes == os.path.getsize(cache._path('https://example.com/a'))
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def count_parses(monkeypatch) -> list:
+    """stream_parser.iter_rows 호출을 기록합니다 (응답 본문을 파싱할 때마다 한 번)."""
+    calls = []
+    iter_rows = stream_parser.iter_rows
+    monkeypatch.setattr(stream_parser, 'iter_rows', lambda *args: calls.append(args) or iter_rows(*args))
+    return calls
+
+
+def test_fetch_rows_uses_ttl_then_revalidates(monkeypatch):
+    parses = count_parses(monkeypatch)
+    clock = Clock()
+    cache = ResponseCache(ttl=30, clock=clock)
+    page = synthetic_page(20)
+    size = len(page.encode('utf-8'))
+    with FixtureServer({'/p': page}) as server:
+        crawler = YahooFinanceCrawler(cache=cache, use_api=False)
+        url = server.url('/p')
+
+        assert crawler.fetch(url, None) == expected_stocks(20)
+        assert (server.requests, len(parses)) == (1, 1)
+
+        # TTL 안: 요청하지 않습니다
+        clock.now += 29
+        assert crawler.fetch(url, None) == expected_stocks(20)
+        assert (server.requests, len(parses)) == (1, 1)
+
+        # TTL이 지나면 If-None-Match로 재검증하고, 304이면 다시 파싱하지 않습니다
+        clock.now += 2
+        assert crawler.fetch(url, None) == expected_stocks(20)
+        assert (server.requests, server.not_modified, len(parses)) == (2, 1, 1)
+
+        # 304가 TTL을 다시 시작합니다
+        clock.now += 29
+        crawler.fetch(url, None)
+        assert server.requests == 2
+
+    assert cache.stats() == {'hits': 2, 'revalidated': 1, 'misses': 1, 'bytes_saved': 3 * size,
+                             'entries': 1, 'memory_bytes': size}
+
+
+def test_changed_page_is_parsed_again(monkeypatch):
+    parses = count_parses(monkeypatch)
+    pages = {'/p': synthetic_page(10)}
+    cache = ResponseCache(ttl=0)
+    with FixtureServer(pages) as server:
+        crawler = YahooFinanceCrawler(cache=cache, use_api=False)
+        crawler.fetch(server.url('/p'), None)
+        pages['/p'] = synthetic_page(12, seed=1)
+        assert crawler.fetch(server.url('/p'), None) == expected_stocks(12, seed=1)
+        assert server.not_modified == 0
+    assert len(parses) == 2
+    assert cache.stats()['misses'] == 2
+
+
+def test_cached_rows_cover_smaller_requests_only():
+    cache = ResponseCache(ttl=60)
+    with FixtureServer({'/p': synthetic_page(30)}) as server:
+        crawler = YahooFinanceCrawler(cache=cache, use_api=False)
+        assert crawler.fetch(server.url('/p'), 5) == expected_stocks(30)[:5]
+        assert crawler.fetch(server.url('/p'), 3) == expected_stocks(30)[:3]
+        assert server.requests == 1
+        # 5행만 받아 둔 항목으로는 전체를 돌려줄 수 없으므로 다시 받습니다
+        assert crawler.fetch(server.url('/p'), None) == expected_stocks(30)
+        assert server.requests == 2
+
+
+def test_disk_cache_survives_restart(tmp_path):
+    with FixtureServer({'/p': synthetic_page(10)}) as server:
+        YahooFinanceCrawler(cache=ResponseCache(str(tmp_path), ttl=0), use_api=False).fetch(server.url('/p'), None)
+        cache = ResponseCache(str(tmp_path), ttl=0)
+        stocks = YahooFinanceCrawler(cache=cache, use_api=False).fetch(server.url('/p'), None)
+        assert server.not_modified == 1
+    assert stocks == expected_stocks(10)
+    assert cache.stats()['revalidated'] == 1
@@ -0,0 +1,144 @@
+"""
+JSON 데이터 경로 테스트: 스크리너 API를 HTML보다 먼저 쓰고, 쓸 수 없으면 HTML로 넘어가며,
+total까지 페이지를 나눠 받고, 페이지에 포함된 <script> JSON에서도 같은 행을 얻는지 확인합니다.
+"""
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+
+from crawler import YahooFinanceCrawler
+from fixtures import (FixtureServer, expected_stocks, synthetic_api_response, synthetic_embedded_page,
+                      synthetic_page, synthetic_quotes)
+from http_cache import ResponseCache
+from json_source import extract_embedded_rows
+
+API_PATH = '/v1/finance/screener/predefined/saved'
+PAGE_PATH = '/screener/predefined/day_gainers'
+
+
+class ScreenerSite:
+    """스크리너 HTML 페이지와 API를 함께 흉내내고 받은 요청을 기록하는 페이지 함수"""
+
+    def __init__(self, n_rows: int, api_status: int = 200):
+        self.quotes = synthetic_quotes(n_rows)
+        self.html = synthetic_page(n_rows)
+        self.api_status = api_status
+        self.api_requests = []
+        self.html_requests = 0
+
+    def __call__(self, path: str):
+        parts = urlsplit(path)
+        if parts.path == PAGE_PATH:
+            self.html_requests += 1
+            return self.html
+        if parts.path != API_PATH:
+            return None
+        query = dict(parse_qsl(parts.query))
+        self.api_requests.append((int(query['start']), int(query['count'])))
+        if self.api_status != 200:
+            return self.api_status, {}
+        return synthetic_api_response(self.quotes, int(query['start']), int(query['count']))
+
+
+def api_crawler(server, **options) -> YahooFinanceCrawler:
+    return YahooFinanceCrawler(api_url=server.url(API_PATH), **options)
+
+
+def test_api_is_used_before_html():
+    site = ScreenerSite(30)
+    with FixtureServer(site) as server:
+        stocks = api_crawler(server).fetch(server.url(PAGE_PATH), None)
+    assert stocks == expected_stocks(30)
+    assert site.html_requests == 0
+    assert site.api_requests == [(0, 250)]
+
+
+@pytest.mark.parametrize('status', [401, 403, 404])
+def test_falls_back_to_html_when_api_is_refused(status):
+    site = ScreenerSite(20, api_status=status)
+    with FixtureServer(site) as server:
+        crawler = api_crawler(server)
+        first = crawler.fetch(server.url(PAGE_PATH), None)
+        second = crawler.fetch(server.url(PAGE_PATH), None)
+    assert first == second == expected_stocks(20)
+    assert site.html_requests == 2
+    assert len(site.api_requests) == 1          # 거절된 뒤로는 API를 다시 시도하지 않습니다
+
+
+def test_server_error_falls_back_without_disabling_api():
+    site = ScreenerSite(20, api_status=500)
+    with FixtureServer(site) as server:
+        crawler = api_crawler(server)
+        crawler.fetch(server.url(PAGE_PATH), None)
+        site.api_status = 200
+        stocks = crawler.fetch(server.url(PAGE_PATH), None)
+    assert stocks == expected_stocks(20)
+    assert site.html_requests == 1
+    assert len(site.api_requests) == 2
+
+
+@pytest.mark.parametrize('n_rows, max_rows, requests', [
+    (60, None, [(0, 25), (25, 25), (50, 25)]),     # 마지막 페이지가 짧으면 멈춥니다
+    (50, None, [(0, 25), (25, 25)]),               # total에 닿으면 빈 페이지를 요청하지 않습니다
+    (60, 30, [(0, 25), (25, 5)]),                  # max_rows만큼만 요청합니다
+])
+def test_api_pages_until_total(n_rows, max_rows, requests):
+    site = ScreenerSite(n_rows)
+    with FixtureServer(site) as server:
+        stocks = api_crawler(server).fetch(server.url(PAGE_PATH), max_rows, page_size=25)
+    assert stocks == expected_stocks(n_rows)[:max_rows]
+    assert site.api_requests == requests
+
+
+def test_api_respects_start_and_count_in_url():
+    site = ScreenerSite(40)
+    with FixtureServer(site) as server:
+        stocks = api_crawler(server).fetch(server.url(PAGE_PATH + '?start=10&count=15'), 20)
+    assert stocks == expected_stocks(40)[10:30]
+    assert site.api_requests == [(10, 15), (25, 5)]
+
+
+def test_api_pages_use_response_cache():
+    site = ScreenerSite(50)
+    cache = ResponseCache(ttl=60)
+    with FixtureServer(site) as server:
+        crawler = api_crawler(server, cache=cache)
+        first = crawler.fetch(server.url(PAGE_PATH), None, page_size=25)
+        second = crawler.fetch(server.url(PAGE_PATH), None, page_size=25)
+        requests = server.requests
+    assert first == second == expected_stocks(50)
+    assert requests == 2                        # 두 번째 fetch는 요청하지 않습니다
+    assert cache.stats()['hits'] == 2
+
+
+def test_api_pages_are_revalidated_after_ttl():
+    site = ScreenerSite(50)
+    cache = ResponseCache(ttl=0)
+    with FixtureServer(site) as server:
+        crawler = api_crawler(server, cache=cache)
+        crawler.fetch(server.url(PAGE_PATH), None, page_size=25)
+        stocks = crawler.fetch(server.url(PAGE_PATH), None, page_size=25)
+        not_modified = server.not_modified
+    assert stocks == expected_stocks(50)
+    assert not_modified == 2
+    assert cache.stats()['revalidated'] == 2
+
+
+def test_embedded_json_page():
+    html_content = synthetic_embedded_page(15)
+    assert extract_embedded_rows(html_content) == expected_stocks(15)
+    assert extract_embedded_rows(html_content.encode('utf-8')) == expected_stocks(15)
+    with FixtureServer({'/markets/stocks/gainers/': html_content}) as server:
+        stocks = YahooFinanceCrawler(use_api=False).fetch(server.url('/markets/stocks/gainers/'), 10)
+    assert stocks == expected_stocks(15)[:10]
+
+
+def test_embedded_json_respects_fields():
+    crawler = YahooFinanceCrawler(fields=['Symbol', 'Price'])
+    stocks = crawler.parse_html_table(synthetic_embedded_page(5))
+    assert stocks == [{'Symbol': s['Symbol'], 'Price': s['Price']} for s in expected_stocks(5)]
+
+
+def test_page_without_data_has_no_embedded_rows():
+    assert extract_embedded_rows(synthetic_page(5)) == []
+    assert extract_embedded_rows('<html><script type="application/json">{"symbol": 1}</script></html>') == []
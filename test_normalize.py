@@ -0,0 +1,77 @@
+"""
+normalize 테스트: 숫자 표기 변환 규칙과, 값 하나(to_number)와 열 전체(normalize_column)의 결과가 같은지 확인합니다.
+"""
+import math
+import random
+
+import numpy as np
+import pytest
+
+from normalize import normalize_column, normalize_row, to_int, to_number
+
+CASES = [
+    # (값, to_number, to_int)
+    ('9.65', 9.65, 10),
+    ('7,850', 7850.0, 7850),
+    ('1,044,999.9999', 1044999.9999, 1045000),
+    ('1.2M', 1200000.0, 1200000),
+    ('1.2k', 1200.0, 1200),
+    ('3T', 3e12, 3000000000000),
+    ('$7.164B', 7164000000.0, 7164000000),
+    ('+8.92%', 8.92, 9),
+    ('-0.45', -0.45, 0),
+    ('−0.45', -0.45, 0),
+    ('(1.5)', -1.5, -2),
+    ('  12.5 ', 12.5, 12),
+    ('1e3', 1000.0, 1000),
+    ('0.00', 0.0, 0),
+    (42, 42.0, 42),
+    (2.75, 2.75, 3),
+    ('--', None, None),
+    ('-', None, None),
+    ('N/A', None, None),
+    ('∞', None, None),
+    ('abc', None, None),
+    ('', None, None),
+    (None, None, None),
+    (float('nan'), None, None),
+]
+
+
+@pytest.mark.parametrize('value, number, integer', CASES)
+def test_to_number_and_to_int(value, number, integer):
+    assert to_number(value) == number
+    assert to_int(value) == integer
+
+
+def scalar_column(values) -> np.ndarray:
+    return np.array([math.nan if number is None else number for number in map(to_number, values)])
+
+
+def test_normalize_column_matches_to_number():
+    values = [value for value, _, _ in CASES]
+    np.testing.assert_array_equal(normalize_column(values), scalar_column(values))
+
+
+def test_normalize_column_matches_to_number_on_random_values():
+    rng = random.Random(7)
+    values = []
+    for _ in range(5000):
+        number = rng.uniform(-1e6, 1e6) if rng.random() < 0.5 else rng.uniform(0, 100)
+        text = f"{number:,.{rng.randint(0, 6)}f}"
+        values.append(rng.choice([
+            text, text + rng.choice('KMBT%'), '+' + text.lstrip('-'), '$' + text, rng.choice(['--', 'N/A', '']),
+        ]))
+    np.testing.assert_array_equal(normalize_column(values, chunk_size=700), scalar_column(values))
+
+
+def test_normalize_column_of_numbers():
+    np.testing.assert_array_equal(normalize_column([1, 2.5, None]), [1.0, 2.5, math.nan])
+    assert normalize_column([]).shape == (0,)
+
+
+def test_normalize_row():
+    row = normalize_row({'Symbol': 'AAA', 'Price': '9.65', 'Volume': '1.2M', 'Avg Vol (3M)': '7,850',
+                         'P/E Ratio (TTM)': None, '52 Wk Range': '5.04 - 10.51'})
+    assert row == {'Symbol': 'AAA', 'Price': 9.65, 'Volume': 1200000, 'Avg Vol (3M)': 7850,
+                   'P/E Ratio (TTM)': None, '52 Wk Range': '5.04 - 10.51'}
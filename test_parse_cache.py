@@ -0,0 +1,42 @@
+"""
+ParseCache 테스트: 캐시를 거쳐도 parse_html_table과 같은 결과와 오류 판단을 내는지 확인합니다.
+"""
+import re
+
+import pytest
+
+from crawler import YahooFinanceCrawler
+from fixtures import synthetic_page
+from parse_cache import ParseCache
+from parse_errors import ParserBrokenError
+
+
+def drop_price(html: str, row: int) -> str:
+    """row번째 행의 가격(regularMarketPrice) 태그를 지웁니다"""
+    found = [m.start() for m in re.finditer(r'data-field="regularMarketPrice"', html)][row]
+    start = html.rfind('<fin-streamer', 0, found)
+    end = html.index('</fin-streamer>', found) + len('</fin-streamer>')
+    return html[:start] + html[end:]
+
+
+@pytest.mark.parametrize('parser', ['lxml', 'html.parser'])
+def test_partial_row_matches_parse_html_table(tmp_path, parser):
+    crawler = YahooFinanceCrawler(parser=parser)
+    html = drop_price(synthetic_page(20, seed=1), 3)
+    expected = crawler.parse_html_table(html)
+    assert len(expected) == 20 and 'Price' not in expected[3]
+
+    assert ParseCache(str(tmp_path)).parse_html(html, crawler) == expected
+    # 두 번째에는 캐시된 행을 재사용해도 결과가 같아야 합니다
+    cache = ParseCache(str(tmp_path))
+    assert cache.parse_html(html + ' ', crawler) == expected
+    assert cache.rows_reused == 20
+
+
+def test_broken_rows_still_raise(tmp_path):
+    crawler = YahooFinanceCrawler()
+    html = synthetic_page(5)
+    for _ in range(5):
+        html = drop_price(html, 0)
+    with pytest.raises(ParserBrokenError):
+        ParseCache(str(tmp_path)).parse_html(html, crawler)
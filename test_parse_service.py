@@ -0,0 +1,132 @@
+"""
+파싱 서비스 테스트: 실제 소켓으로 parse / export / save 요청을 주고받고, 잘못된 요청과 경로를 거절하는지 확인합니다.
+"""
+import os
+import socket
+import stat
+
+import pandas as pd
+import pytest
+
+from crawler import YahooFinanceCrawler
+from export import build_export_frame
+from fixtures import synthetic_page
+from parse_service import (ParseClient, ParseService, ServiceError, encode_message, read_message,
+                           resolve_output_path)
+
+
+needs_unix = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="Unix 소켓이 없는 환경입니다")
+
+
+@pytest.fixture
+def service(tmp_path):
+    """작업 프로세스 없이(workers=0) tmp_path의 Unix 소켓에서 도는 서비스, out/ 폴더에 저장"""
+    address = str(tmp_path / 's.sock') if hasattr(socket, 'AF_UNIX') else '127.0.0.1:0'
+    output_dir = tmp_path / 'out'
+    output_dir.mkdir()
+    with ParseService(address, workers=0, output_dir=str(output_dir)).start() as running:
+        yield running
+
+
+@pytest.fixture
+def client(service):
+    address = service.address if not isinstance(service.address, tuple) else service.bound_address[:2]
+    with ParseClient(address, timeout=30) as connected:
+        yield connected
+
+
+def test_parse_round_trip(client):
+    crawler = YahooFinanceCrawler()
+    pages = [synthetic_page(20, seed) for seed in range(3)]
+    results = client.parse_many(pages + ['<table></table>'])
+    for html_content, (stocks, error) in zip(pages, results):
+        assert error is None
+        assert stocks == crawler.parse_html_table(html_content)
+    assert results[-1] == ([], None)
+    # 컬럼 선택과 max_rows
+    projected = YahooFinanceCrawler(fields=['Symbol', 'Price']).parse_html_table(pages[0])[:5]
+    assert client.parse(pages[0], fields=['Symbol', 'Price'], max_rows=5) == projected
+
+
+def test_export_round_trip(client):
+    crawler = YahooFinanceCrawler()
+    stocks = crawler.parse_html_table(synthetic_page(20))
+    stocks[0]['Volume'] = '--'                  # 숫자 모드에서 <NA>가 있는 Int64 열
+    for numeric in (False, True):
+        expected = build_export_frame(stocks, numeric, crawler)
+        frame = pd.DataFrame(client.export_frame(stocks, numeric=numeric))
+        assert list(frame.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(frame, expected, check_dtype=False)
+
+
+def test_save_round_trip(client, tmp_path):
+    stocks = YahooFinanceCrawler().parse_html_table(synthetic_page(10))
+    assert client.save(stocks, 'daily/stock_data.csv') == 10
+    saved = pd.read_csv(tmp_path / 'out' / 'daily' / 'stock_data.csv', dtype=str)
+    assert list(saved['Symbol']) == [stock['Symbol'] for stock in stocks]
+
+
+@pytest.mark.parametrize('filename', ['../escape.csv', 'a/../../escape.csv', '/tmp/escape.csv', ''])
+def test_save_outside_output_dir_is_rejected(client, tmp_path, filename):
+    with pytest.raises(ServiceError, match='ValueError'):
+        client.save([{'Symbol': 'A'}], filename)
+    assert not (tmp_path / 'escape.csv').exists()
+
+
+def test_save_without_output_dir_is_rejected(tmp_path):
+    address = str(tmp_path / 'nosave.sock') if hasattr(socket, 'AF_UNIX') else '127.0.0.1:0'
+    with ParseService(address, workers=0).start() as running:
+        target = running.address if not isinstance(running.address, tuple) else running.bound_address[:2]
+        with ParseClient(target) as connected:
+            with pytest.raises(ServiceError, match='PermissionError'):
+                connected.save([{'Symbol': 'A'}], 'stock_data.csv')
+
+
+def test_bad_request_and_unknown_op_get_error_replies(client):
+    with pytest.raises(ServiceError, match='KeyError'):
+        client.call({'op': 'parse'})                     # documents가 없음
+    with pytest.raises(ServiceError, match='알 수 없는 요청'):
+        client.call({'op': 'shutdown'})
+    with pytest.raises(ServiceError, match='ValueError'):
+        client.parse('<table></table>', fields=['Nope'])
+    # 오류 응답 뒤에도 같은 연결을 계속 쓸 수 있습니다
+    assert client.ping()['workers'] == 0
+
+
+@needs_unix
+def test_garbage_frame_closes_connection(service):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(10)
+        sock.connect(service.address)
+        sock.sendall(b'\x05\x00\x00\x00hello')
+        assert sock.recv(1) == b''
+        # 정상 요청을 보내는 연결은 영향을 받지 않습니다
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(10)
+        sock.connect(service.address)
+        sock.sendall(encode_message({'op': 'ping'}))
+        assert read_message(sock.makefile('rb'))['ok']
+
+
+@needs_unix
+def test_unix_socket_is_private(service):
+    assert stat.S_IMODE(os.stat(service.address).st_mode) == 0o600
+
+
+@pytest.mark.parametrize('address', ['0.0.0.0:0', '192.168.0.10:8765', 'example.com:8765'])
+def test_non_loopback_tcp_is_rejected(address):
+    with pytest.raises(ValueError, match='루프백'):
+        ParseService(address, workers=0)
+
+
+def test_loopback_tcp_works():
+    with ParseService('127.0.0.1:0', workers=0).start() as running:
+        with ParseClient(running.bound_address[:2]) as connected:
+            assert connected.parse(synthetic_page(3)) == YahooFinanceCrawler().parse_html_table(synthetic_page(3))
+
+
+def test_resolve_output_path(tmp_path):
+    assert resolve_output_path(str(tmp_path), 'a/b.csv') == os.path.join(os.path.realpath(tmp_path), 'a', 'b.csv')
+    os.symlink('/tmp', tmp_path / 'link')
+    with pytest.raises(ValueError):
+        resolve_output_path(str(tmp_path), 'link/x.csv')
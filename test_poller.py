@@ -0,0 +1,159 @@
+"""
+Poller 테스트: 가짜 시계와 난수로 일정, 백오프, 콜백 처리를 확인합니다.
+"""
+import random
+
+import requests
+
+from poller import Poller
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class ScriptedCrawler:
+    """fetch()마다 results의 다음 값(리스트면 반환, 예외면 발생)을 씁니다"""
+
+    def __init__(self, results, before_return=None):
+        self.results = list(results)
+        self.before_return = before_return
+        self.calls = 0
+
+    def fetch(self, url, max_rows=None, **options):
+        self.options = options
+        self.calls += 1
+        result = self.results.pop(0)
+        if self.before_return is not None:
+            self.before_return(url)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def http_error(status: int, retry_after=None) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    if retry_after is not None:
+        response.headers['Retry-After'] = str(retry_after)
+    return requests.HTTPError(f"{status} Error", response=response)
+
+
+def make_poller(crawler, clock, **options):
+    return Poller(crawler, interval=60, min_interval=15, max_interval=600, max_backoff=900,
+                  max_workers=0, clock=clock, rng=random.Random(7), **options)
+
+
+def test_interval_shrinks_on_change_and_grows_when_unchanged():
+    clock = FakeClock()
+    changes = []
+    a, b = [{'Symbol': 'A'}], [{'Symbol': 'B'}]
+    poller = make_poller(ScriptedCrawler([a, a, b]), clock, on_change=lambda url, stocks: changes.append(stocks))
+    target = poller.add('u')
+
+    assert poller.step() == 30          # 첫 결과도 변경이므로 60 -> 30
+    assert changes == [a]
+    clock.advance(30)
+    assert poller.step() == 45          # 그대로면 1.5배
+    clock.advance(45)
+    assert poller.step() == 22.5        # 바뀌면 절반
+    assert changes == [a, b]
+    assert (target.polls, target.changes) == (3, 2)
+
+
+def test_backoff_is_jittered_and_respects_retry_after():
+    clock = FakeClock()
+    errors = []
+    crawler = ScriptedCrawler([requests.ConnectionError('down'), requests.ConnectionError('down'),
+                               http_error(429, retry_after=500), [{'Symbol': 'A'}]])
+    poller = make_poller(crawler, clock, on_error=lambda url, e: errors.append(type(e)))
+    target = poller.add('u')
+
+    wait = poller.step()
+    assert 30 <= wait <= 60             # 첫 실패: [interval/2, interval]
+    clock.advance(wait)
+    wait = poller.step()
+    assert 60 <= wait <= 120            # 두 번째: 두 배
+    clock.advance(wait)
+    wait = poller.step()
+    assert wait == 500                  # 백오프(120~240)보다 긴 Retry-After를 지킵니다
+    assert target.failures == 3 and len(errors) == 3
+    clock.advance(wait)
+    assert poller.step() == 30          # 성공하면 실패 횟수를 지우고 평소 간격으로 돌아갑니다
+    assert target.failures == 0
+
+
+def test_backoff_is_capped_by_max_backoff():
+    clock = FakeClock()
+    crawler = ScriptedCrawler([http_error(503, retry_after=5000)])
+    poller = make_poller(crawler, clock)
+    poller.add('u')
+    assert poller.step() == 900
+
+
+def test_failed_on_change_is_retried_with_same_rows():
+    clock = FakeClock()
+    rows = [{'Symbol': 'A'}]
+    saved = []
+
+    def save(url, stocks):
+        if not saved:
+            saved.append(None)
+            raise OSError('disk full')
+        saved.append(stocks)
+
+    poller = make_poller(ScriptedCrawler([rows, rows]), clock, on_change=save)
+    target = poller.add('u')
+    clock.advance(poller.step())
+    poller.step()
+    assert saved == [None, rows]        # 저장이 실패한 결과는 다음 크롤링에서 다시 넘깁니다
+    assert target.errors == 1 and target.changes == 1
+
+
+def test_removed_target_results_are_discarded():
+    clock = FakeClock()
+    calls = []
+    poller = None
+
+    def remove(url):
+        poller.remove(url)
+
+    crawler = ScriptedCrawler([[{'Symbol': 'A'}]], before_return=remove)
+    poller = make_poller(crawler, clock, on_change=lambda *args: calls.append(args),
+                         on_error=lambda *args: calls.append(args))
+    target = poller.add('u')
+    poller.step()
+    assert calls == [] and target.polls == 0 and not target.running
+    assert poller.targets == {}
+
+
+def test_pool_grows_with_targets():
+    rows = [{'Symbol': 'A'}]
+    crawler = ScriptedCrawler([rows] * 4)
+    poller = Poller(crawler, clock=FakeClock(), rng=random.Random(7))
+    try:
+        poller.add('a')
+        poller.step()
+        assert poller._pool_size == 1
+        for url in ('b', 'c', 'd'):
+            poller.add(url)
+        poller.step()
+        assert poller._pool_size == 4
+    finally:
+        poller.close()
+    assert crawler.calls == 4
+
+
+def test_fetch_options_are_passed_to_crawler():
+    crawler = ScriptedCrawler([[{'Symbol': 'A'}]])
+    poller = make_poller(crawler, FakeClock(), fetch_options={'paginate': True, 'page_size': 100})
+    poller.add('u')
+    poller.step()
+    assert crawler.options == {'paginate': True, 'page_size': 100}
@@ -0,0 +1,150 @@
+"""
+QueryEngine 테스트: 정렬 색인을 쓰는 where / top 결과를 모든 행을 하나씩 검사한 결과와 비교합니다.
+"""
+import operator
+import random
+
+import pytest
+
+from normalize import to_number
+from query import QueryEngine
+
+OPS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le, '==': operator.eq,
+       '!=': operator.ne}
+
+COLUMNS = {'price': 'Price', 'change_percent': 'Change %', 'volume': 'Volume', 'market_cap': 'Market Cap',
+           'pe_ratio': 'P/E Ratio (TTM)', 'avg_volume': 'Avg Vol (3M)'}
+
+
+def random_batches(n_batches: int = 3, n_rows: int = 300, seed: int = 0):
+    """크롤링 결과 여러 번 (같은 종목이 다시 나오고, 값이 없는 칸('--')이 섞여 있습니다)"""
+    rng = random.Random(seed)
+    volumes = iter(rng.sample(range(1000, 10 ** 8), n_batches * n_rows))
+    batches = []
+    for _ in range(n_batches):
+        batch = []
+        for index in rng.sample(range(n_rows * 2), n_rows):
+            batch.append({
+                'Symbol': f"S{index:04d}",
+                'Name': f"Company {index}",
+                'Price': f"{rng.uniform(1, 500):.6f}",
+                'Change %': rng.choice(['--', f"{rng.uniform(-20, 20):+.6f}%"]),
+                'Volume': f"{next(volumes):,}",
+                'Avg Vol (3M)': f"{rng.uniform(1, 99):.4f}M",
+                'Market Cap': rng.choice(['--', f"{rng.uniform(0.01, 900):.6f}B"]),
+                'P/E Ratio (TTM)': rng.choice([None, f"{rng.uniform(1, 80):.6f}"]),
+            })
+        batches.append(batch)
+    return batches
+
+
+def latest_rows(batches):
+    """종목별 마지막 행을 엔진에 들어간 순서(마지막으로 추가된 위치)대로"""
+    latest = {}
+    for position, row in enumerate(row for batch in batches for row in batch):
+        latest[row['Symbol']] = (position, row)
+    return [row for _, row in sorted(latest.values(), key=lambda item: item[0])]
+
+
+def value(row, column):
+    return to_number(row.get(COLUMNS[column]))
+
+
+def brute_where(rows, conditions):
+    result = []
+    for row in rows:
+        for column, op, other, scale in conditions:
+            left = value(row, column)
+            right = value(row, other) if isinstance(other, str) else other
+            if left is None or right is None or not OPS[op](left, right * scale):
+                break
+        else:
+            result.append(row['Symbol'])
+    return result
+
+
+def brute_top(rows, count, column, descending=True):
+    present = [row for row in rows if value(row, column) is not None]
+    present.sort(key=lambda row: value(row, column), reverse=descending)
+    return [row['Symbol'] for row in present[:count]]
+
+
+def symbols(query):
+    return [row['Symbol'] for row in query.rows()]
+
+
+@pytest.fixture(scope='module')
+def data():
+    batches = random_batches()
+    engine = QueryEngine()
+    for batch in batches:
+        engine.add(batch)
+    return engine, latest_rows(batches)
+
+
+def test_engine_keeps_latest_row_per_symbol(data):
+    engine, rows = data
+    assert len(engine) == len(rows)
+    assert engine.total_rows == 900
+    assert engine.get(rows[0]['Symbol'])['Price'] == rows[0]['Price']
+
+
+@pytest.mark.parametrize('column', ['price', 'change_percent', 'volume', 'market_cap', 'pe_ratio'])
+@pytest.mark.parametrize('op', list(OPS))
+def test_where_matches_brute_force(data, column, op):
+    engine, rows = data
+    rng = random.Random(f"{column}{op}")
+    values = sorted(v for v in (value(row, column) for row in rows) if v is not None)
+    for threshold in [values[0], values[len(values) // 3], values[-1], values[-1] + 1, rng.uniform(-1e12, 1e12)]:
+        assert symbols(engine.query().where(column, op, threshold)) == \
+            brute_where(rows, [(column, op, threshold, 1.0)])
+
+
+def test_combined_conditions_match_brute_force(data):
+    engine, rows = data
+    conditions = [('price', '>', 50.0, 1.0), ('market_cap', '<=', 4e11, 1.0), ('change_percent', '>=', -5.0, 1.0),
+                  ('volume', '>', 'avg_volume', 0.5)]
+    query = engine.query()
+    for condition in conditions:
+        query.where(*condition)
+    assert symbols(query) == brute_where(rows, conditions)
+    assert symbols(engine.query().filter('Market Cap > 100B').filter('volume > 0.5 * avg_volume')) == \
+        brute_where(rows, [('market_cap', '>', 1e11, 1.0), ('volume', '>', 'avg_volume', 0.5)])
+
+
+@pytest.mark.parametrize('column', ['price', 'change_percent', 'volume', 'market_cap', 'pe_ratio'])
+@pytest.mark.parametrize('descending', [True, False])
+def test_top_matches_brute_force(data, column, descending):
+    engine, rows = data
+    for count in (1, 10, 1000):
+        assert symbols(engine.query().top(count, column, descending)) == \
+            brute_top(rows, count, column, descending)
+    # 조건이 있으면 정렬 색인 대신 argpartition으로 고릅니다
+    filtered = [row for row in rows if row['Symbol'] in set(brute_where(rows, [('price', '<', 250.0, 1.0)]))]
+    assert symbols(engine.query().where('price', '<', 250).top(15, column, descending)) == \
+        brute_top(filtered, 15, column, descending)
+
+
+def test_history_and_symbols(data):
+    engine, rows = data
+    assert engine.query().include_history().where('price', '>', 0).count() == engine.total_rows
+    wanted = [rows[5]['Symbol'], 'MISSING', rows[2]['Symbol']]
+    assert symbols(engine.query().symbols(wanted)) == [rows[5]['Symbol'], rows[2]['Symbol']]
+
+
+def test_index_is_rebuilt_after_add():
+    engine = QueryEngine([{'Symbol': 'A', 'Price': '1'}, {'Symbol': 'B', 'Price': '2'}])
+    assert symbols(engine.query().top(1, 'price')) == ['B']
+    engine.add([{'Symbol': 'A', 'Price': '3'}])
+    assert symbols(engine.query().top(2, 'price')) == ['A', 'B']
+    assert symbols(engine.query().where('price', '<', 2.5)) == ['B']
+
+
+def test_unknown_column_and_operator_are_rejected():
+    engine = QueryEngine()
+    with pytest.raises(ValueError):
+        engine.query().where('nope', '>', 1)
+    with pytest.raises(ValueError):
+        engine.query().where('price', '=>', 1)
+    with pytest.raises(ValueError):
+        engine.query().filter('price is large')
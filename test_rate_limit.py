@@ -0,0 +1,112 @@
+"""
+RateLimiter 테스트: 로컬 서버(fixtures.FixtureServer)의 429 / 503 응답으로
+Retry-After 준수, 재시도 예산, 호스트별 속도 제한을 확인합니다. (가짜 시계를 쓰므로 실제로 기다리지 않습니다)
+"""
+import random
+
+import pytest
+import requests
+
+from crawler import YahooFinanceCrawler
+from fixtures import FixtureServer, synthetic_page
+from rate_limit import RateLimiter, RetryBudget, parse_retry_after
+
+
+class FakeClock:
+    """sleep()하면 그만큼 시각이 흐르는 가짜 시계"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(clock, **options):
+    options.setdefault('rate', 0)
+    return RateLimiter(clock=clock, sleep=clock.sleep, rng=random.Random(3), **options)
+
+
+def scripted(responses, page):
+    """요청마다 responses의 다음 (상태, 헤더)로 응답하고, 다 쓰면 page를 돌려줍니다"""
+    responses = list(responses)
+
+    def respond(path):
+        return responses.pop(0) if responses else page
+    return respond
+
+
+def test_retry_after_is_honoured():
+    clock = FakeClock()
+    page = synthetic_page(3)
+    limited = (429, {'Retry-After': '2'})
+    with FixtureServer(scripted([limited, limited], page)) as server:
+        limiter = make_limiter(clock, max_retries=3)
+        response = limiter.request(requests.get, server.url('/p'), timeout=5)
+        assert response.status_code == 200
+        assert server.requests == 3
+    assert clock.sleeps == [2.0, 2.0]
+
+
+def test_long_retry_after_is_not_retried_but_blocks_host():
+    clock = FakeClock()
+    with FixtureServer(scripted([(429, {'Retry-After': '600'})], 'ok')) as server:
+        limiter = make_limiter(clock, max_retries=3, max_retry_after=120)
+        url = server.url('/p')
+        response = limiter.request(requests.get, url, timeout=5)
+        assert response.status_code == 429
+        assert server.requests == 1
+        # 다른 작업자도 Retry-After가 끝날 때까지 기다려야 합니다
+        assert limiter.reserve(url) == pytest.approx(600)
+
+
+def test_retry_budget_limits_total_retries():
+    clock = FakeClock()
+    with FixtureServer(lambda path: (503, {})) as server:
+        limiter = make_limiter(clock, max_retries=5, budget=RetryBudget(ratio=0, min_retries=2))
+        url = server.url('/p')
+        assert limiter.request(requests.get, url, timeout=5).status_code == 503
+        assert server.requests == 3          # 재시도 2번으로 예산을 다 씁니다
+        assert limiter.request(requests.get, url, timeout=5).status_code == 503
+        assert server.requests == 4          # 예산이 없으므로 재시도하지 않습니다
+
+
+def test_crawler_reports_429_after_retries():
+    clock = FakeClock()
+    with FixtureServer(lambda path: (429, {'Retry-After': '1'})) as server:
+        crawler = YahooFinanceCrawler(rate_limiter=make_limiter(clock, max_retries=2))
+        url = server.url('/p')
+        with pytest.raises(requests.HTTPError):
+            crawler.fetch(url)
+        assert crawler.reports[url].http_status == 429
+        assert server.requests == 3
+
+
+def test_requests_are_spaced_by_rate_and_burst():
+    clock = FakeClock()
+    limiter = make_limiter(clock, rate=10, burst=2)
+    waits = [limiter.reserve('http://example.com/a') for _ in range(5)]
+    assert waits == pytest.approx([0, 0, 0.1, 0.2, 0.3])
+    # 다른 호스트는 따로 셉니다
+    assert limiter.reserve('http://example.org/a') == 0
+
+
+def test_state_file_is_shared(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / 'rate.json')
+    first = make_limiter(clock, rate=1, burst=1, path=path)
+    second = make_limiter(clock, rate=1, burst=1, path=path)
+    assert first.reserve('http://example.com/') == 0
+    assert second.reserve('http://example.com/') == pytest.approx(1)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('5') == 5
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT', now=1445412470) == pytest.approx(10)
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,73 @@
+"""
+row_diff 테스트: add / change / remove 이벤트와, JSONL로 쓰고 읽은 이벤트를 적용하면 새 결과가 되는지 확인합니다.
+"""
+import io
+import random
+
+from row_diff import RowDiffer, apply_events, read_jsonl, write_jsonl
+
+
+def stock(symbol: str, price: str, **fields):
+    return {'Symbol': symbol, 'Price': price, **fields}
+
+
+def test_add_change_remove_events():
+    differ = RowDiffer()
+    first = [stock('A', '1.00'), stock('B', '2.00', Volume='10'), stock('C', '3.00')]
+    assert list(differ.diff(first)) == [{'op': 'add', 'symbol': symbol, 'row': row}
+                                        for symbol, row in zip('ABC', first)]
+
+    second = [stock('B', '2.50'), stock('A', '1.00'), stock('D', '4.00')]
+    assert list(differ.diff(second)) == [
+        {'op': 'change', 'symbol': 'B', 'fields': {'Price': ['2.00', '2.50'], 'Volume': ['10', None]}},
+        {'op': 'add', 'symbol': 'D', 'row': second[2]},
+        {'op': 'remove', 'symbol': 'C'},
+    ]
+    assert list(differ.diff(second)) == []
+    assert differ.stats == {'add': 4, 'change': 1, 'remove': 1}
+
+
+def test_rows_without_symbol_are_ignored():
+    assert list(RowDiffer().diff([{'Name': 'x'}, stock('A', '1')])) == [
+        {'op': 'add', 'symbol': 'A', 'row': stock('A', '1')}]
+
+
+def test_unread_events_do_not_affect_next_diff():
+    differ = RowDiffer([stock('A', '1')])
+    differ.diff([stock('A', '2')])                 # 읽지 않고 버립니다
+    assert list(differ.diff([stock('A', '3')])) == [
+        {'op': 'change', 'symbol': 'A', 'fields': {'Price': ['2', '3']}}]
+
+
+def random_snapshot(rng: random.Random):
+    rows = []
+    for index in rng.sample(range(30), rng.randint(0, 20)):
+        row = stock(f"S{index:02d}", rng.choice(['1.00', '1.50', '2.25']))
+        if rng.random() < 0.5:
+            row['Volume'] = rng.choice(['7,850', '1.2M'])
+        if rng.random() < 0.3:
+            row['Name'] = rng.choice(['Alpha Corp', '한글 이름'])
+        rows.append(row)
+    return rows
+
+
+def by_symbol(rows):
+    """필드 삭제는 None으로 적용되므로 None 값을 뺀 Symbol -> 행으로 비교합니다."""
+    return {row['Symbol']: {key: value for key, value in row.items() if value is not None} for row in rows}
+
+
+def test_jsonl_round_trip_rebuilds_each_snapshot():
+    rng = random.Random(5)
+    differ = RowDiffer()
+    state = []
+    for _ in range(40):
+        snapshot = random_snapshot(rng)
+        buffer = io.StringIO()
+        count = write_jsonl(differ.diff(snapshot), buffer, url='https://example.com', ts='2026-01-01T00:00:00Z')
+        buffer.seek(0)
+        events = list(read_jsonl(buffer))
+        assert len(events) == count
+        assert all(event['url'] == 'https://example.com' for event in events)
+        state = apply_events(state, events)
+        assert by_symbol(state) == by_symbol(snapshot)
+    assert sum(differ.stats.values()) > 0
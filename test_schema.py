@@ -0,0 +1,147 @@
+"""
+schema 테스트: 선언에서 만든 추출기가 예전 필드별 row.find 추출기와 같은 값을 꺼내는지,
+--fields 컬럼 선택(compile_schema)과 미리보기(preview_lines)가 맞는지 확인합니다.
+"""
+import random
+
+import pytest
+from bs4 import BeautifulSoup
+
+from crawler import YahooFinanceCrawler
+from fixtures import expected_stocks, synthetic_page
+from schema import DEFAULT_FIELDS, DEFAULT_SCHEMA, CompiledSchema, Field, compile_schema, parse_columns
+from stream_parser import iter_rows
+
+# 예전 _extract_row_data의 필드별 탐색: (컬럼, 셀, 값을 읽을 fin-streamer의 data-field 또는 None이면 셀 텍스트)
+LEGACY_CELLS = [
+    ('Price', 'intradayprice', 'regularMarketPrice'),
+    ('Change', 'intradaypricechange', 'regularMarketChange'),
+    ('Change %', 'percentchange', 'regularMarketChangePercent'),
+    ('Volume', 'dayvolume', 'regularMarketVolume'),
+    ('Avg Vol (3M)', 'avgdailyvol3m', None),
+    ('Market Cap', 'intradaymarketcap', 'marketCap'),
+    ('P/E Ratio (TTM)', 'peratio.lasttwelvemonths', None),
+    ('52 Wk Change %', 'fiftytwowkpercentchange', 'fiftyTwoWeekChangePercent'),
+]
+
+
+def legacy_extract_row(row):
+    """스키마 도입 전 crawler._extract_row_data와 같은 방식으로 필드마다 행 전체를 다시 탐색합니다."""
+    stock = {}
+    ticker_cell = row.find('td', {'data-testid-cell': 'ticker'})
+    if ticker_cell:
+        link = ticker_cell.find('a', {'data-testid': 'table-cell-ticker'})
+        span = link.find('span', class_='symbol') if link else None
+        if span:
+            stock['Symbol'] = span.get_text(strip=True)
+    name_cell = row.find('td', {'data-testid-cell': 'companyshortname.raw'})
+    if name_cell:
+        name_div = name_cell.find('div', class_='companyName')
+        if name_div:
+            stock['Name'] = name_div.get_text(strip=True)
+    for column, cell_id, data_field in LEGACY_CELLS:
+        cell = row.find('td', {'data-testid-cell': cell_id})
+        if not cell:
+            continue
+        if data_field is None:
+            text = cell.get_text(strip=True)
+            stock[column] = text if column != 'P/E Ratio (TTM)' or text != '--' else None
+            continue
+        streamer = cell.find('fin-streamer', {'data-field': data_field})
+        if streamer:
+            stock[column] = streamer.get('data-value', streamer.get_text(strip=True))
+    range_cell = row.find('td', {'data-testid-cell': 'fiftyTwoWeekRange'})
+    if range_cell:
+        labels = range_cell.find('div', class_='labels')
+        spans = labels.find_all('span') if labels else []
+        if len(spans) >= 2:
+            stock['52 Wk Range'] = f"{spans[0].get_text(strip=True)} - {spans[1].get_text(strip=True)}"
+    return stock if stock else None
+
+
+def damaged_rows(n_rows: int = 150, seed: int = 3):
+    """합성 페이지의 행에서 셀 / 요소 / data-value 속성을 무작위로 지운 BeautifulSoup 행들"""
+    rng = random.Random(seed)
+    soup = BeautifulSoup(synthetic_page(n_rows, seed=seed), 'html.parser')
+    rows = soup.find_all('tr', {'data-testid': 'data-table-v2-row'})
+    for row in rows:
+        for cell in row.find_all('td', recursive=False):
+            roll = rng.random()
+            if roll < 0.05:
+                cell.decompose()
+            elif roll < 0.10 and cell.find('fin-streamer') is not None:
+                del cell.find('fin-streamer')['data-value']
+            elif roll < 0.15 and cell.find(['fin-streamer', 'span', 'div']) is not None:
+                cell.find(['fin-streamer', 'span', 'div']).decompose()
+            elif roll < 0.18:
+                cell.clear()
+                cell.append('--')
+    return rows
+
+
+def test_extract_row_matches_legacy_extractor():
+    rows = damaged_rows()
+    assert [DEFAULT_SCHEMA.extract_row(row) for row in rows] == [legacy_extract_row(row) for row in rows]
+
+
+def test_parse_matches_fixture_values():
+    html_content = synthetic_page(60, seed=8)
+    assert YahooFinanceCrawler().parse_html_table(html_content) == expected_stocks(60, seed=8)
+
+
+@pytest.mark.parametrize('columns', [['Symbol'], ['Price', 'Symbol'], ['52 Wk Range', 'P/E Ratio (TTM)', 'Name']])
+def test_fields_projection(columns):
+    schema = compile_schema(columns)
+    assert schema.projected
+    assert schema.columns == tuple(field.column for field in DEFAULT_FIELDS if field.column in columns)
+    assert compile_schema(reversed(columns)) is schema
+
+    expected = [{column: stock[column] for column in schema.columns if column in stock}
+                for stock in expected_stocks(40, seed=2)]
+    html_content = synthetic_page(40, seed=2)
+    assert YahooFinanceCrawler(fields=columns).parse_html_table(html_content) == expected
+    assert list(iter_rows([html_content], schema=schema)) == expected
+    assert schema.project(expected_stocks(40, seed=2)) == expected
+    assert [field.column for field in schema.export_plan()] == list(schema.columns)
+
+
+def test_full_schema_is_not_projected():
+    assert compile_schema() is DEFAULT_SCHEMA
+    assert compile_schema([field.column for field in DEFAULT_FIELDS]).projected is False
+    stocks = expected_stocks(3)
+    assert DEFAULT_SCHEMA.project(stocks) is stocks
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(ValueError, match='Ticker'):
+        compile_schema(['Symbol', 'Ticker'])
+    with pytest.raises(ValueError):
+        YahooFinanceCrawler(fields=['price'])
+
+
+def test_parse_columns():
+    assert parse_columns('Symbol, Price ,Change %,') == ['Symbol', 'Price', 'Change %']
+    assert parse_columns('') is None
+    assert parse_columns(None) is None
+
+
+def test_preview_lines():
+    stock = {'Symbol': 'ELPC', 'Name': 'Companhia', 'Price': '6.96', 'Change': '+0.57', 'Change %': '+8.92%',
+             'Volume': '7,850', 'Market Cap': '$7.164B'}
+    assert DEFAULT_SCHEMA.preview_lines(1, stock) == [
+        '\n1. ELPC - Companhia', '   가격: $6.96', '   변동: +0.57 (+8.92%)', '   거래량: 7,850', '   시가총액: $7.164B']
+    # 선택하지 않은 컬럼의 줄은 빼고, 선택했지만 값이 없는 컬럼은 N/A로 표시합니다
+    assert compile_schema(['Symbol', 'Change']).preview_lines(2, {'Symbol': 'ELPC', 'Change': '+0.57'}) == [
+        '\n2. ELPC', '   변동: +0.57 (N/A)']
+    assert compile_schema(['Name', 'Price']).preview_lines(3, {}) == ['\n3. N/A - N/A', '   가격: $N/A']
+
+
+def test_extractor_errors_are_recorded_per_field():
+    row = BeautifulSoup(synthetic_page(1), 'html.parser').find('tr', {'data-testid': 'data-table-v2-row'})
+    symbol, price = (field for field in DEFAULT_FIELDS if field.column in ('Symbol', 'Price'))
+    broken = CompiledSchema([symbol, Field('Price', price.cell, price.select, converter=lambda value: 1 / 0)])
+    issues = []
+    assert broken.extract_row(row, issues, index=4) == {'Symbol': expected_stocks(1)[0]['Symbol']}
+    assert [(issue.row, issue.column, issue.kind) for issue in issues] == [(4, 'Price', 'error')]
+    with pytest.raises(ZeroDivisionError):
+        broken.extract_row(row)
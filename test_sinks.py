@@ -0,0 +1,136 @@
+"""
+출력 싱크 테스트: 형식마다 저장한 파일을 다시 읽어 build_export_frame 결과와 같은지,
+query.load_file로 읽은 결과가 형식과 관계없이 같은지 확인합니다.
+"""
+import json
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from crawler import YahooFinanceCrawler
+from export import build_export_frame
+from fixtures import synthetic_page
+from query import QueryEngine, load_file
+from sinks import SINKS, format_for_filename, get_sink
+from stock_row import StockTable
+
+FORMATS = ['xlsx', 'csv', 'jsonl', 'parquet', 'sqlite']
+
+
+def sample_stocks(n_rows: int = 25):
+    """값이 없는 칸과 쉼표 / 따옴표가 있는 이름이 섞인 parse_html_table 결과 (n_rows >= 4)"""
+    stocks = YahooFinanceCrawler().parse_html_table(synthetic_page(n_rows))
+    stocks[0]['Volume'] = '--'
+    stocks[1]['P/E Ratio (TTM)'] = None
+    stocks[2]['Market Cap'] = '--'
+    stocks[3]['Name'] = '한글 이름, "따옴표"'
+    return stocks
+
+
+def read_back(kind: str, filename: str) -> pd.DataFrame:
+    if kind == 'xlsx':
+        return pd.read_excel(filename)
+    if kind == 'csv':
+        return pd.read_csv(filename, keep_default_na=False, na_values=[''])
+    if kind == 'jsonl':
+        return pd.read_json(filename, lines=True, dtype=False)
+    if kind == 'parquet':
+        return pd.read_parquet(filename)
+    with sqlite3.connect(filename) as connection:
+        return pd.read_sql('SELECT * FROM stocks', connection)
+
+
+def assert_same_frame(df, expected):
+    assert list(df.columns) == list(expected.columns)
+    for column in expected.columns:
+        actual, wanted = df[column], expected[column]
+        if pd.api.types.is_numeric_dtype(wanted):
+            pd.testing.assert_series_equal(actual.astype('Float64'), wanted.astype('Float64'),
+                                           check_names=False, rtol=1e-14)
+        else:
+            assert actual.fillna('').astype(str).tolist() == wanted.fillna('').astype(str).tolist(), column
+
+
+@pytest.mark.parametrize('kind', FORMATS)
+def test_numeric_round_trip(tmp_path, kind):
+    stocks = sample_stocks()
+    filename = str(tmp_path / f"stocks{SINKS[kind].extension}")
+    sink = get_sink(kind, numeric=True, chunk_size=10)
+    assert sink.write(stocks, filename) == len(stocks)
+    # 엑셀만 퍼센트를 100으로 나눈 값으로 저장합니다 (% 셀 서식)
+    expected = build_export_frame(stocks, numeric=True, percent_fraction=kind == 'xlsx')
+    assert_same_frame(read_back(kind, filename), expected)
+
+
+@pytest.mark.parametrize('kind', FORMATS)
+def test_stock_table_is_written_like_dicts(tmp_path, kind):
+    stocks = sample_stocks()
+    extension = SINKS[kind].extension
+    # 숫자 모드의 StockTable은 딕셔너리로 되돌리지 않고 열 배열에서 바로 씁니다
+    get_sink(kind, numeric=True).write(stocks, str(tmp_path / f"dicts{extension}"))
+    get_sink(kind, numeric=True).write(StockTable.from_dicts(stocks), str(tmp_path / f"table{extension}"))
+    assert_same_frame(read_back(kind, str(tmp_path / f"table{extension}")),
+                      read_back(kind, str(tmp_path / f"dicts{extension}")))
+
+
+@pytest.mark.parametrize('kind', ['csv', 'jsonl', 'sqlite'])
+def test_text_mode_round_trip(tmp_path, kind):
+    stocks = sample_stocks()
+    filename = str(tmp_path / f"stocks{SINKS[kind].extension}")
+    get_sink(kind, numeric=False).write(stocks, filename)
+    df = pd.read_csv(filename, dtype=str, keep_default_na=False) if kind == 'csv' else read_back(kind, filename)
+    expected = build_export_frame(stocks, numeric=False)
+    assert df.fillna('').astype(str).values.tolist() == expected.fillna('').astype(str).values.tolist()
+
+
+def test_query_reads_every_format_alike(tmp_path):
+    stocks = sample_stocks()
+    expected = QueryEngine(stocks).query().sort('market_cap').rows()
+    for kind in FORMATS:
+        filename = str(tmp_path / f"stocks{SINKS[kind].extension}")
+        get_sink(kind, numeric=True).write(stocks, filename)
+        engine = QueryEngine()
+        assert load_file(engine, filename) == len(stocks)
+        rows = engine.query().sort('market_cap').rows()
+        assert [row['Symbol'] for row in rows] == [row['Symbol'] for row in expected], kind
+        assert [row.get('Volume') for row in rows] == [row.get('Volume') for row in expected], kind
+
+
+def test_jsonl_append(tmp_path):
+    filename = str(tmp_path / 'stocks.jsonl')
+    get_sink('jsonl').write(sample_stocks(5), filename)
+    get_sink('jsonl', append=True).write(sample_stocks(4), filename)
+    with open(filename, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 9
+    assert records[0]['Volume'] is None and isinstance(records[1]['Volume'], int)
+
+
+def test_sqlite_append_replace_and_types(tmp_path):
+    filename = str(tmp_path / 'stocks.db')
+    get_sink('sqlite').write(sample_stocks(5), filename)
+    get_sink('sqlite').write(sample_stocks(4), filename)
+    with sqlite3.connect(filename) as connection:
+        assert connection.execute('SELECT COUNT(*) FROM stocks').fetchone() == (9,)
+        types = {name: kind for _, name, kind, *_ in connection.execute('PRAGMA table_info(stocks)')}
+    assert (types['Symbol'], types['Price'], types['Volume']) == ('TEXT', 'REAL', 'INTEGER')
+
+    get_sink('sqlite', replace=True, columns=['Symbol', 'Price']).write(sample_stocks(4), filename)
+    with sqlite3.connect(filename) as connection:
+        assert connection.execute('SELECT COUNT(*) FROM stocks').fetchone() == (4,)
+        assert [row[1] for row in connection.execute('PRAGMA table_info(stocks)')] == ['Symbol', 'Price']
+
+
+def test_empty_input_writes_header(tmp_path):
+    filename = str(tmp_path / 'empty.csv')
+    assert get_sink('csv').write([], filename) == 0
+    assert list(pd.read_csv(filename).columns) == list(build_export_frame([], numeric=True).columns)
+
+
+def test_format_lookup():
+    assert format_for_filename('a.XLSX') == 'xlsx'
+    assert format_for_filename('a.sqlite3') == 'sqlite'
+    assert format_for_filename('a.txt') is None
+    with pytest.raises(ValueError):
+        get_sink('xml')
@@ -0,0 +1,145 @@
+"""
+SnapshotStore 테스트: 여러 키프레임 구간에 걸친 무작위 스냅샷을 저장한 뒤
+snapshot_at / history 결과를 입력에서 직접 계산한 값과 비교하고, 다시 열기와 잘린 마지막 레코드 처리를 확인합니다.
+"""
+import os
+import random
+
+import pytest
+
+from snapshot_store import SnapshotStore
+
+KEYFRAME_INTERVAL = 7
+SYMBOLS = [f"S{i:02d}" for i in range(12)]
+
+
+def random_snapshots(n_snapshots: int, seed: int = 0):
+    """(시각, 주식 데이터 리스트) 리스트. 종목이 빠지거나 다시 나오고, 필드가 바뀌거나 없어집니다."""
+    rng = random.Random(seed)
+    snapshots = []
+    timestamp = 1000.0
+    stocks = {}
+    for _ in range(n_snapshots):
+        timestamp += rng.choice([0.5, 1, 7.25, 60])
+        for symbol in SYMBOLS:
+            if rng.random() < 0.15:
+                stocks.pop(symbol, None)
+            elif symbol not in stocks or rng.random() < 0.4:
+                stock = {'Symbol': symbol, 'Price': f"{rng.randint(1, 30) / 4:.2f}"}
+                if rng.random() < 0.7:
+                    stock['Volume'] = rng.choice(['1.2M', '7,850', '--'])
+                if rng.random() < 0.5:
+                    stock['P/E Ratio (TTM)'] = rng.choice([None, '12.5'])
+                stocks[symbol] = stock
+        rows = [dict(stocks[symbol]) for symbol in rng.sample(sorted(stocks), len(stocks))]
+        if rng.random() < 0.1:
+            rows.append({'Name': 'Symbol 없는 행'})          # 저장하지 않습니다
+        snapshots.append((timestamp, rows))
+    return snapshots
+
+
+def table(rows):
+    return [row for row in rows if row.get('Symbol')]
+
+
+def expected_history(snapshots, symbol, first, last):
+    """
+    history의 정의를 입력에서 직접 계산합니다: 구간 시작 시점의 상태(있으면)와,
+    그 뒤 종목이 바뀐(추가 / 변경 / 삭제되거나 키프레임에 다시 기록된) 스냅샷마다 (시각, 상태 또는 {}).
+    """
+    states = [{row['Symbol']: row for row in table(rows)} for _, rows in snapshots]
+    result = []
+    for index in range(first, last + 1):
+        current = states[index].get(symbol)
+        previous = states[index - 1].get(symbol) if index > 0 else None
+        touched = current != previous or (index % KEYFRAME_INTERVAL == 0 and current is not None)
+        if touched or (index == first and current is not None):
+            result.append((snapshots[index][0], current or {}))
+    return result
+
+
+def fill(store, snapshots):
+    for timestamp, rows in snapshots:
+        store.append(rows, timestamp)
+
+
+def check_store(store, snapshots, seed: int = 0):
+    rng = random.Random(seed)
+    timestamps = [timestamp for timestamp, _ in snapshots]
+    assert store.timestamps == timestamps
+    assert store.snapshot_at(timestamps[0] - 1) == []
+
+    # 순서를 섞어 조회해 마지막 복원 상태(cursor)를 재사용하는 경로와 처음부터 적용하는 경로를 모두 씁니다
+    for index in rng.sample(range(len(snapshots)), len(snapshots)):
+        timestamp, rows = snapshots[index]
+        assert store.snapshot_at(timestamp) == table(rows)
+        between = timestamps[index + 1] if index + 1 < len(timestamps) else timestamp + 1
+        assert store.snapshot_at((timestamp + between) / 2) == table(rows)
+
+    for symbol in SYMBOLS + ['MISSING']:
+        if symbol == 'MISSING':
+            assert store.history(symbol) == []
+            continue
+        assert store.history(symbol) == expected_history(snapshots, symbol, 0, len(snapshots) - 1)
+        for _ in range(5):
+            first, last = sorted(rng.sample(range(len(snapshots)), 2))
+            assert store.history(symbol, timestamps[first], timestamps[last]) == \
+                expected_history(snapshots, symbol, first, last)
+
+
+def test_snapshot_at_and_history_match_inputs(tmp_path):
+    snapshots = random_snapshots(45)
+    with SnapshotStore(str(tmp_path / 'h.snap'), keyframe_interval=KEYFRAME_INTERVAL) as store:
+        fill(store, snapshots)
+        assert store.stats()['keyframes'] == 7
+        check_store(store, snapshots)
+
+
+def test_reopened_store_continues(tmp_path):
+    path = str(tmp_path / 'h.snap')
+    snapshots = random_snapshots(40, seed=1)
+    with SnapshotStore(path, keyframe_interval=KEYFRAME_INTERVAL) as store:
+        fill(store, snapshots[:25])
+    # 다시 열면 마지막 상태가 복원되어 이어서 델타를 기록합니다
+    with SnapshotStore(path, keyframe_interval=KEYFRAME_INTERVAL) as store:
+        assert len(store) == 25
+        fill(store, snapshots[25:])
+        check_store(store, snapshots, seed=1)
+    with SnapshotStore(path, keyframe_interval=KEYFRAME_INTERVAL) as store:
+        check_store(store, snapshots, seed=2)
+
+
+@pytest.mark.parametrize('cut', [1, 5, 14])
+def test_partial_trailing_record_is_truncated(tmp_path, cut):
+    path = str(tmp_path / 'h.snap')
+    snapshots = random_snapshots(20, seed=3)
+    timestamp, rows = snapshots[-1]
+    with SnapshotStore(path, keyframe_interval=KEYFRAME_INTERVAL) as store:
+        fill(store, snapshots[:-1])
+        size = os.path.getsize(path)
+        store.append(rows, timestamp)
+    # 마지막 레코드를 쓰는 도중에 멈춘 파일
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - cut)
+
+    with SnapshotStore(path, keyframe_interval=KEYFRAME_INTERVAL) as store:
+        assert len(store) == len(snapshots) - 1
+        assert os.path.getsize(path) == size
+        store.append(rows, timestamp)
+    with SnapshotStore(path, keyframe_interval=KEYFRAME_INTERVAL) as store:
+        check_store(store, snapshots, seed=3)
+
+
+def test_earlier_timestamp_is_rejected(tmp_path):
+    with SnapshotStore(str(tmp_path / 'h.snap')) as store:
+        store.append([{'Symbol': 'A'}], 10)
+        store.append([{'Symbol': 'A'}], 10)
+        with pytest.raises(ValueError):
+            store.append([{'Symbol': 'A'}], 9)
+
+
+def test_other_file_is_rejected(tmp_path):
+    path = tmp_path / 'data.xlsx'
+    path.write_bytes(b'PK\x03\x04 not a snapshot store')
+    with pytest.raises(ValueError):
+        SnapshotStore(str(path))
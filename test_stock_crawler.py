@@ -0,0 +1,41 @@
+"""
+stock_crawler 명령줄 테스트: 인자 검사와 URL별 출력 파일명을 확인합니다.
+"""
+import pytest
+
+from crawler import DEFAULT_MAX_ROWS
+from stock_crawler import output_filenames, parse_args
+
+
+def test_max_rows():
+    assert parse_args([]).max_rows == DEFAULT_MAX_ROWS
+    assert parse_args(['--max-rows', '0']).max_rows == 0
+
+
+@pytest.mark.parametrize('argv', [['--max-rows', '-1'], ['--page-size', '0']])
+def test_invalid_numbers_are_rejected(argv, capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        parse_args(argv)
+    assert exc_info.value.code == 2
+    assert argv[0] in capsys.readouterr().err
+
+
+def test_output_filenames():
+    gainers = 'https://finance.yahoo.com/screener/predefined/day_gainers'
+    losers = 'https://finance.yahoo.com/markets/stocks/losers/'
+    assert output_filenames([gainers]) == {gainers: 'stock_data.xlsx'}
+    assert output_filenames([gainers, losers], '.csv') == {
+        gainers: 'stock_data_day_gainers.csv', losers: 'stock_data_losers.csv'}
+
+
+def test_colliding_output_filenames_get_url_hash():
+    urls = ['https://finance.yahoo.com/screener/predefined/day_gainers',
+            'https://finance.yahoo.com/screener/predefined/day_gainers?start=100',
+            'https://other.example.com/screener/predefined/day_gainers',
+            'https://finance.yahoo.com/markets/stocks/losers/']
+    names = output_filenames(urls)
+    assert len(set(names.values())) == len(urls)
+    assert names[urls[3]] == 'stock_data_losers.xlsx'
+    for url in urls[:3]:
+        assert names[url].startswith('stock_data_day_gainers_') and names[url].endswith('.xlsx')
+    assert output_filenames(urls) == names            # 실행마다 같은 이름
@@ -0,0 +1,73 @@
+"""
+StockRow / StockTable 테스트: 열 단위로 한 번에 만든 테이블(from_dicts)이 행마다 append한 테이블과 같은지 확인합니다.
+"""
+import random
+
+import numpy as np
+
+from crawler import YahooFinanceCrawler
+from fixtures import synthetic_page
+from stock_row import NUMERIC_COLUMNS, TEXT_COLUMNS, StockRow, StockTable
+
+EDGE_CASES = [
+    {'Symbol': 'EDGE1', 'Price': '--', 'Volume': '1.2M', 'Avg Vol (3M)': '1,044,999.5', 'Market Cap': '$7.164B'},
+    {'Symbol': 'EDGE2', 'Name': '한글 이름', 'Change': '(1.5)', 'Change %': '+8.92%', 'P/E Ratio (TTM)': None,
+     '52 Wk Range': '5.04 - '},
+    {'Symbol': 'EDGE3', 'Price': '−0.45', 'Volume': '2.5', 'Avg Vol (3M)': '3.5', '52 Wk Range': '1.2K - 3.4K'},
+    {'Name': 'Symbol 없음', 'Price': 'N/A', 'Market Cap': '1.5T', '52 Wk Change %': '12,345.6789'},
+    {},
+]
+
+
+def appended(stocks) -> StockTable:
+    table = StockTable()
+    for stock in stocks:
+        table.append(stock)
+    return table
+
+
+def assert_same_table(table: StockTable, expected: StockTable):
+    assert len(table) == len(expected)
+    for name in TEXT_COLUMNS:
+        assert table.columns[name] == expected.columns[name], name
+    actual, wanted = table.to_numpy(), expected.to_numpy()
+    for name in NUMERIC_COLUMNS:
+        np.testing.assert_array_equal(actual[name], wanted[name], err_msg=name)
+
+
+def sample_stocks():
+    stocks = YahooFinanceCrawler().parse_html_table(synthetic_page(200))
+    rng = random.Random(4)
+    stocks[:0] = EDGE_CASES
+    rng.shuffle(stocks)
+    return stocks
+
+
+def test_from_dicts_matches_append():
+    stocks = sample_stocks()
+    assert_same_table(StockTable.from_dicts(stocks), appended(stocks))
+    assert StockTable.from_dicts(stocks).to_dicts() == appended(stocks).to_dicts()
+
+
+def test_from_rows_chooses_the_same_result():
+    stocks = sample_stocks()
+    rows = [StockRow.from_dict(stock) for stock in stocks]
+    assert_same_table(StockTable.from_rows(stocks), appended(stocks))
+    assert_same_table(StockTable.from_rows(rows), appended(stocks))
+    assert_same_table(StockTable.from_rows(iter(stocks)), appended(stocks))
+    assert list(StockTable.from_rows(stocks)) == rows
+
+
+def test_round_trip_through_dicts():
+    # 52주 범위는 두 값이 모두 있어야 딕셔너리로 되돌리므로 한쪽만 있는 값은 첫 변환에서 빠집니다
+    dicts = StockTable.from_dicts(sample_stocks()).to_dicts()
+    table = StockTable.from_dicts(dicts)
+    assert table.to_dicts() == dicts
+    assert_same_table(table, appended(dicts))
+
+
+def test_integer_columns_are_rounded():
+    row = StockTable.from_dicts(EDGE_CASES).row(0)
+    assert (row.volume, row.avg_volume, row.price, row.market_cap) == (1200000, 1045000, None, 7164000000.0)
+    assert StockTable.from_dicts(EDGE_CASES).row(2).avg_volume == 4      # 3.5 -> 짝수로 반올림
+    assert StockTable.from_dicts([]).to_dicts() == []